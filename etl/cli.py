@@ -14,7 +14,7 @@ from typing import Optional, List
 from datetime import datetime
 import json
 
-from .config import get_etl_config, PipelineConfig
+from .config import get_etl_config, update_etl_config, PipelineConfig
 from .scheduler import ETLScheduler
 
 
@@ -279,6 +279,15 @@ Examples:
   # 运行临床管道
   etl-cli run clinical --query cancer --phase "Phase 2" --limit 500
 
+  # 流式分阶段运行（抽取/转换/加载重叠执行，转换使用进程池）
+  etl-cli run rd --streaming --transform-executor process --transform-workers 4
+
+  # 全量重建：导出 neo4j-admin 离线导入文件而不是通过 Bolt 加载
+  etl-cli run rd --backend bulk_import --export-dir ./bulk_import
+
+  # 校验导出的离线导入文件
+  etl-cli validate-bundle ./bulk_import
+
   # 运行所有管道
   etl-cli run-all --config etl_config.yaml
 
@@ -323,6 +332,23 @@ Examples:
                            help="Dry run mode (no data loading)")
     run_parser.add_argument("--no-load", action="store_true",
                            help="Skip loading to Neo4j")
+    run_parser.add_argument("--streaming", action="store_true",
+                           help="Overlap extract/transform/validate/load stages with bounded queues")
+    run_parser.add_argument("--chunk-size", type=int, default=None,
+                           help="Records per chunk in streaming mode (default: batch size)")
+    run_parser.add_argument("--transform-workers", type=int, default=2,
+                           help="Transform stage workers in streaming mode")
+    run_parser.add_argument("--transform-executor", choices=["thread", "process"], default="thread",
+                           help="Transform stage executor in streaming mode")
+    run_parser.add_argument("--load-workers", type=int, default=1,
+                           help="Load stage workers in streaming mode")
+    run_parser.add_argument("--backend", choices=["neo4j", "bulk_import"], default=None,
+                           help="Load backend: transactional Bolt loading or "
+                                "neo4j-admin import file export")
+    run_parser.add_argument("--export-dir", type=str, default=None,
+                           help="Output directory for bulk_import backend")
+    run_parser.add_argument("--export-format", choices=["csv", "parquet"], default=None,
+                           help="File format for bulk_import backend")
 
     # run-all 命令
     run_all_parser = subparsers.add_parser("run-all", help="Run all configured pipelines")
@@ -333,6 +359,13 @@ Examples:
     run_all_parser.add_argument("--no-load", action="store_true",
                                help="Skip loading to Neo4j")
 
+    # validate-bundle 命令
+    bundle_parser = subparsers.add_parser(
+        "validate-bundle", help="Validate an exported neo4j-admin import bundle"
+    )
+    bundle_parser.add_argument("bundle_dir", type=str,
+                              help="Bulk import output directory")
+
     # status 命令
     status_parser = subparsers.add_parser("status", help="Show pipeline status")
 
@@ -354,8 +387,27 @@ Examples:
 
     # 执行命令
     if args.command == "run":
+        # 配置加载后端
+        backend_overrides = {}
+        if args.backend:
+            backend_overrides["load_backend"] = args.backend
+        if args.export_dir:
+            backend_overrides["bulk_import_dir"] = args.export_dir
+        if args.export_format:
+            backend_overrides["bulk_import_format"] = args.export_format
+        if backend_overrides:
+            update_etl_config(**backend_overrides)
+
         # 准备参数
         kwargs = {"dry_run": args.dry_run, "load_to_neo4j": not args.no_load}
+        if args.streaming:
+            kwargs.update({
+                "streaming": True,
+                "chunk_size": args.chunk_size,
+                "transform_workers": args.transform_workers,
+                "transform_executor": args.transform_executor,
+                "load_workers": args.load_workers
+            })
 
         if args.pipeline == "rd":
             kwargs["limit_compounds"] = args.limit_compounds
@@ -395,6 +447,13 @@ Examples:
 
         return 0 if result.get("status") == "completed" else 1
 
+    elif args.command == "validate-bundle":
+        from .loaders.bulk_import import validate_bundle
+
+        report = validate_bundle(args.bundle_dir)
+        print(json.dumps(report, indent=2, default=str))
+        return 0 if report["valid"] else 1
+
     elif args.command == "status":
         show_pipeline_status()
         return 0
@@ -69,6 +69,23 @@ class ETLConfig(BaseModel):
         ge=1
     )
 
+    # 加载后端配置
+    load_backend: str = Field(
+        default="neo4j",
+        description="加载后端 (neo4j: 在线事务加载, bulk_import: 导出 neo4j-admin 离线导入文件)",
+        env="ETL_LOAD_BACKEND"
+    )
+    bulk_import_dir: str = Field(
+        default="bulk_import",
+        description="离线导入文件输出目录",
+        env="ETL_BULK_IMPORT_DIR"
+    )
+    bulk_import_format: str = Field(
+        default="csv",
+        description="离线导入文件格式 (csv, parquet)",
+        env="ETL_BULK_IMPORT_FORMAT"
+    )
+
     # 重试配置
     max_retries: int = Field(
         default=3,
@@ -93,6 +110,21 @@ class ETLConfig(BaseModel):
         description="API 请求超时（秒）",
         ge=1
     )
+    api_concurrency: int = Field(
+        default=4,
+        description="分页 API 并发抓取的页面数",
+        ge=1
+    )
+    extraction_checkpoint_dir: Optional[str] = Field(
+        default=None,
+        description="分页抽取检查点目录（设置后支持断点续抓）",
+        env="ETL_EXTRACTION_CHECKPOINT_DIR"
+    )
+    http_cache_dir: Optional[str] = Field(
+        default=None,
+        description="共享 HTTP 缓存目录（设置后 API 响应按 ETag/Last-Modified 重新验证）",
+        env="ETL_HTTP_CACHE_DIR"
+    )
 
     # 数据源配置
     chembl_api_url: str = Field(
@@ -507,6 +539,22 @@ def get_etl_config(**kwargs) -> ETLConfig:
     return _config_cache
 
 
+def update_etl_config(**kwargs) -> ETLConfig:
+    """
+    更新全局 ETL 配置（后续 get_etl_config() 调用返回更新后的配置）
+
+    Args:
+        **kwargs: 要覆盖的配置参数
+
+    Returns:
+        更新后的 ETL 配置实例
+    """
+    global _config_cache
+
+    _config_cache = get_etl_config(**kwargs)
+    return _config_cache
+
+
 def reset_etl_config():
     """重置 ETL 配置缓存"""
     global _config_cache
@@ -13,6 +13,7 @@ from .base import (
     ExtractionResult,
     ExtractorStatus
 )
+from .paging import TokenBucket, PageCheckpoint, parse_retry_after
 
 from .chembl import ChEMBLExtractor
 from .clinicaltrials import ClinicalTrialsGovExtractor
@@ -28,6 +29,9 @@ __all__ = [
     "FileBasedExtractor",
     "ExtractionResult",
     "ExtractorStatus",
+    "TokenBucket",
+    "PageCheckpoint",
+    "parse_retry_after",
 
     # Data Source Extractors
     "ChEMBLExtractor",
@@ -7,9 +7,11 @@
 #===========================================================
 
 import logging
-import time
+import os
+import threading
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional, Generator
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Generator, Callable, Tuple
 from datetime import datetime
 from dataclasses import dataclass
 from enum import Enum
@@ -17,6 +19,15 @@ import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+from .paging import TokenBucket, PageCheckpoint, parse_retry_after
+
+# 共享 HTTP 缓存（与 processors 共用同一实现）
+try:
+    from processors.http_cache import CachingHTTPAdapter, get_http_cache
+    HTTP_CACHE_AVAILABLE = True
+except ImportError:
+    HTTP_CACHE_AVAILABLE = False
+
 
 # 配置日志
 logging.basicConfig(
@@ -116,7 +127,9 @@ class BaseExtractor(ABC):
         api_key: Optional[str] = None,
         rate_limit: float = 1.0,
         timeout: int = 30,
-        max_retries: int = 3
+        max_retries: int = 3,
+        concurrency: int = 1,
+        http_cache=None
     ):
         """
         初始化抽取器
@@ -128,6 +141,8 @@ class BaseExtractor(ABC):
             rate_limit: 请求速率限制（秒/请求）
             timeout: 请求超时时间（秒）
             max_retries: 最大重试次数
+            concurrency: 最大并发请求数
+            http_cache: 共享 HTTP 缓存实例或缓存目录（None 表示不缓存）
         """
         self.name = name
         self.base_url = base_url
@@ -135,11 +150,18 @@ class BaseExtractor(ABC):
         self.rate_limit = rate_limit
         self.timeout = timeout
         self.max_retries = max_retries
+        self.concurrency = max(1, concurrency)
+        if isinstance(http_cache, (str, os.PathLike)) and HTTP_CACHE_AVAILABLE:
+            http_cache = get_http_cache(http_cache)
+        self.http_cache = http_cache
 
         # 状态管理
         self._status = ExtractorStatus.IDLE
         self._metrics = ExtractionMetrics(source_name=name)
-        self._last_request_time = 0.0
+        self._metrics_lock = threading.Lock()
+
+        # 所有线程共享的令牌桶限速器
+        self._rate_limiter = TokenBucket(rate=1.0 / rate_limit if rate_limit > 0 else 0)
 
         # 创建 HTTP 会话
         self.session = self._create_session()
@@ -155,15 +177,26 @@ class BaseExtractor(ABC):
         """
         session = requests.Session()
 
-        # 配置重试策略
+        # 配置重试策略（429 由 _make_request 处理，以便所有线程一起退避）
         retry_strategy = Retry(
             total=self.max_retries,
             backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
+            status_forcelist=[500, 502, 503, 504],
             allowed_methods=["GET", "POST"]
         )
 
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        adapter_kwargs = {
+            "max_retries": retry_strategy,
+            "pool_connections": self.concurrency,
+            "pool_maxsize": max(10, self.concurrency)
+        }
+        if self.http_cache is not None and HTTP_CACHE_AVAILABLE:
+            # 未变化的页面只需一次 304 往返
+            adapter = CachingHTTPAdapter(self.http_cache, source=self.name, **adapter_kwargs)
+        else:
+            if self.http_cache is not None:
+                logger.warning("processors.http_cache is not importable; HTTP caching disabled")
+            adapter = HTTPAdapter(**adapter_kwargs)
         session.mount("http://", adapter)
         session.mount("https://", adapter)
 
@@ -173,16 +206,10 @@ class BaseExtractor(ABC):
         return session
 
     def _rate_limit_wait(self):
-        """等待以满足速率限制"""
-        current_time = time.time()
-        time_since_last_request = current_time - self._last_request_time
-
-        if time_since_last_request < self.rate_limit:
-            wait_time = self.rate_limit - time_since_last_request
+        """等待以满足速率限制（令牌桶，线程安全）"""
+        wait_time = self._rate_limiter.acquire()
+        if wait_time:
             logger.debug(f"Rate limit wait: {wait_time:.2f}s")
-            time.sleep(wait_time)
-
-        self._last_request_time = time.time()
 
     def _make_request(
         self,
@@ -208,42 +235,63 @@ class BaseExtractor(ABC):
         Raises:
             requests.RequestException: 请求失败
         """
-        # 速率限制等待
-        self._rate_limit_wait()
-
         # 构建完整 URL
         url = f"{self.base_url}{endpoint}" if self.base_url else endpoint
 
         # 添加认证头
-        request_headers = headers or {}
+        request_headers = dict(headers or {})
         if self.api_key:
             request_headers["Authorization"] = f"Bearer {self.api_key}"
 
-        # 记录 API 调用
-        self._metrics.api_calls += 1
+        attempt = 0
+        while True:
+            # 速率限制等待
+            self._rate_limit_wait()
 
-        try:
-            logger.debug(f"Request: {method} {url}")
-            response = self.session.request(
-                method=method,
-                url=url,
-                params=params,
-                json=data,
-                headers=request_headers,
-                timeout=self.timeout
-            )
-            response.raise_for_status()
-            return response
-
-        except requests.RequestException as e:
-            self._metrics.errors.append({
-                "timestamp": datetime.now().isoformat(),
-                "error": str(e),
-                "endpoint": endpoint,
-                "method": method
-            })
-            logger.error(f"Request failed: {e}")
-            raise
+            # 记录 API 调用
+            with self._metrics_lock:
+                self._metrics.api_calls += 1
+
+            try:
+                logger.debug(f"Request: {method} {url}")
+                response = self.session.request(
+                    method=method,
+                    url=url,
+                    params=params,
+                    json=data,
+                    headers=request_headers,
+                    timeout=self.timeout
+                )
+
+                # 429：按 Retry-After 暂停所有请求并降低速率后重试
+                if response.status_code == 429 and attempt < self.max_retries:
+                    attempt += 1
+                    delay = parse_retry_after(
+                        response.headers.get("Retry-After"),
+                        default=float(2 ** attempt)
+                    )
+                    logger.warning(
+                        f"Rate limited by {self.name}, retrying in {delay:.1f}s "
+                        f"(attempt {attempt}/{self.max_retries})"
+                    )
+                    self._rate_limiter.pause(delay)
+                    self._rate_limiter.throttle()
+                    continue
+
+                response.raise_for_status()
+                self._rate_limiter.recover()
+                return response
+
+            except requests.RequestException as e:
+                with self._metrics_lock:
+                    self._metrics.errors.append({
+                        "timestamp": datetime.now().isoformat(),
+                        "error": str(e),
+                        "endpoint": endpoint,
+                        "method": method
+                    })
+                logger.error(f"Request failed: {e}")
+                raise
 
     def fetch_all(
         self,
@@ -366,16 +414,35 @@ class PaginatedExtractor(BaseExtractor):
     """
     支持分页的抽取器基类
 
-    用于处理支持分页的 API
+    用于处理支持分页的 API：
+    - concurrency > 1 时以滑动窗口并发抓取后续页面，仍按页码顺序产出
+    - 所有请求共享令牌桶限速器，429 时按 Retry-After 整体退避
+    - 设置 checkpoint_path 后每处理完一页记录进度，中断后从下一页继续
     """
 
+    # 页码起始值（0 或 1，取决于 API）
+    FIRST_PAGE: int = 1
+    # 页面是否可独立寻址（基于 token 的分页只能顺序抓取）
+    SUPPORTS_CONCURRENT_PAGES: bool = True
+
+    def __init__(self, *args, checkpoint_path: Optional[str] = None, **kwargs):
+        """
+        初始化分页抽取器
+
+        Args:
+            checkpoint_path: 分页检查点文件路径（None 表示不记录进度）
+            其余参数同 BaseExtractor
+        """
+        super().__init__(*args, **kwargs)
+        self.checkpoint = PageCheckpoint(checkpoint_path) if checkpoint_path else None
+
     @abstractmethod
     def _fetch_page(self, page: int, page_size: int) -> List[Dict]:
         """
         抽取单页数据的抽象方法
 
         Args:
-            page: 页码（从 1 开始）
+            page: 页码（从 FIRST_PAGE 开始）
             page_size: 每页大小
 
         Returns:
@@ -396,45 +463,121 @@ class PaginatedExtractor(BaseExtractor):
         """
         pass
 
-    def _fetch_records(
+    def _iter_pages(
         self,
-        start_page: int = 1,
-        page_size: int = 100
-    ) -> Generator[Dict, None, None]:
+        fetch_page: Callable[[int], List[Dict]],
+        start_page: Optional[int] = None,
+        page_size: int = 100,
+        max_pages: Optional[int] = None,
+        checkpoint_key: Optional[str] = None,
+        fingerprint: Optional[str] = None
+    ) -> Generator[Tuple[int, List[Dict]], None, None]:
         """
-        从所有页面抽取记录
+        按页码顺序抓取页面（可并发、可恢复）
+
+        返回空页或不足 page_size 的页面视为最后一页。并发模式下最多
+        预取 concurrency 个页面，末页之后的预取结果被丢弃。
+        到达末页或 max_pages 时清除检查点；抓取出错或调用方提前关闭
+        生成器时保留检查点，下次从最后一个未处理完的页面继续。
 
         Args:
-            start_page: 起始页码
+            fetch_page: 抓取单页的函数 page -> records（须线程安全）
+            start_page: 起始页码（默认 FIRST_PAGE，有检查点时从检查点继续）
             page_size: 每页大小
+            max_pages: 最多抓取的页数（从起始页码计）
+            checkpoint_key: 检查点中的抽取流名称
+            fingerprint: 查询参数指纹（参数变化时不沿用检查点）
 
         Yields:
-            单条数据记录
+            (页码, 记录列表)
         """
-        page = start_page
-
-        while True:
-            logger.debug(f"Fetching page {page} (size: {page_size})")
+        page = self.FIRST_PAGE if start_page is None else start_page
+        end_page = page + max_pages if max_pages else None
+
+        if self.checkpoint and checkpoint_key:
+            state = self.checkpoint.get(checkpoint_key, fingerprint)
+            if state and state.get("page_size") == page_size:
+                page = state["next_page"]
+                logger.info(f"Resuming {self.name} {checkpoint_key} from page {page}")
+
+        concurrent = self.concurrency > 1 and self.SUPPORTS_CONCURRENT_PAGES
+        pool = ThreadPoolExecutor(
+            max_workers=self.concurrency,
+            thread_name_prefix=f"{self.name}-pages"
+        ) if concurrent else None
+        futures = {}
+        next_submit = page
+        finished = False
 
-            try:
-                records = self._fetch_page(page, page_size)
+        try:
+            while end_page is None or page < end_page:
+                if pool is not None:
+                    while len(futures) < self.concurrency and (end_page is None or next_submit < end_page):
+                        futures[next_submit] = pool.submit(fetch_page, next_submit)
+                        next_submit += 1
+                    logger.debug(f"Waiting for page {page} ({len(futures)} in flight)")
+                    records = futures.pop(page).result()
+                else:
+                    logger.debug(f"Fetching page {page} (size: {page_size})")
+                    records = fetch_page(page)
 
                 if not records:
                     logger.info(f"No more records at page {page}")
                     break
 
-                for record in records:
-                    yield record
+                yield page, records
+
+                if self.checkpoint and checkpoint_key:
+                    self.checkpoint.update(
+                        checkpoint_key,
+                        fingerprint=fingerprint,
+                        next_page=page + 1,
+                        page_size=page_size
+                    )
 
                 # 如果返回的记录少于页面大小，说明是最后一页
                 if len(records) < page_size:
                     break
-
                 page += 1
 
-            except Exception as e:
-                logger.error(f"Failed to fetch page {page}: {e}")
-                raise
+            finished = True
+
+        except Exception as e:
+            logger.error(f"Failed to fetch page {page}: {e}")
+            raise
+
+        finally:
+            if pool is not None:
+                for future in futures.values():
+                    future.cancel()
+                pool.shutdown(wait=True)
+            if finished and self.checkpoint and checkpoint_key:
+                self.checkpoint.clear(checkpoint_key)
+
+    def _fetch_records(
+        self,
+        start_page: Optional[int] = None,
+        page_size: int = 100
+    ) -> Generator[Dict, None, None]:
+        """
+        从所有页面抽取记录
+
+        Args:
+            start_page: 起始页码（默认 FIRST_PAGE）
+            page_size: 每页大小
+
+        Yields:
+            单条数据记录
+        """
+        pages = self._iter_pages(
+            lambda page: self._fetch_page(page, page_size),
+            start_page=start_page,
+            page_size=page_size,
+            checkpoint_key="records"
+        )
+        for _, records in pages:
+            for record in records:
+                yield record
 
 
 class FileBasedExtractor(BaseExtractor):
@@ -30,10 +30,17 @@ class ChEMBLExtractor(PaginatedExtractor):
     # ChEMBL API v2 端点
     API_BASE_URL = "https://www.ebi.ac.uk/chembl/api/data"
 
+    # ChEMBL 使用 offset 分页，页码从 0 开始
+    FIRST_PAGE = 0
+
     def __init__(
         self,
         api_key: Optional[str] = None,
-        rate_limit: float = 0.5  # ChEMBL 建议不超过 2 req/sec
+        rate_limit: float = 0.5,  # ChEMBL 建议不超过 2 req/sec
+        concurrency: int = 1,
+        checkpoint_path: Optional[str] = None,
+        base_url: Optional[str] = None,
+        http_cache=None
     ):
         """
         初始化 ChEMBL 抽取器
@@ -41,12 +48,19 @@ class ChEMBLExtractor(PaginatedExtractor):
         Args:
             api_key: ChEMBL API 密钥（可选，高频访问需要）
             rate_limit: 速率限制（秒/请求）
+            concurrency: 并发抓取的页面数
+            checkpoint_path: 分页检查点文件路径（可选，用于断点续抓）
+            base_url: API 基础 URL（默认官方地址，测试时可指向本地服务）
+            http_cache: 共享 HTTP 缓存（可选）
         """
         super().__init__(
             name="ChEMBL",
-            base_url=self.API_BASE_URL,
+            base_url=base_url or self.API_BASE_URL,
             api_key=api_key,
-            rate_limit=rate_limit
+            rate_limit=rate_limit,
+            concurrency=concurrency,
+            checkpoint_path=checkpoint_path,
+            http_cache=http_cache
         )
 
     #===========================================================
@@ -64,17 +78,7 @@ class ChEMBLExtractor(PaginatedExtractor):
         Returns:
             该页的分子数据记录
         """
-        response = self._make_request(
-            endpoint="/molecule",
-            params={
-                "format": "json",
-                "offset": page * page_size,
-                "limit": page_size
-            }
-        )
-
-        data = response.json()
-        return data.get("molecules", {})
+        return self._fetch_listing("/molecule", "molecules", page, page_size)
 
     def get_total_pages(self, page_size: int) -> Optional[int]:
         """
@@ -147,30 +151,16 @@ class ChEMBLExtractor(PaginatedExtractor):
 
         props = properties or default_properties
 
-        endpoint = "/molecule"
-        offset = 0
         batch_size = 100
+        pages = self._iter_pages(
+            lambda page: self._fetch_listing("/molecule", "molecules", page, batch_size),
+            page_size=batch_size,
+            max_pages=-(-limit // batch_size) if limit else None,
+            checkpoint_key="compounds",
+            fingerprint=str(limit)
+        )
 
-        while True:
-            # 检查限制
-            if limit and offset >= limit:
-                break
-
-            response = self._make_request(
-                endpoint=endpoint,
-                params={
-                    "format": "json",
-                    "offset": offset,
-                    "limit": batch_size
-                }
-            )
-
-            data = response.json()
-            molecules = data.get("molecules", {})
-
-            if not molecules:
-                break
-
+        for _, molecules in pages:
             for molecule in molecules:
                 # 过滤只获取父分子
                 if molecule.get("is_parent"):
@@ -187,7 +177,34 @@ class ChEMBLExtractor(PaginatedExtractor):
                         "structures": molecule.get("molecule_structures", {})
                     }
 
-            offset += batch_size
+    def _fetch_listing(
+        self,
+        endpoint: str,
+        key: str,
+        page: int,
+        page_size: int
+    ) -> List[Dict]:
+        """
+        抓取列表端点的一页（offset 分页）
+
+        Args:
+            endpoint: API 端点
+            key: 响应中记录列表的键
+            page: 页码（从 0 开始）
+            page_size: 每页大小
+
+        Returns:
+            该页的记录列表
+        """
+        response = self._make_request(
+            endpoint=endpoint,
+            params={
+                "format": "json",
+                "offset": page * page_size,
+                "limit": page_size
+            }
+        )
+        return response.json().get(key) or []
 
     def _extract_smiles(self, molecule: Dict) -> Optional[str]:
         """从分子数据中提取 SMILES"""
@@ -216,29 +233,16 @@ class ChEMBLExtractor(PaginatedExtractor):
         Yields:
             靶点数据记录
         """
-        endpoint = "/target"
-        offset = 0
         batch_size = 100
+        pages = self._iter_pages(
+            lambda page: self._fetch_listing("/target", "targets", page, batch_size),
+            page_size=batch_size,
+            max_pages=-(-limit // batch_size) if limit else None,
+            checkpoint_key="targets",
+            fingerprint=str(limit)
+        )
 
-        while True:
-            if limit and offset >= limit:
-                break
-
-            response = self._make_request(
-                endpoint=endpoint,
-                params={
-                    "format": "json",
-                    "offset": offset,
-                    "limit": batch_size
-                }
-            )
-
-            data = response.json()
-            targets = data.get("targets", {})
-
-            if not targets:
-                break
-
+        for _, targets in pages:
             for target in targets:
                 yield {
                     "chembl_id": target.get("target_chembl_id"),
@@ -250,8 +254,6 @@ class ChEMBLExtractor(PaginatedExtractor):
                     "components": target.get("target_components", [])
                 }
 
-            offset += batch_size
-
     def extract_activities(
         self,
         compound_id: Optional[str] = None,
@@ -6,6 +6,7 @@
 # 描述: 从 ClinicalTrials.gov API v2 抽取临床试验数据
 #===========================================================
 
+import json
 import logging
 from typing import Generator, Dict, Optional, List
 from datetime import datetime
@@ -31,10 +32,16 @@ class ClinicalTrialsGovExtractor(PaginatedExtractor):
     # ClinicalTrials.gov API v2 端点
     API_BASE_URL = "https://clinicaltrials.gov/api/v2"
 
+    # API v2 使用 nextPageToken 链式分页，页面只能顺序抓取
+    SUPPORTS_CONCURRENT_PAGES = False
+
     def __init__(
         self,
         api_key: Optional[str] = None,
-        rate_limit: float = 0.5  # API 建议延迟
+        rate_limit: float = 0.5,  # API 建议延迟
+        checkpoint_path: Optional[str] = None,
+        base_url: Optional[str] = None,
+        http_cache=None
     ):
         """
         初始化 ClinicalTrials.gov 抽取器
@@ -42,12 +49,17 @@ class ClinicalTrialsGovExtractor(PaginatedExtractor):
         Args:
             api_key: NIH API 密钥（可选，提高速率限制）
             rate_limit: 速率限制（秒/请求）
+            checkpoint_path: 分页检查点文件路径（可选，保存 nextPageToken 用于断点续抓）
+            base_url: API 基础 URL（默认官方地址，测试时可指向本地服务）
+            http_cache: 共享 HTTP 缓存（可选）
         """
         super().__init__(
             name="ClinicalTrials.gov",
-            base_url=self.API_BASE_URL,
+            base_url=base_url or self.API_BASE_URL,
             api_key=api_key,
-            rate_limit=rate_limit
+            rate_limit=rate_limit,
+            checkpoint_path=checkpoint_path,
+            http_cache=http_cache
         )
 
     #===========================================================
@@ -152,33 +164,61 @@ class ClinicalTrialsGovExtractor(PaginatedExtractor):
         next_page_token = None
         total_fetched = 0
 
-        while True:
-            # 检查限制
-            if limit and total_fetched >= limit:
-                break
-
-            if next_page_token:
-                params["pageToken"] = next_page_token
-
-            response = self._make_request(
-                endpoint="/studies",
-                params=params
-            )
-
-            data = response.json()
-            studies = data.get("studies", [])
-
-            if not studies:
-                break
-
-            for study in studies:
-                yield self._parse_study(study)
-                total_fetched += 1
+        # 从检查点恢复 nextPageToken（指纹包含全部筛选条件和 limit）
+        fingerprint = json.dumps(
+            {"query": query, "status": status, "phase": phase, "limit": limit},
+            sort_keys=True
+        )
+        if self.checkpoint:
+            state = self.checkpoint.get("studies", fingerprint)
+            if state:
+                next_page_token = state.get("page_token")
+                total_fetched = state.get("fetched", 0)
+                logger.info(f"Resuming ClinicalTrials.gov studies after {total_fetched} records")
+
+        # 抓完、达到 limit 或遇到空页时清除检查点；
+        # 异常或调用方提前关闭生成器时保留检查点，下次从断点继续
+        completed = False
+        try:
+            while True:
+                # 检查限制
+                if limit and total_fetched >= limit:
+                    break
+
+                if next_page_token:
+                    params["pageToken"] = next_page_token
+
+                response = self._make_request(
+                    endpoint="/studies",
+                    params=params
+                )
+
+                data = response.json()
+                studies = data.get("studies", [])
+
+                if not studies:
+                    break
 
-            # 获取下一页 token
-            next_page_token = data.get("nextPageToken")
-            if not next_page_token:
-                break
+                for study in studies:
+                    yield self._parse_study(study)
+                    total_fetched += 1
+
+                # 获取下一页 token
+                next_page_token = data.get("nextPageToken")
+                if not next_page_token:
+                    break
+
+                if self.checkpoint:
+                    self.checkpoint.update(
+                        "studies",
+                        fingerprint=fingerprint,
+                        page_token=next_page_token,
+                        fetched=total_fetched
+                    )
+            completed = True
+        finally:
+            if completed and self.checkpoint:
+                self.checkpoint.clear("studies")
 
     def _parse_study(self, study: Dict) -> Dict:
         """
@@ -0,0 +1,218 @@
+#===========================================================
+# PharmaKG ETL - 分页抓取工具
+# Pharmaceutical Knowledge Graph - Paging Utilities
+#===========================================================
+# 版本: v1.0
+# 描述: 令牌桶限速器、Retry-After 解析和可恢复的分页检查点
+#===========================================================
+
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    线程安全的令牌桶限速器
+
+    - 以 rate 个/秒的速度补充令牌，最多积累 burst 个
+    - pause() 使所有线程暂停到指定时间（用于响应 429 Retry-After）
+    - throttle() / recover() 在被限流时降低速率，之后逐步恢复到初始速率
+    """
+
+    def __init__(self, rate: float, burst: int = 1, min_rate: Optional[float] = None):
+        """
+        初始化令牌桶
+
+        Args:
+            rate: 每秒补充的令牌数（<= 0 表示不限速）
+            burst: 令牌桶容量（允许的突发请求数）
+            min_rate: 自适应降速的下限（默认 rate 的 1/8）
+        """
+        self.initial_rate = rate
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.min_rate = min_rate if min_rate is not None else rate / 8
+
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+        self.stats = {
+            "acquired": 0,
+            "wait_seconds": 0.0,
+            "pauses": 0
+        }
+
+    def acquire(self) -> float:
+        """
+        获取一个令牌（必要时阻塞）
+
+        Returns:
+            本次等待的秒数
+        """
+        if self.rate <= 0:
+            self.stats["acquired"] += 1
+            return 0.0
+
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    delay = self._paused_until - now
+                else:
+                    self._tokens = min(
+                        self.burst,
+                        self._tokens + (now - self._updated) * self.rate
+                    )
+                    self._updated = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        self.stats["acquired"] += 1
+                        self.stats["wait_seconds"] += waited
+                        return waited
+                    delay = (1 - self._tokens) / self.rate
+
+            time.sleep(delay)
+            waited += delay
+
+    def pause(self, seconds: float):
+        """所有请求暂停指定秒数（与已有暂停取较晚者）"""
+        with self._lock:
+            until = time.monotonic() + max(0.0, seconds)
+            if until > self._paused_until:
+                self._paused_until = until
+                self._tokens = 0.0
+                self._updated = until
+            self.stats["pauses"] += 1
+
+    def throttle(self, factor: float = 0.5):
+        """被限流时按比例降低速率"""
+        with self._lock:
+            if self.rate > 0:
+                self.rate = max(self.min_rate, self.rate * factor)
+                logger.info(f"Rate limit lowered to {self.rate:.2f} req/s")
+
+    def recover(self, factor: float = 1.1):
+        """请求成功后逐步恢复速率"""
+        if self.rate >= self.initial_rate:
+            return
+        with self._lock:
+            self.rate = min(self.initial_rate, self.rate * factor)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取统计"""
+        stats = self.stats.copy()
+        stats["rate"] = self.rate
+        return stats
+
+
+def parse_retry_after(value: Optional[str], default: float = 1.0) -> float:
+    """
+    解析 Retry-After 响应头
+
+    Args:
+        value: 秒数或 HTTP 日期
+        default: 无法解析时的等待时间
+
+    Returns:
+        需要等待的秒数
+    """
+    if not value:
+        return default
+
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return default
+
+
+class PageCheckpoint:
+    """
+    可恢复的分页检查点
+
+    以 JSON 文件保存每个抽取流（key）的进度状态，例如
+    {"next_page": 12, "page_size": 100} 或 {"page_token": "...", "fetched": 500}。
+    fingerprint 记录查询参数，参数变化时旧检查点自动失效。
+    """
+
+    def __init__(self, path: str):
+        """
+        初始化检查点
+
+        Args:
+            path: 检查点文件路径
+        """
+        self.path = Path(path)
+        self._state: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+        if self.path.exists():
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self._state = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning(f"Ignoring unreadable checkpoint {self.path}: {e}")
+                self._state = {}
+
+    def get(self, key: str, fingerprint: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        获取抽取流的检查点
+
+        Args:
+            key: 抽取流名称
+            fingerprint: 当前查询参数指纹（不匹配时返回 None）
+
+        Returns:
+            检查点状态
+        """
+        state = self._state.get(key)
+        if state is None:
+            return None
+        if fingerprint is not None and state.get("fingerprint") != fingerprint:
+            logger.info(f"Checkpoint for {key} was written for different parameters, ignoring")
+            return None
+        return dict(state)
+
+    def update(self, key: str, fingerprint: Optional[str] = None, **state):
+        """更新并持久化抽取流的检查点"""
+        with self._lock:
+            entry = dict(state)
+            entry["fingerprint"] = fingerprint
+            entry["updated_at"] = datetime.now().isoformat()
+            self._state[key] = entry
+            self._save()
+
+    def clear(self, key: str):
+        """抽取流完成后删除其检查点"""
+        with self._lock:
+            if self._state.pop(key, None) is not None:
+                self._save()
+
+    def _save(self):
+        # 先写临时文件再原子替换，避免中断时损坏检查点
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._state, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
@@ -8,9 +8,27 @@
 
 from .neo4j_batch import Neo4jBatchLoader
 from .cypher_builder import CypherBuilder
+from .bulk_import import BulkImportExporter, validate_bundle
+from .schema_manager import (
+    SchemaManager,
+    SchemaConstraint,
+    SchemaIndex,
+    PIPELINE_SCHEMAS,
+    get_pipeline_schema
+)
+from .factory import create_loader, LOAD_BACKENDS
 
 
 __all__ = [
     "Neo4jBatchLoader",
-    "CypherBuilder"
+    "CypherBuilder",
+    "BulkImportExporter",
+    "validate_bundle",
+    "SchemaManager",
+    "SchemaConstraint",
+    "SchemaIndex",
+    "PIPELINE_SCHEMAS",
+    "get_pipeline_schema",
+    "create_loader",
+    "LOAD_BACKENDS"
 ]
@@ -0,0 +1,770 @@
+#===========================================================
+# PharmaKG ETL - 离线批量导入导出器
+# Pharmaceutical Knowledge Graph - Offline Bulk Import Exporter
+#===========================================================
+# 版本: v1.0
+# 描述: 将节点和关系写出为 neo4j-admin database import 格式
+#===========================================================
+
+import csv
+import json
+import logging
+import re
+from datetime import datetime, date
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Set, Tuple
+
+from .schema_manager import SchemaConstraint, get_pipeline_schema
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+
+logger = logging.getLogger(__name__)
+
+
+MANIFEST_FILE = "manifest.json"
+SCHEMA_FILE = "schema.cypher"
+
+def _value_type(value: Any) -> Optional[str]:
+    """推断单个值的 neo4j-admin 头部类型（None 表示无值，json 表示序列化为字符串）"""
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return "boolean"
+    if isinstance(value, int):
+        return "long"
+    if isinstance(value, float):
+        return "double"
+    if isinstance(value, (list, tuple)):
+        element_types = {_value_type(v) for v in value if v is not None}
+        if len(element_types) == 1:
+            element_type = element_types.pop()
+            if not element_type.endswith("[]"):
+                return f"{element_type}[]"
+        if not element_types:
+            return "string[]"
+        if element_types <= {"long", "double"}:
+            return "double[]"
+        return "json"
+    if isinstance(value, dict):
+        return "json"
+    return "string"
+
+
+def _merge_types(current: Optional[str], new: Optional[str]) -> Optional[str]:
+    """合并同一列的两个类型"""
+    if current is None:
+        return new
+    if new is None or current == new:
+        return current
+    if {current, new} == {"long", "double"}:
+        return "double"
+    if {current, new} == {"long[]", "double[]"}:
+        return "double[]"
+    if "json" in (current, new) or current.endswith("[]") or new.endswith("[]"):
+        return "json"
+    return "string"
+
+
+def _safe_name(name: str) -> str:
+    """将标签/关系类型转换为安全的文件名"""
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", name)
+
+
+class BulkImportExporter:
+    """
+    离线批量导入导出器
+
+    与 Neo4jBatchLoader 接口兼容，但不连接 Neo4j，而是把每次
+    load_nodes / load_relationships 调用写成一组 header + data 文件，
+    供 `neo4j-admin database import full` 离线导入。
+
+    功能：
+    - 每个标签使用独立的 ID 空间（:ID(Label)），合并键即 ID 列
+    - 节点按 ID、关系按 (起点, 终点) 去重（保留首次出现的记录）
+    - 生成 manifest.json（文件清单、计数、导入命令）和 schema.cypher
+    - 支持 CSV 与 Parquet（需 pyarrow）两种输出格式
+    - 支持在已有导出目录上追加（恢复 ID 集合以便跨管道去重）
+    """
+
+    def __init__(
+        self,
+        output_dir: str,
+        file_format: str = "csv",
+        batch_size: int = 500,
+        array_delimiter: str = ";",
+        append: bool = True,
+        dry_run: bool = False
+    ):
+        """
+        初始化导出器
+
+        Args:
+            output_dir: 导出目录
+            file_format: 输出格式 (csv, parquet)
+            batch_size: 批量大小（仅用于统计批次数）
+            array_delimiter: CSV 数组分隔符
+            append: 目录中已有 manifest 时是否在其基础上追加
+            dry_run: 试运行模式
+        """
+        if file_format not in ("csv", "parquet"):
+            raise ValueError(f"Unsupported bulk import format: {file_format}")
+        if file_format == "parquet" and not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow package is required for parquet export. Install with: pip install pyarrow")
+
+        self.output_dir = Path(output_dir)
+        self.file_format = file_format
+        self.batch_size = batch_size
+        self.array_delimiter = array_delimiter
+        self.dry_run = dry_run
+
+        # ID 空间: label -> 合并键
+        self._id_spaces: Dict[str, str] = {}
+        # 已导出的节点 ID: label -> set(id)
+        self._node_ids: Dict[str, Set[str]] = {}
+        # 已导出的关系: rel_type -> set((from_label, from_id, to_label, to_id))
+        self._rel_keys: Dict[str, Set[Tuple[str, str, str, str]]] = {}
+        # 文件清单
+        self._node_files: Dict[str, List[Dict[str, Any]]] = {}
+        self._rel_files: Dict[str, List[Dict[str, Any]]] = {}
+        # 约束和索引语句
+        self._schema_statements: List[str] = []
+        self._part_counter = 0
+        self._closed = False
+
+        self.stats = {
+            "nodes_loaded": 0,
+            "relationships_loaded": 0,
+            "errors": 0,
+            "batches_processed": 0,
+            "duplicate_nodes": 0,
+            "duplicate_relationships": 0,
+            "invalid_records": 0
+        }
+
+        if not self.dry_run:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            if append and (self.output_dir / MANIFEST_FILE).exists():
+                self._resume()
+
+    def close(self):
+        """写出 manifest 和 schema 文件"""
+        if self._closed or self.dry_run:
+            self._closed = True
+            return
+
+        self.write_manifest()
+        self._closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    # ------------------------------------------------------------------
+    # 与 Neo4jBatchLoader 兼容的接口
+    # ------------------------------------------------------------------
+
+    def load_nodes(
+        self,
+        label: str,
+        records: List[Dict],
+        merge_key: str,
+        additional_props: Optional[Dict[str, Any]] = None,
+        create_constraints: bool = True
+    ) -> int:
+        """
+        导出节点
+
+        Args:
+            label: 节点标签
+            records: 记录列表
+            merge_key: 合并键字段（作为 ID 列）
+            additional_props: 额外的属性（添加到所有节点）
+            create_constraints: 是否在 schema.cypher 中记录唯一约束
+
+        Returns:
+            写出的节点数量
+        """
+        if self.dry_run:
+            logger.info(f"[DRY RUN] Would export {len(records)} {label} nodes")
+            return len(records)
+
+        if not records:
+            logger.warning(f"No records to export for label {label}")
+            return 0
+
+        self._register_id_space(label, merge_key)
+        if create_constraints:
+            self.create_constraint(label, merge_key, "unique")
+
+        seen = self._node_ids.setdefault(label, set())
+        rows = []
+        for record in records:
+            if additional_props:
+                record = {**record, **additional_props}
+
+            node_id = record.get(merge_key)
+            if node_id is None or node_id == "":
+                self.stats["invalid_records"] += 1
+                continue
+
+            node_id = str(node_id)
+            if node_id in seen:
+                self.stats["duplicate_nodes"] += 1
+                continue
+
+            seen.add(node_id)
+            row = {k: v for k, v in record.items() if k != merge_key}
+            row[merge_key] = node_id
+            rows.append(row)
+
+        if not rows:
+            return 0
+
+        id_column = f"{merge_key}:ID({label})"
+        columns = self._infer_columns(rows, exclude={merge_key})
+        part = self._write_part(
+            kind="nodes",
+            name=label,
+            id_columns=[(id_column, merge_key)],
+            columns=columns,
+            rows=rows
+        )
+        self._node_files.setdefault(label, []).append(part)
+
+        self.stats["nodes_loaded"] += len(rows)
+        self.stats["batches_processed"] += (len(records) + self.batch_size - 1) // self.batch_size
+        logger.info(f"Exported {len(rows)} {label} nodes to {part['data']}")
+
+        return len(rows)
+
+    def load_relationships(
+        self,
+        from_label: str,
+        from_key: str,
+        to_label: str,
+        to_key: str,
+        rel_type: str,
+        records: List[Dict],
+        rel_properties: Optional[Dict[str, Any]] = None,
+        merge: bool = True
+    ) -> int:
+        """
+        导出关系
+
+        Args:
+            from_label: 起始节点标签（起点 ID 空间）
+            from_key: 起始节点键字段
+            to_label: 目标节点标签（终点 ID 空间）
+            to_key: 目标节点键字段
+            rel_type: 关系类型
+            records: 记录列表（包含 from_id, to_id, 可选的 props）
+            rel_properties: 关系属性模板
+            merge: 是否去重（与 MERGE 语义一致）
+
+        Returns:
+            写出的关系数量
+        """
+        if self.dry_run:
+            logger.info(f"[DRY RUN] Would export {len(records)} {rel_type} relationships")
+            return len(records)
+
+        if not records:
+            logger.warning(f"No relationships to export for type {rel_type}")
+            return 0
+
+        self._register_id_space(from_label, from_key)
+        self._register_id_space(to_label, to_key)
+
+        seen = self._rel_keys.setdefault(rel_type, set())
+        rows = []
+        for record in records:
+            from_id = record.get("from_id")
+            to_id = record.get("to_id")
+            if from_id is None or to_id is None:
+                self.stats["invalid_records"] += 1
+                continue
+
+            from_id, to_id = str(from_id), str(to_id)
+            if merge:
+                key = (from_label, from_id, to_label, to_id)
+                if key in seen:
+                    self.stats["duplicate_relationships"] += 1
+                    continue
+                seen.add(key)
+
+            props = rel_properties.copy() if rel_properties else {}
+            if "props" in record:
+                props.update(record["props"])
+            elif "properties" in record:
+                props.update(record["properties"])
+
+            rows.append({**props, "__from": from_id, "__to": to_id})
+
+        if not rows:
+            return 0
+
+        columns = self._infer_columns(rows, exclude={"__from", "__to"})
+        part = self._write_part(
+            kind="relationships",
+            name=rel_type,
+            id_columns=[
+                (f":START_ID({from_label})", "__from"),
+                (f":END_ID({to_label})", "__to")
+            ],
+            columns=columns,
+            rows=rows
+        )
+        part["start_id_space"] = from_label
+        part["end_id_space"] = to_label
+        self._rel_files.setdefault(rel_type, []).append(part)
+
+        self.stats["relationships_loaded"] += len(rows)
+        self.stats["batches_processed"] += (len(records) + self.batch_size - 1) // self.batch_size
+        logger.info(f"Exported {len(rows)} {rel_type} relationships to {part['data']}")
+
+        return len(rows)
+
+    def create_constraint(
+        self,
+        label: str,
+        property_key: str,
+        constraint_type: str = "unique"
+    ) -> bool:
+        """
+        记录约束（写入 schema.cypher，导入后执行）
+
+        Args:
+            label: 节点标签
+            property_key: 属性键
+            constraint_type: 约束类型 (unique, exists)
+
+        Returns:
+            是否成功
+        """
+        if constraint_type not in ("unique", "exists"):
+            logger.error(f"Unknown constraint type: {constraint_type}")
+            return False
+
+        statement = f"{SchemaConstraint(label, property_key, constraint_type).to_cypher()};"
+        if statement not in self._schema_statements:
+            self._schema_statements.append(statement)
+        return True
+
+    def prepare_schema(self, pipelines: Optional[List[str]] = None) -> Dict[str, int]:
+        """
+        将声明式模式写入 schema.cypher（导入后执行）
+
+        Args:
+            pipelines: 管道名称列表（None 表示全部管道）
+
+        Returns:
+            创建摘要
+        """
+        summary = {"created": 0, "existing": 0, "failed": 0}
+        for spec in get_pipeline_schema(pipelines):
+            statement = f"{spec.to_cypher()};"
+            if statement in self._schema_statements:
+                summary["existing"] += 1
+            else:
+                self._schema_statements.append(statement)
+                summary["created"] += 1
+        return summary
+
+    def execute_cypher(
+        self,
+        query: str,
+        params: Optional[Dict[str, Any]] = None
+    ) -> List[Dict]:
+        """离线模式下无法执行 Cypher，仅记录日志"""
+        logger.warning("Bulk import exporter cannot execute Cypher; query skipped")
+        return []
+
+    def test_connection(self) -> bool:
+        """离线模式无需连接，检查导出目录是否可写"""
+        return self.dry_run or self.output_dir.is_dir()
+
+    def count_nodes(self, label: str) -> int:
+        """统计已导出的节点数量"""
+        return len(self._node_ids.get(label, ()))
+
+    def count_relationships(
+        self,
+        from_label: Optional[str] = None,
+        rel_type: Optional[str] = None,
+        to_label: Optional[str] = None
+    ) -> int:
+        """统计已导出的关系数量"""
+        total = 0
+        for current_type, parts in self._rel_files.items():
+            if rel_type and current_type != rel_type:
+                continue
+            for part in parts:
+                if from_label and part["start_id_space"] != from_label:
+                    continue
+                if to_label and part["end_id_space"] != to_label:
+                    continue
+                total += part["rows"]
+        return total
+
+    def get_stats(self) -> Dict[str, int]:
+        """获取导出统计"""
+        return self.stats.copy()
+
+    def reset_stats(self):
+        """重置统计"""
+        for key in self.stats:
+            self.stats[key] = 0
+
+    # ------------------------------------------------------------------
+    # manifest 和导入命令
+    # ------------------------------------------------------------------
+
+    def import_arguments(self, database: str = "neo4j") -> List[str]:
+        """
+        生成 neo4j-admin database import full 参数
+
+        Args:
+            database: 目标数据库名称
+
+        Returns:
+            参数列表
+        """
+        args = ["neo4j-admin", "database", "import", "full", database]
+
+        if self.file_format == "parquet":
+            args.append("--input-type=parquet")
+        else:
+            args.extend([
+                f"--array-delimiter={self.array_delimiter}",
+                "--multiline-fields=true"
+            ])
+
+        for label, parts in sorted(self._node_files.items()):
+            for part in parts:
+                args.append(f"--nodes={label}={self._part_files(part)}")
+
+        for rel_type, parts in sorted(self._rel_files.items()):
+            for part in parts:
+                args.append(f"--relationships={rel_type}={self._part_files(part)}")
+
+        args.append("--overwrite-destination=true")
+        return args
+
+    def write_manifest(self) -> Path:
+        """
+        写出 manifest.json 与 schema.cypher
+
+        Returns:
+            manifest 文件路径
+        """
+        manifest = {
+            "format": self.file_format,
+            "array_delimiter": self.array_delimiter,
+            "generated_at": datetime.now().isoformat(),
+            "id_spaces": {
+                label: {
+                    "key": key,
+                    "count": len(self._node_ids.get(label, ()))
+                }
+                for label, key in sorted(self._id_spaces.items())
+            },
+            "nodes": self._node_files,
+            "relationships": self._rel_files,
+            "stats": self.stats,
+            "schema_file": SCHEMA_FILE,
+            "import_command": " ".join(self.import_arguments())
+        }
+
+        manifest_path = self.output_dir / MANIFEST_FILE
+        with open(manifest_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False)
+
+        with open(self.output_dir / SCHEMA_FILE, "w", encoding="utf-8") as f:
+            f.write("\n".join(self._schema_statements) + "\n")
+
+        logger.info(f"Bulk import manifest written to {manifest_path}")
+        return manifest_path
+
+    # ------------------------------------------------------------------
+    # 内部方法
+    # ------------------------------------------------------------------
+
+    def _register_id_space(self, label: str, key: str):
+        """注册 ID 空间，同一标签只能使用一个合并键"""
+        existing = self._id_spaces.get(label)
+        if existing is None:
+            self._id_spaces[label] = key
+        elif existing != key:
+            raise ValueError(
+                f"ID space {label} already uses key '{existing}', cannot export with key '{key}'"
+            )
+
+    def _infer_columns(
+        self,
+        rows: List[Dict[str, Any]],
+        exclude: Set[str]
+    ) -> List[Tuple[str, str]]:
+        """推断属性列及其类型，返回 [(属性名, 类型)]"""
+        types: Dict[str, Optional[str]] = {}
+        for row in rows:
+            for key, value in row.items():
+                if key in exclude:
+                    continue
+                value_type = _value_type(value)
+                if self.file_format == "csv" and value_type and value_type.endswith("[]"):
+                    # 元素中包含数组分隔符时退化为 JSON 字符串
+                    if any(self.array_delimiter in str(v) for v in value):
+                        value_type = "json"
+                types[key] = _merge_types(types.get(key), value_type)
+
+        return [
+            (key, value_type or "string")
+            for key, value_type in types.items()
+        ]
+
+    def _header_name(self, key: str, value_type: str) -> str:
+        """生成属性列头部"""
+        if value_type == "json":
+            value_type = "string"
+        return key if value_type == "string" else f"{key}:{value_type}"
+
+    def _encode_value(self, value: Any, value_type: str) -> Any:
+        """将值编码为目标列类型"""
+        if value is None:
+            return None
+        if value_type == "json":
+            return json.dumps(value, ensure_ascii=False, default=str)
+        if value_type.endswith("[]"):
+            element_type = value_type[:-2]
+            items = [self._encode_scalar(v, element_type) for v in value if v is not None]
+            if self.file_format == "csv":
+                return self.array_delimiter.join(
+                    "true" if v is True else "false" if v is False else str(v)
+                    for v in items
+                )
+            return items
+        return self._encode_scalar(value, value_type)
+
+    def _encode_scalar(self, value: Any, value_type: str) -> Any:
+        """编码标量值"""
+        if value_type == "double":
+            return float(value)
+        if value_type == "string":
+            if isinstance(value, (datetime, date)):
+                return value.isoformat()
+            return value if isinstance(value, str) else str(value)
+        if self.file_format == "csv" and value_type == "boolean":
+            return "true" if value else "false"
+        return value
+
+    def _write_part(
+        self,
+        kind: str,
+        name: str,
+        id_columns: List[Tuple[str, str]],
+        columns: List[Tuple[str, str]],
+        rows: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """写出一个数据分片（header + data）"""
+        part_dir = self.output_dir / kind
+        part_dir.mkdir(parents=True, exist_ok=True)
+
+        stem = f"{_safe_name(name)}-{self._part_counter:05d}"
+        self._part_counter += 1
+
+        headers = [header for header, _ in id_columns] + [
+            self._header_name(key, value_type) for key, value_type in columns
+        ]
+
+        def encoded_rows():
+            for row in rows:
+                values = [row[source] for _, source in id_columns]
+                values.extend(
+                    self._encode_value(row.get(key), value_type)
+                    for key, value_type in columns
+                )
+                yield values
+
+        if self.file_format == "parquet":
+            data_path = part_dir / f"{stem}.parquet"
+            column_values = list(zip(*encoded_rows()))
+            table = pa.table({
+                header: pa.array(list(values))
+                for header, values in zip(headers, column_values)
+            })
+            pq.write_table(table, data_path, compression="zstd")
+            return {
+                "header": None,
+                "data": str(data_path.relative_to(self.output_dir)),
+                "rows": len(rows)
+            }
+
+        header_path = part_dir / f"{stem}.header.csv"
+        data_path = part_dir / f"{stem}.csv"
+
+        with open(header_path, "w", newline="", encoding="utf-8") as f:
+            csv.writer(f).writerow(headers)
+
+        with open(data_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            for values in encoded_rows():
+                writer.writerow(["" if v is None else v for v in values])
+
+        return {
+            "header": str(header_path.relative_to(self.output_dir)),
+            "data": str(data_path.relative_to(self.output_dir)),
+            "rows": len(rows)
+        }
+
+    def _part_files(self, part: Dict[str, Any]) -> str:
+        """生成分片的文件参数（header,data）"""
+        files = [part["header"], part["data"]] if part.get("header") else [part["data"]]
+        return ",".join(str(self.output_dir / f) for f in files)
+
+    def _resume(self):
+        """从已有 manifest 恢复导出状态"""
+        with open(self.output_dir / MANIFEST_FILE, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+
+        if manifest.get("format") != self.file_format:
+            raise ValueError(
+                f"Existing bundle in {self.output_dir} uses format {manifest.get('format')}, "
+                f"cannot append {self.file_format}"
+            )
+
+        self._id_spaces = {
+            label: info["key"] for label, info in manifest.get("id_spaces", {}).items()
+        }
+        self._node_files = manifest.get("nodes", {})
+        self._rel_files = manifest.get("relationships", {})
+        self._part_counter = sum(
+            len(parts) for parts in list(self._node_files.values()) + list(self._rel_files.values())
+        )
+
+        schema_path = self.output_dir / SCHEMA_FILE
+        if schema_path.exists():
+            self._schema_statements = [
+                line for line in schema_path.read_text(encoding="utf-8").splitlines() if line
+            ]
+
+        for label, parts in self._node_files.items():
+            seen = self._node_ids.setdefault(label, set())
+            for part in parts:
+                for row in _read_part(self.output_dir, part, self.file_format):
+                    seen.add(row[0])
+
+        for rel_type, parts in self._rel_files.items():
+            seen = self._rel_keys.setdefault(rel_type, set())
+            for part in parts:
+                for row in _read_part(self.output_dir, part, self.file_format):
+                    seen.add((part["start_id_space"], row[0], part["end_id_space"], row[1]))
+
+        logger.info(
+            f"Resumed bulk import bundle in {self.output_dir}: "
+            f"{sum(len(ids) for ids in self._node_ids.values())} nodes, "
+            f"{sum(len(keys) for keys in self._rel_keys.values())} relationships"
+        )
+
+
+def _read_part(output_dir: Path, part: Dict[str, Any], file_format: str):
+    """逐行读取分片数据（返回值列表，ID 列在前）"""
+    data_path = output_dir / part["data"]
+
+    if file_format == "parquet":
+        if not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow package is required to read parquet bundles")
+        parquet_file = pq.ParquetFile(data_path)
+        for batch in parquet_file.iter_batches():
+            columns = [column.to_pylist() for column in batch.columns]
+            yield from (list(values) for values in zip(*columns))
+        return
+
+    with open(data_path, "r", newline="", encoding="utf-8") as f:
+        yield from csv.reader(f)
+
+
+def validate_bundle(output_dir: str) -> Dict[str, Any]:
+    """
+    本地校验导出的批量导入文件
+
+    检查项：
+    - 每个分片的行列数与头部一致
+    - 每个 ID 空间内节点 ID 唯一
+    - 所有关系的起点/终点 ID 在对应 ID 空间中存在
+
+    Args:
+        output_dir: 导出目录
+
+    Returns:
+        校验报告
+    """
+    output_dir = Path(output_dir)
+    with open(output_dir / MANIFEST_FILE, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    file_format = manifest.get("format", "csv")
+    report = {
+        "valid": True,
+        "nodes": 0,
+        "relationships": 0,
+        "malformed_rows": 0,
+        "duplicate_ids": 0,
+        "dangling_relationships": 0,
+        "errors": []
+    }
+
+    def header_width(part):
+        if part.get("header"):
+            with open(output_dir / part["header"], "r", newline="", encoding="utf-8") as f:
+                return len(next(csv.reader(f)))
+        return None
+
+    node_ids: Dict[str, Set[str]] = {}
+    for label, parts in manifest.get("nodes", {}).items():
+        seen = node_ids.setdefault(label, set())
+        for part in parts:
+            width = header_width(part)
+            for row in _read_part(output_dir, part, file_format):
+                if width is not None and len(row) != width:
+                    report["malformed_rows"] += 1
+                    continue
+                if row[0] in seen:
+                    report["duplicate_ids"] += 1
+                seen.add(row[0])
+                report["nodes"] += 1
+
+    for rel_type, parts in manifest.get("relationships", {}).items():
+        for part in parts:
+            start_ids = node_ids.get(part["start_id_space"], set())
+            end_ids = node_ids.get(part["end_id_space"], set())
+            width = header_width(part)
+            dangling = 0
+            for row in _read_part(output_dir, part, file_format):
+                if width is not None and len(row) != width:
+                    report["malformed_rows"] += 1
+                    continue
+                if row[0] not in start_ids or row[1] not in end_ids:
+                    dangling += 1
+                report["relationships"] += 1
+            if dangling:
+                report["dangling_relationships"] += dangling
+                report["errors"].append(
+                    f"{part['data']}: {dangling} {rel_type} relationships reference missing "
+                    f"{part['start_id_space']}/{part['end_id_space']} nodes"
+                )
+
+    if report["malformed_rows"]:
+        report["errors"].append(f"{report['malformed_rows']} rows do not match their header")
+    if report["duplicate_ids"]:
+        report["errors"].append(f"{report['duplicate_ids']} duplicate node IDs")
+
+    report["valid"] = not report["errors"]
+    return report
@@ -0,0 +1,58 @@
+#===========================================================
+# PharmaKG ETL - 加载器工厂
+# Pharmaceutical Knowledge Graph - Loader Factory
+#===========================================================
+# 版本: v1.0
+# 描述: 根据配置创建在线加载器或离线导出器
+#===========================================================
+
+import logging
+
+from .neo4j_batch import Neo4jBatchLoader
+from .bulk_import import BulkImportExporter
+
+
+logger = logging.getLogger(__name__)
+
+
+LOAD_BACKENDS = ("neo4j", "bulk_import")
+
+
+def create_loader(config):
+    """
+    根据 ETL 配置创建加载器
+
+    Args:
+        config: ETL 配置（ETLConfig）
+
+    Returns:
+        Neo4jBatchLoader 或 BulkImportExporter 实例
+    """
+    backend = getattr(config, "load_backend", "neo4j")
+
+    if backend == "bulk_import":
+        logger.info(
+            f"Using bulk import backend ({config.bulk_import_format}) -> {config.bulk_import_dir}"
+        )
+        return BulkImportExporter(
+            output_dir=config.bulk_import_dir,
+            file_format=config.bulk_import_format,
+            batch_size=config.batch_size,
+            dry_run=config.dry_run
+        )
+
+    if backend != "neo4j":
+        raise ValueError(
+            f"Unknown load backend: {backend}. Available: {', '.join(LOAD_BACKENDS)}"
+        )
+
+    return Neo4jBatchLoader(
+        uri=config.neo4j_uri,
+        user=config.neo4j_user,
+        password=config.neo4j_password,
+        database=config.neo4j_database,
+        batch_size=config.batch_size,
+        timeout=config.timeout,
+        max_retries=config.max_retries,
+        dry_run=config.dry_run
+    )
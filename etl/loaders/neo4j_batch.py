@@ -18,6 +18,7 @@ except ImportError:
     NEO4J_AVAILABLE = False
 
 from .cypher_builder import CypherBuilder
+from .schema_manager import SchemaManager, get_pipeline_schema
 
 
 logger = logging.getLogger(__name__)
@@ -32,7 +33,7 @@ class Neo4jBatchLoader:
     - 批量关系加载
     - 事务管理
     - 错误恢复
-    - 约束创建
+    - 约束创建（通过 SchemaManager 缓存，避免重复往返）
     """
 
     def __init__(
@@ -73,6 +74,7 @@ class Neo4jBatchLoader:
 
         self._driver: Optional[Driver] = None
         self._lock = Lock()
+        self._schema: Optional[SchemaManager] = None
 
         # 统计信息
         self.stats = {
@@ -96,6 +98,31 @@ class Neo4jBatchLoader:
             )
         return self._driver
 
+    @property
+    def schema(self) -> SchemaManager:
+        """模式管理器（首次访问时读取并缓存数据库约束/索引）"""
+        if self._schema is None:
+            self._schema = SchemaManager(self._execute_query, await_timeout=self.timeout)
+        return self._schema
+
+    def prepare_schema(self, pipelines: Optional[List[str]] = None) -> Dict[str, int]:
+        """
+        按声明式模式预先创建所有缺失的约束和索引
+
+        Args:
+            pipelines: 管道名称列表（None 表示全部管道）
+
+        Returns:
+            创建摘要
+        """
+        specs = get_pipeline_schema(pipelines)
+
+        if self.dry_run:
+            logger.info(f"[DRY RUN] Would ensure {len(specs)} schema constraints/indexes")
+            return {"created": 0, "existing": 0, "failed": 0}
+
+        return self.schema.ensure_schema(specs)
+
     def close(self):
         """关闭连接"""
         if self._driver:
@@ -219,6 +246,9 @@ class Neo4jBatchLoader:
             logger.warning(f"No relationships to load for type {rel_type}")
             return 0
 
+        # 关系 MATCH 依赖端点索引，确保索引填充完成后再批量加载
+        self.schema.await_indexes()
+
         # 分批处理
         total_loaded = 0
         for i in range(0, len(records), self.batch_size):
@@ -331,8 +361,8 @@ class Neo4jBatchLoader:
             return False
 
     def _ensure_unique_constraint(self, label: str, property_key: str):
-        """确保唯一约束存在"""
-        self.create_constraint(label, property_key, "unique")
+        """确保唯一约束存在（已缓存的约束不再访问数据库）"""
+        self.schema.ensure_constraint(label, property_key, "unique")
 
     def _execute_query(
         self,
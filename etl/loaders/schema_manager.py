@@ -0,0 +1,330 @@
+#===========================================================
+# PharmaKG ETL - Neo4j 模式管理器
+# Pharmaceutical Knowledge Graph - Neo4j Schema Manager
+#===========================================================
+# 版本: v1.0
+# 描述: 缓存约束/索引状态，按声明式模式批量创建并等待索引就绪
+#===========================================================
+
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Any, Optional, Set, Tuple, Iterable
+
+
+logger = logging.getLogger(__name__)
+
+
+# SHOW CONSTRAINTS 返回的类型 -> 约束类型
+_CONSTRAINT_TYPES = {
+    "UNIQUENESS": "unique",
+    "NODE_PROPERTY_UNIQUENESS": "unique",
+    "NODE_KEY": "unique",
+    "NODE_PROPERTY_EXISTENCE": "exists"
+}
+
+
+@dataclass(frozen=True)
+class SchemaConstraint:
+    """约束声明"""
+    label: str
+    property_key: str
+    constraint_type: str = "unique"
+
+    @property
+    def name(self) -> str:
+        return f"{self.label.lower()}_{self.property_key}_{self.constraint_type}"
+
+    def to_cypher(self) -> str:
+        requirement = "IS UNIQUE" if self.constraint_type == "unique" else "IS NOT NULL"
+        return (
+            f"CREATE CONSTRAINT {self.name} IF NOT EXISTS "
+            f"FOR (n:{self.label}) REQUIRE n.{self.property_key} {requirement}"
+        )
+
+
+@dataclass(frozen=True)
+class SchemaIndex:
+    """索引声明"""
+    label: str
+    property_key: str
+
+    @property
+    def name(self) -> str:
+        return f"{self.label.lower()}_{self.property_key}_index"
+
+    def to_cypher(self) -> str:
+        return (
+            f"CREATE INDEX {self.name} IF NOT EXISTS "
+            f"FOR (n:{self.label}) ON (n.{self.property_key})"
+        )
+
+
+# ============================================
+# 各管道加载的标签的声明式模式
+# ============================================
+
+PIPELINE_SCHEMAS: Dict[str, List[Any]] = {
+    "rd": [
+        SchemaConstraint("Compound", "primary_id"),
+        SchemaConstraint("Target", "primary_id"),
+        SchemaIndex("Compound", "name"),
+        SchemaIndex("Compound", "inchikey"),
+        SchemaIndex("Target", "name")
+    ],
+    "clinical": [
+        SchemaConstraint("ClinicalTrial", "primary_id"),
+        SchemaConstraint("Intervention", "intervention_name"),
+        SchemaConstraint("StudySite", "location_id"),
+        SchemaIndex("ClinicalTrial", "trial_phase"),
+        SchemaIndex("ClinicalTrial", "trial_status")
+    ],
+    "sc": [
+        SchemaConstraint("Manufacturer", "primary_id"),
+        SchemaConstraint("DrugShortage", "primary_id"),
+        SchemaIndex("Manufacturer", "name")
+    ],
+    "regulatory": [
+        SchemaConstraint("FDAProduct", "primary_id"),
+        SchemaConstraint("FDAApplication", "primary_id"),
+        SchemaConstraint("TECode", "primary_id"),
+        SchemaIndex("FDAProduct", "appl_no")
+    ],
+    "document": [
+        SchemaConstraint("RegulatoryDocument", "document_id")
+    ]
+}
+
+
+def get_pipeline_schema(pipelines: Optional[Iterable[str]] = None) -> List[Any]:
+    """
+    获取一个或多个管道的声明式模式
+
+    Args:
+        pipelines: 管道名称列表（None 表示全部管道）
+
+    Returns:
+        去重后的约束和索引声明列表
+    """
+    names = list(pipelines) if pipelines is not None else list(PIPELINE_SCHEMAS.keys())
+
+    specs = []
+    for name in names:
+        if name not in PIPELINE_SCHEMAS:
+            raise ValueError(
+                f"Unknown pipeline schema: {name}. Available: {', '.join(PIPELINE_SCHEMAS.keys())}"
+            )
+        for spec in PIPELINE_SCHEMAS[name]:
+            if spec not in specs:
+                specs.append(spec)
+    return specs
+
+
+class SchemaManager:
+    """
+    Neo4j 模式管理器
+
+    功能：
+    - 每个加载器只读取一次 SHOW CONSTRAINTS / SHOW INDEXES 并缓存
+    - 已存在的约束/索引不再发起 CREATE ... IF NOT EXISTS 往返
+    - 按声明式模式一次性创建缺失的约束和索引
+    - 在批量关系加载前等待索引填充完成
+    """
+
+    def __init__(self, execute_query, await_timeout: int = 300):
+        """
+        初始化模式管理器
+
+        Args:
+            execute_query: 执行 Cypher 的可调用对象 (query, params) -> List[Dict]
+            await_timeout: 等待索引填充的超时时间（秒）
+        """
+        self._execute_query = execute_query
+        self.await_timeout = await_timeout
+
+        # (label, property_key, constraint_type)
+        self._constraints: Set[Tuple[str, str, str]] = set()
+        # (label, property_key)
+        self._indexes: Set[Tuple[str, str]] = set()
+        self._loaded = False
+        self._population_pending = False
+
+        self.stats = {
+            "schema_queries": 0,
+            "constraints_created": 0,
+            "indexes_created": 0,
+            "cache_hits": 0
+        }
+
+    def refresh(self):
+        """从数据库重新读取约束和索引"""
+        self._constraints.clear()
+        self._indexes.clear()
+        self._population_pending = False
+
+        constraints = self._execute_query(
+            "SHOW CONSTRAINTS YIELD type, entityType, labelsOrTypes, properties",
+            {}
+        )
+        self.stats["schema_queries"] += 1
+        for row in constraints:
+            constraint_type = _CONSTRAINT_TYPES.get(row.get("type"))
+            if constraint_type is None or row.get("entityType") not in (None, "NODE"):
+                continue
+            for label in row.get("labelsOrTypes") or []:
+                properties = row.get("properties") or []
+                if len(properties) == 1:
+                    self._constraints.add((label, properties[0], constraint_type))
+
+        indexes = self._execute_query(
+            "SHOW INDEXES YIELD type, entityType, labelsOrTypes, properties, state",
+            {}
+        )
+        self.stats["schema_queries"] += 1
+        for row in indexes:
+            if row.get("type") in ("LOOKUP", "FULLTEXT") or row.get("entityType") != "NODE":
+                continue
+            if row.get("state") not in (None, "ONLINE"):
+                self._population_pending = True
+            for label in row.get("labelsOrTypes") or []:
+                properties = row.get("properties") or []
+                if properties:
+                    # 复合索引的首个属性同样可用于查找
+                    self._indexes.add((label, properties[0]))
+
+        self._loaded = True
+        logger.info(
+            f"Schema cache loaded: {len(self._constraints)} constraints, {len(self._indexes)} indexes"
+        )
+
+    def _ensure_loaded(self):
+        if not self._loaded:
+            self.refresh()
+
+    def has_constraint(self, label: str, property_key: str, constraint_type: str = "unique") -> bool:
+        """约束是否已存在（基于缓存）"""
+        self._ensure_loaded()
+        return (label, property_key, constraint_type) in self._constraints
+
+    def has_index(self, label: str, property_key: str) -> bool:
+        """属性是否已有索引（唯一约束自带索引）"""
+        self._ensure_loaded()
+        return (
+            (label, property_key) in self._indexes or
+            (label, property_key, "unique") in self._constraints
+        )
+
+    def ensure_constraint(
+        self,
+        label: str,
+        property_key: str,
+        constraint_type: str = "unique"
+    ) -> bool:
+        """
+        确保约束存在（缓存命中时不访问数据库）
+
+        Returns:
+            是否成功
+        """
+        return self._apply(SchemaConstraint(label, property_key, constraint_type))
+
+    def ensure_index(self, label: str, property_key: str) -> bool:
+        """
+        确保索引存在（缓存命中时不访问数据库）
+
+        Returns:
+            是否成功
+        """
+        return self._apply(SchemaIndex(label, property_key))
+
+    def ensure_schema(self, specs: Iterable[Any]) -> Dict[str, int]:
+        """
+        按声明式模式创建所有缺失的约束和索引
+
+        约束先于索引创建，以免为唯一属性重复建索引。
+
+        Args:
+            specs: SchemaConstraint / SchemaIndex 列表
+
+        Returns:
+            {"created": n, "existing": n, "failed": n}
+        """
+        specs = sorted(specs, key=lambda s: 0 if isinstance(s, SchemaConstraint) else 1)
+        summary = {"created": 0, "existing": 0, "failed": 0}
+
+        for spec in specs:
+            if self._exists(spec):
+                summary["existing"] += 1
+            elif self._apply(spec):
+                summary["created"] += 1
+            else:
+                summary["failed"] += 1
+
+        logger.info(
+            f"Schema setup: {summary['created']} created, "
+            f"{summary['existing']} already present, {summary['failed']} failed"
+        )
+        return summary
+
+    def await_indexes(self, timeout: Optional[int] = None) -> bool:
+        """
+        等待索引填充完成（仅当有新建或未就绪的索引时才访问数据库）
+
+        Args:
+            timeout: 超时时间（秒）
+
+        Returns:
+            是否成功
+        """
+        self._ensure_loaded()
+        if not self._population_pending:
+            return True
+
+        timeout = timeout or self.await_timeout
+        try:
+            self._execute_query("CALL db.awaitIndexes($timeout)", {"timeout": timeout})
+            self.stats["schema_queries"] += 1
+            self._population_pending = False
+            logger.info("All indexes are online")
+            return True
+        except Exception as e:
+            logger.warning(f"Waiting for index population failed: {e}")
+            return False
+
+    def get_stats(self) -> Dict[str, int]:
+        """获取统计"""
+        return self.stats.copy()
+
+    def _exists(self, spec: Any) -> bool:
+        if isinstance(spec, SchemaConstraint):
+            return self.has_constraint(spec.label, spec.property_key, spec.constraint_type)
+        return self.has_index(spec.label, spec.property_key)
+
+    def _apply(self, spec: Any) -> bool:
+        """创建单个约束或索引并更新缓存"""
+        if isinstance(spec, SchemaConstraint) and spec.constraint_type not in ("unique", "exists"):
+            logger.error(f"Unknown constraint type: {spec.constraint_type}")
+            return False
+
+        if self._exists(spec):
+            self.stats["cache_hits"] += 1
+            return True
+
+        try:
+            self._execute_query(spec.to_cypher(), {})
+            self.stats["schema_queries"] += 1
+        except Exception as e:
+            logger.warning(f"Failed to create {spec.name}: {e}")
+            return False
+
+        if isinstance(spec, SchemaConstraint):
+            self._constraints.add((spec.label, spec.property_key, spec.constraint_type))
+            self.stats["constraints_created"] += 1
+            logger.info(f"Created {spec.constraint_type} constraint on {spec.label}.{spec.property_key}")
+        else:
+            self._indexes.add((spec.label, spec.property_key))
+            self.stats["indexes_created"] += 1
+            logger.info(f"Created index on {spec.label}.{spec.property_key}")
+
+        # 新建的约束/索引在后台填充
+        self._population_pending = True
+        return True
@@ -11,6 +11,12 @@ from .clinical_pipeline import ClinicalPipeline, run_clinical_pipeline
 from .sc_pipeline import SupplyChainPipeline, run_supply_chain_pipeline
 from .regulatory_pipeline import RegulatoryPipeline, run_regulatory_pipeline
 from .document_pipeline import DocumentPipeline, run_document_pipeline
+from .streaming import (
+    StagedPipelineRunner,
+    PipelineStage,
+    StageMetrics,
+    StreamingPipelineMixin
+)
 
 
 __all__ = [
@@ -23,7 +29,11 @@ __all__ = [
     "RegulatoryPipeline",
     "run_regulatory_pipeline",
     "DocumentPipeline",
-    "run_document_pipeline"
+    "run_document_pipeline",
+    "StagedPipelineRunner",
+    "PipelineStage",
+    "StageMetrics",
+    "StreamingPipelineMixin"
 ]
 
 
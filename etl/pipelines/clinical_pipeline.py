@@ -7,19 +7,22 @@
 #===========================================================
 
 import logging
+import os
 from typing import Dict, List, Any
 from datetime import datetime
 
 from ..extractors.clinicaltrials import ClinicalTrialsGovExtractor
 from ..transformers.trial import ClinicalTrialTransformer
 from ..loaders.neo4j_batch import Neo4jBatchLoader
+from ..loaders.factory import create_loader
+from .streaming import StreamingPipelineMixin
 from ..config import get_etl_config
 
 
 logger = logging.getLogger(__name__)
 
 
-class ClinicalPipeline:
+class ClinicalPipeline(StreamingPipelineMixin):
     """
     临床领域 ETL 管道
 
@@ -28,8 +31,13 @@ class ClinicalPipeline:
     2. 转换和标准化试验数据
     3. 验证数据完整性
     4. 加载到 Neo4j
+
+    run() 按阶段顺序处理全部数据；run_streaming() 按块重叠执行各阶段。
     """
 
+    STREAM_KEYS = ("studies",)
+    SCHEMA_NAME = "clinical"
+
     def __init__(self, config=None):
         """
         初始化临床管道
@@ -40,9 +48,17 @@ class ClinicalPipeline:
         self.config = config or get_etl_config()
 
         # 初始化组件
+        checkpoint_dir = self.config.extraction_checkpoint_dir
+        checkpoint_path = (
+            os.path.join(checkpoint_dir, "clinicaltrials_pages.json") if checkpoint_dir else None
+        )
+
+        # clinicaltrials_rate_limit 为请求/秒，抽取器使用秒/请求
         self.extractor = ClinicalTrialsGovExtractor(
             api_key=self.config.clinicaltrials_api_key,
-            rate_limit=self.config.clinicaltrials_rate_limit
+            rate_limit=1.0 / self.config.clinicaltrials_rate_limit,
+            checkpoint_path=checkpoint_path,
+            http_cache=self.config.http_cache_dir
         )
         self.transformer = ClinicalTrialTransformer()
 
@@ -138,6 +154,52 @@ class ClinicalPipeline:
                 "extraction": self.stats
             }
 
+    def run_streaming(
+        self,
+        query: str = None,
+        phase: str = None,
+        limit: int = 1000,
+        load_to_neo4j: bool = True,
+        dry_run: bool = False,
+        **stream_options
+    ) -> Dict[str, Any]:
+        """
+        以流式分阶段方式运行临床 ETL 管道
+
+        ClinicalTrials.gov 分页抽取的同时，已抽取的试验按块进入转换、
+        验证和加载阶段。
+
+        Args:
+            query: 搜索查询（疾病、药物等）
+            phase: 试验阶段筛选
+            limit: 记录数限制
+            load_to_neo4j: 是否加载到 Neo4j
+            dry_run: 试运行模式
+            **stream_options: 流式参数（chunk_size, transform_workers,
+                transform_executor, load_workers, queue_size）
+
+        Returns:
+            执行结果统计（含各阶段利用率）
+        """
+        sources = {
+            "studies": lambda: self.extractor.extract_studies(
+                query=query,
+                phase=phase,
+                limit=limit
+            )
+        }
+
+        return self._run_streaming(
+            "Clinical",
+            sources,
+            load_to_neo4j=load_to_neo4j,
+            dry_run=dry_run,
+            **stream_options
+        )
+
+    def _stream_transformers(self) -> Dict[str, Any]:
+        return {"studies": self.transformer}
+
     def _extract_phase(
         self,
         query: str,
@@ -213,39 +275,40 @@ class ClinicalPipeline:
             logger.info("[DRY RUN] Would load data to Neo4j")
             return {"dry_run": True}
 
-        loader = Neo4jBatchLoader(
-            uri=self.config.neo4j_uri,
-            user=self.config.neo4j_user,
-            password=self.config.neo4j_password,
-            batch_size=self.config.batch_size,
-            dry_run=self.config.dry_run
-        )
+        loader = create_loader(self.config)
 
         try:
-            # 加载临床试验节点
-            studies = data.get("studies", [])
-            if studies:
-                loader.load_nodes(
-                    label="ClinicalTrial",
-                    records=studies,
-                    merge_key="primary_id",
-                    additional_props={
-                        "created_at": datetime.now().isoformat(),
-                        "data_source": "clinicaltrials.gov"
-                    }
-                )
-                self.stats["loaded_nodes"] += len(studies)
-                logger.info(f"Loaded {len(studies)} ClinicalTrial nodes")
+            # 预先创建本管道所需的约束和索引
+            loader.prepare_schema(["clinical"])
 
-            # 加载干预措施节点和关系
-            self._load_interventions(loader, studies)
-            self._load_locations(loader, studies)
+            self._load_nodes(loader, data)
 
             return loader.get_stats()
 
         finally:
             loader.close()
 
+    def _load_nodes(self, loader: Neo4jBatchLoader, data: Dict):
+        """加载临床试验节点及其干预措施、研究地点"""
+        # 加载临床试验节点
+        studies = data.get("studies", [])
+        if studies:
+            loader.load_nodes(
+                label="ClinicalTrial",
+                records=studies,
+                merge_key="primary_id",
+                additional_props={
+                    "created_at": datetime.now().isoformat(),
+                    "data_source": "clinicaltrials.gov"
+                }
+            )
+            self.stats["loaded_nodes"] += len(studies)
+            logger.info(f"Loaded {len(studies)} ClinicalTrial nodes")
+
+        # 加载干预措施节点和关系
+        self._load_interventions(loader, studies)
+        self._load_locations(loader, studies)
+
     def _load_interventions(self, loader: Neo4jBatchLoader, studies: List[Dict]):
         """加载干预措施节点和关系"""
         interventions = []
@@ -356,7 +419,9 @@ def run_clinical_pipeline(
     phase: str = None,
     limit: int = 1000,
     load_to_neo4j: bool = True,
-    dry_run: bool = False
+    dry_run: bool = False,
+    streaming: bool = False,
+    **stream_options
 ) -> Dict[str, Any]:
     """
     便捷函数：运行临床管道
@@ -367,11 +432,22 @@ def run_clinical_pipeline(
         limit: 记录数限制
         load_to_neo4j: 是否加载到 Neo4j
         dry_run: 试运行模式
+        streaming: 是否使用流式分阶段执行
+        **stream_options: 流式参数（见 ClinicalPipeline.run_streaming）
 
     Returns:
         执行结果
     """
     pipeline = ClinicalPipeline()
+    if streaming:
+        return pipeline.run_streaming(
+            query=query,
+            phase=phase,
+            limit=limit,
+            load_to_neo4j=load_to_neo4j,
+            dry_run=dry_run,
+            **stream_options
+        )
     return pipeline.run(
         query=query,
         phase=phase,
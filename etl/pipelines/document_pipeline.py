@@ -220,6 +220,9 @@ class DocumentPipeline:
             nodes_created = 0
             relationships_created = 0
 
+            # 预先创建本管道所需的约束和索引
+            self.loader.prepare_schema(["document"])
+
             # 按标签分组节点
             nodes_by_label = {}
             for node in nodes:
@@ -7,6 +7,7 @@
 #===========================================================
 
 import logging
+import os
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 
@@ -15,12 +16,14 @@ from ..extractors.chembl import ChEMBLExtractor
 from ..transformers.compound import CompoundTransformer
 from ..transformers.target_disease import TargetTransformer
 from ..loaders.neo4j_batch import Neo4jBatchLoader
+from ..loaders.factory import create_loader
+from .streaming import StreamingPipelineMixin
 
 
 logger = logging.getLogger(__name__)
 
 
-class RDPipeline:
+class RDPipeline(StreamingPipelineMixin):
     """
     R&D 领域 ETL 管道
 
@@ -29,8 +32,14 @@ class RDPipeline:
     2. 转换和标准化
     3. 验证数据完整性
     4. 加载到 Neo4j
+
+    run() 按阶段顺序处理全部数据；run_streaming() 按块重叠执行各阶段。
     """
 
+    STREAM_KEYS = ("compounds", "targets", "activities")
+    STREAM_DEFERRED_KEYS = ("activities",)
+    SCHEMA_NAME = "rd"
+
     def __init__(self, config=None):
         """
         初始化 R&D 管道
@@ -41,9 +50,18 @@ class RDPipeline:
         self.config = config or get_etl_config()
 
         # 初始化组件
+        checkpoint_dir = self.config.extraction_checkpoint_dir
+        checkpoint_path = (
+            os.path.join(checkpoint_dir, "chembl_pages.json") if checkpoint_dir else None
+        )
+
+        # api_rate_limit 为请求/秒，抽取器使用秒/请求
         self.extractor = ChEMBLExtractor(
             api_key=self.config.chembl_api_key,
-            rate_limit=self.config.api_rate_limit
+            rate_limit=1.0 / self.config.api_rate_limit,
+            concurrency=self.config.api_concurrency,
+            checkpoint_path=checkpoint_path,
+            http_cache=self.config.http_cache_dir
         )
 
         self.compound_transformer = CompoundTransformer()
@@ -147,6 +165,58 @@ class RDPipeline:
                 }
             }
 
+    def run_streaming(
+        self,
+        limit_compounds: int = 1000,
+        limit_targets: int = 500,
+        load_to_neo4j: bool = True,
+        dry_run: bool = False,
+        **stream_options
+    ) -> Dict[str, Any]:
+        """
+        以流式分阶段方式运行 R&D ETL 管道
+
+        化合物、靶点和活性数据在独立线程中并发抽取，按块进入转换、
+        验证和加载阶段；化合物-靶点关系在所有节点加载完成后写入。
+
+        Args:
+            limit_compounds: 化合物数量限制
+            limit_targets: 靶点数量限制
+            load_to_neo4j: 是否加载到 Neo4j
+            dry_run: 试运行模式
+            **stream_options: 流式参数（chunk_size, transform_workers,
+                transform_executor, load_workers, queue_size）
+
+        Returns:
+            执行结果统计（含各阶段利用率）
+        """
+        sources = {
+            "compounds": lambda: self.extractor.extract_compounds(
+                limit=limit_compounds,
+                properties=["molecule_structures", "molecule_properties"]
+            ),
+            "targets": lambda: self.extractor.extract_targets(limit=limit_targets),
+            "activities": lambda: self.extractor.extract_activities(
+                compound_id=None,
+                target_id=None,
+                limit=min(limit_compounds, 500)
+            )
+        }
+
+        return self._run_streaming(
+            "R&D",
+            sources,
+            load_to_neo4j=load_to_neo4j,
+            dry_run=dry_run,
+            **stream_options
+        )
+
+    def _stream_transformers(self) -> Dict[str, Any]:
+        return {
+            "compounds": self.compound_transformer,
+            "targets": self.target_transformer
+        }
+
     def _extract_phase(
         self,
         limit_compounds: int,
@@ -268,44 +338,13 @@ class RDPipeline:
             logger.info("[DRY RUN] Would load data to Neo4j")
             return {"dry_run": True}
 
-        loader = Neo4jBatchLoader(
-            uri=self.config.neo4j_uri,
-            user=self.config.neo4j_user,
-            password=self.config.neo4j_password,
-            batch_size=self.config.batch_size,
-            dry_run=self.config.dry_run
-        )
+        loader = create_loader(self.config)
 
         try:
-            # 加载化合物节点
-            compounds = data.get("compounds", [])
-            if compounds:
-                loader.load_nodes(
-                    label="Compound",
-                    records=compounds,
-                    merge_key="primary_id",
-                    additional_props={
-                        "created_at": datetime.now().isoformat(),
-                        "data_source": "chembl"
-                    }
-                )
-                self.stats["loaded_compounds"] = len(compounds)
-                logger.info(f"Loaded {len(compounds)} Compound nodes")
-
-            # 加载靶点节点
-            targets = data.get("targets", [])
-            if targets:
-                loader.load_nodes(
-                    label="Target",
-                    records=targets,
-                    merge_key="primary_id",
-                    additional_props={
-                        "created_at": datetime.now().isoformat(),
-                        "data_source": "chembl"
-                    }
-                )
-                self.stats["loaded_targets"] = len(targets)
-                logger.info(f"Loaded {len(targets)} Target nodes")
+            # 预先创建本管道所需的约束和索引
+            loader.prepare_schema(["rd"])
+
+            self._load_nodes(loader, data)
 
             # 加载化合物-靶点关系（基于活性数据）
             self._load_compound_target_relationships(loader, data)
@@ -315,6 +354,42 @@ class RDPipeline:
         finally:
             loader.close()
 
+    def _load_nodes(self, loader: Neo4jBatchLoader, data: Dict):
+        """加载化合物和靶点节点"""
+        # 加载化合物节点
+        compounds = data.get("compounds", [])
+        if compounds:
+            loader.load_nodes(
+                label="Compound",
+                records=compounds,
+                merge_key="primary_id",
+                additional_props={
+                    "created_at": datetime.now().isoformat(),
+                    "data_source": "chembl"
+                }
+            )
+            self.stats["loaded_compounds"] += len(compounds)
+            logger.info(f"Loaded {len(compounds)} Compound nodes")
+
+        # 加载靶点节点
+        targets = data.get("targets", [])
+        if targets:
+            loader.load_nodes(
+                label="Target",
+                records=targets,
+                merge_key="primary_id",
+                additional_props={
+                    "created_at": datetime.now().isoformat(),
+                    "data_source": "chembl"
+                }
+            )
+            self.stats["loaded_targets"] += len(targets)
+            logger.info(f"Loaded {len(targets)} Target nodes")
+
+    def _load_deferred(self, loader: Neo4jBatchLoader, data: Dict):
+        """流式模式下在所有节点加载后加载化合物-靶点关系"""
+        self._load_compound_target_relationships(loader, data)
+
     def _load_compound_target_relationships(
         self,
         loader: Neo4jBatchLoader,
@@ -365,7 +440,9 @@ def run_rd_pipeline(
     limit_compounds: int = 1000,
     limit_targets: int = 500,
     load_to_neo4j: bool = True,
-    dry_run: bool = False
+    dry_run: bool = False,
+    streaming: bool = False,
+    **stream_options
 ) -> Dict[str, Any]:
     """
     便捷函数：运行 R&D 管道
@@ -375,11 +452,21 @@ def run_rd_pipeline(
         limit_targets: 靶点数量限制
         load_to_neo4j: 是否加载到 Neo4j
         dry_run: 试运行模式
+        streaming: 是否使用流式分阶段执行
+        **stream_options: 流式参数（见 RDPipeline.run_streaming）
 
     Returns:
         执行结果
     """
     pipeline = RDPipeline()
+    if streaming:
+        return pipeline.run_streaming(
+            limit_compounds=limit_compounds,
+            limit_targets=limit_targets,
+            load_to_neo4j=load_to_neo4j,
+            dry_run=dry_run,
+            **stream_options
+        )
     return pipeline.run(
         limit_compounds=limit_compounds,
         limit_targets=limit_targets,
@@ -13,13 +13,14 @@ from datetime import datetime
 from pathlib import Path
 
 from ..config import get_etl_config
-from ..loaders import Neo4jBatchLoader
+from ..loaders import Neo4jBatchLoader, create_loader
+from .streaming import StreamingPipelineMixin
 
 
 logger = logging.getLogger(__name__)
 
 
-class RegulatoryPipeline:
+class RegulatoryPipeline(StreamingPipelineMixin):
     """
     监管领域 ETL 管道
 
@@ -28,8 +29,14 @@ class RegulatoryPipeline:
     2. 转换和标准化
     3. 验证数据完整性
     4. 加载到 Neo4j
+
+    run() 按阶段顺序处理全部数据；run_streaming() 按块重叠执行各阶段。
     """
 
+    STREAM_KEYS = ("products", "applications", "tecodes")
+    STREAM_DEFERRED_KEYS = ("products", "tecodes")
+    SCHEMA_NAME = "regulatory"
+
     def __init__(self, config=None):
         """
         初始化监管管道
@@ -126,6 +133,52 @@ class RegulatoryPipeline:
                 "extraction": self.stats
             }
 
+    def run_streaming(
+        self,
+        data_file: Optional[str] = None,
+        limit: int = 1000,
+        load_to_neo4j: bool = True,
+        dry_run: bool = False,
+        **stream_options
+    ) -> Dict[str, Any]:
+        """
+        以流式分阶段方式运行监管 ETL 管道
+
+        产品、应用和 TE 代码在独立线程中并发抽取；产品-应用和
+        TE 代码-产品关系在所有节点加载完成后写入。
+
+        Args:
+            data_file: 数据文件路径（ZIP 格式）
+            limit: 记录数限制
+            load_to_neo4j: 是否加载到 Neo4j
+            dry_run: 试运行模式
+            **stream_options: 流式参数（chunk_size, transform_workers,
+                transform_executor, load_workers, queue_size）
+
+        Returns:
+            执行结果统计（含各阶段利用率）
+        """
+        if data_file:
+            sources = {
+                "products": lambda: self._extract_products_from_file(data_file, limit),
+                "applications": lambda: self._extract_applications_from_file(data_file, limit),
+                "tecodes": lambda: self._extract_tecodes_from_file(data_file, limit)
+            }
+        else:
+            sources = {
+                "products": lambda: self._extract_products(limit),
+                "applications": lambda: self._extract_applications(limit),
+                "tecodes": lambda: self._extract_tecodes(limit)
+            }
+
+        return self._run_streaming(
+            "Regulatory",
+            sources,
+            load_to_neo4j=load_to_neo4j,
+            dry_run=dry_run,
+            **stream_options
+        )
+
     def _extract_phase(
         self,
         data_file: Optional[str],
@@ -412,49 +465,13 @@ class RegulatoryPipeline:
             logger.info("[DRY RUN] Would load data to Neo4j")
             return {"dry_run": True}
 
-        from ..loaders.neo4j_batch import Neo4jBatchLoader
-
-        loader = Neo4jBatchLoader(
-            uri=self.config.neo4j_uri,
-            user=self.config.neo4j_user,
-            password=self.config.neo4j_password,
-            batch_size=self.config.batch_size,
-            dry_run=self.config.dry_run
-        )
+        loader = create_loader(self.config)
 
         try:
-            # 加载产品节点
-            products = data.get("products", [])
-            if products:
-                loader.load_nodes(
-                    label="FDAProduct",
-                    records=products,
-                    merge_key="primary_id"
-                )
-                self.stats["loaded_products"] = len(products)
-                logger.info(f"Loaded {len(products)} FDAProduct nodes")
-
-            # 加载应用节点
-            applications = data.get("applications", [])
-            if applications:
-                loader.load_nodes(
-                    label="FDAApplication",
-                    records=applications,
-                    merge_key="primary_id"
-                )
-                self.stats["loaded_applications"] = len(applications)
-                logger.info(f"Loaded {len(applications)} FDAApplication nodes")
-
-            # 加载 TE 代码节点
-            tecodes = data.get("tecodes", [])
-            if tecodes:
-                loader.load_nodes(
-                    label="TECode",
-                    records=tecodes,
-                    merge_key="primary_id"
-                )
-                self.stats["loaded_tecodes"] = len(tecodes)
-                logger.info(f"Loaded {len(tecodes)} TECode nodes")
+            # 预先创建本管道所需的约束和索引
+            loader.prepare_schema(["regulatory"])
+
+            self._load_nodes(loader, data)
 
             # 加载关系
             self._load_regulatory_relationships(loader, data)
@@ -464,6 +481,45 @@ class RegulatoryPipeline:
         finally:
             loader.close()
 
+    def _load_nodes(self, loader: Neo4jBatchLoader, data: Dict):
+        """加载产品、应用和 TE 代码节点"""
+        # 加载产品节点
+        products = data.get("products", [])
+        if products:
+            loader.load_nodes(
+                label="FDAProduct",
+                records=products,
+                merge_key="primary_id"
+            )
+            self.stats["loaded_products"] += len(products)
+            logger.info(f"Loaded {len(products)} FDAProduct nodes")
+
+        # 加载应用节点
+        applications = data.get("applications", [])
+        if applications:
+            loader.load_nodes(
+                label="FDAApplication",
+                records=applications,
+                merge_key="primary_id"
+            )
+            self.stats["loaded_applications"] += len(applications)
+            logger.info(f"Loaded {len(applications)} FDAApplication nodes")
+
+        # 加载 TE 代码节点
+        tecodes = data.get("tecodes", [])
+        if tecodes:
+            loader.load_nodes(
+                label="TECode",
+                records=tecodes,
+                merge_key="primary_id"
+            )
+            self.stats["loaded_tecodes"] += len(tecodes)
+            logger.info(f"Loaded {len(tecodes)} TECode nodes")
+
+    def _load_deferred(self, loader: Neo4jBatchLoader, data: Dict):
+        """流式模式下在所有节点加载后加载监管关系"""
+        self._load_regulatory_relationships(loader, data)
+
     def _load_regulatory_relationships(self, loader: Neo4jBatchLoader, data: Dict):
         """加载监管关系"""
         # 产品-应用关系
@@ -520,7 +576,9 @@ def run_regulatory_pipeline(
     data_file: str = None,
     limit: int = 1000,
     load_to_neo4j: bool = True,
-    dry_run: bool = False
+    dry_run: bool = False,
+    streaming: bool = False,
+    **stream_options
 ) -> Dict[str, Any]:
     """
     便捷函数：运行监管管道
@@ -530,11 +588,21 @@ def run_regulatory_pipeline(
         limit: 记录数限制
         load_to_neo4j: 是否加载到 Neo4j
         dry_run: 试运行模式
+        streaming: 是否使用流式分阶段执行
+        **stream_options: 流式参数（见 RegulatoryPipeline.run_streaming）
 
     Returns:
         执行结果
     """
     pipeline = RegulatoryPipeline()
+    if streaming:
+        return pipeline.run_streaming(
+            data_file=data_file,
+            limit=limit,
+            load_to_neo4j=load_to_neo4j,
+            dry_run=dry_run,
+            **stream_options
+        )
     return pipeline.run(
         data_file=data_file,
         limit=limit,
@@ -11,12 +11,14 @@ from typing import Dict, List, Any, Optional
 from datetime import datetime
 
 from ..config import get_etl_config
+from ..loaders.factory import create_loader
+from .streaming import StreamingPipelineMixin
 
 
 logger = logging.getLogger(__name__)
 
 
-class SupplyChainPipeline:
+class SupplyChainPipeline(StreamingPipelineMixin):
     """
     供应链领域 ETL 管道
 
@@ -25,8 +27,13 @@ class SupplyChainPipeline:
     2. 抽取制造商和供应商信息
     3. 转换和标准化
     4. 加载到 Neo4j
+
+    run() 按阶段顺序处理全部数据；run_streaming() 按块重叠执行各阶段。
     """
 
+    STREAM_KEYS = ("manufacturers", "shortages")
+    SCHEMA_NAME = "sc"
+
     def __init__(self, config=None):
         """
         初始化供应链管道
@@ -120,6 +127,41 @@ class SupplyChainPipeline:
                 "extraction": self.stats
             }
 
+    def run_streaming(
+        self,
+        data_file: Optional[str] = None,
+        limit: int = 500,
+        load_to_neo4j: bool = True,
+        dry_run: bool = False,
+        **stream_options
+    ) -> Dict[str, Any]:
+        """
+        以流式分阶段方式运行供应链 ETL 管道
+
+        Args:
+            data_file: 数据文件路径
+            limit: 记录数限制
+            load_to_neo4j: 是否加载到 Neo4j
+            dry_run: 试运行模式
+            **stream_options: 流式参数（chunk_size, transform_workers,
+                transform_executor, load_workers, queue_size）
+
+        Returns:
+            执行结果统计（含各阶段利用率）
+        """
+        sources = {
+            "manufacturers": lambda: self._extract_manufacturers(limit),
+            "shortages": lambda: self._extract_shortages(limit)
+        }
+
+        return self._run_streaming(
+            "Supply Chain",
+            sources,
+            load_to_neo4j=load_to_neo4j,
+            dry_run=dry_run,
+            **stream_options
+        )
+
     def _extract_phase(
         self,
         data_file: Optional[str],
@@ -230,47 +272,48 @@ class SupplyChainPipeline:
             logger.info("[DRY RUN] Would load data to Neo4j")
             return {"dry_run": True}
 
-        from ..loaders.neo4j_batch import Neo4jBatchLoader
-
-        loader = Neo4jBatchLoader(
-            uri=self.config.neo4j_uri,
-            user=self.config.neo4j_user,
-            password=self.config.neo4j_password,
-            batch_size=self.config.batch_size,
-            dry_run=self.config.dry_run
-        )
+        loader = create_loader(self.config)
 
         try:
-            # 加载制造商节点
-            manufacturers = data.get("manufacturers", [])
-            if manufacturers:
-                loader.load_nodes(
-                    label="Manufacturer",
-                    records=manufacturers,
-                    merge_key="primary_id"
-                )
-                self.stats["loaded_manufacturers"] = len(manufacturers)
-
-            # 加载短缺节点
-            shortages = data.get("shortages", [])
-            if shortages:
-                loader.load_nodes(
-                    label="DrugShortage",
-                    records=shortages,
-                    merge_key="primary_id"
-                )
-                self.stats["loaded_shortages"] = len(shortages)
+            # 预先创建本管道所需的约束和索引
+            loader.prepare_schema(["sc"])
+
+            self._load_nodes(loader, data)
 
             return loader.get_stats()
 
         finally:
             loader.close()
 
+    def _load_nodes(self, loader, data: Dict):
+        """加载制造商和短缺节点"""
+        # 加载制造商节点
+        manufacturers = data.get("manufacturers", [])
+        if manufacturers:
+            loader.load_nodes(
+                label="Manufacturer",
+                records=manufacturers,
+                merge_key="primary_id"
+            )
+            self.stats["loaded_manufacturers"] += len(manufacturers)
+
+        # 加载短缺节点
+        shortages = data.get("shortages", [])
+        if shortages:
+            loader.load_nodes(
+                label="DrugShortage",
+                records=shortages,
+                merge_key="primary_id"
+            )
+            self.stats["loaded_shortages"] += len(shortages)
+
 
 def run_supply_chain_pipeline(
     limit: int = 500,
     load_to_neo4j: bool = True,
-    dry_run: bool = False
+    dry_run: bool = False,
+    streaming: bool = False,
+    **stream_options
 ) -> Dict[str, Any]:
     """
     便捷函数：运行供应链管道
@@ -279,11 +322,20 @@ def run_supply_chain_pipeline(
         limit: 记录数限制
         load_to_neo4j: 是否加载到 Neo4j
         dry_run: 试运行模式
+        streaming: 是否使用流式分阶段执行
+        **stream_options: 流式参数（见 SupplyChainPipeline.run_streaming）
 
     Returns:
         执行结果
     """
     pipeline = SupplyChainPipeline()
+    if streaming:
+        return pipeline.run_streaming(
+            limit=limit,
+            load_to_neo4j=load_to_neo4j,
+            dry_run=dry_run,
+            **stream_options
+        )
     return pipeline.run(
         limit=limit,
         load_to_neo4j=load_to_neo4j,
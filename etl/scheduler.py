@@ -6,11 +6,19 @@
 # 描述: ETL 管道的任务调度和执行管理
 #===========================================================
 
+import heapq
 import logging
+import pickle
 import threading
 import time
-from typing import Dict, Callable, Optional, List, Any
-from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Dict, Callable, Optional, List, Any, Tuple
+from concurrent.futures import (
+    ThreadPoolExecutor,
+    ProcessPoolExecutor,
+    Future,
+    FIRST_COMPLETED,
+    wait
+)
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
@@ -48,6 +56,17 @@ class TaskInfo:
     completed_at: Optional[datetime] = None
     retry_count: int = 0
     max_retries: int = 3
+    executor: str = "thread"
+    retry_backoff: float = 1.0
+    duration_seconds: float = 0.0
+    attempt_started_at: Optional[float] = None
+
+
+# 任务执行器类型：thread 适合 I/O 密集任务，process 适合 CPU 密集任务
+TASK_EXECUTORS = ("thread", "process")
+
+# 重试退避的上限（秒）
+MAX_RETRY_BACKOFF = 60.0
 
 
 class ETLScheduler:
@@ -56,26 +75,36 @@ class ETLScheduler:
 
     功能：
     - 任务注册和管理
-    - 依赖关系解析
-    - 并发执行控制
-    - 进度跟踪
-    - 错误处理和重试
+    - 依赖关系解析（拓扑就绪队列，父任务完成即派发子任务）
+    - 并发执行控制（线程池 + 可选进程池）
+    - 进度跟踪和关键路径报告
+    - 错误处理和非阻塞的指数退避重试
     """
 
-    def __init__(self, max_workers: int = 4):
+    def __init__(
+        self,
+        max_workers: int = 4,
+        process_workers: Optional[int] = None,
+        poll_interval: float = 0.5
+    ):
         """
         初始化调度器
 
         Args:
             max_workers: 最大并发工作线程数
+            process_workers: CPU 密集任务的进程池大小（None 表示与 max_workers 相同）
+            poll_interval: 等待任务完成时的最长轮询间隔（秒）
         """
         self.max_workers = max_workers
+        self.process_workers = process_workers or max_workers
+        self.poll_interval = poll_interval
         self.tasks: Dict[str, TaskInfo] = {}
         self.task_order: List[str] = []
         self._lock = threading.Lock()
         self._executor: Optional[ThreadPoolExecutor] = None
         self._futures: Dict[str, Future] = {}
         self._progress_callbacks: List[Callable] = []
+        self._last_critical_path: Optional[Dict[str, Any]] = None
 
         # 统计信息
         self._stats = {
@@ -94,7 +123,9 @@ class ETLScheduler:
         dependencies: Optional[List[str]] = None,
         enabled: bool = True,
         timeout: int = 300,
-        max_retries: int = 3
+        max_retries: int = 3,
+        executor: str = "thread",
+        retry_backoff: float = 1.0
     ) -> None:
         """
         注册任务
@@ -102,13 +133,26 @@ class ETLScheduler:
         Args:
             task_id: 任务唯一标识
             name: 任务名称
-            func: 任务执行函数
+            func: 任务执行函数（executor="process" 时必须可被 pickle，即模块级函数）
             priority: 优先级（数字越大越优先）
             dependencies: 依赖的任务 ID 列表
             enabled: 是否启用
             timeout: 超时时间（秒）
             max_retries: 最大重试次数
+            executor: 执行器类型（thread/process）
+            retry_backoff: 首次重试前的等待时间（秒），之后每次翻倍
         """
+        if executor not in TASK_EXECUTORS:
+            raise ValueError(
+                f"Unknown task executor: {executor}. Available: {', '.join(TASK_EXECUTORS)}"
+            )
+        if executor == "process":
+            # 进程池任务需要被序列化到工作进程，提前失败好过每次重试都失败
+            try:
+                pickle.dumps(func)
+            except Exception as e:
+                raise ValueError(f"Task {task_id} cannot run in a process pool: {e}") from e
+
         with self._lock:
             if task_id in self.tasks:
                 logger.warning(f"Task {task_id} already registered, overwriting")
@@ -121,7 +165,9 @@ class ETLScheduler:
                 dependencies=dependencies or [],
                 enabled=enabled,
                 timeout=timeout,
-                max_retries=max_retries
+                max_retries=max_retries,
+                executor=executor,
+                retry_backoff=retry_backoff
             )
 
             # 更新任务顺序（按优先级排序）
@@ -146,12 +192,13 @@ class ETLScheduler:
         # 注册抽取任务
         for task in config.extraction_tasks:
             if task.enabled:
+                deps = [f"{pipeline_name}.{d}" for d in task.dependencies]
                 self.register_task(
                     task_id=f"{pipeline_name}.{task.name}",
                     name=task.name,
                     func=lambda: None,  # 实际函数由管道提供
                     priority=task.priority,
-                    dependencies=task.dependencies,
+                    dependencies=deps,
                     enabled=task.enabled,
                     timeout=task.timeout
                 )
@@ -222,9 +269,14 @@ class ETLScheduler:
 
         return True
 
+    def _retry_delay(self, task_info: TaskInfo) -> float:
+        """计算下一次重试前的退避时间（指数增长，有上限）"""
+        delay = task_info.retry_backoff * (2 ** max(task_info.retry_count - 1, 0))
+        return min(delay, MAX_RETRY_BACKOFF)
+
     def _execute_task(self, task_info: TaskInfo) -> Any:
         """
-        执行单个任务
+        执行单个任务（单次尝试，失败时抛出异常）
 
         Args:
             task_info: 任务信息
@@ -234,41 +286,19 @@ class ETLScheduler:
         """
         task_id = task_info.task_id
         task_info.status = TaskStatus.RUNNING
-        task_info.started_at = datetime.now()
+        task_info.started_at = task_info.started_at or datetime.now()
 
         logger.info(f"Executing task: {task_id}")
 
+        start = time.monotonic()
         try:
-            # 执行任务函数
             result = task_info.func()
             task_info.result = result
             task_info.status = TaskStatus.COMPLETED
-
-            logger.info(f"Task completed: {task_id}")
-            self._notify_progress(task_id, TaskStatus.COMPLETED)
-
+            task_info.error = None
             return result
-
-        except Exception as e:
-            logger.error(f"Task failed: {task_id} - {e}")
-
-            task_info.error = str(e)
-
-            # 检查是否需要重试
-            if task_info.retry_count < task_info.max_retries:
-                task_info.retry_count += 1
-                task_info.status = TaskStatus.PENDING
-
-                logger.info(f"Retrying task {task_id} (attempt {task_info.retry_count}/{task_info.max_retries})")
-                time.sleep(1)  # 重试前等待
-
-                return self._execute_task(task_info)
-            else:
-                task_info.status = TaskStatus.FAILED
-                self._notify_progress(task_id, TaskStatus.FAILED)
-                raise
-
         finally:
+            task_info.duration_seconds += time.monotonic() - start
             task_info.completed_at = datetime.now()
 
     def execute_task(
@@ -277,7 +307,7 @@ class ETLScheduler:
         retry_count: int = 0
     ) -> Any:
         """
-        执行指定任务
+        执行指定任务（同步调用，失败时按退避时间重试）
 
         Args:
             task_id: 任务 ID
@@ -300,8 +330,30 @@ class ETLScheduler:
             logger.warning(f"Dependencies not satisfied for task {task_id}")
             return None
 
-        # 执行任务
-        return self._execute_task(task)
+        task.retry_count = retry_count
+        while True:
+            try:
+                result = self._execute_task(task)
+                logger.info(f"Task completed: {task_id}")
+                self._notify_progress(task_id, TaskStatus.COMPLETED)
+                return result
+            except Exception as e:
+                logger.error(f"Task failed: {task_id} - {e}")
+                task.error = str(e)
+
+                if task.retry_count >= task.max_retries:
+                    task.status = TaskStatus.FAILED
+                    self._notify_progress(task_id, TaskStatus.FAILED)
+                    raise
+
+                task.retry_count += 1
+                task.status = TaskStatus.PENDING
+                delay = self._retry_delay(task)
+                logger.info(
+                    f"Retrying task {task_id} in {delay:.1f}s "
+                    f"(attempt {task.retry_count}/{task.max_retries})"
+                )
+                time.sleep(delay)
 
     def execute_pipeline(
         self,
@@ -378,63 +430,363 @@ class ETLScheduler:
         parallel: bool = False
     ) -> Dict[str, Any]:
         """
-        执行所有已注册的任务
+        按依赖拓扑执行所有已注册的任务
+
+        任务在其所有父任务完成后立即进入就绪队列，按优先级派发；
+        失败的任务按退避时间重新入队而不占用工作线程；
+        父任务最终失败时，其所有下游任务被标记为跳过。
 
         Args:
-            parallel: 是否并行执行
+            parallel: 是否并行执行（False 时一次只运行一个任务）
 
         Returns:
-            执行结果汇总
+            执行结果汇总（含关键路径报告）
         """
         logger.info("Executing all tasks...")
         start_time = datetime.now()
 
-        results = {}
-
-        if parallel:
-            # 并行执行
-            self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
-
-            for task_id in self.task_order:
-                task = self.tasks[task_id]
-                if task.enabled and self._resolve_dependencies(task_id):
-                    future = self._executor.submit(self.execute_task, task_id)
-                    self._futures[task_id] = future
-
-            # 等待所有任务完成
-            for task_id, future in self._futures.items():
-                try:
-                    results[task_id] = future.result()
-                except Exception as e:
-                    results[task_id] = {"error": str(e)}
-
-            if self._executor:
-                self._executor.shutdown(wait=True)
-        else:
-            # 串行执行
-            for task_id in self.task_order:
-                task = self.tasks[task_id]
-                if task.enabled:
+        task_ids = [task_id for task_id in self.task_order if self.tasks[task_id].enabled]
+        children = self._build_dag(task_ids)
+
+        thread_slots = self.max_workers if parallel else 1
+        process_slots = self.process_workers if parallel else 1
+
+        results: Dict[str, Any] = {}
+        remaining_deps = {
+            task_id: sum(1 for d in self.tasks[task_id].dependencies if d in children)
+            for task_id in task_ids
+        }
+        sequence = {task_id: i for i, task_id in enumerate(task_ids)}
+
+        # (-priority, 注册顺序, task_id)
+        ready: List[Tuple[int, int, str]] = []
+        # (到期时间, 注册顺序, task_id)
+        retry_timers: List[Tuple[float, int, str]] = []
+        running: Dict[Future, str] = {}
+        running_by_executor = {"thread": 0, "process": 0}
+
+        for task_id in task_ids:
+            task = self.tasks[task_id]
+            task.status = TaskStatus.PENDING
+            task.retry_count = 0
+            task.error = None
+            task.result = None
+            task.started_at = None
+            task.completed_at = None
+            task.duration_seconds = 0.0
+            task.attempt_started_at = None
+
+            missing = [d for d in task.dependencies if d not in children]
+            if missing:
+                logger.error(f"Dependencies {missing} not found for task {task_id}")
+                self._skip_task(task_id, f"Missing dependencies: {', '.join(missing)}", results)
+            elif remaining_deps[task_id] == 0:
+                heapq.heappush(ready, (-task.priority, sequence[task_id], task_id))
+
+        for task_id in task_ids:
+            if self.tasks[task_id].status == TaskStatus.SKIPPED:
+                self._skip_descendants(task_id, children, results)
+
+        self._executor = ThreadPoolExecutor(max_workers=thread_slots)
+        process_executor: Optional[ProcessPoolExecutor] = None
+
+        try:
+            while ready or retry_timers or running:
+                # 到期的重试重新进入就绪队列
+                now = time.monotonic()
+                while retry_timers and retry_timers[0][0] <= now:
+                    _, seq, task_id = heapq.heappop(retry_timers)
+                    heapq.heappush(ready, (-self.tasks[task_id].priority, seq, task_id))
+
+                # 按优先级派发，每种执行器受各自的并发上限约束
+                deferred = []
+                while ready:
+                    item = heapq.heappop(ready)
+                    task = self.tasks[item[2]]
+                    if task.status == TaskStatus.CANCELLED:
+                        self._skip_descendants(task.task_id, children, results)
+                        results[task.task_id] = {"error": "cancelled"}
+                        continue
+
+                    limit = process_slots if task.executor == "process" else thread_slots
+                    if running_by_executor[task.executor] >= limit or (not parallel and running):
+                        deferred.append(item)
+                        continue
+
+                    if task.executor == "process" and process_executor is None:
+                        process_executor = ProcessPoolExecutor(max_workers=process_slots)
+                    pool = process_executor if task.executor == "process" else self._executor
+                    future = self._submit(pool, task)
+                    running[future] = task.task_id
+                    self._futures[task.task_id] = future
+                    running_by_executor[task.executor] += 1
+                for item in deferred:
+                    heapq.heappush(ready, item)
+
+                if not running:
+                    if retry_timers:
+                        time.sleep(max(0.0, retry_timers[0][0] - time.monotonic()))
+                    continue
+
+                timeout = self.poll_interval
+                if retry_timers:
+                    timeout = min(timeout, max(0.0, retry_timers[0][0] - time.monotonic()))
+                done, _ = wait(list(running), timeout=timeout, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    task_id = running.pop(future)
+                    task = self.tasks[task_id]
+                    running_by_executor[task.executor] -= 1
+                    task.duration_seconds += time.monotonic() - task.attempt_started_at
+                    task.completed_at = datetime.now()
+
                     try:
-                        results[task_id] = self.execute_task(task_id)
+                        result = future.result()
                     except Exception as e:
-                        results[task_id] = {"error": str(e)}
+                        task.error = str(e)
+                        logger.error(f"Task failed: {task_id} - {e}")
+
+                        if task.status == TaskStatus.CANCELLED:
+                            results[task_id] = {"error": "cancelled"}
+                            self._skip_descendants(task_id, children, results)
+                        elif task.retry_count < task.max_retries:
+                            task.retry_count += 1
+                            task.status = TaskStatus.PENDING
+                            delay = self._retry_delay(task)
+                            logger.info(
+                                f"Retrying task {task_id} in {delay:.1f}s "
+                                f"(attempt {task.retry_count}/{task.max_retries})"
+                            )
+                            heapq.heappush(
+                                retry_timers,
+                                (time.monotonic() + delay, sequence[task_id], task_id)
+                            )
+                        else:
+                            task.status = TaskStatus.FAILED
+                            results[task_id] = {"error": str(e)}
+                            self._notify_progress(task_id, TaskStatus.FAILED)
+                            self._skip_descendants(task_id, children, results)
+                        continue
+
+                    if task.status == TaskStatus.CANCELLED:
+                        results[task_id] = {"error": "cancelled"}
+                        self._skip_descendants(task_id, children, results)
+                        continue
+
+                    task.result = result
+                    task.error = None
+                    task.status = TaskStatus.COMPLETED
+                    results[task_id] = result
+                    logger.info(f"Task completed: {task_id} ({task.duration_seconds:.2f}s)")
+                    self._notify_progress(task_id, TaskStatus.COMPLETED)
+
+                    # 父任务完成后立即释放子任务
+                    for child_id in children[task_id]:
+                        remaining_deps[child_id] -= 1
+                        child = self.tasks[child_id]
+                        if remaining_deps[child_id] == 0 and child.status in (
+                            TaskStatus.PENDING, TaskStatus.CANCELLED
+                        ):
+                            heapq.heappush(ready, (-child.priority, sequence[child_id], child_id))
+        finally:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+            if process_executor is not None:
+                process_executor.shutdown(wait=True)
 
         duration = (datetime.now() - start_time).total_seconds()
 
         # 统计结果
-        completed = sum(1 for r in results.values() if "error" not in r)
-        failed = len(results) - completed
+        statuses = [self.tasks[task_id].status for task_id in task_ids]
+        completed = statuses.count(TaskStatus.COMPLETED)
+        failed = statuses.count(TaskStatus.FAILED)
+        skipped = statuses.count(TaskStatus.SKIPPED) + statuses.count(TaskStatus.CANCELLED)
+
+        critical_path = self.get_critical_path(wall_seconds=duration)
+        self._log_critical_path(critical_path)
 
         return {
-            "status": "completed",
-            "total_tasks": len(results),
+            "status": "completed" if failed == 0 and skipped == 0 else "partial",
+            "total_tasks": len(task_ids),
             "completed": completed,
             "failed": failed,
+            "skipped": skipped,
             "duration_seconds": duration,
-            "results": results
+            "results": results,
+            "critical_path": critical_path
         }
 
+    def _build_dag(self, task_ids: List[str]) -> Dict[str, List[str]]:
+        """
+        构建子任务邻接表并检测循环依赖
+
+        Args:
+            task_ids: 参与执行的任务 ID
+
+        Returns:
+            {task_id: [子任务 ID]}
+        """
+        children: Dict[str, List[str]] = {task_id: [] for task_id in task_ids}
+        indegree = {task_id: 0 for task_id in task_ids}
+        for task_id in task_ids:
+            for dep_id in self.tasks[task_id].dependencies:
+                if dep_id in children:
+                    children[dep_id].append(task_id)
+                    indegree[task_id] += 1
+
+        # Kahn 算法：无法排出的节点位于环上或依赖环
+        queue = [task_id for task_id, degree in indegree.items() if degree == 0]
+        visited = 0
+        while queue:
+            task_id = queue.pop()
+            visited += 1
+            for child_id in children[task_id]:
+                indegree[child_id] -= 1
+                if indegree[child_id] == 0:
+                    queue.append(child_id)
+
+        if visited != len(task_ids):
+            cyclic = sorted(task_id for task_id, degree in indegree.items() if degree > 0)
+            raise ValueError(f"Circular task dependencies: {', '.join(cyclic)}")
+
+        return children
+
+    def _submit(self, pool, task: TaskInfo) -> Future:
+        """将一次任务尝试提交到对应的执行器"""
+        task.status = TaskStatus.RUNNING
+        task.started_at = task.started_at or datetime.now()
+        task.attempt_started_at = time.monotonic()
+
+        attempt = f" (retry {task.retry_count})" if task.retry_count else ""
+        logger.info(f"Executing task: {task.task_id} [{task.executor}]{attempt}")
+        self._notify_progress(task.task_id, TaskStatus.RUNNING)
+
+        return pool.submit(task.func)
+
+    def _skip_task(self, task_id: str, reason: str, results: Dict[str, Any]) -> None:
+        task = self.tasks[task_id]
+        task.status = TaskStatus.SKIPPED
+        task.error = reason
+        results[task_id] = {"error": reason}
+        logger.warning(f"Task skipped: {task_id} - {reason}")
+        self._notify_progress(task_id, TaskStatus.SKIPPED)
+
+    def _skip_descendants(
+        self,
+        task_id: str,
+        children: Dict[str, List[str]],
+        results: Dict[str, Any]
+    ) -> None:
+        """将失败/取消任务的所有下游任务标记为跳过"""
+        stack = list(children.get(task_id, []))
+        while stack:
+            child_id = stack.pop()
+            if self.tasks[child_id].status != TaskStatus.PENDING:
+                continue
+            self._skip_task(child_id, f"Upstream task {task_id} did not complete", results)
+            stack.extend(children.get(child_id, []))
+
+    def get_critical_path(self, wall_seconds: Optional[float] = None) -> Dict[str, Any]:
+        """
+        计算最近一次运行的关键路径
+
+        以任务耗时（含所有重试尝试）为权重，求依赖图中耗时最长的路径；
+        同时给出每个任务的松弛时间（可延迟而不影响总耗时的秒数）。
+
+        Args:
+            wall_seconds: 实际运行的墙钟时间（用于计算并行度）
+
+        Returns:
+            关键路径报告
+        """
+        task_ids = [
+            task_id for task_id in self.task_order
+            if self.tasks[task_id].status == TaskStatus.COMPLETED
+        ]
+        if not task_ids:
+            return {"path": [], "length_seconds": 0.0, "tasks": {}}
+
+        children = {task_id: [] for task_id in task_ids}
+        for task_id in task_ids:
+            for dep_id in self.tasks[task_id].dependencies:
+                if dep_id in children:
+                    children[dep_id].append(task_id)
+
+        # 按拓扑顺序求最早完成时间
+        indegree = {
+            task_id: sum(1 for d in self.tasks[task_id].dependencies if d in children)
+            for task_id in task_ids
+        }
+        queue = [task_id for task_id in task_ids if indegree[task_id] == 0]
+        topo = []
+        while queue:
+            task_id = queue.pop(0)
+            topo.append(task_id)
+            for child_id in children[task_id]:
+                indegree[child_id] -= 1
+                if indegree[child_id] == 0:
+                    queue.append(child_id)
+
+        finish: Dict[str, float] = {}
+        parent: Dict[str, Optional[str]] = {}
+        for task_id in topo:
+            task = self.tasks[task_id]
+            deps = [d for d in task.dependencies if d in finish]
+            best = max(deps, key=lambda d: finish[d]) if deps else None
+            parent[task_id] = best
+            finish[task_id] = (finish[best] if best else 0.0) + task.duration_seconds
+
+        length = max(finish.values())
+        end = max(finish, key=lambda t: finish[t])
+        path = []
+        while end is not None:
+            path.append(end)
+            end = parent[end]
+        path.reverse()
+
+        # 反向求最晚完成时间，得到松弛时间
+        latest = {task_id: length for task_id in task_ids}
+        for task_id in reversed(topo):
+            for child_id in children[task_id]:
+                latest[task_id] = min(
+                    latest[task_id],
+                    latest[child_id] - self.tasks[child_id].duration_seconds
+                )
+
+        total_work = sum(self.tasks[t].duration_seconds for t in task_ids)
+        report = {
+            "path": path,
+            "length_seconds": round(length, 3),
+            "total_task_seconds": round(total_work, 3),
+            "tasks": {
+                task_id: {
+                    "duration_seconds": round(self.tasks[task_id].duration_seconds, 3),
+                    "retries": self.tasks[task_id].retry_count,
+                    "slack_seconds": round(max(0.0, latest[task_id] - finish[task_id]), 3)
+                }
+                for task_id in topo
+            }
+        }
+        if wall_seconds:
+            report["wall_seconds"] = round(wall_seconds, 3)
+            report["parallelism"] = round(total_work / wall_seconds, 2)
+
+        self._last_critical_path = report
+        return report
+
+    def _log_critical_path(self, report: Dict[str, Any]) -> None:
+        if not report["path"]:
+            return
+        logger.info(
+            f"Critical path ({report['length_seconds']:.2f}s of "
+            f"{report.get('wall_seconds', 0):.2f}s wall): {' -> '.join(report['path'])}"
+        )
+        for task_id in report["path"]:
+            info = report["tasks"][task_id]
+            logger.info(
+                f"  {task_id}: {info['duration_seconds']:.2f}s, {info['retries']} retries"
+            )
+
     def get_progress(self) -> Dict[str, Any]:
         """
         获取执行进度
@@ -455,6 +807,9 @@ class ETLScheduler:
                 "status": task.status.value,
                 "started_at": task.started_at.isoformat() if task.started_at else None,
                 "completed_at": task.completed_at.isoformat() if task.completed_at else None,
+                "duration_seconds": round(task.duration_seconds, 3),
+                "retries": task.retry_count,
+                "executor": task.executor,
                 "error": task.error
             }
 
@@ -465,7 +820,8 @@ class ETLScheduler:
             "pending_tasks": pending,
             "running_tasks": running,
             "progress_percent": (completed / total * 100) if total > 0 else 0,
-            "task_details": task_details
+            "task_details": task_details,
+            "critical_path": self._last_critical_path
         }
 
     def add_progress_callback(self, callback: Callable) -> None:
@@ -516,6 +872,7 @@ class ETLScheduler:
             self.task_order.clear()
             self._futures.clear()
             self._stats = {"total": 0, "completed": 0, "failed": 0, "skipped": 0}
+            self._last_critical_path = None
 
         if self._executor:
             self._executor.shutdown(wait=False)
@@ -7,8 +7,11 @@
 #===========================================================
 
 import logging
+import os
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Any
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from itertools import islice
+from typing import Dict, List, Optional, Any, Iterable, Iterator, Tuple
 from datetime import datetime
 from dataclasses import dataclass
 from enum import Enum
@@ -40,6 +43,50 @@ class TransformationResult:
         return self.status == TransformationStatus.SUCCESS
 
 
+# ============================================
+# 进程池转换的数据块协议
+# ============================================
+# 转换器在每个工作进程初始化时只传输一次；每个数据块只发送 (块序号, 记录列表)，
+# 工作进程返回紧凑元组而不回传输入记录，由主进程按位置重新关联，
+# 使跨进程序列化量约等于输入 + 输出各一份。
+
+_WORKER_TRANSFORMER: Optional["BaseTransformer"] = None
+
+
+def _init_transform_worker(transformer: "BaseTransformer"):
+    """工作进程初始化：保存转换器副本"""
+    global _WORKER_TRANSFORMER
+    _WORKER_TRANSFORMER = transformer
+
+
+def _transform_chunk(
+    chunk_index: int,
+    records: List[Dict],
+    outputs_only: bool
+) -> Tuple[int, List[Tuple], Dict[str, Any]]:
+    """
+    在工作进程中转换一个数据块
+
+    Returns:
+        (块序号, [(状态值, 输出记录, 错误, 警告, 元数据)], 本块统计增量)
+    """
+    transformer = _WORKER_TRANSFORMER
+    transformer.reset_stats()
+    results = transformer.transform_batch(records)
+
+    if outputs_only:
+        packed = [
+            (r.status.value, r.output_record, None, None, None)
+            for r in results
+        ]
+    else:
+        packed = [
+            (r.status.value, r.output_record, r.errors, r.warnings, r.metadata)
+            for r in results
+        ]
+    return chunk_index, packed, transformer.get_stats()
+
+
 class BaseTransformer(ABC):
     """
     数据转换器基类
@@ -112,6 +159,151 @@ class BaseTransformer(ABC):
 
         return results
 
+    def transform_batch_parallel(
+        self,
+        records: Iterable[Dict],
+        workers: Optional[int] = None,
+        chunk_size: int = 1000,
+        ordered: bool = True,
+        outputs_only: bool = False
+    ) -> List[TransformationResult]:
+        """
+        使用进程池批量转换记录
+
+        Args:
+            records: 输入记录（列表或任意可迭代对象）
+            workers: 工作进程数（默认 CPU 核数）
+            chunk_size: 每个数据块的记录数
+            ordered: 是否保持输入顺序（False 时按块完成顺序返回）
+            outputs_only: 仅回传输出记录（不回传错误/警告/元数据，进一步减少序列化开销）
+
+        Returns:
+            转换结果列表
+        """
+        return list(self.iter_transform_parallel(
+            records,
+            workers=workers,
+            chunk_size=chunk_size,
+            ordered=ordered,
+            outputs_only=outputs_only
+        ))
+
+    def iter_transform_parallel(
+        self,
+        records: Iterable[Dict],
+        workers: Optional[int] = None,
+        chunk_size: int = 1000,
+        ordered: bool = True,
+        outputs_only: bool = False
+    ) -> Iterator[TransformationResult]:
+        """
+        使用进程池流式转换记录
+
+        输入按块惰性读取，同时在途的块数不超过工作进程数的两倍，
+        内存占用与输入总量无关。各工作进程的统计增量合并回 self.stats。
+        转换器及其属性必须可被 pickle。
+
+        Args:
+            records: 输入记录（列表或任意可迭代对象）
+            workers: 工作进程数（默认 CPU 核数）
+            chunk_size: 每个数据块的记录数
+            ordered: 是否保持输入顺序（False 时按块完成顺序产出）
+            outputs_only: 仅回传输出记录
+
+        Yields:
+            转换结果
+        """
+        workers = workers or os.cpu_count() or 1
+        chunk_size = max(1, chunk_size)
+        iterator = iter(records)
+
+        first = list(islice(iterator, chunk_size))
+        if not first:
+            return
+
+        # 数据量不足一个块或只有一个工作进程时，进程池开销大于收益
+        if workers <= 1:
+            yield from self.transform_batch(first)
+            for chunk in iter(lambda: list(islice(iterator, chunk_size)), []):
+                yield from self.transform_batch(chunk)
+            return
+
+        second = list(islice(iterator, chunk_size))
+        if not second:
+            yield from self.transform_batch(first)
+            return
+
+        max_in_flight = workers * 2
+        pending = {}
+        inputs: Dict[int, List[Dict]] = {}
+        completed: Dict[int, List[TransformationResult]] = {}
+        next_to_submit = 0
+        next_to_yield = 0
+
+        def chunks():
+            yield first
+            yield second
+            yield from iter(lambda: list(islice(iterator, chunk_size)), [])
+
+        chunk_source = chunks()
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_transform_worker,
+            initargs=(self,)
+        ) as executor:
+
+            def submit_more():
+                nonlocal next_to_submit
+                while len(pending) < max_in_flight:
+                    chunk = next(chunk_source, None)
+                    if chunk is None:
+                        return
+                    inputs[next_to_submit] = chunk
+                    future = executor.submit(_transform_chunk, next_to_submit, chunk, outputs_only)
+                    pending[future] = next_to_submit
+                    next_to_submit += 1
+
+            submit_more()
+            while pending:
+                done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+                for future in done:
+                    del pending[future]
+                    chunk_index, packed, stats = future.result()
+                    self._merge_worker_stats(stats)
+                    completed[chunk_index] = self._unpack_chunk(inputs.pop(chunk_index), packed)
+
+                submit_more()
+
+                if ordered:
+                    while next_to_yield in completed:
+                        yield from completed.pop(next_to_yield)
+                        next_to_yield += 1
+                else:
+                    for chunk_index in list(completed):
+                        yield from completed.pop(chunk_index)
+
+    @staticmethod
+    def _unpack_chunk(records: List[Dict], packed: List[Tuple]) -> List[TransformationResult]:
+        """按位置将工作进程返回的紧凑结果与输入记录重新关联"""
+        return [
+            TransformationResult(
+                status=TransformationStatus(status),
+                input_record=record,
+                output_record=output_record,
+                errors=errors or [],
+                warnings=warnings or [],
+                metadata=metadata or {}
+            )
+            for record, (status, output_record, errors, warnings, metadata) in zip(records, packed)
+        ]
+
+    def _merge_worker_stats(self, stats: Dict[str, Any]):
+        """将工作进程的统计增量合并到 self.stats（数值累加）"""
+        for key, value in stats.items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                self.stats[key] = self.stats.get(key, 0) + value
+
     def validate(self, record: Dict) -> List[str]:
         """
         验证记录数据
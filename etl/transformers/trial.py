@@ -9,7 +9,7 @@
 import logging
 from typing import Dict, Optional, List
 from datetime import datetime
-from .base import BaseTransformer, TransformationResult, FieldMapping
+from .base import BaseTransformer, TransformationResult, TransformationStatus, FieldMapping
 
 
 logger = logging.getLogger(__name__)
@@ -15,10 +15,28 @@ PharmaKG 图分析模块
 - 路径查找（最短路径、所有路径、权重路径）
 - 相似度计算（Jaccard、Cosine、图谱嵌入）
 - 推荐算法（协同过滤、基于图谱的推荐）
+- 内存图投影（CSR/CSC 数组，供各算法共享）
+- 随机游走语料（均匀 / node2vec，多进程生成）
+- 嵌入向量近邻索引（分块精确检索 / IVF）和内存映射存储
+- 知识图谱嵌入（TransE / DistMult / ComplEx，负采样小批量训练）
 """
 
 __version__ = "1.0.0"
 
+from .projection import (
+    GraphProjection,
+    ProjectionCache,
+    get_projection_cache
+)
+
+from .walks import (
+    WalkGraph,
+    WalkCorpus
+)
+
+from .ann import EmbeddingIndex
+from .embedding_store import EmbeddingStore
+
 from .algorithms import (
     GraphAlgorithms,
     CentralityMeasures,
@@ -40,6 +58,8 @@ from .embeddings import (
     SimilarityEngine
 )
 
+from .kg_embeddings import KGEmbeddingModel
+
 from .visualization import (
     GraphVisualizer,
     SubgraphExtractor,
@@ -54,6 +74,19 @@ from .api import (
 )
 
 __all__ = [
+    # Projection
+    "GraphProjection",
+    "ProjectionCache",
+    "get_projection_cache",
+
+    # Walks
+    "WalkGraph",
+    "WalkCorpus",
+
+    # ANN
+    "EmbeddingIndex",
+    "EmbeddingStore",
+
     # Algorithms
     "GraphAlgorithms",
     "CentralityMeasures",
@@ -71,6 +104,7 @@ __all__ = [
     "GraphEmbeddings",
     "NodeEmbeddingModel",
     "SimilarityEngine",
+    "KGEmbeddingModel",
 
     # Visualization
     "GraphVisualizer",
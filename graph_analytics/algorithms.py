@@ -7,10 +7,15 @@
 #===========================================================
 
 import logging
-from typing import Dict, List, Any, Optional, Tuple, Set
+from typing import Dict, List, Any, Optional, Tuple, Set, Union
 from dataclasses import dataclass, field
 from enum import Enum
-from collections import defaultdict, deque
+from collections import deque
+
+import numpy as np
+
+from . import kernels
+from .projection import GraphProjection, ProjectionCache, get_projection_cache, write_node_property
 
 logger = logging.getLogger(__name__)
 
@@ -48,14 +53,16 @@ class CentralityMeasures:
     - 特征向量中心性 (Eigenvector Centrality)
     """
 
-    def __init__(self, neo4j_driver):
+    def __init__(self, neo4j_driver, projections: Optional[ProjectionCache] = None):
         """
         初始化中心性计算器
 
         Args:
             neo4j_driver: Neo4j 数据库驱动
+            projections: 图投影缓存（默认使用驱动共享的缓存）
         """
         self.driver = neo4j_driver
+        self.projections = projections or get_projection_cache(neo4j_driver)
 
     def degree_centrality(
         self,
@@ -134,19 +141,33 @@ class CentralityMeasures:
         self,
         label: Optional[str] = None,
         relationship_types: Optional[List[str]] = None,
-        iterations: int = 20,
+        iterations: int = 100,
         damping_factor: float = 0.85,
-        top_n: int = 100
+        top_n: int = 100,
+        tolerance: float = 1e-6,
+        relationship_weights: Optional[Dict[str, float]] = None,
+        weight_property: Optional[str] = None,
+        personalization: Optional[List[Union[List[str], Dict[str, float]]]] = None,
+        exclude_seeds: bool = False
     ) -> AlgorithmResult:
         """
-        计算 PageRank
+        计算 PageRank / 个性化 PageRank
+
+        在图投影上做稀疏矩阵幂迭代，收敛（L1 变化量 < tolerance）后提前停止，
+        悬挂节点的分数按个性化向量重新分配。传入 personalization 时，
+        每组种子得到一个个性化 PageRank 排名，所有组在同一次迭代中计算。
 
         Args:
             label: 节点标签过滤
             relationship_types: 关系类型列表
-            iterations: 迭代次数
+            iterations: 最大迭代次数
             damping_factor: 阻尼系数
             top_n: 返回前N个节点
+            tolerance: 收敛阈值
+            relationship_weights: 按关系类型的边权重（未列出的类型为 1，0 表示忽略）
+            weight_property: 作为边权重的关系属性
+            personalization: 种子组列表，每组为 primary_id 列表或 {primary_id: 权重}
+            exclude_seeds: 个性化排名中是否排除种子节点本身
 
         Returns:
             算法结果
@@ -155,52 +176,67 @@ class CentralityMeasures:
         start_time = time.time()
 
         try:
-            # 使用 Neo4j Graph Data Science 库或手动实现
-            label_filter = f":{label}" if label else ""
-
-            # 构建关系模式
-            if relationship_types:
-                rel_pattern = "|".join(relationship_types)
-            else:
-                rel_pattern = None
+            projection = self.projections.get(
+                [label] if label else None, relationship_types, weight_property
+            )
 
-            # 尝试使用 GDS 库
-            query = f"""
-            CALL algo.pageRank.stream(
-                '{label or '*'}',
-                '{rel_pattern or ''}',
-                {{iterations: {iterations}, dampingFactor: {damping_factor}}}
+            edge_weights = None
+            if relationship_weights:
+                edge_weights = projection.type_weights(relationship_weights)
+
+            matrix = None
+            if personalization:
+                seeds = kernels.personalization_matrix(projection, personalization)
+                has_seeds = seeds.sum(axis=0) > 0
+                if not has_seeds.any():
+                    raise ValueError("None of the seed nodes were found in the projection")
+                matrix = seeds[:, has_seeds]
+
+            power = kernels.pagerank(
+                projection,
+                damping_factor=damping_factor,
+                tolerance=tolerance,
+                max_iterations=iterations,
+                edge_weights=edge_weights,
+                personalization=matrix
             )
-            YIELD nodeId, score
-            RETURN algo.getNodeById(nodeId).primary_id as node_id,
-                   algo.getNodeById(nodeId).name as name,
-                   score
-            ORDER BY score DESC
-            LIMIT {top_n}
-            """
 
-            with self.driver.session() as session:
-                try:
-                    result = session.run(query)
-                    nodes = [record.data() for record in result]
-                except Exception:
-                    # GDS 不可用，使用简单实现
-                    nodes = self._simple_pagerank(
-                        label, rel_pattern, iterations, damping_factor, top_n
-                    )
+            if personalization:
+                rankings = []
+                column = 0
+                for group_index, group in enumerate(personalization):
+                    if not has_seeds[group_index]:
+                        rankings.append({"seeds": group, "nodes": [], "error": "No seed nodes found in projection"})
+                        continue
+                    exclude = np.flatnonzero(seeds[:, group_index]) if exclude_seeds else None
+                    rankings.append({
+                        "seeds": group,
+                        "nodes": self._ranked_nodes(projection, power.scores[:, column], top_n, exclude)
+                    })
+                    column += 1
+                result = {"rankings": rankings, "total": len(rankings)}
+            else:
+                nodes = self._ranked_nodes(projection, power.scores[:, 0], top_n)
+                result = {"nodes": nodes, "total": len(nodes)}
 
             execution_time = (time.time() - start_time) * 1000
 
             return AlgorithmResult(
                 algorithm_type=AlgorithmType.CENTRALITY,
-                algorithm_name="pagerank",
+                algorithm_name="personalized_pagerank" if personalization else "pagerank",
                 success=True,
                 execution_time_ms=execution_time,
-                result={"nodes": nodes, "total": len(nodes)},
+                result=result,
                 metadata={
-                    "iterations": iterations,
+                    "max_iterations": iterations,
+                    "iterations": power.iterations,
+                    "converged": power.converged,
+                    "residual": float(power.residuals.max()) if len(power.residuals) else None,
+                    "tolerance": tolerance,
                     "damping_factor": damping_factor,
-                    "top_n": top_n
+                    "top_n": top_n,
+                    "node_count": projection.node_count,
+                    "edge_count": projection.edge_count
                 }
             )
 
@@ -215,111 +251,83 @@ class CentralityMeasures:
                 error=str(e)
             )
 
-    def _simple_pagerank(
-        self,
-        label: Optional[str],
-        rel_pattern: Optional[str],
-        iterations: int,
-        damping_factor: float,
-        top_n: int
+    @staticmethod
+    def _ranked_nodes(
+        projection: GraphProjection,
+        scores: np.ndarray,
+        top_n: int,
+        exclude: Optional[np.ndarray] = None
     ) -> List[Dict]:
-        """简单的 PageRank 实现（当 GDS 不可用时）"""
-        label_filter = f":{label}" if label else ""
-
-        # 获取所有节点
-        query = f"""
-        MATCH (n{label_filter})
-        RETURN n.primary_id as node_id, n.name as name
-        """
-
-        with self.driver.session() as session:
-            result = session.run(query)
-            nodes = {record["node_id"]: record for record in result}
-
-        # 获取边
-        query = f"""
-        MATCH (a{label_filter})-[r]->(b{label_filter})
-        RETURN a.primary_id as source, b.primary_id as target
-        """
-
-        with self.driver.session() as session:
-            result = session.run(query)
-            edges = [(record["source"], record["target"]) for record in result]
-
-        # 计算 PageRank
-        scores = {node_id: 1.0 for node_id in nodes}
-        out_links = defaultdict(list)
-        in_links = defaultdict(set)
-
-        for src, tgt in edges:
-            out_links[src].append(tgt)
-            in_links[tgt].add(src)
-
-        for _ in range(iterations):
-            new_scores = {}
-            for node_id in nodes:
-                rank_sum = 0
-                for neighbor in in_links[node_id]:
-                    out_degree = len(out_links[neighbor])
-                    if out_degree > 0:
-                        rank_sum += scores[neighbor] / out_degree
-
-                new_scores[node_id] = (1 - damping_factor) + damping_factor * rank_sum
-
-            scores = new_scores
-
-        # 排序并返回
-        sorted_nodes = sorted(scores.items(), key=lambda x: x[1], reverse=True)[:top_n]
-
+        """按分数取前N个节点（分数为 0 的节点不可达，不参与排名）"""
         return [
             {
-                "node_id": node_id,
-                "name": nodes[node_id]["name"],
-                "score": score
+                "node_id": projection.primary_ids[i],
+                "name": projection.names[i],
+                "score": float(scores[i])
             }
-            for node_id, score in sorted_nodes
+            for i in kernels.top_k_indices(scores, top_n, exclude)
+            if scores[i] > 0
         ]
 
     def betweenness_centrality(
         self,
         label: Optional[str] = None,
         relationship_types: Optional[List[str]] = None,
-        sample_size: int = 1000
+        sample_size: Optional[int] = 1000,
+        top_n: int = 100,
+        directed: bool = False,
+        seed: int = 42,
+        workers: Optional[int] = None,
+        confidence: float = 0.95
     ) -> AlgorithmResult:
         """
-        计算中介中心性（采样版本）
+        计算中介中心性（Brandes 算法，可采样）
+
+        在图投影上运行 Brandes 算法，统计全部最短路径；sample_size 小于
+        节点数时只以 k 个随机源点做 BFS 并按 n/k 放大，metadata 中给出
+        归一化分数的误差上界。源点按分区在多个进程中并行计算。
 
         Args:
             label: 节点标签过滤
             relationship_types: 关系类型列表
-            sample_size: 采样大小
+            sample_size: 源点采样数（None 表示精确计算）
+            top_n: 返回前N个节点
+            directed: 是否按关系方向计算最短路径
+            seed: 采样随机种子（相同种子结果可复现）
+            workers: 进程数（默认 CPU 数）
+            confidence: 误差上界的置信度
 
         Returns:
             算法结果
         """
+        import os
         import time
         start_time = time.time()
 
         try:
-            # 简化实现：使用最短路径计数
-            label_filter = f":{label}" if label else ""
-
-            query = f"""
-            MATCH (a{label_filter}), (b{label_filter})
-            WHERE id(a) < id(b)
-            MATCH path = shortestPath((a)-[*..5]-(b))
-            WITH path, nodes(path) as path_nodes
-            UNWIND path_nodes[1..-2] as intermediate
-            RETURN intermediate.primary_id as node_id,
-                   intermediate.name as name,
-                   count(*) as betweenness
-            ORDER BY betweenness DESC
-            LIMIT {sample_size}
-            """
+            projection = self.projections.get([label] if label else None, relationship_types)
+
+            if workers is None:
+                workers = os.cpu_count() or 1
+
+            bc = kernels.betweenness(
+                projection,
+                sample_size=sample_size,
+                directed=directed,
+                seed=seed,
+                workers=workers,
+                delta=1.0 - confidence
+            )
 
-            with self.driver.session() as session:
-                result = session.run(query)
-                nodes = [record.data() for record in result]
+            nodes = [
+                {
+                    "node_id": projection.primary_ids[i],
+                    "name": projection.names[i],
+                    "betweenness": float(bc.scores[i]),
+                    "normalized": float(bc.normalized[i])
+                }
+                for i in kernels.top_k_indices(bc.scores, top_n)
+            ]
 
             execution_time = (time.time() - start_time) * 1000
 
@@ -329,7 +337,17 @@ class CentralityMeasures:
                 success=True,
                 execution_time_ms=execution_time,
                 result={"nodes": nodes, "total": len(nodes)},
-                metadata={"sample_size": sample_size}
+                metadata={
+                    "sample_size": sample_size,
+                    "pivots": bc.pivots,
+                    "exact": bc.exact,
+                    "error_bound": bc.error_bound,
+                    "confidence": confidence,
+                    "directed": directed,
+                    "seed": seed,
+                    "node_count": projection.node_count,
+                    "edge_count": projection.edge_count
+                }
             )
 
         except Exception as e:
@@ -354,28 +372,56 @@ class CommunityDetection:
     - 弱连通分量
     """
 
-    def __init__(self, neo4j_driver):
+    def __init__(self, neo4j_driver, projections: Optional[ProjectionCache] = None):
         """
         初始化社区检测器
 
         Args:
             neo4j_driver: Neo4j 数据库驱动
+            projections: 图投影缓存（默认使用驱动共享的缓存）
         """
         self.driver = neo4j_driver
+        self.projections = projections or get_projection_cache(neo4j_driver)
 
     def louvain(
         self,
         label: Optional[str] = None,
         relationship_types: Optional[List[str]] = None,
-        include_intermediate_communities: bool = False
+        include_intermediate_communities: bool = False,
+        resolution: float = 1.0,
+        seed: int = 42,
+        algorithm: str = "louvain",
+        relationship_weights: Optional[Dict[str, float]] = None,
+        weight_property: Optional[str] = None,
+        max_levels: int = 10,
+        max_iterations: int = 50,
+        tolerance: float = 1e-7,
+        top_n: int = 100,
+        write_property: Optional[str] = None,
+        batch_size: int = 10000
     ) -> AlgorithmResult:
         """
-        Louvain 社区检测
+        Louvain / Leiden 社区检测
+
+        在图投影上做多层模块度优化（关系方向被忽略，平行边权重相加），
+        同一随机种子结果可复现。algorithm="leiden" 时每层聚合前把社区拆分为
+        内部连通分量，保证社区连通。
 
         Args:
             label: 节点标签过滤
             relationship_types: 关系类型列表
-            include_intermediate_communities: 是否包含中间社区
+            include_intermediate_communities: 是否返回（和写回）每层的社区
+            resolution: 分辨率（越大社区越小）
+            seed: 随机种子
+            algorithm: "louvain" 或 "leiden"
+            relationship_weights: 按关系类型的边权重（未列出的类型为 1，0 表示忽略）
+            weight_property: 作为边权重的关系属性
+            max_levels: 最大层数
+            max_iterations: 每层局部移动的最大轮数
+            tolerance: 模块度提升阈值
+            top_n: 返回最大的前N个社区
+            write_property: 写回社区编号的节点属性名（None 表示不写回）
+            batch_size: 写回时每批节点数
 
         Returns:
             算法结果
@@ -384,38 +430,75 @@ class CommunityDetection:
         start_time = time.time()
 
         try:
-            label_filter = f":{label}" if label else ""
-            rel_pattern = "|".join(relationship_types) if relationship_types else ""
+            if algorithm not in ("louvain", "leiden"):
+                raise ValueError(f"Unknown community algorithm: {algorithm}")
 
-            # 尝试使用 GDS 库
-            query = f"""
-            CALL algo.louvain.stream(
-                '{label or '*'}',
-                '{rel_pattern or ''}',
-                {{includeIntermediateCommunities: {str(include_intermediate_communities).lower()}}}
+            projection = self.projections.get(
+                [label] if label else None, relationship_types, weight_property
             )
-            YIELD nodeId, community
-            RETURN community, count(*) as size
-            ORDER BY size DESC
-            """
 
-            with self.driver.session() as session:
-                try:
-                    result = session.run(query)
-                    communities = [record.data() for record in result]
-                except Exception:
-                    # GDS 不可用，使用标签传播作为替代
-                    return self.label_propagation(label, relationship_types)
+            edge_weights = None
+            if relationship_weights:
+                edge_weights = projection.type_weights(relationship_weights)
+
+            detection = kernels.louvain(
+                projection,
+                edge_weights=edge_weights,
+                resolution=resolution,
+                seed=seed,
+                max_levels=max_levels,
+                max_iterations=max_iterations,
+                tolerance=tolerance,
+                refine=algorithm == "leiden"
+            )
+            membership = detection.membership
+
+            result = {
+                "communities": self._largest_communities(membership, top_n),
+                "total": int(membership.max()) + 1 if len(membership) else 0,
+                "modularity": detection.modularity[-1] if detection.modularity else 0.0
+            }
+            if include_intermediate_communities:
+                result["levels"] = [
+                    {
+                        "level": level,
+                        "modularity": score,
+                        "total": int(assignment.max()) + 1 if len(assignment) else 0,
+                        "communities": self._largest_communities(assignment, top_n)
+                    }
+                    for level, (assignment, score) in enumerate(zip(detection.levels, detection.modularity))
+                ]
+
+            written = 0
+            if write_property:
+                if include_intermediate_communities and detection.levels:
+                    values = np.stack(detection.levels, axis=1).tolist()
+                else:
+                    values = membership.tolist()
+                written = write_node_property(
+                    self.driver, projection.primary_ids, values, write_property,
+                    label=label, batch_size=batch_size
+                )
 
             execution_time = (time.time() - start_time) * 1000
 
             return AlgorithmResult(
                 algorithm_type=AlgorithmType.COMMUNITY,
-                algorithm_name="louvain",
+                algorithm_name=algorithm,
                 success=True,
                 execution_time_ms=execution_time,
-                result={"communities": communities, "total": len(communities)},
-                metadata={"include_intermediate": include_intermediate_communities}
+                result=result,
+                metadata={
+                    "include_intermediate": include_intermediate_communities,
+                    "resolution": resolution,
+                    "seed": seed,
+                    "levels": len(detection.levels),
+                    "level_modularity": detection.modularity,
+                    "write_property": write_property,
+                    "nodes_written": written,
+                    "node_count": projection.node_count,
+                    "edge_count": projection.edge_count
+                }
             )
 
         except Exception as e:
@@ -423,25 +506,55 @@ class CommunityDetection:
             logger.error(f"Louvain community detection failed: {e}")
             return AlgorithmResult(
                 algorithm_type=AlgorithmType.COMMUNITY,
-                algorithm_name="louvain",
+                algorithm_name=algorithm,
                 success=False,
                 execution_time_ms=execution_time,
                 error=str(e)
             )
 
+    @staticmethod
+    def _largest_communities(membership: np.ndarray, top_n: int) -> List[Dict]:
+        """按规模取前N个社区"""
+        sizes = np.bincount(membership) if len(membership) else np.zeros(0, dtype=np.int64)
+        return [
+            {"community": int(c), "size": int(sizes[c])}
+            for c in kernels.top_k_indices(sizes.astype(np.float64), top_n)
+        ]
+
     def label_propagation(
         self,
         label: Optional[str] = None,
         relationship_types: Optional[List[str]] = None,
-        iterations: int = 10
+        iterations: int = 10,
+        synchronous: bool = False,
+        seed: int = 42,
+        tolerance: float = 0.0,
+        relationship_weights: Optional[Dict[str, float]] = None,
+        weight_property: Optional[str] = None,
+        top_n: int = 100,
+        member_limit: int = 100,
+        write_property: Optional[str] = None,
+        batch_size: int = 10000
     ) -> AlgorithmResult:
         """
         标签传播算法
 
+        在图投影上迭代，每个节点取邻居中（按边权重）最常见的标签；
+        一轮中改变标签的节点比例不超过 tolerance 时提前停止。
+
         Args:
             label: 节点标签过滤
             relationship_types: 关系类型列表
-            iterations: 迭代次数
+            iterations: 最大迭代次数
+            synchronous: 是否同步更新（默认按顶点着色分批异步更新）
+            seed: 随机种子
+            tolerance: 提前停止的标签变化比例
+            relationship_weights: 按关系类型的边权重（未列出的类型为 1，0 表示忽略）
+            weight_property: 作为边权重的关系属性
+            top_n: 返回最大的前N个社区
+            member_limit: 每个社区最多列出的成员数
+            write_property: 写回社区编号的节点属性名（None 表示不写回）
+            batch_size: 写回时每批节点数
 
         Returns:
             算法结果
@@ -450,29 +563,33 @@ class CommunityDetection:
         start_time = time.time()
 
         try:
-            label_filter = f":{label}" if label else ""
-            rel_pattern = "|".join(relationship_types) if relationship_types else ""
+            projection = self.projections.get(
+                [label] if label else None, relationship_types, weight_property
+            )
 
-            query = f"""
-            CALL algo.labelPropagation.stream(
-                '{label or '*'}',
-                '{rel_pattern or ''}',
-                {{iterations: {iterations}}}
+            edge_weights = None
+            if relationship_weights:
+                edge_weights = projection.type_weights(relationship_weights)
+
+            propagation = kernels.label_propagation(
+                projection,
+                edge_weights=edge_weights,
+                max_iterations=iterations,
+                synchronous=synchronous,
+                seed=seed,
+                tolerance=tolerance
             )
-            YIELD nodeId, community
-            RETURN community, count(*) as size
-            ORDER BY size DESC
-            """
 
-            with self.driver.session() as session:
-                try:
-                    result = session.run(query)
-                    communities = [record.data() for record in result]
-                except Exception:
-                    # GDS 不可用，使用简单实现
-                    communities = self._simple_label_propagation(
-                        label, rel_pattern, iterations
-                    )
+            communities, histogram = self._describe_groups(
+                projection, propagation.labels, top_n, member_limit
+            )
+
+            written = 0
+            if write_property:
+                written = write_node_property(
+                    self.driver, projection.primary_ids, propagation.labels.tolist(),
+                    write_property, label=label, batch_size=batch_size
+                )
 
             execution_time = (time.time() - start_time) * 1000
 
@@ -481,8 +598,21 @@ class CommunityDetection:
                 algorithm_name="label_propagation",
                 success=True,
                 execution_time_ms=execution_time,
-                result={"communities": communities, "total": len(communities)},
-                metadata={"iterations": iterations}
+                result={
+                    "communities": communities,
+                    "total": int(propagation.labels.max()) + 1 if projection.node_count else 0,
+                    "size_histogram": histogram
+                },
+                metadata={
+                    "max_iterations": iterations,
+                    "iterations": propagation.iterations,
+                    "converged": propagation.converged,
+                    "synchronous": synchronous,
+                    "write_property": write_property,
+                    "nodes_written": written,
+                    "node_count": projection.node_count,
+                    "edge_count": projection.edge_count
+                }
             )
 
         except Exception as e:
@@ -496,78 +626,33 @@ class CommunityDetection:
                 error=str(e)
             )
 
-    def _simple_label_propagation(
-        self,
-        label: Optional[str],
-        rel_pattern: Optional[str],
-        iterations: int
-    ) -> List[Dict]:
-        """简单的标签传播实现"""
-        # 获取节点和边
-        label_filter = f":{label}" if label else ""
-
-        query = f"""
-        MATCH (n{label_filter})
-        RETURN n.primary_id as node_id
-        """
-
-        with self.driver.session() as session:
-            result = session.run(query)
-            nodes = [record["node_id"] for record in result]
-
-        # 初始化：每个节点自己的社区
-        labels = {node: i for i, node in enumerate(nodes)}
-        neighbors = defaultdict(set)
-
-        # 获取邻居
-        query = f"""
-        MATCH (a{label_filter})-[r]-(b{label_filter})
-        RETURN a.primary_id as node_id, b.primary_id as neighbor
-        """
-
-        with self.driver.session() as session:
-            result = session.run(query)
-            for record in result:
-                neighbors[record["node_id"]].add(record["neighbor"])
-
-        # 迭代传播
-        for _ in range(iterations):
-            new_labels = {}
-            for node in nodes:
-                # 统计邻居的标签
-                label_counts = defaultdict(int)
-                for neighbor in neighbors[node]:
-                    label_counts[labels[neighbor]] += 1
-
-                # 选择最常见的标签
-                if label_counts:
-                    new_labels[node] = max(label_counts.items(), key=lambda x: x[1])[0]
-                else:
-                    new_labels[node] = labels[node]
-
-            labels = new_labels
-
-        # 统计社区大小
-        community_sizes = defaultdict(int)
-        for node, community in labels.items():
-            community_sizes[community] += 1
-
-        return [
-            {"community": str(comm), "size": size}
-            for comm, size in sorted(community_sizes.items(), key=lambda x: x[1], reverse=True)
-        ]
-
     def weakly_connected_components(
         self,
         label: Optional[str] = None,
-        relationship_types: Optional[List[str]] = None
+        relationship_types: Optional[List[str]] = None,
+        top_n: int = 100,
+        member_limit: int = 100,
+        min_size: int = 1,
+        max_size: Optional[int] = None,
+        write_property: Optional[str] = None,
+        batch_size: int = 10000
     ) -> AlgorithmResult:
         """
         弱连通分量检测
 
+        在图投影的边数组上求连通分量（忽略关系方向）。min_size / max_size
+        只影响列出的分量，例如 max_size=5 可列出游离的小孤岛；
+        分量规模直方图始终覆盖全部分量。
+
         Args:
             label: 节点标签过滤
             relationship_types: 关系类型列表
+            top_n: 最多列出的分量数（按规模降序）
+            member_limit: 每个分量最多列出的成员数
+            min_size: 列出分量的最小规模
+            max_size: 列出分量的最大规模
+            write_property: 写回分量编号的节点属性名（None 表示不写回）
+            batch_size: 写回时每批节点数
 
         Returns:
             算法结果
@@ -576,27 +661,24 @@ class CommunityDetection:
         start_time = time.time()
 
         try:
-            label_filter = f":{label}" if label else ""
-            rel_pattern = "|".join(relationship_types) if relationship_types else ""
+            projection = self.projections.get([label] if label else None, relationship_types)
 
-            query = f"""
-            CALL algo.unionFind.stream(
-                '{label or '*'}',
-                '{rel_pattern or ''}'
+            components = kernels.connected_component_labels(
+                projection.node_count, projection.edge_sources(), projection.out_indices
             )
-            YIELD nodeId, setId
-            RETURN setId as component, count(*) as size
-            ORDER BY size DESC
-            """
 
-            with self.driver.session() as session:
-                try:
-                    result = session.run(query)
-                    components = [record.data() for record in result]
-                except Exception:
-                    # GDS 不可用，使用 Cypher 实现
-                    components = self._cypher_connected_components(label, rel_pattern)
+            listed, histogram = self._describe_groups(
+                projection, components, top_n, member_limit, min_size, max_size, key="component"
+            )
 
+            written = 0
+            if write_property:
+                written = write_node_property(
+                    self.driver, projection.primary_ids, components.tolist(),
+                    write_property, label=label, batch_size=batch_size
+                )
+
+            sizes = np.bincount(components) if projection.node_count else np.zeros(0, dtype=np.int64)
             execution_time = (time.time() - start_time) * 1000
 
             return AlgorithmResult(
@@ -604,8 +686,21 @@ class CommunityDetection:
                 algorithm_name="weakly_connected_components",
                 success=True,
                 execution_time_ms=execution_time,
-                result={"components": components, "total": len(components)},
-                metadata={}
+                result={
+                    "components": listed,
+                    "total": len(sizes),
+                    "largest": int(sizes.max()) if len(sizes) else 0,
+                    "isolated_nodes": int(np.count_nonzero(sizes == 1)),
+                    "size_histogram": histogram
+                },
+                metadata={
+                    "min_size": min_size,
+                    "max_size": max_size,
+                    "write_property": write_property,
+                    "nodes_written": written,
+                    "node_count": projection.node_count,
+                    "edge_count": projection.edge_count
+                }
             )
 
         except Exception as e:
@@ -619,36 +714,52 @@ class CommunityDetection:
                 error=str(e)
             )
 
-    def _cypher_connected_components(
-        self,
-        label: Optional[str],
-        rel_pattern: Optional[str]
-    ) -> List[Dict]:
-        """使用 Cypher 实现连通分量检测"""
-        label_filter = f":{label}" if label else ""
-
-        # 简化实现：使用遍历
-        query = f"""
-        MATCH (n{label_filter})
-        WHERE NOT (n)-[]->()
-        WITH n
-        CALL apoc.path.subgraphAll(n, {{
-            maxLevel: 100,
-            relationshipFilter: '{rel_pattern or ''}'
-        }})
-        YIELD nodes
-        RETURN min([node in nodes | node.primary_id]) as component, count(*) as size
-        ORDER BY size DESC
-        LIMIT 100
+    @staticmethod
+    def _describe_groups(
+        projection: GraphProjection,
+        groups: np.ndarray,
+        top_n: int,
+        member_limit: int,
+        min_size: int = 1,
+        max_size: Optional[int] = None,
+        key: str = "community"
+    ) -> Tuple[List[Dict], List[Dict]]:
         """
+        汇总节点分组（社区/连通分量）
 
-        with self.driver.session() as session:
-            try:
-                result = session.run(query)
-                return [record.data() for record in result]
-            except Exception:
-                # APOC 也不可用，返回空结果
-                return []
+        Returns:
+            (规模在 [min_size, max_size] 内的前 top_n 个分组及其成员, 规模直方图)
+        """
+        if not len(groups):
+            return [], []
+        sizes = np.bincount(groups)
+        size_values, size_counts = np.unique(sizes, return_counts=True)
+        histogram = [
+            {"size": int(size), "count": int(count)}
+            for size, count in zip(size_values[::-1], size_counts[::-1])
+        ]
+
+        eligible = sizes >= min_size
+        if max_size is not None:
+            eligible &= sizes <= max_size
+        scores = np.where(eligible, sizes, -np.inf).astype(np.float64)
+        selected = kernels.top_k_indices(scores, top_n)
+
+        # 按分组排序一次，每个分组的成员是连续的一段
+        order = np.argsort(groups, kind="stable")
+        starts = np.zeros(len(sizes) + 1, dtype=np.int64)
+        np.cumsum(sizes, out=starts[1:])
+        return [
+            {
+                key: int(group),
+                "size": int(sizes[group]),
+                "members": [
+                    {"node_id": projection.primary_ids[i], "name": projection.names[i]}
+                    for i in order[starts[group]:min(starts[group] + member_limit, starts[group + 1])]
+                ]
+            }
+            for group in selected
+        ], histogram
 
 
 class PathFinding:
@@ -662,14 +773,16 @@ class PathFinding:
     - 权重最短路径
     """
 
-    def __init__(self, neo4j_driver):
+    def __init__(self, neo4j_driver, projections: Optional[ProjectionCache] = None):
         """
         初始化路径查找器
 
         Args:
             neo4j_driver: Neo4j 数据库驱动
+            projections: 图投影缓存（默认使用驱动共享的缓存）
         """
         self.driver = neo4j_driver
+        self.projections = projections or get_projection_cache(neo4j_driver)
 
     def shortest_path(
         self,
@@ -912,14 +1025,16 @@ class SimilarityMeasures:
     - 图结构相似度
     """
 
-    def __init__(self, neo4j_driver):
+    def __init__(self, neo4j_driver, projections: Optional[ProjectionCache] = None):
         """
         初始化相似度计算器
 
         Args:
             neo4j_driver: Neo4j 数据库驱动
+            projections: 图投影缓存（默认使用驱动共享的缓存）
         """
         self.driver = neo4j_driver
+        self.projections = projections or get_projection_cache(neo4j_driver)
 
     def jaccard_similarity(
         self,
@@ -1075,10 +1190,30 @@ class GraphAlgorithms:
             neo4j_driver: Neo4j 数据库驱动
         """
         self.driver = neo4j_driver
-        self.centrality = CentralityMeasures(neo4j_driver)
-        self.community = CommunityDetection(neo4j_driver)
-        self.pathfinding = PathFinding(neo4j_driver)
-        self.similarity = SimilarityMeasures(neo4j_driver)
+        self.projections = get_projection_cache(neo4j_driver)
+        self.centrality = CentralityMeasures(neo4j_driver, self.projections)
+        self.community = CommunityDetection(neo4j_driver, self.projections)
+        self.pathfinding = PathFinding(neo4j_driver, self.projections)
+        self.similarity = SimilarityMeasures(neo4j_driver, self.projections)
+
+    def get_projection(
+        self,
+        labels: Optional[List[str]] = None,
+        relationship_types: Optional[List[str]] = None,
+        weight_property: Optional[str] = None
+    ) -> GraphProjection:
+        """
+        获取（必要时加载）图投影
+
+        Args:
+            labels: 节点标签
+            relationship_types: 关系类型
+            weight_property: 作为边权重的关系属性
+
+        Returns:
+            图投影
+        """
+        return self.projections.get(labels, relationship_types, weight_property)
 
     def get_graph_statistics(self) -> Dict[str, Any]:
         """
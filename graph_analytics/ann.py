@@ -0,0 +1,462 @@
+#===========================================================
+# PharmaKG - 嵌入向量近邻索引
+# Pharmaceutical Knowledge Graph - Embedding Nearest-Neighbour Index
+#===========================================================
+# 版本: v1.0
+# 描述: 连续 float32 单位向量矩阵上的分块精确检索和倒排（IVF）
+#       近似检索，支持节点类型过滤和磁盘持久化
+#===========================================================
+
+import json
+import logging
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .embedding_store import IdTable
+from .projection import SCIPY_AVAILABLE
+
+if SCIPY_AVAILABLE:
+    import scipy.sparse as sp
+
+logger = logging.getLogger(__name__)
+
+METRICS = ("cosine", "dot", "euclidean")
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """每行分数最高的 k 个列下标（降序）"""
+    k = min(k, scores.shape[1])
+    if k <= 0:
+        return np.zeros((scores.shape[0], 0), dtype=np.int64)
+    part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    order = np.argsort(-np.take_along_axis(scores, part, axis=1), axis=1, kind="stable")
+    return np.take_along_axis(part, order, axis=1)
+
+
+def spherical_kmeans(
+    vectors: np.ndarray,
+    n_clusters: int,
+    iterations: int = 10,
+    seed: int = 42,
+    block_size: int = 65536
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    单位向量上的球面 k-means
+
+    Args:
+        vectors: 单位向量矩阵（n x d）
+        n_clusters: 簇数
+        iterations: 迭代次数
+        seed: 随机种子
+        block_size: 分配时每块的向量数
+
+    Returns:
+        (单位化的簇中心, 每个向量的簇编号)
+    """
+    rng = np.random.default_rng(seed)
+    n = len(vectors)
+    n_clusters = max(1, min(n_clusters, n))
+    centroids = vectors[rng.choice(n, size=n_clusters, replace=False)].copy()
+    assignment = np.zeros(n, dtype=np.int64)
+
+    for _ in range(iterations):
+        for start in range(0, n, block_size):
+            block = vectors[start:start + block_size]
+            assignment[start:start + block_size] = np.argmax(block @ centroids.T, axis=1)
+
+        counts = np.bincount(assignment, minlength=n_clusters)
+        order = np.argsort(assignment, kind="stable")
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        empty = counts == 0
+        sums = np.zeros((n_clusters, vectors.shape[1]), dtype=np.float64)
+        sums[~empty] = np.add.reduceat(vectors[order], starts[~empty], axis=0)
+        if empty.any():
+            # 空簇用随机向量重新初始化
+            sums[empty] = vectors[rng.choice(n, size=int(empty.sum()), replace=False)]
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        centroids = (sums / norms).astype(np.float32)
+
+    return centroids, assignment
+
+
+def similarity_matrix(
+    vectors: np.ndarray,
+    others: Optional[np.ndarray] = None,
+    metric: str = "cosine",
+    top_k: Optional[int] = None,
+    memory_budget_mb: float = 256,
+    exclude_self: bool = True
+):
+    """
+    分块计算相似度矩阵
+
+    按行分块做 float32 矩阵乘法，每块的中间结果不超过内存预算；
+    欧氏距离由模长和点积得到（取负值，越大越相似）。
+
+    Args:
+        vectors: 行向量（n x d）
+        others: 列向量（m x d，默认与 vectors 相同）
+        metric: cosine、dot 或 euclidean
+        top_k: 每行只保留分数最高的 k 个（返回 CSR 稀疏矩阵）
+        memory_budget_mb: 每块中间结果的内存上限
+        exclude_self: others 为空且指定 top_k 时是否排除对角线
+
+    Returns:
+        n x m 的 float32 稠密矩阵，或指定 top_k 时的 CSR 矩阵
+    """
+    if metric not in METRICS:
+        raise ValueError(f"Unknown similarity method: {metric}")
+    if top_k is not None and not SCIPY_AVAILABLE:
+        raise ImportError("scipy is required for sparse top-k output: pip install scipy")
+
+    square = others is None
+    left = np.ascontiguousarray(vectors, dtype=np.float32)
+    right = left if square else np.ascontiguousarray(others, dtype=np.float32)
+    left_norms = np.linalg.norm(left, axis=1)
+    right_norms = left_norms if square else np.linalg.norm(right, axis=1)
+    if metric == "cosine":
+        left = left / np.where(left_norms > 0, left_norms, 1.0)[:, None]
+        right = left if square else right / np.where(right_norms > 0, right_norms, 1.0)[:, None]
+
+    n, m = len(left), len(right)
+    # 每块约需 3 个 block_rows x m 的 float32 临时数组
+    block_rows = max(1, int(memory_budget_mb * 2 ** 20 // (12 * max(m, 1))))
+    if top_k is None:
+        result = np.empty((n, m), dtype=np.float32)
+    else:
+        k = min(top_k, m - 1 if square and exclude_self else m)
+        indices = np.empty((n, max(k, 0)), dtype=np.int64)
+        data = np.empty((n, max(k, 0)), dtype=np.float32)
+
+    for start in range(0, n, block_rows):
+        stop = min(start + block_rows, n)
+        block = left[start:stop] @ right.T
+        if metric == "euclidean":
+            block *= -2
+            block += left_norms[start:stop, None] ** 2
+            block += right_norms[None, :] ** 2
+            np.maximum(block, 0, out=block)
+            np.sqrt(block, out=block)
+            np.negative(block, out=block)
+            if square:
+                # 展开式在自身上的舍入误差，对角线直接置 0
+                block[np.arange(stop - start), np.arange(start, stop)] = 0.0
+        if top_k is None:
+            result[start:stop] = block
+            continue
+        if square and exclude_self:
+            block[np.arange(stop - start), np.arange(start, stop)] = -np.inf
+        keep = _top_k(block, k)
+        indices[start:stop] = keep
+        data[start:stop] = np.take_along_axis(block, keep, axis=1)
+
+    if top_k is None:
+        return result
+    indptr = np.arange(n + 1) * indices.shape[1]
+    return sp.csr_matrix((data.ravel(), indices.ravel(), indptr), shape=(n, m))
+
+
+class EmbeddingIndex:
+    """
+    嵌入向量检索索引
+
+    向量按行存为连续 float32 单位向量矩阵（另存模长），余弦、点积和欧氏距离
+    都由同一个矩阵乘法得到。检索集合（按类型过滤后）不超过 exact_threshold
+    时分块精确计算；否则使用倒排索引：向量按球面 k-means 分到 n_lists 个簇，
+    查询只精确计算最接近的 n_probe 个簇内的向量。类型过滤后结果不足时
+    逐步扩大探测的簇数。
+    """
+
+    def __init__(
+        self,
+        ids: Union[Sequence[str], IdTable],
+        vectors: np.ndarray,
+        node_types: Optional[Sequence[Optional[str]]] = None,
+        exact_threshold: int = 50000,
+        n_lists: Optional[int] = None,
+        n_probe: int = 8,
+        block_size: int = 65536,
+        seed: int = 42
+    ):
+        """
+        Args:
+            ids: 向量对应的节点 ID（或已构建的 IdTable）
+            vectors: 向量矩阵（n x d）
+            node_types: 每个向量的节点类型
+            exact_threshold: 不超过此规模时精确检索
+            n_lists: IVF 簇数（默认 4 * sqrt(n)）
+            n_probe: 每次查询探测的簇数
+            block_size: 精确检索时每块的向量数
+            seed: k-means 随机种子
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if vectors.ndim != 2 or len(vectors) != len(ids):
+            raise ValueError("vectors must be a 2-D array with one row per id")
+
+        self.ids = ids if isinstance(ids, IdTable) else IdTable.build(ids)
+        self.norms = np.linalg.norm(vectors, axis=1).astype(np.float32)
+        safe = np.where(self.norms > 0, self.norms, 1.0)
+        self.unit = np.ascontiguousarray(vectors / safe[:, None], dtype=np.float32)
+
+        types = list(node_types) if node_types is not None else [None] * len(self.ids)
+        self.type_names: List[Optional[str]] = sorted(set(types), key=lambda t: (t is None, t or ""))
+        codes = {name: code for code, name in enumerate(self.type_names)}
+        self.type_codes = np.array([codes[t] for t in types], dtype=np.int32)
+
+        self.exact_threshold = exact_threshold
+        self.n_probe = n_probe
+        self.block_size = block_size
+        self.seed = seed
+        self.path: Optional[Path] = None
+        self.centroids: Optional[np.ndarray] = None
+        self.list_offsets: Optional[np.ndarray] = None
+        self.list_rows: Optional[np.ndarray] = None
+        if len(self.ids) > exact_threshold:
+            self._build_ivf(n_lists or int(4 * np.sqrt(len(self.ids))))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def dimension(self) -> int:
+        return self.unit.shape[1]
+
+    def row_of(self, node_id: str) -> Optional[int]:
+        return self.ids.row_of(node_id)
+
+    def vector(self, row: int) -> np.ndarray:
+        """第 row 行的原始向量"""
+        return self.unit[row] * self.norms[row]
+
+    def node_type(self, row: int) -> Optional[str]:
+        return self.type_names[self.type_codes[row]]
+
+    def _build_ivf(self, n_lists: int):
+        """构建倒排索引（簇中心和按簇排序的行号）"""
+        rng = np.random.default_rng(self.seed)
+        n = len(self.ids)
+        sample = self.unit if n <= 64 * n_lists else self.unit[np.sort(rng.choice(n, 64 * n_lists, replace=False))]
+        self.centroids, _ = spherical_kmeans(sample, n_lists, seed=self.seed, block_size=self.block_size)
+
+        assignment = np.empty(n, dtype=np.int64)
+        for start in range(0, n, self.block_size):
+            block = self.unit[start:start + self.block_size]
+            assignment[start:start + self.block_size] = np.argmax(block @ self.centroids.T, axis=1)
+        self.list_rows = np.argsort(assignment, kind="stable")
+        self.list_offsets = np.zeros(len(self.centroids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(assignment, minlength=len(self.centroids)), out=self.list_offsets[1:])
+        logger.info(f"Built IVF index: {n} vectors, {len(self.centroids)} lists")
+
+    #-------------------------------------------------------
+    # 检索
+    #-------------------------------------------------------
+
+    def _scores(self, queries: np.ndarray, query_norms: np.ndarray, rows: np.ndarray, metric: str) -> np.ndarray:
+        """查询（单位向量）与 rows 的分数矩阵；欧氏距离取负值，越大越相似"""
+        cosine = queries @ self.unit[rows].T
+        if metric == "cosine":
+            return cosine
+        dot = cosine * query_norms[:, None] * self.norms[rows][None, :]
+        if metric == "dot":
+            return dot
+        squared = query_norms[:, None] ** 2 + self.norms[rows][None, :] ** 2 - 2 * dot
+        return -np.sqrt(np.maximum(squared, 0.0))
+
+    def _type_rows(self, node_type: Optional[str]) -> Optional[np.ndarray]:
+        if node_type is None:
+            return None
+        if node_type not in self.type_names:
+            return np.zeros(0, dtype=np.int64)
+        return np.flatnonzero(self.type_codes == self.type_names.index(node_type))
+
+    def search(
+        self,
+        queries: np.ndarray,
+        top_k: int = 10,
+        node_type: Optional[str] = None,
+        metric: str = "cosine",
+        exclude: Optional[Sequence[int]] = None,
+        exact: Optional[bool] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        检索最相似的向量
+
+        Args:
+            queries: 查询向量（d 或 q x d）
+            top_k: 每个查询返回的数量
+            node_type: 只返回该类型的节点
+            metric: cosine、dot 或 euclidean（返回负距离）
+            exclude: 每个查询需要排除的行号（-1 表示不排除），通常为查询节点本身
+            exact: 强制精确检索（None 表示按规模自动选择）
+
+        Returns:
+            (行号矩阵, 分数矩阵)，形状为 q x top_k，不足时行号为 -1、分数为 -inf
+        """
+        if metric not in METRICS:
+            raise ValueError(f"Unknown similarity method: {metric}")
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        query_norms = np.linalg.norm(queries, axis=1).astype(np.float32)
+        unit_queries = queries / np.where(query_norms > 0, query_norms, 1.0)[:, None]
+        exclude = np.full(len(queries), -1) if exclude is None else np.asarray(exclude, dtype=np.int64)
+
+        candidates = self._type_rows(node_type)
+        size = len(self.ids) if candidates is None else len(candidates)
+        if exact is None:
+            exact = self.centroids is None or size <= self.exact_threshold
+
+        rows = np.full((len(queries), top_k), -1, dtype=np.int64)
+        scores = np.full((len(queries), top_k), -np.inf, dtype=np.float32)
+        if size == 0 or top_k <= 0:
+            return rows, scores
+
+        if exact:
+            found_rows, found_scores = self._exact(unit_queries, query_norms, candidates, metric, exclude, top_k)
+            rows[:, :found_rows.shape[1]] = found_rows
+            scores[:, :found_scores.shape[1]] = found_scores
+        else:
+            for i in range(len(queries)):
+                found_rows, found_scores = self._probe(
+                    unit_queries[i:i + 1], query_norms[i:i + 1], node_type, metric, exclude[i], top_k
+                )
+                rows[i, :len(found_rows)] = found_rows
+                scores[i, :len(found_scores)] = found_scores
+        return rows, scores
+
+    def _exact(
+        self,
+        queries: np.ndarray,
+        query_norms: np.ndarray,
+        candidates: Optional[np.ndarray],
+        metric: str,
+        exclude: np.ndarray,
+        top_k: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """分块精确检索：每块计算一次矩阵乘法，与当前前 k 个结果合并"""
+        all_rows = np.arange(len(self.ids)) if candidates is None else candidates
+        best_rows = np.zeros((len(queries), 0), dtype=np.int64)
+        best_scores = np.zeros((len(queries), 0), dtype=np.float32)
+
+        for start in range(0, len(all_rows), self.block_size):
+            block = all_rows[start:start + self.block_size]
+            block_scores = self._scores(queries, query_norms, block, metric).astype(np.float32)
+            block_scores[block[None, :] == exclude[:, None]] = -np.inf
+            merged_rows = np.concatenate([best_rows, np.broadcast_to(block, (len(queries), len(block)))], axis=1)
+            merged_scores = np.concatenate([best_scores, block_scores], axis=1)
+            keep = _top_k(merged_scores, top_k)
+            best_rows = np.take_along_axis(merged_rows, keep, axis=1)
+            best_scores = np.take_along_axis(merged_scores, keep, axis=1)
+
+        best_rows = np.where(np.isfinite(best_scores), best_rows, -1)
+        return best_rows, best_scores
+
+    def _probe(
+        self,
+        query: np.ndarray,
+        query_norm: np.ndarray,
+        node_type: Optional[str],
+        metric: str,
+        exclude: int,
+        top_k: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """单个查询的 IVF 检索；类型过滤后结果不足时加倍探测的簇数"""
+        order = np.argsort(-(query @ self.centroids.T)[0], kind="stable")
+        type_code = self.type_names.index(node_type) if node_type is not None else None
+        n_probe = min(self.n_probe, len(order))
+
+        while True:
+            lists = order[:n_probe]
+            rows = np.concatenate([
+                self.list_rows[self.list_offsets[c]:self.list_offsets[c + 1]] for c in lists
+            ])
+            if type_code is not None:
+                rows = rows[self.type_codes[rows] == type_code]
+            rows = rows[rows != exclude]
+            if len(rows) >= top_k or n_probe >= len(order):
+                break
+            n_probe = min(n_probe * 2, len(order))
+
+        if not len(rows):
+            return rows, np.zeros(0, dtype=np.float32)
+        scores = self._scores(query, query_norm, rows, metric)[0].astype(np.float32)
+        keep = _top_k(scores[None, :], top_k)[0]
+        return rows[keep], scores[keep]
+
+    def pair_scores(self, rows_a: np.ndarray, rows_b: np.ndarray, metric: str = "cosine") -> np.ndarray:
+        """逐对计算 rows_a[i] 与 rows_b[i] 的分数"""
+        if metric not in METRICS:
+            raise ValueError(f"Unknown similarity method: {metric}")
+        cosine = np.einsum("ij,ij->i", self.unit[rows_a], self.unit[rows_b])
+        if metric == "cosine":
+            return cosine
+        dot = cosine * self.norms[rows_a] * self.norms[rows_b]
+        if metric == "dot":
+            return dot
+        return -np.sqrt(np.maximum(self.norms[rows_a] ** 2 + self.norms[rows_b] ** 2 - 2 * dot, 0.0))
+
+    #-------------------------------------------------------
+    # 持久化
+    #-------------------------------------------------------
+
+    def save(self, path: Union[str, Path]):
+        """
+        保存到目录（矩阵为 .npy，加载时可内存映射）
+
+        Args:
+            path: 索引目录
+        """
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        np.save(path / "unit.npy", self.unit)
+        np.save(path / "norms.npy", self.norms)
+        np.save(path / "type_codes.npy", self.type_codes)
+        self.ids.save(path)
+        if self.centroids is not None:
+            np.save(path / "centroids.npy", self.centroids)
+            np.save(path / "list_rows.npy", self.list_rows)
+            np.save(path / "list_offsets.npy", self.list_offsets)
+        with open(path / "index.json", "w", encoding="utf-8") as f:
+            json.dump({
+                "type_names": self.type_names,
+                "exact_threshold": self.exact_threshold,
+                "n_probe": self.n_probe,
+                "block_size": self.block_size,
+                "seed": self.seed
+            }, f, ensure_ascii=False)
+        self.path = path
+        logger.info(f"Saved embedding index to {path}")
+
+    @classmethod
+    def load(cls, path: Union[str, Path], mmap: bool = True) -> "EmbeddingIndex":
+        """
+        从目录加载索引
+
+        Args:
+            path: 索引目录
+            mmap: 是否以内存映射方式打开矩阵
+        """
+        path = Path(path)
+        mode = "r" if mmap else None
+        with open(path / "index.json", encoding="utf-8") as f:
+            meta = json.load(f)
+
+        index = cls.__new__(cls)
+        index.ids = IdTable.load(path, mmap=mmap)
+        index.unit = np.load(path / "unit.npy", mmap_mode=mode)
+        index.norms = np.load(path / "norms.npy")
+        index.type_codes = np.load(path / "type_codes.npy")
+        index.type_names = meta["type_names"]
+        index.exact_threshold = meta["exact_threshold"]
+        index.n_probe = meta["n_probe"]
+        index.block_size = meta["block_size"]
+        index.seed = meta["seed"]
+        index.path = path
+        index.centroids = index.list_rows = index.list_offsets = None
+        if (path / "centroids.npy").exists():
+            index.centroids = np.load(path / "centroids.npy")
+            index.list_rows = np.load(path / "list_rows.npy")
+            index.list_offsets = np.load(path / "list_offsets.npy")
+        logger.info(f"Loaded embedding index from {path}: {len(index.ids)} vectors")
+        return index
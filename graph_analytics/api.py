@@ -7,8 +7,9 @@
 #===========================================================
 
 import logging
-from typing import Dict, List, Any, Optional
-from fastapi import APIRouter, HTTPException, Query, Depends
+import threading
+from typing import Dict, List, Any, Optional, Union
+from fastapi import APIRouter, Body, HTTPException, Query, Depends
 from pydantic import BaseModel, Field
 
 from .algorithms import GraphAlgorithms
@@ -36,6 +37,41 @@ class CentralityRequest(BaseModel):
     top_n: int = Field(default=100, ge=1, le=1000)
 
 
+class PageRankRequest(BaseModel):
+    """PageRank 计算请求"""
+    label: Optional[str] = None
+    relationship_types: Optional[List[str]] = None
+    relationship_weights: Optional[Dict[str, float]] = None
+    weight_property: Optional[str] = None
+    damping_factor: float = Field(default=0.85, gt=0, lt=1)
+    max_iterations: int = Field(default=100, ge=1, le=1000)
+    tolerance: float = Field(default=1e-6, gt=0)
+    personalization: Optional[List[Union[List[str], Dict[str, float]]]] = Field(
+        default=None,
+        description="Seed groups for personalised PageRank; each group is a list of node IDs or {node_id: weight}"
+    )
+    exclude_seeds: bool = False
+    top_n: int = Field(default=100, ge=1, le=1000)
+
+
+class CommunityRequest(BaseModel):
+    """Louvain / Leiden 社区检测请求"""
+    label: Optional[str] = None
+    relationship_types: Optional[List[str]] = None
+    relationship_weights: Optional[Dict[str, float]] = None
+    weight_property: Optional[str] = None
+    algorithm: str = Field(default="louvain", description="louvain or leiden")
+    resolution: float = Field(default=1.0, gt=0)
+    seed: int = 42
+    max_levels: int = Field(default=10, ge=1, le=50)
+    include_intermediate_communities: bool = False
+    write_property: Optional[str] = Field(
+        default=None,
+        description="Node property to write community IDs back to"
+    )
+    top_n: int = Field(default=100, ge=1, le=1000)
+
+
 class PathFindingRequest(BaseModel):
     """路径查找请求"""
     source_id: str
@@ -65,6 +101,8 @@ class EmbeddingTrainRequest(BaseModel):
     relationship_types: Optional[List[str]] = None
     walk_length: int = Field(default=80, ge=10, le=200)
     num_walks: int = Field(default=10, ge=1, le=100)
+    p: float = Field(default=1.0, gt=0, description="node2vec return parameter")
+    q: float = Field(default=1.0, gt=0, description="node2vec in-out parameter")
 
 
 class VisualizationRequest(BaseModel):
@@ -81,12 +119,27 @@ class VisualizationRequest(BaseModel):
 # API 路由
 # ============================================
 
-def create_analytics_router(neo4j_driver) -> APIRouter:
+def _with_legacy_params(model, body, **query):
+    """
+    兼容旧版接口：旧版以查询参数传 label 等参数、请求体为关系类型列表（或为空），
+    此时由查询参数构造请求模型；请求体为 JSON 对象时直接使用
+    """
+    if isinstance(body, model):
+        return body
+    return model(relationship_types=body or None, **query)
+
+
+# 精确中介中心性允许的最大节点数（与采样源点数上限一致）
+MAX_EXACT_BETWEENNESS_NODES = 10000
+
+
+def create_analytics_router(neo4j_driver, betweenness_workers: Optional[int] = None) -> APIRouter:
     """
     创建分析 API 路由
 
     Args:
         neo4j_driver: Neo4j 数据库驱动
+        betweenness_workers: 中介中心性计算进程数（默认 CPU 数）
 
     Returns:
         FastAPI 路由
@@ -95,6 +148,8 @@ def create_analytics_router(neo4j_driver) -> APIRouter:
 
     # 初始化组件
     algorithms = GraphAlgorithms(neo4j_driver)
+    # 同一时间只运行一个中介中心性计算，由它使用全部 betweenness_workers 个进程
+    betweenness_slot = threading.BoundedSemaphore(1)
 
     @router.get("/statistics")
     async def get_graph_statistics():
@@ -146,20 +201,31 @@ def create_analytics_router(neo4j_driver) -> APIRouter:
 
     @router.post("/centrality/pagerank")
     async def calculate_pagerank(
+        request: Union[PageRankRequest, List[str], None] = Body(default=None),
         label: Optional[str] = None,
-        relationship_types: Optional[List[str]] = None,
         top_n: int = Query(default=100, ge=1, le=1000)
     ):
         """
         计算 PageRank
 
-        返回 PageRank 分数最高的节点
+        返回 PageRank 分数最高的节点；提供 personalization 时
+        为每组种子节点返回一个个性化 PageRank 排名。
+        请求体为 PageRankRequest；仍接受旧版调用（label、top_n 为查询参数，
+        请求体为关系类型列表或为空）
         """
+        request = _with_legacy_params(PageRankRequest, request, label=label, top_n=top_n)
         try:
             result = algorithms.centrality.pagerank(
-                label=label,
-                relationship_types=relationship_types,
-                top_n=top_n
+                label=request.label,
+                relationship_types=request.relationship_types,
+                iterations=request.max_iterations,
+                damping_factor=request.damping_factor,
+                top_n=request.top_n,
+                tolerance=request.tolerance,
+                relationship_weights=request.relationship_weights,
+                weight_property=request.weight_property,
+                personalization=request.personalization,
+                exclude_seeds=request.exclude_seeds
             )
 
             if not result.success:
@@ -167,9 +233,10 @@ def create_analytics_router(neo4j_driver) -> APIRouter:
 
             return {
                 "success": True,
-                "algorithm": "pagerank",
+                "algorithm": result.algorithm_name,
                 "execution_time_ms": result.execution_time_ms,
-                "data": result.result
+                "data": result.result,
+                "metadata": result.metadata
             }
 
         except HTTPException:
@@ -179,22 +246,41 @@ def create_analytics_router(neo4j_driver) -> APIRouter:
             raise HTTPException(status_code=500, detail=str(e))
 
     @router.post("/centrality/betweenness")
-    async def calculate_betweenness(
+    def calculate_betweenness(
         label: Optional[str] = None,
-        relationship_types: Optional[List[str]] = None,
-        sample_size: int = Query(default=1000, ge=100, le=10000)
+        relationship_types: Optional[List[str]] = Query(default=None),
+        sample_size: int = Query(default=1000, ge=100, le=10000),
+        top_n: int = Query(default=100, ge=1, le=1000),
+        directed: bool = False,
+        seed: int = 42,
+        exact: bool = False
     ):
         """
         计算中介中心性
 
-        返回经过最短路径次数最多的节点
+        返回经过最短路径次数最多的节点；默认以 sample_size 个随机源点近似计算，
+        exact=true 时精确计算（仅限不超过 MAX_EXACT_BETWEENNESS_NODES 个节点的图）。
+        同步处理函数在线程池中运行，不阻塞事件循环。
         """
         try:
-            result = algorithms.centrality.betweenness_centrality(
-                label=label,
-                relationship_types=relationship_types,
-                sample_size=sample_size
-            )
+            projection = algorithms.projections.get([label] if label else None, relationship_types)
+            if exact and projection.node_count > MAX_EXACT_BETWEENNESS_NODES:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Exact betweenness is limited to {MAX_EXACT_BETWEENNESS_NODES} nodes "
+                           f"(graph has {projection.node_count}); use sample_size instead"
+                )
+
+            with betweenness_slot:
+                result = algorithms.centrality.betweenness_centrality(
+                    label=label,
+                    relationship_types=relationship_types,
+                    sample_size=None if exact else min(sample_size, projection.node_count),
+                    top_n=top_n,
+                    directed=directed,
+                    seed=seed,
+                    workers=betweenness_workers
+                )
 
             if not result.success:
                 raise HTTPException(status_code=500, detail=result.error)
@@ -203,7 +289,8 @@ def create_analytics_router(neo4j_driver) -> APIRouter:
                 "success": True,
                 "algorithm": "betweenness_centrality",
                 "execution_time_ms": result.execution_time_ms,
-                "data": result.result
+                "data": result.result,
+                "metadata": result.metadata
             }
 
         except HTTPException:
@@ -214,18 +301,31 @@ def create_analytics_router(neo4j_driver) -> APIRouter:
 
     @router.post("/community/louvain")
     async def detect_louvain_communities(
-        label: Optional[str] = None,
-        relationship_types: Optional[List[str]] = None
+        request: Union[CommunityRequest, List[str], None] = Body(default=None),
+        label: Optional[str] = None
     ):
         """
-        Louvain 社区检测
+        Louvain / Leiden 社区检测
 
-        使用 Louvain 算法检测图中的社区结构
+        返回规模最大的社区和模块度；提供 write_property 时
+        把每个节点的社区编号按批写回该属性。
+        请求体为 CommunityRequest；仍接受旧版调用（label 为查询参数，
+        请求体为关系类型列表或为空）
         """
+        request = _with_legacy_params(CommunityRequest, request, label=label)
         try:
             result = algorithms.community.louvain(
-                label=label,
-                relationship_types=relationship_types
+                label=request.label,
+                relationship_types=request.relationship_types,
+                include_intermediate_communities=request.include_intermediate_communities,
+                resolution=request.resolution,
+                seed=request.seed,
+                algorithm=request.algorithm,
+                relationship_weights=request.relationship_weights,
+                weight_property=request.weight_property,
+                max_levels=request.max_levels,
+                top_n=request.top_n,
+                write_property=request.write_property
             )
 
             if not result.success:
@@ -233,9 +333,10 @@ def create_analytics_router(neo4j_driver) -> APIRouter:
 
             return {
                 "success": True,
-                "algorithm": "louvain",
+                "algorithm": result.algorithm_name,
                 "execution_time_ms": result.execution_time_ms,
-                "data": result.result
+                "data": result.result,
+                "metadata": result.metadata
             }
 
         except HTTPException:
@@ -244,20 +345,76 @@ def create_analytics_router(neo4j_driver) -> APIRouter:
             logger.error(f"Louvain community detection failed: {e}")
             raise HTTPException(status_code=500, detail=str(e))
 
+    @router.post("/community/label-propagation")
+    async def detect_label_propagation_communities(
+        label: Optional[str] = None,
+        relationship_types: Optional[List[str]] = Query(default=None),
+        iterations: int = Query(default=10, ge=1, le=100),
+        synchronous: bool = False,
+        seed: int = 42,
+        top_n: int = Query(default=100, ge=1, le=1000),
+        member_limit: int = Query(default=100, ge=0, le=10000),
+        write_property: Optional[str] = None
+    ):
+        """
+        标签传播社区检测
+
+        返回规模最大的社区（含成员列表）和社区规模直方图
+        """
+        try:
+            result = algorithms.community.label_propagation(
+                label=label,
+                relationship_types=relationship_types,
+                iterations=iterations,
+                synchronous=synchronous,
+                seed=seed,
+                top_n=top_n,
+                member_limit=member_limit,
+                write_property=write_property
+            )
+
+            if not result.success:
+                raise HTTPException(status_code=500, detail=result.error)
+
+            return {
+                "success": True,
+                "algorithm": "label_propagation",
+                "execution_time_ms": result.execution_time_ms,
+                "data": result.result,
+                "metadata": result.metadata
+            }
+
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"Label propagation failed: {e}")
+            raise HTTPException(status_code=500, detail=str(e))
+
     @router.post("/community/connected-components")
     async def find_connected_components(
         label: Optional[str] = None,
-        relationship_types: Optional[List[str]] = None
+        relationship_types: Optional[List[str]] = Query(default=None),
+        top_n: int = Query(default=100, ge=1, le=10000),
+        member_limit: int = Query(default=100, ge=0, le=10000),
+        min_size: int = Query(default=1, ge=1),
+        max_size: Optional[int] = Query(default=None, ge=1),
+        write_property: Optional[str] = None
     ):
         """
         弱连通分量检测
 
-        找出图中的所有连通分量
+        返回分量规模直方图和按规模降序的分量成员列表；
+        max_size 可用于列出游离的小孤岛
         """
         try:
             result = algorithms.community.weakly_connected_components(
                 label=label,
-                relationship_types=relationship_types
+                relationship_types=relationship_types,
+                top_n=top_n,
+                member_limit=member_limit,
+                min_size=min_size,
+                max_size=max_size,
+                write_property=write_property
             )
 
             if not result.success:
@@ -267,7 +424,8 @@ def create_analytics_router(neo4j_driver) -> APIRouter:
                 "success": True,
                 "algorithm": "connected_components",
                 "execution_time_ms": result.execution_time_ms,
-                "data": result.result
+                "data": result.result,
+                "metadata": result.metadata
             }
 
         except HTTPException:
@@ -688,14 +846,16 @@ class AnalyticsAPI:
     整合所有图分析 API 端点
     """
 
-    def __init__(self, neo4j_driver):
+    def __init__(self, neo4j_driver, betweenness_workers: Optional[int] = None):
         """
         初始化分析 API
 
         Args:
             neo4j_driver: Neo4j 数据库驱动
+            betweenness_workers: 中介中心性计算进程数（默认 CPU 数）
         """
         self.driver = neo4j_driver
+        self.betweenness_workers = betweenness_workers
 
     def register_routers(self, app):
         """
@@ -704,7 +864,7 @@ class AnalyticsAPI:
         Args:
             app: FastAPI 应用实例
         """
-        app.include_router(create_analytics_router(self.driver))
+        app.include_router(create_analytics_router(self.driver, self.betweenness_workers))
         app.include_router(create_similarity_router(self.driver))
         app.include_router(create_path_router(self.driver))
         app.include_router(create_inference_router(self.driver))
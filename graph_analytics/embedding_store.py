@@ -0,0 +1,357 @@
+#===========================================================
+# PharmaKG - 嵌入向量存储
+# Pharmaceutical Knowledge Graph - Embedding Store
+#===========================================================
+# 版本: v1.0
+# 描述: 内存映射的嵌入矩阵、排序 ID 表和元数据，
+#       多个 API 进程共享同一份页缓存
+#===========================================================
+
+import json
+import logging
+import os
+import shutil
+import time
+from collections.abc import Mapping
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+DTYPES = ("float32", "float16")
+
+
+@contextmanager
+def atomic_directory(path: Union[str, Path]) -> Iterator[Path]:
+    """
+    原子地替换目录
+
+    path 是指向同级版本目录 .{名称}.v{时间}-{进程号} 的符号链接。在新的版本目录中
+    写入，成功后用 os.replace 原子地切换链接，再删除旧版本目录：任何时刻打开 path
+    都能看到完整的旧版本或新版本；已内存映射旧文件的进程继续读取旧的 inode；
+    旧版本中多余的文件（如旧索引）随之删除。写入失败时删除新版本目录，path 保持不变。
+
+    path 原为普通目录（旧布局）时，首次切换需先把目录移开，存在短暂的不可见窗口。
+
+    Args:
+        path: 目标路径
+
+    Yields:
+        新版本目录
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    version = path.with_name(f".{path.name}.v{time.time_ns()}-{os.getpid()}")
+    version.mkdir()
+
+    try:
+        yield version
+    except BaseException:
+        shutil.rmtree(version, ignore_errors=True)
+        raise
+
+    old = None
+    if path.is_symlink():
+        old = path.parent / os.readlink(path)
+    elif path.is_dir():
+        old = path.with_name(f".{path.name}.old-{os.getpid()}")
+        os.rename(path, old)
+
+    link = path.with_name(f".{path.name}.link-{os.getpid()}")
+    if link.is_symlink():
+        link.unlink()
+    os.symlink(version.name, link)
+    # 链接替换是原子的；path 为旧版 pickle 文件时同样直接替换
+    os.replace(link, path)
+
+    if old is not None and old.is_dir() and old.name.startswith(f".{path.name}."):
+        shutil.rmtree(old, ignore_errors=True)
+
+
+def _encode_ids(ids: Sequence[str]) -> np.ndarray:
+    """ID 编码为定长字节数组（UTF-8）"""
+    return np.array([str(node_id).encode("utf-8") for node_id in ids], dtype=np.bytes_)
+
+
+class IdTable:
+    """
+    节点 ID 与行号的映射
+
+    ID 按行存为定长字节数组，另存按字节序排序的 ID 及其行号，
+    查找用二分搜索，不需要在内存中构建字典。
+    """
+
+    def __init__(self, ids: np.ndarray, sorted_ids: np.ndarray, sorted_rows: np.ndarray):
+        self.ids = ids
+        self.sorted_ids = sorted_ids
+        self.sorted_rows = sorted_rows
+
+    @classmethod
+    def build(cls, ids: Sequence[str]) -> "IdTable":
+        encoded = _encode_ids(ids)
+        order = np.argsort(encoded, kind="stable")
+        sorted_ids = encoded[order]
+        if len(sorted_ids) > 1 and (sorted_ids[1:] == sorted_ids[:-1]).any():
+            raise ValueError("duplicate ids in embedding store")
+        return cls(encoded, sorted_ids, order.astype(np.int64))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, row: int) -> str:
+        return self.ids[row].decode("utf-8")
+
+    def rows_of(self, node_ids: Sequence[str]) -> np.ndarray:
+        """批量查找行号，不存在的 ID 为 -1"""
+        keys = _encode_ids(node_ids)
+        if not len(keys) or not len(self.sorted_ids):
+            return np.full(len(keys), -1, dtype=np.int64)
+        positions = np.searchsorted(self.sorted_ids, keys)
+        positions = np.minimum(positions, len(self.sorted_ids) - 1)
+        found = self.sorted_ids[positions] == keys
+        return np.where(found, self.sorted_rows[positions], -1)
+
+    def row_of(self, node_id: str) -> Optional[int]:
+        row = int(self.rows_of([node_id])[0])
+        return row if row >= 0 else None
+
+    def to_list(self) -> List[str]:
+        return [node_id.decode("utf-8") for node_id in self.ids]
+
+    def save(self, path: Path):
+        np.save(path / "ids.npy", self.ids)
+        np.save(path / "sorted_ids.npy", self.sorted_ids)
+        np.save(path / "sorted_rows.npy", self.sorted_rows)
+
+    @classmethod
+    def load(cls, path: Path, mmap: bool = True) -> "IdTable":
+        mode = "r" if mmap else None
+        return cls(
+            np.load(path / "ids.npy", mmap_mode=mode),
+            np.load(path / "sorted_ids.npy", mmap_mode=mode),
+            np.load(path / "sorted_rows.npy", mmap_mode=mode)
+        )
+
+
+class EmbeddingStore(Mapping):
+    """
+    嵌入向量存储
+
+    目录结构：
+        vectors.npy      n x dim 矩阵（float32 或 float16）
+        ids.npy          按行的节点 ID
+        sorted_ids.npy   排序后的节点 ID
+        sorted_rows.npy  排序 ID 对应的行号
+        types.npy        每行的节点类型编号
+        metadata.json    维度、数据类型、模型类型、图版本、类型名
+
+    打开时矩阵和 ID 表均为内存映射，启动几乎不需要时间；
+    以 Mapping 形式按节点 ID 读取向量（返回 float32）。
+    """
+
+    def __init__(
+        self,
+        vectors: np.ndarray,
+        id_table: IdTable,
+        type_codes: np.ndarray,
+        metadata: Dict[str, Any],
+        path: Optional[Path] = None,
+        directory: Optional[Path] = None
+    ):
+        self.vectors = vectors
+        self.id_table = id_table
+        self.type_codes = type_codes
+        self.metadata = metadata
+        self.path = path
+        # 实际读取的版本目录（path 为符号链接时是其目标）
+        self.directory = directory or path
+        self.type_names: List[Optional[str]] = metadata.get("type_names", [None])
+        self.node_types = _NodeTypes(self)
+
+    #-------------------------------------------------------
+    # Mapping 接口
+    #-------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.id_table)
+
+    def __iter__(self) -> Iterator[str]:
+        for row in range(len(self.id_table)):
+            yield self.id_table[row]
+
+    def __getitem__(self, node_id: str) -> np.ndarray:
+        row = self.id_table.row_of(node_id)
+        if row is None:
+            raise KeyError(node_id)
+        return np.asarray(self.vectors[row], dtype=np.float32)
+
+    def __contains__(self, node_id: object) -> bool:
+        return isinstance(node_id, str) and self.id_table.row_of(node_id) is not None
+
+    #-------------------------------------------------------
+    # 批量读取
+    #-------------------------------------------------------
+
+    @property
+    def dimension(self) -> int:
+        return int(self.metadata["dim"])
+
+    @property
+    def ids(self) -> List[str]:
+        return self.id_table.to_list()
+
+    def rows_of(self, node_ids: Sequence[str]) -> np.ndarray:
+        """批量查找行号，不存在的 ID 为 -1"""
+        return self.id_table.rows_of(node_ids)
+
+    def matrix(self, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """读取指定行（默认全部）为 float32 矩阵"""
+        if rows is None:
+            return np.asarray(self.vectors, dtype=np.float32)
+        return np.asarray(self.vectors[np.asarray(rows)], dtype=np.float32)
+
+    def node_type_of_row(self, row: int) -> Optional[str]:
+        return self.type_names[self.type_codes[row]]
+
+    #-------------------------------------------------------
+    # 读写
+    #-------------------------------------------------------
+
+    @classmethod
+    def write(
+        cls,
+        path: Union[str, Path],
+        ids: Sequence[str],
+        vectors: Union[np.ndarray, Sequence[np.ndarray]],
+        node_types: Optional[Sequence[Optional[str]]] = None,
+        model_type: Optional[str] = None,
+        graph_version: Optional[str] = None,
+        dtype: str = "float32",
+        extra: Optional[Dict[str, Any]] = None,
+        atomic: bool = True
+    ) -> "EmbeddingStore":
+        """
+        写入存储目录
+
+        Args:
+            path: 存储目录
+            ids: 节点 ID（与 vectors 按行对应）
+            vectors: n x dim 矩阵或向量序列
+            node_types: 每行的节点类型
+            model_type: 模型类型
+            graph_version: 训练时的图版本
+            dtype: 存储精度（float32 或 float16）
+            extra: 附加元数据
+            atomic: 是否整体替换已有目录（见 atomic_directory）；
+                False 时直接写入 path，用于调用方已在临时目录中写入的情况
+
+        Returns:
+            以内存映射方式打开的存储
+        """
+        if dtype not in DTYPES:
+            raise ValueError(f"Unsupported embedding dtype: {dtype}")
+        path = Path(path)
+        if atomic:
+            with atomic_directory(path) as version:
+                cls._write_files(version, ids, vectors, node_types, model_type, graph_version, dtype, extra)
+        else:
+            path.mkdir(parents=True, exist_ok=True)
+            cls._write_files(path, ids, vectors, node_types, model_type, graph_version, dtype, extra)
+
+        logger.info(f"Wrote embedding store to {path}: {len(ids)} rows ({dtype})")
+        return cls.open(path)
+
+    @staticmethod
+    def _write_files(path, ids, vectors, node_types, model_type, graph_version, dtype, extra):
+        ids = list(ids)
+        dim = len(vectors[0]) if len(ids) else 0
+        out = np.lib.format.open_memmap(path / "vectors.npy", mode="w+", dtype=dtype, shape=(len(ids), dim))
+        if isinstance(vectors, np.ndarray):
+            out[:] = vectors
+        else:
+            for row, vector in enumerate(vectors):
+                out[row] = vector
+        out.flush()
+        del out
+
+        IdTable.build(ids).save(path)
+
+        types = list(node_types) if node_types is not None else [None] * len(ids)
+        type_names = sorted(set(types), key=lambda t: (t is None, t or "")) or [None]
+        codes = {name: code for code, name in enumerate(type_names)}
+        np.save(path / "types.npy", np.array([codes[t] for t in types], dtype=np.int32))
+
+        metadata = {
+            "format_version": FORMAT_VERSION,
+            "count": len(ids),
+            "dim": dim,
+            "dtype": dtype,
+            "model_type": model_type,
+            "graph_version": graph_version,
+            "type_names": type_names,
+            **(extra or {})
+        }
+        # 元数据最后写入，作为存储完整的标志
+        with open(path / "metadata.json.tmp", "w", encoding="utf-8") as f:
+            json.dump(metadata, f, ensure_ascii=False)
+        os.replace(path / "metadata.json.tmp", path / "metadata.json")
+
+    @classmethod
+    def open(cls, path: Union[str, Path], mmap: bool = True) -> "EmbeddingStore":
+        """
+        打开存储目录
+
+        Args:
+            path: 存储目录
+            mmap: 是否以内存映射方式打开（False 时读入内存）
+        """
+        path = Path(path)
+        mode = "r" if mmap else None
+        # 解析一次符号链接，全部文件取自同一版本目录；
+        # 读取途中该版本被替换删除时重新解析
+        for attempt in range(3):
+            version = path.resolve()
+            try:
+                with open(version / "metadata.json", encoding="utf-8") as f:
+                    metadata = json.load(f)
+                if metadata.get("format_version") != FORMAT_VERSION:
+                    raise ValueError(f"Unsupported embedding store format: {metadata.get('format_version')}")
+                return cls(
+                    vectors=np.load(version / "vectors.npy", mmap_mode=mode),
+                    id_table=IdTable.load(version, mmap=mmap),
+                    type_codes=np.load(version / "types.npy", mmap_mode=mode),
+                    metadata=metadata,
+                    path=path,
+                    directory=version
+                )
+            except FileNotFoundError:
+                if attempt == 2 or not path.is_symlink():
+                    raise
+                logger.debug(f"Embedding store {path} was replaced while opening; retrying")
+
+    @staticmethod
+    def exists(path: Union[str, Path]) -> bool:
+        return (Path(path) / "metadata.json").is_file()
+
+
+class _NodeTypes(Mapping):
+    """按节点 ID 读取存储中的节点类型"""
+
+    def __init__(self, store: EmbeddingStore):
+        self._store = store
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._store)
+
+    def __getitem__(self, node_id: str) -> Optional[str]:
+        row = self._store.id_table.row_of(node_id)
+        if row is None:
+            raise KeyError(node_id)
+        return self._store.node_type_of_row(row)
@@ -7,15 +7,24 @@
 #===========================================================
 
 import logging
+import os
 import numpy as np
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Mapping, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
 from collections import defaultdict
 import pickle
 
+from .ann import EmbeddingIndex, similarity_matrix
+from .embedding_store import EmbeddingStore, atomic_directory
+from .projection import SCIPY_AVAILABLE, ProjectionCache, get_projection_cache
+from .walks import WalkCorpus, WalkGraph
+
 logger = logging.getLogger(__name__)
 
+if SCIPY_AVAILABLE:
+    import scipy.sparse as sp
+
 
 class EmbeddingType(str, Enum):
     """嵌入类型"""
@@ -48,7 +57,8 @@ class NodeEmbeddingModel:
         self,
         neo4j_driver,
         embedding_dim: int = 128,
-        model_type: EmbeddingType = EmbeddingType.RANDOM_WALK
+        model_type: EmbeddingType = EmbeddingType.RANDOM_WALK,
+        projections: Optional[ProjectionCache] = None
     ):
         """
         初始化嵌入模型
@@ -57,12 +67,17 @@ class NodeEmbeddingModel:
             neo4j_driver: Neo4j 数据库驱动
             embedding_dim: 嵌入维度
             model_type: 模型类型
+            projections: 图投影缓存（默认使用驱动共享的缓存）
         """
         self.driver = neo4j_driver
+        self.projections = projections or get_projection_cache(neo4j_driver)
         self.embedding_dim = embedding_dim
         self.model_type = model_type
-        self.embeddings: Dict[str, np.ndarray] = {}
-        self.node_types: Dict[str, str] = {}
+        self.embeddings: Mapping[str, np.ndarray] = {}
+        self.node_types: Mapping[str, str] = {}
+        self.graph_version: Optional[str] = None
+        self._index: Optional[EmbeddingIndex] = None
+        self._index_dir: Optional[str] = None
 
     def train(
         self,
@@ -71,11 +86,22 @@ class NodeEmbeddingModel:
         walk_length: int = 80,
         num_walks: int = 10,
         window_size: int = 5,
-        min_count: int = 1
+        min_count: int = 1,
+        p: float = 1.0,
+        q: float = 1.0,
+        directed: bool = False,
+        weight_property: Optional[str] = None,
+        seed: int = 42,
+        workers: Optional[int] = None,
+        walks_path: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         训练嵌入模型
 
+        在图投影上生成随机游走（p = q = 1 为均匀游走，否则为 node2vec 游走），
+        再用 Word2Vec skip-gram 训练。游走默认流式交给 Word2Vec；
+        指定 walks_path 时先写入该文件，再以 corpus_file 方式训练。
+
         Args:
             labels: 节点标签列表
             relationship_types: 关系类型列表
@@ -83,6 +109,13 @@ class NodeEmbeddingModel:
             num_walks: 每个节点的游走次数
             window_size: Word2Vec 窗口大小
             min_count: 最小词频
+            p: node2vec 返回参数
+            q: node2vec 进出参数
+            directed: 是否只沿出边游走（默认忽略方向）
+            weight_property: 作为边权重的关系属性（按权重抽样下一节点）
+            seed: 随机种子
+            workers: 游走生成和 Word2Vec 的进程/线程数（默认 CPU 数）
+            walks_path: 游走语料文件路径
 
         Returns:
             训练统计信息
@@ -91,23 +124,49 @@ class NodeEmbeddingModel:
         start_time = time.time()
 
         try:
-            # 收集随机游走数据
-            walks = self._generate_random_walks(
-                labels=labels,
-                relationship_types=relationship_types,
+            if workers is None:
+                workers = os.cpu_count() or 1
+
+            projection = self.projections.get(labels, relationship_types, weight_property)
+            corpus = WalkCorpus(
+                WalkGraph.from_projection(projection, directed=directed),
+                projection.primary_ids,
+                num_walks=num_walks,
                 walk_length=walk_length,
-                num_walks=num_walks
+                p=p,
+                q=q,
+                seed=seed,
+                workers=workers
             )
 
             # 训练 Word2Vec 模型
-            model = self._train_word2vec(walks, window_size=window_size, min_count=min_count)
+            if walks_path:
+                corpus.save(walks_path)
+                model = self._train_word2vec(
+                    corpus_file=walks_path, window_size=window_size,
+                    min_count=min_count, workers=workers
+                )
+            else:
+                model = self._train_word2vec(
+                    walks=corpus, window_size=window_size,
+                    min_count=min_count, workers=workers
+                )
+
+            # 从内存映射存储加载的模型先转为字典再更新
+            if isinstance(self.embeddings, EmbeddingStore):
+                self.embeddings = {nid: self.embeddings[nid] for nid in self.embeddings}
+                self.node_types = dict(self.node_types)
 
             # 提取嵌入向量
             for node_id in model.wv.key_to_index:
                 self.embeddings[node_id] = model.wv[node_id]
 
-            # 获取节点类型
-            self._fetch_node_types(labels)
+            # 节点类型取自投影
+            for index, node_id in enumerate(projection.primary_ids):
+                self.node_types[node_id] = projection.node_label(index)
+            self.graph_version = projection.version
+            self._index = None
+            self._index_dir = None
 
             training_time = time.time() - start_time
 
@@ -116,8 +175,11 @@ class NodeEmbeddingModel:
                 "training_time_seconds": training_time,
                 "num_nodes": len(self.embeddings),
                 "embedding_dim": self.embedding_dim,
-                "num_walks": len(walks),
-                "walk_length": walk_length
+                "num_walks": len(corpus),
+                "walk_length": walk_length,
+                "p": p,
+                "q": q,
+                "walks_path": walks_path
             }
 
         except Exception as e:
@@ -127,82 +189,15 @@ class NodeEmbeddingModel:
                 "error": str(e)
             }
 
-    def _generate_random_walks(
-        self,
-        labels: Optional[List[str]],
-        relationship_types: Optional[List[str]],
-        walk_length: int,
-        num_walks: int
-    ) -> List[List[str]]:
-        """生成随机游走序列"""
-        label_filter = ""
-        if labels:
-            label_filter = ":" + "|".join(labels)
-
-        rel_pattern = ""
-        if relationship_types:
-            rel_pattern = ":" + "|".join(relationship_types)
-
-        # 获取所有节点
-        query = f"""
-        MATCH (n{label_filter})
-        RETURN n.primary_id as node_id
-        """
-
-        with self.driver.session() as session:
-            result = session.run(query)
-            nodes = [record["node_id"] for record in result]
-
-        walks = []
-
-        for _ in range(num_walks):
-            import random
-            random.shuffle(nodes)
-
-            for node_id in nodes:
-                walk = self._random_walk(node_id, walk_length, label_filter, rel_pattern)
-                if walk:
-                    walks.append(walk)
-
-        return walks
-
-    def _random_walk(
-        self,
-        start_node: str,
-        length: int,
-        label_filter: str,
-        rel_pattern: str
-    ) -> List[str]:
-        """执行单次随机游走"""
-        walk = [start_node]
-        current = start_node
-
-        for _ in range(length - 1):
-            query = f"""
-            MATCH (n {{primary_id: $current_id}})-[{rel_pattern}]->(neighbor{label_filter})
-            RETURN neighbor.primary_id as neighbor_id
-            """
-
-            with self.driver.session() as session:
-                result = session.run(query, current_id=current)
-                neighbors = [record["neighbor_id"] for record in result]
-
-            if not neighbors:
-                break
-
-            import random
-            current = random.choice(neighbors)
-            walk.append(current)
-
-        return walk
-
     def _train_word2vec(
         self,
-        walks: List[List[str]],
-        window_size: int,
-        min_count: int
+        walks: Optional[WalkCorpus] = None,
+        window_size: int = 5,
+        min_count: int = 1,
+        workers: int = 4,
+        corpus_file: Optional[str] = None
     ):
-        """训练 Word2Vec 模型"""
+        """训练 Word2Vec 模型（walks 为可重复迭代的语料，或 corpus_file 为每行一条游走的文件）"""
         try:
             from gensim.models import Word2Vec
         except ImportError:
@@ -211,63 +206,132 @@ class NodeEmbeddingModel:
 
         model = Word2Vec(
             sentences=walks,
+            corpus_file=corpus_file,
             vector_size=self.embedding_dim,
             window=window_size,
             min_count=min_count,
-            workers=4,
+            workers=workers,
             sg=1,  # Skip-gram
             epochs=10
         )
 
         return model
 
-    def _fetch_node_types(self, labels: Optional[List[str]]):
-        """获取节点类型"""
-        label_filter = ""
-        if labels:
-            label_filter = ":" + "|".join(labels)
-
-        query = f"""
-        MATCH (n{label_filter})
-        RETURN n.primary_id as node_id, head(labels(n)) as node_type
-        """
-
-        with self.driver.session() as session:
-            result = session.run(query)
-            for record in result:
-                self.node_types[record["node_id"]] = record["node_type"]
-
     def get_embedding(self, node_id: str) -> Optional[np.ndarray]:
         """获取节点嵌入向量"""
         return self.embeddings.get(node_id)
 
     def get_embeddings_batch(self, node_ids: List[str]) -> Dict[str, np.ndarray]:
         """批量获取节点嵌入向量"""
+        if isinstance(self.embeddings, EmbeddingStore):
+            rows = self.embeddings.rows_of(node_ids)
+            found = rows >= 0
+            vectors = self.embeddings.matrix(rows[found])
+            return dict(zip((nid for nid, ok in zip(node_ids, found) if ok), vectors))
         return {nid: self.embeddings.get(nid) for nid in node_ids if nid in self.embeddings}
 
-    def save(self, filepath: str):
-        """保存嵌入模型"""
-        data = {
-            "embeddings": self.embeddings,
-            "node_types": self.node_types,
-            "embedding_dim": self.embedding_dim,
-            "model_type": self.model_type
-        }
+    def build_index(self, **kwargs) -> EmbeddingIndex:
+        """
+        构建近邻检索索引
+
+        Args:
+            **kwargs: EmbeddingIndex 参数（exact_threshold, n_lists, n_probe 等）
+        """
+        if isinstance(self.embeddings, EmbeddingStore):
+            store = self.embeddings
+            node_types = [store.type_names[code] for code in store.type_codes]
+            self._index = EmbeddingIndex(store.id_table, store.matrix(), node_types, **kwargs)
+            return self._index
+
+        ids = list(self.embeddings)
+        vectors = np.array([self.embeddings[node_id] for node_id in ids], dtype=np.float32)
+        vectors = vectors.reshape(len(ids), self.embedding_dim)
+        self._index = EmbeddingIndex(ids, vectors, [self.node_types.get(node_id) for node_id in ids], **kwargs)
+        return self._index
+
+    def get_index(self) -> EmbeddingIndex:
+        """获取近邻检索索引（优先加载已保存的索引，嵌入更新后重新构建）"""
+        if self._index is None and self._index_dir and os.path.isdir(self._index_dir):
+            self._index = EmbeddingIndex.load(self._index_dir)
+        if self._index is None or len(self._index) != len(self.embeddings):
+            self.build_index()
+        return self._index
+
+    @staticmethod
+    def index_path(filepath: str) -> str:
+        """模型存储目录内的索引目录"""
+        return os.path.join(filepath, "index")
+
+    def save(self, filepath: str, dtype: str = "float32"):
+        """
+        保存嵌入模型为内存映射存储目录（检索索引一并保存，未构建时先构建）
 
-        with open(filepath, "wb") as f:
-            pickle.dump(data, f)
+        写入新的版本目录后原子切换 filepath 链接（见 atomic_directory），
+        正在映射旧存储的进程不受影响。
+
+        Args:
+            filepath: 存储目录
+            dtype: 向量存储精度（float32 或 float16）
+        """
+        with atomic_directory(filepath) as directory:
+            self._write_directory(str(directory), dtype)
 
         logger.info(f"Saved embeddings to {filepath}")
 
-    def load(self, filepath: str):
-        """加载嵌入模型"""
-        with open(filepath, "rb") as f:
-            data = pickle.load(f)
+    def _write_directory(self, directory: str, dtype: str):
+        """把嵌入存储和检索索引写入（临时）目录"""
+        store = self.embeddings if isinstance(self.embeddings, EmbeddingStore) else None
+        if store is not None:
+            ids, vectors = store.ids, store.matrix()
+            node_types = [store.type_names[code] for code in store.type_codes]
+        else:
+            ids = list(self.embeddings)
+            vectors = [self.embeddings[node_id] for node_id in ids]
+            node_types = [self.node_types.get(node_id) for node_id in ids]
+        EmbeddingStore.write(
+            directory,
+            ids,
+            vectors,
+            node_types=node_types,
+            model_type=EmbeddingType(self.model_type).value,
+            graph_version=self.graph_version,
+            dtype=dtype,
+            atomic=False
+        )
+        # 总是保存索引，各进程加载后共享页缓存，而不是各自重建
+        if len(ids):
+            self.get_index().save(self.index_path(directory))
+
+    def load(self, filepath: str, mmap: bool = True):
+        """
+        加载嵌入模型
 
-        self.embeddings = data["embeddings"]
-        self.node_types = data["node_types"]
-        self.embedding_dim = data["embedding_dim"]
-        self.model_type = data["model_type"]
+        Args:
+            filepath: 存储目录（旧版 pickle 文件仍可读取）
+            mmap: 是否以内存映射方式打开向量矩阵
+        """
+        self._index = None
+        self._index_dir = None
+
+        if os.path.isfile(filepath):
+            logger.warning(f"Loading legacy pickled embeddings from {filepath}; re-save to convert")
+            with open(filepath, "rb") as f:
+                data = pickle.load(f)
+
+            self.embeddings = data["embeddings"]
+            self.node_types = data["node_types"]
+            self.embedding_dim = data["embedding_dim"]
+            self.model_type = data["model_type"]
+            self.graph_version = None
+        else:
+            store = EmbeddingStore.open(filepath, mmap=mmap)
+            self.embeddings = store
+            self.node_types = store.node_types
+            self.embedding_dim = store.dimension
+            self.model_type = EmbeddingType(store.metadata["model_type"])
+            self.graph_version = store.metadata.get("graph_version")
+            # 索引取自与向量相同的版本目录
+            self._index_dir = self.index_path(str(store.directory))
 
         logger.info(f"Loaded embeddings from {filepath}: {len(self.embeddings)} nodes")
 
@@ -276,7 +340,7 @@ class SimilarityEngine:
     """
     相似度引擎
 
-    基于嵌入向量计算相似度
+    基于嵌入向量计算相似度，检索使用模型的 EmbeddingIndex
     """
 
     def __init__(
@@ -317,70 +381,54 @@ class SimilarityEngine:
             logger.warning(f"Node {node_id} not in embeddings")
             return []
 
-        query_embedding = self.model.embeddings[node_id]
-        similarities = []
-
-        for other_id, other_embedding in self.model.embeddings.items():
-            if other_id == node_id:
-                continue
-
-            # 按节点类型过滤
-            if node_type:
-                if self.model.node_types.get(other_id) != node_type:
-                    continue
-
-            similarity = self._compute_similarity(query_embedding, other_embedding, method)
-            similarities.append({
-                "node_id": other_id,
-                "similarity": similarity,
-                "node_type": self.model.node_types.get(other_id)
-            })
-
-        # 排序并返回 top_k
-        similarities.sort(key=lambda x: x["similarity"], reverse=True)
-
-        # 获取节点详细信息
-        results = []
-        for sim in similarities[:top_k]:
-            details = self._get_node_details(sim["node_id"])
-            results.append({**sim, **details})
-
-        return results
+        index = self.model.get_index()
+        row = index.row_of(node_id)
+        rows, scores = index.search(
+            index.vector(row), top_k=top_k, node_type=node_type, metric=method, exclude=[row]
+        )
+        return self._describe_matches(index, rows[0], scores[0])
 
-    def _compute_similarity(
+    def _describe_matches(
         self,
-        vec1: np.ndarray,
-        vec2: np.ndarray,
-        method: str
-    ) -> float:
-        """计算向量相似度"""
-        if method == "cosine":
-            return float(np.dot(vec1, vec2) / (np.linalg.norm(vec1) * np.linalg.norm(vec2)))
-        elif method == "euclidean":
-            return float(-np.linalg.norm(vec1 - vec2))  # 负值，因为越大越相似
-        elif method == "dot":
-            return float(np.dot(vec1, vec2))
-        else:
-            raise ValueError(f"Unknown similarity method: {method}")
+        index: EmbeddingIndex,
+        rows: np.ndarray,
+        scores: np.ndarray
+    ) -> List[Dict[str, Any]]:
+        """将检索结果转换为带节点详情的列表"""
+        matches = [
+            {
+                "node_id": index.ids[row],
+                "similarity": float(score),
+                "node_type": index.node_type(row)
+            }
+            for row, score in zip(rows, scores)
+            if row >= 0
+        ]
+        details = self._get_nodes_details([m["node_id"] for m in matches])
+        return [{**m, **details.get(m["node_id"], {})} for m in matches]
+
+    def _get_nodes_details(self, node_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """批量获取节点详细信息（单次查询）"""
+        if not node_ids:
+            return {}
 
-    def _get_node_details(self, node_id: str) -> Dict[str, Any]:
-        """获取节点详细信息"""
         query = """
-        MATCH (n {primary_id: $node_id})
-        RETURN n.name as name,
-               labels(n) as labels,
-               properties(n) as props
+        UNWIND $node_ids AS node_id
+        MATCH (n {primary_id: node_id})
+        RETURN node_id,
+               n.name as name,
+               labels(n) as labels
         """
 
         with self.driver.session() as session:
-            result = session.run(query, node_id=node_id)
-            record = result.single()
-            if record:
-                return {
+            result = session.run(query, node_ids=node_ids)
+            return {
+                record["node_id"]: {
                     "name": record["name"],
                     "labels": record["labels"]
                 }
-        return {}
+                for record in result
+            }
 
     def batch_similarity(
         self,
@@ -397,13 +445,20 @@ class SimilarityEngine:
         Returns:
             相似度结果列表
         """
-        results = []
-
-        for node1_id, node2_id in node_pairs:
-            emb1 = self.model.embeddings.get(node1_id)
-            emb2 = self.model.embeddings.get(node2_id)
+        index = self.model.get_index()
+        found = [
+            (i, index.row_of(node1_id), index.row_of(node2_id))
+            for i, (node1_id, node2_id) in enumerate(node_pairs)
+        ]
+        found = [(i, row1, row2) for i, row1, row2 in found if row1 is not None and row2 is not None]
+        similarities = {}
+        if found:
+            positions, rows1, rows2 = (np.array(column) for column in zip(*found))
+            similarities = dict(zip(positions.tolist(), index.pair_scores(rows1, rows2, method).tolist()))
 
-            if emb1 is None or emb2 is None:
+        results = []
+        for i, (node1_id, node2_id) in enumerate(node_pairs):
+            if i not in similarities:
                 results.append({
                     "node1": node1_id,
                     "node2": node2_id,
@@ -412,12 +467,10 @@ class SimilarityEngine:
                 })
                 continue
 
-            similarity = self._compute_similarity(emb1, emb2, method)
-
             results.append({
                 "node1": node1_id,
                 "node2": node2_id,
-                "similarity": similarity,
+                "similarity": similarities[i],
                 "node1_type": self.model.node_types.get(node1_id),
                 "node2_type": self.model.node_types.get(node2_id)
             })
@@ -441,29 +494,12 @@ class SimilarityEngine:
         Returns:
             相似节点列表
         """
-        similarities = []
-
-        for node_id, embedding in self.model.embeddings.items():
-            # 按节点类型过滤
-            if node_type:
-                if self.model.node_types.get(node_id) != node_type:
-                    continue
-
-            similarity = self._compute_similarity(vector, embedding, "cosine")
-            similarities.append({
-                "node_id": node_id,
-                "similarity": similarity,
-                "node_type": self.model.node_types.get(node_id)
-            })
+        if not self.model.embeddings:
+            return []
 
-        similarities.sort(key=lambda x: x["similarity"], reverse=True)
-
-        results = []
-        for sim in similarities[:top_k]:
-            details = self._get_node_details(sim["node_id"])
-            results.append({**sim, **details})
-
-        return results
+        index = self.model.get_index()
+        rows, scores = index.search(vector, top_k=top_k, node_type=node_type, metric="cosine")
+        return self._describe_matches(index, rows[0], scores[0])
 
 
 class GraphEmbeddings:
@@ -499,9 +535,12 @@ class GraphEmbeddings:
             model_type: 模型类型
 
         Returns:
-            嵌入模型实例
+            嵌入模型实例（TransE / DistMult / ComplEx 为 KGEmbeddingModel）
         """
-        model = NodeEmbeddingModel(
+        from .kg_embeddings import KG_MODEL_TYPES, KGEmbeddingModel
+
+        model_class = KGEmbeddingModel if EmbeddingType(model_type) in KG_MODEL_TYPES else NodeEmbeddingModel
+        model = model_class(
             neo4j_driver=self.driver,
             embedding_dim=embedding_dim,
             model_type=model_type
@@ -538,16 +577,21 @@ class GraphEmbeddings:
         )
 
     def save_model(self, model_name: str, filepath: str):
-        """保存模型"""
+        """保存模型（检索索引保存在模型存储目录内）"""
         if model_name not in self.models:
             raise ValueError(f"Model {model_name} not found")
 
         self.models[model_name].save(filepath)
 
-    def load_model(self, model_name: str, filepath: str) -> NodeEmbeddingModel:
-        """加载模型"""
-        model = NodeEmbeddingModel(neo4j_driver=self.driver)
-        model.load(filepath)
+    def load_model(self, model_name: str, filepath: str, mmap: bool = True) -> NodeEmbeddingModel:
+        """加载模型（默认以内存映射方式打开，多个进程共享页缓存）"""
+        from .kg_embeddings import KGEmbeddingModel
+
+        if os.path.isdir(KGEmbeddingModel.relations_path(filepath)):
+            model = KGEmbeddingModel(neo4j_driver=self.driver)
+        else:
+            model = NodeEmbeddingModel(neo4j_driver=self.driver)
+        model.load(filepath, mmap=mmap)
         self.models[model_name] = model
         return model
 
@@ -582,43 +626,59 @@ class GraphEmbeddings:
         """
         return self.similarity_engine.find_similar_nodes(node_id, node_type, top_k)
 
+    def _gather_embeddings(self, node_ids: List[str]) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """批量读取嵌入，返回 (有嵌入的节点 ID, 其在 node_ids 中的位置, float32 矩阵)"""
+        model = self.similarity_engine.model
+        found = model.get_embeddings_batch(node_ids)
+        positions = [i for i, nid in enumerate(node_ids) if nid in found]
+        valid_ids = [node_ids[i] for i in positions]
+        matrix = np.array([found[nid] for nid in valid_ids], dtype=np.float32)
+        return valid_ids, np.array(positions, dtype=np.int64), matrix.reshape(len(valid_ids), model.embedding_dim)
+
     def compute_similarity_matrix(
         self,
         node_ids: List[str],
-        method: str = "cosine"
-    ) -> np.ndarray:
+        method: str = "cosine",
+        top_k: Optional[int] = None,
+        memory_budget_mb: float = 256
+    ):
         """
         计算节点间的相似度矩阵
 
         Args:
             node_ids: 节点 ID 列表
-            method: 相似度计算方法
+            method: 相似度计算方法 (cosine, euclidean, dot)
+            top_k: 每行只保留最相似的 K 个节点（不含自身），返回 CSR 稀疏矩阵
+            memory_budget_mb: 分块计算时每块中间结果的内存上限
 
         Returns:
-            相似度矩阵
+            相似度矩阵（float32；没有嵌入的节点对应的行列为 0）
         """
-        model = self.similarity_engine.model
         n = len(node_ids)
-        matrix = np.zeros((n, n))
-
-        embeddings = [model.get_embedding(nid) for nid in node_ids]
-
-        for i in range(n):
-            for j in range(i, n):
-                if embeddings[i] is not None and embeddings[j] is not None:
-                    sim = self.similarity_engine._compute_similarity(
-                        embeddings[i], embeddings[j], method
-                    )
-                    matrix[i, j] = sim
-                    matrix[j, i] = sim
+        _, positions, vectors = self._gather_embeddings(node_ids)
+        similarities = similarity_matrix(
+            vectors, metric=method, top_k=top_k, memory_budget_mb=memory_budget_mb
+        )
 
-        return matrix
+        if len(positions) == n:
+            return similarities
+        if top_k is None:
+            matrix = np.zeros((n, n), dtype=np.float32)
+            matrix[np.ix_(positions, positions)] = similarities
+            return matrix
+        similarities = similarities.tocoo()
+        return sp.csr_matrix(
+            (similarities.data, (positions[similarities.row], positions[similarities.col])),
+            shape=(n, n)
+        )
 
     def cluster_nodes(
         self,
         node_ids: List[str],
         n_clusters: int = 5,
-        method: str = "kmeans"
+        method: str = "kmeans",
+        minibatch_threshold: int = 10000,
+        batch_size: int = 4096
     ) -> Dict[str, int]:
         """
         对节点进行聚类
@@ -627,23 +687,21 @@ class GraphEmbeddings:
             node_ids: 节点 ID 列表
             n_clusters: 聚类数量
             method: 聚类方法 (kmeans, hierarchical)
+            minibatch_threshold: 超过此节点数时 kmeans 使用 MiniBatchKMeans
+            batch_size: MiniBatchKMeans 的批大小
 
         Returns:
             节点到簇的映射
         """
-        model = self.similarity_engine.model
-        embeddings = []
-
-        valid_ids = []
-        for nid in node_ids:
-            emb = model.get_embedding(nid)
-            if emb is not None:
-                embeddings.append(emb)
-                valid_ids.append(nid)
-
-        embeddings = np.array(embeddings)
+        valid_ids, _, embeddings = self._gather_embeddings(node_ids)
 
-        if method == "kmeans":
+        if method == "kmeans" and len(valid_ids) > minibatch_threshold:
+            from sklearn.cluster import MiniBatchKMeans
+            kmeans = MiniBatchKMeans(
+                n_clusters=n_clusters, batch_size=batch_size, n_init=3, random_state=42
+            )
+            clusters = kmeans.fit_predict(embeddings)
+        elif method == "kmeans":
             from sklearn.cluster import KMeans
             kmeans = KMeans(n_clusters=n_clusters, random_state=42)
             clusters = kmeans.fit_predict(embeddings)
@@ -0,0 +1,855 @@
+#===========================================================
+# PharmaKG - 图算法数值内核
+# Pharmaceutical Knowledge Graph - Array Graph Kernels
+#===========================================================
+# 版本: v1.0
+# 描述: 基于 GraphProjection 数组的向量化图算法实现，
+#       由 algorithms.py 中的各算法类调用
+#===========================================================
+
+import logging
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Union
+
+import numpy as np
+
+from .projection import GraphProjection, SCIPY_AVAILABLE
+
+logger = logging.getLogger(__name__)
+
+
+def top_k_indices(scores: np.ndarray, k: int, exclude: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    分数最高的 k 个下标（降序）
+
+    Args:
+        scores: 一维分数数组
+        k: 返回数量
+        exclude: 需要排除的下标
+
+    Returns:
+        下标数组
+    """
+    if exclude is not None and len(exclude):
+        scores = scores.copy()
+        scores[exclude] = -np.inf
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.zeros(0, dtype=np.int64)
+    candidates = np.argpartition(-scores, k - 1)[:k]
+    order = np.argsort(-scores[candidates], kind="stable")
+    result = candidates[order]
+    return result[np.isfinite(scores[result])]
+
+
+#===========================================================
+# PageRank
+#===========================================================
+
+@dataclass
+class PowerIterationResult:
+    """幂迭代结果"""
+    scores: np.ndarray          # n x k，每列为一个 PageRank 向量（和为 1）
+    iterations: int
+    converged: bool
+    residuals: np.ndarray       # 每列最后一次迭代的 L1 变化量
+
+
+def personalization_matrix(
+    projection: GraphProjection,
+    seeds: Iterable[Union[Iterable[str], Dict[str, float]]]
+) -> np.ndarray:
+    """
+    由种子节点构建个性化矩阵
+
+    Args:
+        projection: 图投影
+        seeds: 每项为 primary_id 列表（等权）或 {primary_id: 权重}
+
+    Returns:
+        n x k 矩阵（每列和为 1；没有任何已知种子的列全为 0）
+    """
+    seeds = list(seeds)
+    matrix = np.zeros((projection.node_count, len(seeds)), dtype=np.float64)
+    for column, entry in enumerate(seeds):
+        items = entry.items() if isinstance(entry, dict) else ((pid, 1.0) for pid in entry)
+        for primary_id, weight in items:
+            node = projection.index_of(primary_id)
+            if node is not None and weight > 0:
+                matrix[node, column] += weight
+        total = matrix[:, column].sum()
+        if total > 0:
+            matrix[:, column] /= total
+    return matrix
+
+
+def pagerank(
+    projection: GraphProjection,
+    damping_factor: float = 0.85,
+    tolerance: float = 1e-6,
+    max_iterations: int = 100,
+    edge_weights: Optional[np.ndarray] = None,
+    personalization: Optional[np.ndarray] = None
+) -> PowerIterationResult:
+    """
+    稀疏矩阵幂迭代 PageRank
+
+    每步计算 x' = d·Aᵀ·D⁻¹·x + (d·dangling(x) + 1 - d)·p：
+    出度为 0（或出边权重全为 0）的节点的分数按个性化向量 p 重新分配，
+    因此每列分数之和恒为 1。所有列的 L1 变化量都小于 tolerance 时提前停止。
+    多个个性化向量作为矩阵的列在同一次稀疏乘法中计算。
+
+    Args:
+        projection: 图投影
+        damping_factor: 阻尼系数
+        tolerance: 收敛阈值（每列的 L1 变化量）
+        max_iterations: 最大迭代次数
+        edge_weights: CSR 边权重（默认 projection.out_weights；权重为 0 的边被忽略）
+        personalization: n x k 个性化矩阵（默认均匀分布，k = 1）
+
+    Returns:
+        幂迭代结果
+    """
+    n = projection.node_count
+    if personalization is None:
+        personalization = np.full((n, 1), 1.0 / n if n else 0.0)
+    personalization = np.asarray(personalization, dtype=np.float64)
+    if personalization.ndim == 1:
+        personalization = personalization[:, None]
+    k = personalization.shape[1]
+
+    if n == 0:
+        return PowerIterationResult(np.zeros((0, k)), 0, True, np.zeros(k))
+
+    weights = projection.out_weights if edge_weights is None else np.asarray(edge_weights, dtype=np.float64)
+    keep = weights > 0
+    sources = projection.edge_sources()[keep]
+    targets = projection.out_indices[keep]
+    weights = weights[keep].astype(np.float64)
+
+    out_strength = np.bincount(sources, weights=weights, minlength=n)
+    dangling = out_strength == 0
+    inverse = np.zeros(n)
+    inverse[~dangling] = 1.0 / out_strength[~dangling]
+
+    if SCIPY_AVAILABLE:
+        import scipy.sparse as sp
+        transition = sp.csr_matrix((weights, (targets, sources)), shape=(n, n))
+
+        def propagate(x: np.ndarray) -> np.ndarray:
+            return transition @ (x * inverse[:, None])
+    else:
+        def propagate(x: np.ndarray) -> np.ndarray:
+            scaled = x * inverse[:, None]
+            return np.stack([
+                np.bincount(targets, weights=weights * scaled[sources, j], minlength=n)
+                for j in range(x.shape[1])
+            ], axis=1)
+
+    x = personalization.copy()
+    residuals = np.full(k, np.inf)
+    iterations = 0
+    for iterations in range(1, max_iterations + 1):
+        teleport = damping_factor * x[dangling].sum(axis=0) + (1.0 - damping_factor)
+        x_next = damping_factor * propagate(x) + personalization * teleport
+        residuals = np.abs(x_next - x).sum(axis=0)
+        x = x_next
+        if np.all(residuals < tolerance):
+            return PowerIterationResult(x, iterations, True, residuals)
+
+    return PowerIterationResult(x, iterations, False, residuals)
+
+
+#===========================================================
+# 邻接辅助
+#===========================================================
+
+def simple_adjacency(projection: GraphProjection, directed: bool = False):
+    """
+    去重、去自环的邻接数组
+
+    Args:
+        projection: 图投影
+        directed: False 时每条边双向各出现一次
+
+    Returns:
+        (indptr, indices)，每个节点的邻居按编号升序
+    """
+    n = projection.node_count
+    sources = projection.edge_sources().astype(np.int64)
+    targets = projection.out_indices.astype(np.int64)
+    if not directed:
+        sources, targets = np.concatenate([sources, targets]), np.concatenate([targets, sources])
+
+    keep = sources != targets
+    keys = np.unique(sources[keep] * n + targets[keep])
+    sources = keys // n
+    indices = (keys % n).astype(np.int32)
+
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    if len(sources):
+        np.cumsum(np.bincount(sources, minlength=n), out=indptr[1:])
+    return indptr, indices
+
+
+def _expand(indptr: np.ndarray, indices: np.ndarray, frontier: np.ndarray):
+    """
+    展开一组节点的全部邻接边
+
+    Returns:
+        (源节点数组, 邻居数组)
+    """
+    starts = indptr[frontier]
+    counts = indptr[frontier + 1] - starts
+    total = int(counts.sum())
+    if total == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty
+    offsets = np.cumsum(counts) - counts
+    positions = np.repeat(starts - offsets, counts) + np.arange(total)
+    return np.repeat(frontier, counts), indices[positions].astype(np.int64)
+
+
+#===========================================================
+# 中介中心性
+#===========================================================
+
+@dataclass
+class BetweennessResult:
+    """中介中心性结果"""
+    scores: np.ndarray              # 估计的（未归一化）中介中心性
+    normalized: np.ndarray          # 归一化到 [0, 1]
+    pivots: int                     # 作为 BFS 源点的节点数
+    exact: bool
+    error_bound: Optional[float]    # normalized 的绝对误差上界（以 1 - delta 的概率对所有节点成立）
+
+
+def brandes_dependencies(indptr: np.ndarray, indices: np.ndarray, sources: Iterable[int]) -> np.ndarray:
+    """
+    Brandes 算法：累计给定源点的依赖值
+
+    每个源点做一次逐层向量化 BFS（统计最短路径数 sigma），
+    再沿最短路径 DAG 逐层反向累计依赖值 delta。
+
+    Args:
+        indptr: 邻接 indptr
+        indices: 邻接 indices
+        sources: 源点编号
+
+    Returns:
+        各节点的依赖值之和
+    """
+    n = len(indptr) - 1
+    total = np.zeros(n)
+    dist = np.empty(n, dtype=np.int32)
+    sigma = np.empty(n)
+    delta = np.empty(n)
+    owner = np.empty(n, dtype=np.int64)
+
+    for source in sources:
+        dist.fill(-1)
+        sigma.fill(0.0)
+        dist[source] = 0
+        sigma[source] = 1.0
+
+        frontier = np.array([source], dtype=np.int64)
+        levels = []
+        depth = 0
+        while frontier.size:
+            src, nbr = _expand(indptr, indices, frontier)
+            if not src.size:
+                break
+            # 去重（不排序）：每个新节点只保留最后写入 owner 的那一次出现
+            unseen = nbr[dist[nbr] < 0]
+            positions = np.arange(len(unseen))
+            owner[unseen] = positions
+            frontier = unseen[owner[unseen] == positions]
+            dist[frontier] = depth + 1
+
+            # 只保留最短路径 DAG 上的边
+            on_dag = dist[nbr] == depth + 1
+            src, nbr = src[on_dag], nbr[on_dag]
+            np.add.at(sigma, nbr, sigma[src])
+            levels.append((src, nbr))
+            depth += 1
+
+        delta.fill(0.0)
+        for src, nbr in reversed(levels):
+            np.add.at(delta, src, sigma[src] / sigma[nbr] * (1.0 + delta[nbr]))
+        delta[source] = 0.0
+        total += delta
+
+    return total
+
+
+# 工作进程内的邻接数组（由 _init_brandes_worker 设置）
+_BRANDES_GRAPH = None
+
+
+def _init_brandes_worker(indptr: np.ndarray, indices: np.ndarray):
+    global _BRANDES_GRAPH
+    _BRANDES_GRAPH = (indptr, indices)
+
+
+def _brandes_partition(sources: np.ndarray) -> np.ndarray:
+    indptr, indices = _BRANDES_GRAPH
+    return brandes_dependencies(indptr, indices, sources)
+
+
+def betweenness(
+    projection: GraphProjection,
+    sample_size: Optional[int] = None,
+    directed: bool = False,
+    seed: int = 42,
+    workers: int = 1,
+    delta: float = 0.05
+) -> BetweennessResult:
+    """
+    （采样）Brandes 中介中心性
+
+    sample_size 小于节点数时均匀无放回抽取 k 个源点，结果按 n/k 放大。
+    每个源点对节点 v 的依赖值不超过 n-2，由 Hoeffding 不等式和并集界，
+    以至少 1-delta 的概率对所有节点同时有 |估计 - 真值| ≤ sqrt(ln(2n/delta) / 2k)
+    （在 normalized 尺度上）。源点按分区交给进程池并行计算。
+
+    Args:
+        projection: 图投影
+        sample_size: 源点数（None 或不小于节点数时精确计算）
+        directed: 是否按有向图计算（默认忽略方向）
+        seed: 抽样随机种子
+        workers: 进程数
+        delta: 误差上界的失败概率
+
+    Returns:
+        中介中心性结果
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    n = projection.node_count
+    if n < 3:
+        zeros = np.zeros(n)
+        return BetweennessResult(zeros, zeros.copy(), n, True, 0.0)
+
+    indptr, indices = simple_adjacency(projection, directed)
+
+    exact = sample_size is None or sample_size >= n
+    if exact:
+        sources = np.arange(n, dtype=np.int64)
+    else:
+        rng = np.random.default_rng(seed)
+        sources = np.sort(rng.choice(n, size=sample_size, replace=False))
+    k = len(sources)
+
+    if workers and workers > 1 and k > 1:
+        partitions = [p for p in np.array_split(sources, min(k, workers * 4)) if len(p)]
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_brandes_worker,
+            initargs=(indptr, indices)
+        ) as executor:
+            scores = np.sum(list(executor.map(_brandes_partition, partitions)), axis=0)
+    else:
+        scores = brandes_dependencies(indptr, indices, sources)
+
+    if not exact:
+        scores *= n / k
+    if not directed:
+        scores /= 2.0
+
+    scale = (n - 1) * (n - 2)
+    normalized = scores / (scale if directed else scale / 2.0)
+    error_bound = None if exact else float(np.sqrt(np.log(2 * n / delta) / (2 * k)) * n / (n - 1))
+
+    return BetweennessResult(scores, normalized, k, exact, error_bound)
+
+
+#===========================================================
+# 连通分量
+#===========================================================
+
+def connected_component_labels(n: int, sources: np.ndarray, targets: np.ndarray) -> np.ndarray:
+    """
+    弱连通分量标签（向量化并查集）
+
+    每轮把每条边两端的根挂到较小的根上（minimum.at），再做指针跳跃
+    压缩路径，直到所有边两端同根。安装了 scipy 时直接使用
+    scipy.sparse.csgraph.connected_components。
+
+    Args:
+        n: 节点数
+        sources: 边的一端
+        targets: 边的另一端
+
+    Returns:
+        每个节点的分量编号（0..c-1，按分量内最小节点编号排序）
+    """
+    sources = np.asarray(sources, dtype=np.int64)
+    targets = np.asarray(targets, dtype=np.int64)
+
+    if SCIPY_AVAILABLE:
+        import scipy.sparse as sp
+        from scipy.sparse.csgraph import connected_components
+        graph = sp.coo_matrix((np.ones(len(sources), dtype=np.int8), (sources, targets)), shape=(n, n))
+        _, labels = connected_components(graph, directed=True, connection="weak")
+        return labels.astype(np.int64)
+
+    parent = np.arange(n, dtype=np.int64)
+    while True:
+        root_s, root_t = parent[sources], parent[targets]
+        differ = root_s != root_t
+        if not differ.any():
+            break
+        root_s, root_t = root_s[differ], root_t[differ]
+        np.minimum.at(parent, np.maximum(root_s, root_t), np.minimum(root_s, root_t))
+        # 指针跳跃，直到每个节点直接指向根
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                break
+            parent = grandparent
+        sources, targets = sources[differ], targets[differ]
+
+    _, labels = np.unique(parent, return_inverse=True)
+    return labels.astype(np.int64)
+
+
+#===========================================================
+# Louvain / Leiden
+#===========================================================
+
+@dataclass
+class LouvainResult:
+    """Louvain 结果"""
+    levels: List[np.ndarray]        # 每层原始节点的社区编号（最后一层为最终结果）
+    modularity: List[float]         # 每层的模块度
+
+    @property
+    def membership(self) -> np.ndarray:
+        return self.levels[-1]
+
+
+def _symmetric_edges(projection: GraphProjection, edge_weights: Optional[np.ndarray]):
+    """无向加权边（A = W + Wᵀ，自环计两次），权重为 0 的边被忽略"""
+    weights = projection.out_weights if edge_weights is None else np.asarray(edge_weights)
+    weights = weights.astype(np.float64)
+    keep = weights > 0
+    sources = projection.edge_sources()[keep].astype(np.int64)
+    targets = projection.out_indices[keep].astype(np.int64)
+    weights = weights[keep]
+    return (
+        np.concatenate([sources, targets]),
+        np.concatenate([targets, sources]),
+        np.concatenate([weights, weights])
+    )
+
+
+def _sum_by_pairs(rows: np.ndarray, cols: np.ndarray, weights: np.ndarray, n_rows: int, n_cols: int):
+    """按 (row, col) 合并权重，结果按行排序"""
+    if SCIPY_AVAILABLE:
+        import scipy.sparse as sp
+        matrix = sp.csr_matrix((weights, (rows, cols)), shape=(n_rows, n_cols))
+        matrix.sum_duplicates()
+        counts = np.diff(matrix.indptr)
+        return (
+            np.repeat(np.arange(n_rows, dtype=np.int64), counts),
+            matrix.indices.astype(np.int64),
+            matrix.data
+        )
+    keys, inverse = np.unique(rows * n_cols + cols, return_inverse=True)
+    return keys // n_cols, keys % n_cols, np.bincount(inverse, weights=weights)
+
+
+def modularity(
+    membership: np.ndarray,
+    rows: np.ndarray,
+    cols: np.ndarray,
+    weights: np.ndarray,
+    resolution: float = 1.0
+) -> float:
+    """
+    加权无向图的模块度
+
+    Args:
+        membership: 节点社区编号
+        rows, cols, weights: 对称边列表
+        resolution: 分辨率参数
+
+    Returns:
+        模块度 Q
+    """
+    total = weights.sum()
+    if total == 0:
+        return 0.0
+    communities = int(membership.max()) + 1 if len(membership) else 0
+    inside = np.bincount(
+        membership[rows], weights=weights * (membership[rows] == membership[cols]), minlength=communities
+    )
+    degree = np.bincount(rows, weights=weights, minlength=len(membership))
+    strength = np.bincount(membership, weights=degree, minlength=communities)
+    return float(inside.sum() / total - resolution * np.sum((strength / total) ** 2))
+
+
+def color_classes(n: int, rows: np.ndarray, cols: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """
+    Jones-Plassmann 并行顶点着色
+
+    每轮随机优先级高于所有未着色邻居的节点组成一个独立集并获得同一颜色，
+    同色节点互不相邻。
+
+    Args:
+        n: 节点数
+        rows, cols: 边列表（自环被忽略）
+        rng: 随机数生成器
+
+    Returns:
+        每个节点的颜色编号（从 0 开始）
+    """
+    colors = np.full(n, -1, dtype=np.int64)
+    priority = rng.permutation(n)
+    keep = rows != cols
+    rows, cols = rows[keep], cols[keep]
+
+    remaining = np.arange(n, dtype=np.int64)
+    beaten = np.full(n, -1, dtype=np.int64)     # 被更高优先级邻居压过的轮次
+    color = 0
+    while len(remaining):
+        beaten[np.where(priority[rows] < priority[cols], rows, cols)] = color
+        lost = beaten[remaining] == color
+        colors[remaining[~lost]] = color
+        remaining = remaining[lost]
+        active = (colors[rows] < 0) & (colors[cols] < 0)
+        rows, cols = rows[active], cols[active]
+        color += 1
+    return colors
+
+
+def _best_moves(
+    nodes: np.ndarray,
+    rows: np.ndarray,
+    cols: np.ndarray,
+    weights: np.ndarray,
+    membership: np.ndarray,
+    degree: np.ndarray,
+    strength: np.ndarray,
+    scale: float
+):
+    """
+    计算一组互不相邻节点的最优移动
+
+    Args:
+        nodes: 节点（升序）
+        rows, cols, weights: 这些节点的出边（rows 为 nodes 中的位置）
+        membership: 当前社区
+        degree: 节点度（加权）
+        strength: 社区总度
+        scale: resolution / 总权重
+
+    Returns:
+        (移动的节点, 目标社区, 模块度增益×总权重)
+    """
+    position, community, w = _sum_by_pairs(rows, membership[cols], weights, len(nodes), len(membership))
+    node = nodes[position]
+    own = membership[node] == community
+    gain = w - scale * degree[node] * (strength[community] - np.where(own, degree[node], 0.0))
+
+    # 留在原社区的得分（原社区中没有邻居时连接权重为 0），按 nodes 中的位置索引
+    stay = -scale * degree[nodes] * (strength[membership[nodes]] - degree[nodes])
+    stay[position[own]] = gain[own]
+
+    # 每个节点增益最大的其他社区（并列时取编号最小的社区）
+    candidate = ~own
+    position, community, gain = position[candidate], community[candidate], gain[candidate]
+    if not len(position):
+        return nodes[position], community, gain
+    starts = np.flatnonzero(np.r_[True, position[1:] != position[:-1]])
+    row_max = np.maximum.reduceat(gain, starts)
+    at_max = np.flatnonzero(gain == np.repeat(row_max, np.diff(np.r_[starts, len(position)])))
+    at_max = at_max[np.r_[True, position[at_max][1:] != position[at_max][:-1]]]
+    position, community, gain = position[at_max], community[at_max], gain[at_max]
+
+    improvement = gain - stay[position]
+    improving = improvement > 1e-12
+    return nodes[position[improving]], community[improving], improvement[improving]
+
+
+def _local_moving(
+    membership: np.ndarray,
+    rows: np.ndarray,
+    cols: np.ndarray,
+    weights: np.ndarray,
+    resolution: float,
+    rng: np.random.Generator,
+    max_iterations: int,
+    tolerance: float
+) -> np.ndarray:
+    """
+    按颜色分批的局部移动
+
+    节点先着色，每轮依次处理各颜色类：同色节点互不相邻，可以同时移动到各自
+    增益最大的社区，后处理的颜色类能看到先前的移动（与逐点 Louvain 的行为一致）。
+    一轮的模块度提升不超过 tolerance 时停止。
+    """
+    n = len(membership)
+    degree = np.bincount(rows, weights=weights, minlength=n)
+    total = weights.sum()
+    if total == 0:
+        return membership
+    scale = resolution / total
+
+    keep = rows != cols
+    rows, cols, weights = rows[keep], cols[keep], weights[keep]
+
+    # 节点按 (颜色, 编号) 排序，边按同样的顺序排列，每个节点的边是连续的一段
+    upper = rows < cols
+    colors = color_classes(n, rows[upper], cols[upper], rng)
+    color_count = int(colors.max()) + 1 if n else 0
+    node_order = np.argsort(colors, kind='stable')
+    node_bounds = np.searchsorted(colors[node_order], np.arange(color_count + 1))
+    rank = np.empty(n, dtype=np.int64)
+    rank[node_order] = np.arange(n)
+    order = np.argsort(rank[rows], kind='stable')
+    cols, weights = cols[order], weights[order]
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=n)[node_order], out=indptr[1:])
+    edge_ids = np.arange(len(cols))
+
+    # 只重新考察邻居社区发生变化的节点
+    active = np.ones(n, dtype=bool)
+    membership = membership.copy()
+    strength = np.bincount(membership, weights=degree, minlength=n)
+    for _ in range(max_iterations):
+        improvement = 0.0
+        for color in range(color_count):
+            nodes = node_order[node_bounds[color]:node_bounds[color + 1]]
+            nodes = nodes[active[nodes]]
+            if not len(nodes):
+                continue
+            active[nodes] = False
+            local, edges = _expand(indptr, edge_ids, rank[nodes])
+            if not len(edges):
+                continue
+            local = np.searchsorted(rank[nodes], local)
+            moved, target, gain = _best_moves(
+                nodes, local, cols[edges], weights[edges],
+                membership, degree, strength, scale
+            )
+            if not len(moved):
+                continue
+            np.subtract.at(strength, membership[moved], degree[moved])
+            np.add.at(strength, target, degree[moved])
+            membership[moved] = target
+            active[_expand(indptr, cols, rank[moved])[1]] = True
+            improvement += 2 * gain.sum() / total
+        if improvement <= tolerance or not active.any():
+            break
+
+    return membership
+
+
+def louvain(
+    projection: GraphProjection,
+    edge_weights: Optional[np.ndarray] = None,
+    resolution: float = 1.0,
+    seed: int = 42,
+    max_levels: int = 10,
+    max_iterations: int = 50,
+    tolerance: float = 1e-7,
+    refine: bool = False
+) -> LouvainResult:
+    """
+    Louvain（refine=True 时为 Leiden 风格）社区检测
+
+    每层先做按颜色分批的局部移动，再把社区聚合为下一层的节点，直到社区数不再减少。
+    refine=True 时，聚合前把每个社区拆分为其内部的连通分量，聚合后的节点
+    以所属社区作为初始划分，保证最终社区内部连通（Leiden 的连通性保证）。
+    关系方向被忽略；同一随机种子结果可复现。
+
+    Args:
+        projection: 图投影
+        edge_weights: CSR 边权重（默认 projection.out_weights）
+        resolution: 分辨率（越大社区越小）
+        seed: 随机种子
+        max_levels: 最大层数
+        max_iterations: 每层局部移动的最大轮数
+        tolerance: 模块度提升阈值
+        refine: 是否使用连通分量细化
+
+    Returns:
+        各层划分和模块度
+    """
+    rng = np.random.default_rng(seed)
+    base_edges = _symmetric_edges(projection, edge_weights)
+    rows, cols, weights = base_edges
+    n = projection.node_count
+
+    node_membership = np.arange(n, dtype=np.int64)    # 原始节点 → 当前层节点
+    membership = np.arange(n, dtype=np.int64)         # 当前层节点 → 社区
+    levels: List[np.ndarray] = []
+    scores: List[float] = []
+
+    for _ in range(max_levels):
+        level_nodes = len(membership)
+        membership = _local_moving(
+            membership, rows, cols, weights, resolution, rng, max_iterations, tolerance
+        )
+        _, membership = np.unique(membership, return_inverse=True)
+        membership = membership.astype(np.int64)
+        if levels and int(membership.max()) + 1 == level_nodes:
+            break
+
+        levels.append(membership[node_membership])
+        scores.append(modularity(levels[-1], *base_edges, resolution))
+
+        if refine:
+            # 社区内部的连通分量成为下一层的节点
+            inside = membership[rows] == membership[cols]
+            aggregate = connected_component_labels(level_nodes, rows[inside], cols[inside])
+            next_membership = np.zeros(int(aggregate.max()) + 1 if level_nodes else 0, dtype=np.int64)
+            next_membership[aggregate] = membership
+        else:
+            aggregate = membership
+            next_membership = None
+
+        aggregate_nodes = int(aggregate.max()) + 1 if level_nodes else 0
+        if aggregate_nodes == level_nodes:
+            break
+
+        rows, cols, weights = _sum_by_pairs(aggregate[rows], aggregate[cols], weights, aggregate_nodes, aggregate_nodes)
+        node_membership = aggregate[node_membership]
+        membership = (
+            next_membership if next_membership is not None
+            else np.arange(aggregate_nodes, dtype=np.int64)
+        )
+
+        if not refine and len(levels) > 1 and scores[-1] - scores[-2] <= tolerance:
+            break
+
+    return LouvainResult(levels, scores)
+
+
+#===========================================================
+# 标签传播
+#===========================================================
+
+@dataclass
+class LabelPropagationResult:
+    """标签传播结果"""
+    labels: np.ndarray      # 每个节点的社区编号（0..c-1）
+    iterations: int
+    converged: bool
+
+
+def _dominant_labels(
+    nodes: np.ndarray,
+    rows: np.ndarray,
+    cols: np.ndarray,
+    weights: np.ndarray,
+    labels: np.ndarray
+) -> np.ndarray:
+    """
+    一组节点的邻居中权重最大的标签
+
+    并列时优先保留当前标签，否则取编号最小的标签；没有邻居的节点保持原标签。
+
+    Args:
+        nodes: 节点（升序）
+        rows, cols, weights: 这些节点的边（rows 为 nodes 中的位置）
+        labels: 当前标签
+
+    Returns:
+        nodes 的新标签
+    """
+    result = labels[nodes].copy()
+    position, label, w = _sum_by_pairs(rows, labels[cols], weights, len(nodes), len(labels))
+    if not len(position):
+        return result
+
+    starts = np.flatnonzero(np.r_[True, position[1:] != position[:-1]])
+    row_max = np.maximum.reduceat(w, starts)
+    at_max = w >= np.repeat(row_max, np.diff(np.r_[starts, len(position)])) * (1 - 1e-12)
+
+    position, label = position[at_max], label[at_max]
+    first = np.r_[True, position[1:] != position[:-1]]
+    result[position[first]] = label[first]
+    current = label == labels[nodes][position]
+    result[position[current]] = label[current]
+    return result
+
+
+def label_propagation(
+    projection: GraphProjection,
+    edge_weights: Optional[np.ndarray] = None,
+    max_iterations: int = 10,
+    synchronous: bool = False,
+    seed: int = 42,
+    tolerance: float = 0.0
+) -> LabelPropagationResult:
+    """
+    标签传播社区检测
+
+    每个节点取邻居中（按边权重）最常见的标签。synchronous=True 时所有节点
+    同时更新；否则按顶点着色分批更新（同色节点互不相邻，后处理的颜色类能
+    看到先前的更新），避免同步更新在二分结构上来回振荡。
+    一轮中改变标签的节点比例不超过 tolerance 时提前停止。关系方向被忽略。
+
+    Args:
+        projection: 图投影
+        edge_weights: CSR 边权重（默认 projection.out_weights）
+        max_iterations: 最大轮数
+        synchronous: 是否同步更新
+        seed: 随机种子（着色顺序）
+        tolerance: 提前停止的标签变化比例
+
+    Returns:
+        标签传播结果
+    """
+    n = projection.node_count
+    rows, cols, weights = _symmetric_edges(projection, edge_weights)
+    keep = rows != cols
+    rows, cols, weights = rows[keep], cols[keep], weights[keep]
+
+    if synchronous:
+        batches = [np.arange(n, dtype=np.int64)]
+    else:
+        upper = rows < cols
+        colors = color_classes(n, rows[upper], cols[upper], np.random.default_rng(seed))
+        order = np.argsort(colors, kind='stable')
+        bounds = np.searchsorted(colors[order], np.arange(int(colors.max()) + 2 if n else 1))
+        batches = [order[bounds[c]:bounds[c + 1]] for c in range(len(bounds) - 1)]
+
+    # 边按起点排序，每个节点的边是连续的一段
+    order = np.argsort(rows, kind='stable')
+    cols, weights = cols[order], weights[order]
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+    edge_ids = np.arange(len(cols))
+
+    # 只重新计算邻居标签发生变化的节点
+    active = np.ones(n, dtype=bool)
+    labels = np.arange(n, dtype=np.int64)
+    converged = False
+    iterations = 0
+    for iterations in range(1, max_iterations + 1):
+        updated = labels.copy() if synchronous else labels
+        changed = 0
+        for nodes in batches:
+            nodes = nodes[active[nodes]]
+            if not len(nodes):
+                continue
+            active[nodes] = False
+            local, edges = _expand(indptr, edge_ids, nodes)
+            if not len(edges):
+                continue
+            local = np.searchsorted(nodes, local)
+            new = _dominant_labels(nodes, local, cols[edges], weights[edges], labels)
+            moved = nodes[new != labels[nodes]]
+            updated[nodes] = new
+            active[_expand(indptr, cols, moved)[1]] = True
+            changed += len(moved)
+        labels = updated
+        if changed <= tolerance * n:
+            converged = True
+            break
+
+    _, labels = np.unique(labels, return_inverse=True)
+    return LabelPropagationResult(labels.astype(np.int64), iterations, converged)
@@ -0,0 +1,728 @@
+#===========================================================
+# PharmaKG - 知识图谱嵌入
+# Pharmaceutical Knowledge Graph - Knowledge Graph Embeddings
+#===========================================================
+# 版本: v1.0
+# 描述: TransE / DistMult / ComplEx 小批量训练（负采样、
+#       Adagrad/Adam、可选 Hogwild 多进程）和过滤式链接预测评估
+#===========================================================
+
+import logging
+import os
+import queue
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .embedding_store import EmbeddingStore, IdTable
+from .embeddings import EmbeddingType, NodeEmbeddingModel
+from .projection import ProjectionCache
+
+logger = logging.getLogger(__name__)
+
+KG_MODEL_TYPES = (EmbeddingType.TRANSE, EmbeddingType.DISTMULT, EmbeddingType.COMPLEX)
+
+
+#===========================================================
+# 打分函数及其梯度
+#===========================================================
+# ComplEx 向量按 [实部 | 虚部] 存储，维度为 2 * rank
+
+def _halves(x: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    half = x.shape[-1] // 2
+    return x[..., :half], x[..., half:]
+
+
+def score_triples(model_type: EmbeddingType, h: np.ndarray, r: np.ndarray, t: np.ndarray) -> np.ndarray:
+    """
+    逐行计算三元组分数（越大越可信）
+
+    TransE 为 -||h + r - t||，DistMult 为 <h, r, t>，
+    ComplEx 为 Re(<h, r, conj(t)>)。
+    """
+    if model_type == EmbeddingType.TRANSE:
+        return -np.linalg.norm(h + r - t, axis=-1)
+    if model_type == EmbeddingType.DISTMULT:
+        return np.sum(h * r * t, axis=-1)
+    hr, hi = _halves(h)
+    rr, ri = _halves(r)
+    tr, ti = _halves(t)
+    return np.sum(hr * rr * tr + hi * rr * ti + hr * ri * ti - hi * ri * tr, axis=-1)
+
+
+def _score_gradients(
+    model_type: EmbeddingType,
+    h: np.ndarray,
+    r: np.ndarray,
+    t: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """分数对 h、r、t 的梯度"""
+    if model_type == EmbeddingType.TRANSE:
+        diff = h + r - t
+        norm = np.linalg.norm(diff, axis=-1, keepdims=True)
+        unit = diff / np.maximum(norm, 1e-9)
+        return -unit, -unit, unit
+    if model_type == EmbeddingType.DISTMULT:
+        return r * t, h * t, h * r
+    hr, hi = _halves(h)
+    rr, ri = _halves(r)
+    tr, ti = _halves(t)
+    grad_h = np.concatenate([rr * tr + ri * ti, rr * ti - ri * tr], axis=-1)
+    grad_r = np.concatenate([hr * tr + hi * ti, hr * ti - hi * tr], axis=-1)
+    grad_t = np.concatenate([hr * rr - hi * ri, hi * rr + hr * ri], axis=-1)
+    return grad_h, grad_r, grad_t
+
+
+def score_all_entities(
+    model_type: EmbeddingType,
+    entities: np.ndarray,
+    anchors: np.ndarray,
+    relations: np.ndarray,
+    side: str = "tail",
+    entity_norms: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    一次矩阵乘法对所有候选实体打分
+
+    Args:
+        model_type: 模型类型
+        entities: 实体矩阵（n x d）
+        anchors: 已知端实体向量（B x d，side 为 tail 时是头实体）
+        relations: 关系向量（B x d）
+        side: 预测尾实体（tail）或头实体（head）
+        entity_norms: 实体模长的平方（TransE 用，可预先计算）
+
+    Returns:
+        B x n 分数矩阵
+    """
+    if model_type == EmbeddingType.TRANSE:
+        query = anchors + relations if side == "tail" else anchors - relations
+        if entity_norms is None:
+            entity_norms = np.einsum("ij,ij->i", entities, entities)
+        squared = np.einsum("ij,ij->i", query, query)[:, None] + entity_norms[None, :] - 2 * (query @ entities.T)
+        return -np.sqrt(np.maximum(squared, 0.0))
+    if model_type == EmbeddingType.DISTMULT:
+        return (anchors * relations) @ entities.T
+
+    ar, ai = _halves(anchors)
+    rr, ri = _halves(relations)
+    if side == "tail":
+        query = np.concatenate([ar * rr - ai * ri, ar * ri + ai * rr], axis=1)
+    else:
+        query = np.concatenate([rr * ar + ri * ai, rr * ai - ri * ar], axis=1)
+    return query @ entities.T
+
+
+def _sum_rows(indices: np.ndarray, grads: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """按行号合并梯度，返回 (去重行号, 梯度和)"""
+    order = np.argsort(indices, kind="stable")
+    ordered = indices[order]
+    starts = np.flatnonzero(np.r_[True, ordered[1:] != ordered[:-1]])
+    return ordered[starts], np.add.reduceat(grads[order], starts, axis=0)
+
+
+def _ranges(lo: np.ndarray, hi: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """展开区间 [lo[i], hi[i])，返回 (所属区间编号, 位置)"""
+    counts = hi - lo
+    owners = np.repeat(np.arange(len(lo)), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    return owners, lo[owners] + offsets
+
+
+#===========================================================
+# 稀疏优化器（只更新本批涉及的行）
+#===========================================================
+
+class _RowOptimizer:
+    """按行更新的 Adagrad / Adam；状态数组可位于共享内存"""
+
+    def __init__(
+        self,
+        name: str,
+        learning_rate: float,
+        states: Dict[str, np.ndarray],
+        beta1: float = 0.9,
+        beta2: float = 0.999,
+        epsilon: float = 1e-8
+    ):
+        self.name = name
+        self.learning_rate = learning_rate
+        self.states = states
+        self.beta1 = beta1
+        self.beta2 = beta2
+        self.epsilon = epsilon
+        self.steps = 0
+
+    @staticmethod
+    def state_names(name: str) -> Tuple[str, ...]:
+        return ("sum_squares",) if name == "adagrad" else ("first_moment", "second_moment")
+
+    def step(self, key: str, params: np.ndarray, rows: np.ndarray, grads: np.ndarray):
+        if self.name == "adagrad":
+            sum_squares = self.states[f"{key}.sum_squares"]
+            sum_squares[rows] += grads ** 2
+            params[rows] -= self.learning_rate * grads / (np.sqrt(sum_squares[rows]) + self.epsilon)
+            return
+
+        # 惰性 Adam：未出现在本批的行不衰减动量
+        first = self.states[f"{key}.first_moment"]
+        second = self.states[f"{key}.second_moment"]
+        first[rows] = self.beta1 * first[rows] + (1 - self.beta1) * grads
+        second[rows] = self.beta2 * second[rows] + (1 - self.beta2) * grads ** 2
+        correction = np.sqrt(1 - self.beta2 ** self.steps) / (1 - self.beta1 ** self.steps)
+        params[rows] -= self.learning_rate * correction * first[rows] / (np.sqrt(second[rows]) + self.epsilon)
+
+
+#===========================================================
+# 训练循环
+#===========================================================
+
+class _KGTrainer:
+    """
+    小批量训练器
+
+    每个正例采样 negatives 个负例（随机替换头或尾实体），
+    损失为间隔损失或自对抗负采样损失，梯度按行合并后稀疏更新。
+    """
+
+    def __init__(
+        self,
+        model_type: EmbeddingType,
+        arrays: Dict[str, np.ndarray],
+        triples: np.ndarray,
+        config: Dict[str, Any]
+    ):
+        self.model_type = model_type
+        self.arrays = arrays
+        self.entities = arrays["entities"]
+        self.relations = arrays["relations"]
+        self.triples = triples
+        self.config = config
+        self.optimizer = _RowOptimizer(config["optimizer"], config["learning_rate"], arrays)
+
+    def _loss_gradients(self, positive: np.ndarray, negative: np.ndarray) -> Tuple[float, np.ndarray, np.ndarray]:
+        """返回 (批平均损失, dL/d 正例分数, dL/d 负例分数)"""
+        batch = len(positive)
+        margin = self.config["margin"]
+        if self.config["loss"] == "margin":
+            violation = margin - positive[:, None] + negative
+            active = violation > 0
+            loss = float(np.sum(violation[active])) / batch
+            return loss, -active.sum(axis=1) / batch, active / batch
+
+        # 自对抗负采样：负例按 softmax(alpha * 分数) 加权（权重不参与求导）
+        shift = margin if self.model_type == EmbeddingType.TRANSE else 0.0
+        positive = positive + shift
+        negative = negative + shift
+        logits = self.config["adversarial_temperature"] * negative
+        weights = np.exp(logits - logits.max(axis=1, keepdims=True))
+        weights /= weights.sum(axis=1, keepdims=True)
+        log_sigmoid_pos = -np.logaddexp(0, -positive)
+        log_sigmoid_neg = -np.logaddexp(0, negative)
+        loss = float(-np.sum(log_sigmoid_pos) - np.sum(weights * log_sigmoid_neg)) / batch
+        grad_positive = -(1 - np.exp(log_sigmoid_pos)) / batch
+        grad_negative = weights * (1 - np.exp(log_sigmoid_neg)) / batch
+        return loss, grad_positive, grad_negative
+
+    def train_batch(self, batch: np.ndarray, rng: np.random.Generator) -> float:
+        """训练一个批次，返回批平均损失"""
+        heads, rels, tails = batch[:, 0], batch[:, 1], batch[:, 2]
+        size, negatives = len(batch), self.config["negatives"]
+        n_entities = len(self.entities)
+
+        # 负例：每个正例的每个负例随机替换头或尾
+        neg_heads = np.repeat(heads, negatives)
+        neg_tails = np.repeat(tails, negatives)
+        neg_rels = np.repeat(rels, negatives)
+        corrupt = rng.integers(0, n_entities, size=size * negatives)
+        replace_head = rng.random(size * negatives) < 0.5
+        neg_heads = np.where(replace_head, corrupt, neg_heads)
+        neg_tails = np.where(replace_head, neg_tails, corrupt)
+
+        all_heads = np.concatenate([heads, neg_heads])
+        all_rels = np.concatenate([rels, neg_rels])
+        all_tails = np.concatenate([tails, neg_tails])
+        h = self.entities[all_heads]
+        r = self.relations[all_rels]
+        t = self.entities[all_tails]
+        scores = score_triples(self.model_type, h, r, t)
+
+        loss, grad_pos, grad_neg = self._loss_gradients(scores[:size], scores[size:].reshape(size, negatives))
+        grad_scores = np.concatenate([grad_pos, grad_neg.ravel()])[:, None].astype(np.float32)
+        grad_h, grad_r, grad_t = _score_gradients(self.model_type, h, r, t)
+        grad_h *= grad_scores
+        grad_r *= grad_scores
+        grad_t *= grad_scores
+
+        regularization = self.config["regularization"]
+        if regularization > 0:
+            grad_h[:size] += 2 * regularization * h[:size] / size
+            grad_r[:size] += 2 * regularization * r[:size] / size
+            grad_t[:size] += 2 * regularization * t[:size] / size
+
+        self.optimizer.steps += 1
+        entity_rows, entity_grads = _sum_rows(
+            np.concatenate([all_heads, all_tails]), np.concatenate([grad_h, grad_t])
+        )
+        relation_rows, relation_grads = _sum_rows(all_rels, grad_r)
+        self.optimizer.step("entities", self.entities, entity_rows, entity_grads)
+        self.optimizer.step("relations", self.relations, relation_rows, relation_grads)
+
+        # TransE 约束实体向量在单位球内
+        if self.model_type == EmbeddingType.TRANSE:
+            norms = np.linalg.norm(self.entities[entity_rows], axis=1, keepdims=True)
+            self.entities[entity_rows] /= np.maximum(norms, 1.0)
+        return loss
+
+    def train_epoch(self, rows: np.ndarray, rng: np.random.Generator) -> float:
+        """打乱 rows 指定的三元组并逐批训练，返回各批损失的平均值"""
+        order = rows[rng.permutation(len(rows))]
+        batch_size = self.config["batch_size"]
+        losses = [
+            self.train_batch(self.triples[order[start:start + batch_size]], rng)
+            for start in range(0, len(order), batch_size)
+        ]
+        return float(np.mean(losses)) if losses else 0.0
+
+
+def _shared_array(shape: Tuple[int, ...], initial: Optional[np.ndarray] = None):
+    """在共享内存中分配 float32 数组，返回 (RawArray, ndarray 视图)"""
+    import multiprocessing as mp
+
+    buffer = mp.RawArray("f", int(np.prod(shape)))
+    array = np.frombuffer(buffer, dtype=np.float32).reshape(shape)
+    if initial is not None:
+        array[:] = initial
+    return buffer, array
+
+
+def _hogwild_worker(buffers, shapes, model_type, triples, rows, config, epochs, seed, losses):
+    """Hogwild 工作进程：在共享参数上无锁训练自己的分片"""
+    arrays = {
+        key: np.frombuffer(buffers[key], dtype=np.float32).reshape(shapes[key])
+        for key in buffers
+    }
+    trainer = _KGTrainer(model_type, arrays, triples, config)
+    rng = np.random.default_rng(np.random.SeedSequence(seed))
+    for epoch in range(epochs):
+        losses.put((epoch, trainer.train_epoch(rows, rng)))
+
+
+#===========================================================
+# 模型
+#===========================================================
+
+class KGEmbeddingModel(NodeEmbeddingModel):
+    """
+    知识图谱嵌入模型
+
+    从图投影取 (头实体, 关系类型, 尾实体) 三元组训练 TransE / DistMult /
+    ComplEx。实体向量同时作为节点嵌入，可直接用于 SimilarityEngine；
+    关系向量和训练三元组与实体存储一起保存。
+    """
+
+    def __init__(
+        self,
+        neo4j_driver,
+        embedding_dim: int = 100,
+        model_type: EmbeddingType = EmbeddingType.TRANSE,
+        projections: Optional[ProjectionCache] = None
+    ):
+        """
+        初始化知识图谱嵌入模型
+
+        Args:
+            neo4j_driver: Neo4j 数据库驱动
+            embedding_dim: 嵌入维度（ComplEx 为实部和虚部之和，须为偶数）
+            model_type: TransE、DistMult 或 ComplEx
+            projections: 图投影缓存（默认使用驱动共享的缓存）
+        """
+        model_type = EmbeddingType(model_type)
+        if model_type not in KG_MODEL_TYPES:
+            raise ValueError(f"Unsupported knowledge graph embedding type: {model_type}")
+        if model_type == EmbeddingType.COMPLEX and embedding_dim % 2:
+            raise ValueError("ComplEx requires an even embedding_dim")
+        super().__init__(neo4j_driver, embedding_dim, model_type, projections)
+
+        self.entity_ids: Optional[IdTable] = None
+        self.entity_matrix: Optional[np.ndarray] = None
+        self.entity_type_codes: Optional[np.ndarray] = None
+        self.entity_type_names: List[Optional[str]] = []
+        self.relation_names: List[str] = []
+        self.relation_matrix: Optional[np.ndarray] = None
+        self.triples: Optional[np.ndarray] = None
+        self.test_triples: Optional[np.ndarray] = None
+        self._filters: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+
+    def train(
+        self,
+        labels: Optional[List[str]] = None,
+        relationship_types: Optional[List[str]] = None,
+        epochs: int = 100,
+        batch_size: int = 1024,
+        learning_rate: float = 0.01,
+        negatives: int = 16,
+        margin: float = 1.0,
+        loss: str = "margin",
+        adversarial_temperature: float = 1.0,
+        optimizer: str = "adagrad",
+        regularization: float = 0.0,
+        test_fraction: float = 0.0,
+        workers: int = 1,
+        seed: int = 42
+    ) -> Dict[str, Any]:
+        """
+        训练知识图谱嵌入
+
+        Args:
+            labels: 节点标签列表
+            relationship_types: 关系类型列表
+            epochs: 训练轮数
+            batch_size: 每批正例数
+            learning_rate: 学习率
+            negatives: 每个正例的负例数
+            margin: 间隔（自对抗损失中为 TransE 的 gamma）
+            loss: margin（间隔损失）或 adversarial（自对抗负采样损失）
+            adversarial_temperature: 自对抗负例权重的温度
+            optimizer: adagrad 或 adam
+            regularization: L2 正则系数（作用于正例涉及的向量）
+            test_fraction: 留作评估的三元组比例
+            workers: Hogwild 进程数（1 为单进程）
+            seed: 随机种子
+
+        Returns:
+            训练统计信息
+        """
+        start_time = time.time()
+
+        try:
+            if loss not in ("margin", "adversarial"):
+                raise ValueError(f"Unknown loss: {loss}")
+            if optimizer not in ("adagrad", "adam"):
+                raise ValueError(f"Unknown optimizer: {optimizer}")
+
+            projection = self.projections.get(labels, relationship_types)
+            triples = np.stack([
+                projection.edge_sources(), projection.out_types, projection.out_indices
+            ], axis=1).astype(np.int64)
+            if not len(triples):
+                raise ValueError("No triples in the selected subgraph")
+
+            rng = np.random.default_rng(seed)
+            order = rng.permutation(len(triples))
+            n_test = int(len(triples) * test_fraction)
+            self.triples = triples
+            self.test_triples = triples[order[:n_test]]
+            train_rows = np.sort(order[n_test:])
+            self._filters = {}
+
+            n_entities, n_relations = projection.node_count, len(projection.relationship_types)
+            bound = 6 / np.sqrt(self.embedding_dim)
+            initial = {
+                "entities": rng.uniform(-bound, bound, (n_entities, self.embedding_dim)).astype(np.float32),
+                "relations": rng.uniform(-bound, bound, (n_relations, self.embedding_dim)).astype(np.float32)
+            }
+            if self.model_type == EmbeddingType.TRANSE:
+                for key in initial:
+                    initial[key] /= np.linalg.norm(initial[key], axis=1, keepdims=True)
+            shapes = {key: value.shape for key, value in initial.items()}
+            for key in initial:
+                for state in _RowOptimizer.state_names(optimizer):
+                    shapes[f"{key}.{state}"] = initial[key].shape
+
+            config = {
+                "batch_size": batch_size,
+                "learning_rate": learning_rate,
+                "negatives": negatives,
+                "margin": margin,
+                "loss": loss,
+                "adversarial_temperature": adversarial_temperature,
+                "optimizer": optimizer,
+                "regularization": regularization
+            }
+
+            if workers > 1:
+                history, arrays = self._train_hogwild(initial, shapes, triples, train_rows, config, epochs, workers, seed)
+            else:
+                arrays = {key: initial.get(key, np.zeros(shape, dtype=np.float32)) for key, shape in shapes.items()}
+                trainer = _KGTrainer(self.model_type, arrays, triples, config)
+                history = [trainer.train_epoch(train_rows, rng) for _ in range(epochs)]
+
+            self.entity_matrix = np.array(arrays["entities"])
+            self.relation_matrix = np.array(arrays["relations"])
+            self.entity_ids = IdTable.build(projection.primary_ids)
+            self.entity_type_names = list(projection.label_names) or [None]
+            self.entity_type_codes = projection.node_labels.astype(np.int32)
+            self.relation_names = list(projection.relationship_types)
+
+            # 实体向量即节点嵌入（与 NodeEmbeddingModel 接口一致）
+            self.embeddings = dict(zip(projection.primary_ids, self.entity_matrix))
+            self.node_types = {
+                node_id: projection.node_label(index)
+                for index, node_id in enumerate(projection.primary_ids)
+            }
+            self.graph_version = projection.version
+            self._index = None
+            self._index_dir = None
+
+            return {
+                "success": True,
+                "training_time_seconds": time.time() - start_time,
+                "model_type": self.model_type.value,
+                "num_entities": n_entities,
+                "num_relations": n_relations,
+                "num_train_triples": len(train_rows),
+                "num_test_triples": n_test,
+                "epochs": epochs,
+                "loss_history": history
+            }
+
+        except Exception as e:
+            logger.error(f"Knowledge graph embedding training failed: {e}")
+            return {
+                "success": False,
+                "error": str(e)
+            }
+
+    def _train_hogwild(
+        self,
+        initial: Dict[str, np.ndarray],
+        shapes: Dict[str, Tuple[int, ...]],
+        triples: np.ndarray,
+        train_rows: np.ndarray,
+        config: Dict[str, Any],
+        epochs: int,
+        workers: int,
+        seed: int
+    ) -> Tuple[List[float], Dict[str, np.ndarray]]:
+        """多进程无锁训练：参数和优化器状态放在共享内存，各进程训练一个分片"""
+        import multiprocessing as mp
+
+        buffers, arrays = {}, {}
+        for key, shape in shapes.items():
+            buffers[key], arrays[key] = _shared_array(shape, initial.get(key))
+
+        losses = mp.Queue()
+        shards = np.array_split(train_rows, workers)
+        processes = [
+            mp.Process(
+                target=_hogwild_worker,
+                args=(buffers, shapes, self.model_type, triples, shard, config, epochs, (seed, index), losses)
+            )
+            for index, shard in enumerate(shards)
+        ]
+        for process in processes:
+            process.start()
+
+        totals = np.zeros(epochs)
+        received = 0
+        while received < epochs * len(processes):
+            try:
+                epoch, value = losses.get(timeout=1.0)
+            except queue.Empty:
+                if any(process.exitcode not in (None, 0) for process in processes):
+                    for process in processes:
+                        process.terminate()
+                    raise RuntimeError("Hogwild worker failed")
+                continue
+            totals[epoch] += value
+            received += 1
+        for process in processes:
+            process.join()
+            if process.exitcode != 0:
+                raise RuntimeError(f"Hogwild worker exited with code {process.exitcode}")
+
+        return (totals / len(processes)).tolist(), arrays
+
+    #-------------------------------------------------------
+    # 链接预测
+    #-------------------------------------------------------
+
+    def _filter_index(self, side: str) -> Tuple[np.ndarray, np.ndarray]:
+        """已知三元组按 (实体, 关系) 排序的键和另一端实体，用于过滤式排名"""
+        if side not in self._filters:
+            anchor, other = (0, 2) if side == "tail" else (2, 0)
+            keys = self.triples[:, anchor] * len(self.relation_names) + self.triples[:, 1]
+            order = np.lexsort((self.triples[:, other], keys))
+            self._filters[side] = (keys[order], self.triples[order, other])
+        return self._filters[side]
+
+    def _known(self, anchors: np.ndarray, relations: np.ndarray, side: str) -> Tuple[np.ndarray, np.ndarray]:
+        """每个查询 (实体, 关系) 已知的另一端实体，返回 (查询编号, 实体编号)"""
+        keys, others = self._filter_index(side)
+        query_keys = anchors * len(self.relation_names) + relations
+        owners, positions = _ranges(
+            np.searchsorted(keys, query_keys, "left"), np.searchsorted(keys, query_keys, "right")
+        )
+        return owners, others[positions]
+
+    def _require_trained(self):
+        if self.entity_matrix is None:
+            raise ValueError("Model has not been trained or loaded")
+
+    def predict_links(
+        self,
+        head_id: str,
+        relation: str,
+        top_k: int = 10,
+        node_type: Optional[str] = None,
+        exclude_known: bool = True
+    ) -> List[Dict[str, Any]]:
+        """
+        预测 (head_id, relation, ?) 的尾实体
+
+        Args:
+            head_id: 头实体 ID
+            relation: 关系类型
+            top_k: 返回前 K 个结果
+            node_type: 只返回该类型的实体
+            exclude_known: 排除图中已有的尾实体
+
+        Returns:
+            候选尾实体列表（按分数降序）
+        """
+        self._require_trained()
+        head = self.entity_ids.row_of(head_id)
+        if head is None or relation not in self.relation_names:
+            return []
+        rel = self.relation_names.index(relation)
+
+        scores = score_all_entities(
+            self.model_type, self.entity_matrix,
+            self.entity_matrix[[head]], self.relation_matrix[[rel]], side="tail"
+        )[0]
+        scores[head] = -np.inf
+        if exclude_known and self.triples is not None:
+            _, known = self._known(np.array([head]), np.array([rel]), "tail")
+            scores[known] = -np.inf
+        if node_type is not None:
+            codes = [i for i, name in enumerate(self.entity_type_names) if name == node_type]
+            scores[~np.isin(self.entity_type_codes, codes)] = -np.inf
+
+        k = min(top_k, len(scores))
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best], kind="stable")]
+        return [
+            {
+                "node_id": self.entity_ids[row],
+                "score": float(scores[row]),
+                "node_type": self.entity_type_names[self.entity_type_codes[row]]
+            }
+            for row in best
+            if np.isfinite(scores[row])
+        ]
+
+    def evaluate(
+        self,
+        triples: Optional[np.ndarray] = None,
+        hits_at: Sequence[int] = (1, 3, 10),
+        filtered: bool = True,
+        memory_budget_mb: float = 256
+    ) -> Dict[str, Any]:
+        """
+        过滤式链接预测评估（头、尾两个方向）
+
+        对每个三元组给所有候选实体打分，过滤掉图中其他已知的正确答案后
+        计算正确实体的排名（同分取平均排名）。
+
+        Args:
+            triples: 编码后的 (头, 关系, 尾) 数组（默认训练时留出的测试三元组）
+            hits_at: 计算 Hits@k 的 k 值
+            filtered: 是否过滤已知三元组
+            memory_budget_mb: 每批分数矩阵的内存上限
+
+        Returns:
+            MRR、MR 和 Hits@k
+        """
+        self._require_trained()
+        triples = self.test_triples if triples is None else np.asarray(triples, dtype=np.int64)
+        if triples is None or not len(triples):
+            raise ValueError("No triples to evaluate")
+
+        n = len(self.entity_matrix)
+        norms = np.einsum("ij,ij->i", self.entity_matrix, self.entity_matrix)
+        batch_size = max(1, int(memory_budget_mb * 2 ** 20 // (8 * n)))
+        ranks = []
+
+        for side, anchor, target in (("tail", 0, 2), ("head", 2, 0)):
+            for start in range(0, len(triples), batch_size):
+                batch = triples[start:start + batch_size]
+                scores = score_all_entities(
+                    self.model_type, self.entity_matrix,
+                    self.entity_matrix[batch[:, anchor]], self.relation_matrix[batch[:, 1]],
+                    side=side, entity_norms=norms
+                )
+                rows = np.arange(len(batch))
+                target_scores = scores[rows, batch[:, target]].copy()
+                if filtered:
+                    owners, known = self._known(batch[:, anchor], batch[:, 1], side)
+                    scores[owners, known] = -np.inf
+                    scores[rows, batch[:, target]] = target_scores
+                greater = (scores > target_scores[:, None]).sum(axis=1)
+                ties = (scores == target_scores[:, None]).sum(axis=1) - 1
+                ranks.append(1 + greater + ties / 2)
+
+        ranks = np.concatenate(ranks)
+        result = {
+            "num_triples": len(triples),
+            "mrr": float(np.mean(1 / ranks)),
+            "mean_rank": float(np.mean(ranks)),
+            "filtered": filtered
+        }
+        for k in hits_at:
+            result[f"hits@{k}"] = float(np.mean(ranks <= k))
+        return result
+
+    #-------------------------------------------------------
+    # 持久化
+    #-------------------------------------------------------
+
+    @staticmethod
+    def relations_path(filepath: str) -> str:
+        return os.path.join(filepath, "relations")
+
+    def save(self, filepath: str, dtype: str = "float32"):
+        """
+        保存实体存储、关系存储（relations/）和三元组
+
+        Args:
+            filepath: 存储目录
+            dtype: 向量存储精度（float32 或 float16）
+        """
+        self._require_trained()
+        super().save(filepath, dtype=dtype)
+
+    def _write_directory(self, directory: str, dtype: str):
+        super()._write_directory(directory, dtype)
+        EmbeddingStore.write(
+            self.relations_path(directory), self.relation_names, self.relation_matrix,
+            model_type=self.model_type.value, graph_version=self.graph_version,
+            dtype="float32", atomic=False
+        )
+        np.save(os.path.join(directory, "triples.npy"), self.triples)
+        np.save(os.path.join(directory, "test_triples.npy"), self.test_triples)
+
+    def load(self, filepath: str, mmap: bool = True):
+        """
+        加载知识图谱嵌入模型
+
+        Args:
+            filepath: 存储目录
+            mmap: 是否以内存映射方式打开实体矩阵
+        """
+        super().load(filepath, mmap=mmap)
+        store = self.embeddings
+        # 关系和三元组取自与实体向量相同的版本目录
+        filepath = str(store.directory)
+        relations = EmbeddingStore.open(self.relations_path(filepath), mmap=False)
+
+        self.entity_ids = store.id_table
+        self.entity_matrix = store.matrix() if store.vectors.dtype != np.float32 else store.vectors
+        self.entity_type_names = store.type_names
+        self.entity_type_codes = np.asarray(store.type_codes)
+        self.relation_names = relations.ids
+        self.relation_matrix = relations.matrix()
+        self.triples = np.load(os.path.join(filepath, "triples.npy"), mmap_mode="r" if mmap else None)
+        self.test_triples = np.load(os.path.join(filepath, "test_triples.npy"))
+        self._filters = {}
@@ -0,0 +1,630 @@
+#===========================================================
+# PharmaKG - 图投影
+# Pharmaceutical Knowledge Graph - In-Memory Graph Projection
+#===========================================================
+# 版本: v1.0
+# 描述: 将带标签/关系类型过滤的子图一次性读入 NumPy CSR/CSC 数组，
+#       按 (标签, 关系类型, 图版本) 缓存，供各图算法共享
+#===========================================================
+
+import logging
+import re
+import threading
+import weakref
+from array import array
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+try:
+    import scipy.sparse as sp
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+
+# 允许直接拼入 Cypher 的标签/关系类型名
+_IDENTIFIER_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+ProjectionKey = Tuple[Optional[Tuple[str, ...]], Optional[Tuple[str, ...]], Optional[str]]
+
+
+def _quote_identifier(name: str) -> str:
+    """校验并转义标签/关系类型名"""
+    if not _IDENTIFIER_PATTERN.match(name):
+        raise ValueError(f"Invalid label or relationship type: {name!r}")
+    return f"`{name}`"
+
+
+def _normalize_names(names: Optional[Iterable[str]]) -> Optional[Tuple[str, ...]]:
+    if not names:
+        return None
+    if isinstance(names, str):
+        names = [names]
+    return tuple(sorted(set(names)))
+
+
+#===========================================================
+# 投影
+#===========================================================
+
+class GraphProjection:
+    """
+    内存中的有向多重图投影
+
+    节点按内部编号 0..n-1 存储，边同时以 CSR（按源节点）和 CSC（按目标节点）
+    两种布局保存：
+    - out_indptr / out_indices / out_types / out_weights：第 i 个节点的出边位于
+      out_indptr[i]:out_indptr[i+1]
+    - in_indptr / in_indices / in_edges：入边，in_edges 为对应的 CSR 边位置，
+      可用于按边取类型或权重
+    索引数组为 int32，indptr 为 int64；边类型以 int16 编码，名称见 relationship_types。
+    """
+
+    def __init__(
+        self,
+        primary_ids: Sequence[str],
+        sources: np.ndarray,
+        targets: np.ndarray,
+        edge_types: np.ndarray,
+        relationship_types: Sequence[str],
+        weights: Optional[np.ndarray] = None,
+        node_labels: Optional[np.ndarray] = None,
+        label_names: Optional[Sequence[str]] = None,
+        names: Optional[Sequence[Optional[str]]] = None,
+        version: Optional[str] = None
+    ):
+        """
+        由边列表构建投影
+
+        Args:
+            primary_ids: 节点 primary_id（下标即内部编号）
+            sources: 边的源节点编号
+            targets: 边的目标节点编号
+            edge_types: 边的类型编码（relationship_types 的下标）
+            relationship_types: 关系类型名称
+            weights: 边权重（默认全部为 1）
+            node_labels: 节点标签编码（label_names 的下标）
+            label_names: 标签名称
+            names: 节点名称
+            version: 构建时的图版本
+        """
+        self.primary_ids: List[str] = list(primary_ids)
+        self.names: List[Optional[str]] = list(names) if names is not None else [None] * len(self.primary_ids)
+        self.relationship_types: List[str] = list(relationship_types)
+        self.label_names: List[str] = list(label_names) if label_names is not None else []
+        self.version = version
+
+        n = len(self.primary_ids)
+        self.node_labels = (
+            np.asarray(node_labels, dtype=np.int16) if node_labels is not None
+            else np.zeros(n, dtype=np.int16)
+        )
+
+        sources = np.asarray(sources, dtype=np.int32)
+        targets = np.asarray(targets, dtype=np.int32)
+        edge_types = np.asarray(edge_types, dtype=np.int16)
+        weights = (
+            np.asarray(weights, dtype=np.float32) if weights is not None
+            else np.ones(len(sources), dtype=np.float32)
+        )
+
+        # CSR：按源节点稳定排序，保持同一节点的边的输入顺序
+        order = np.argsort(sources, kind="stable")
+        self.out_indptr = self._indptr(sources, n)
+        self.out_indices = targets[order]
+        self.out_types = edge_types[order]
+        self.out_weights = weights[order]
+        out_sources = sources[order]
+
+        # CSC：in_edges 指向 CSR 中的边位置
+        in_order = np.argsort(self.out_indices, kind="stable")
+        self.in_indptr = self._indptr(self.out_indices, n)
+        self.in_indices = out_sources[in_order]
+        self.in_edges = in_order.astype(np.int64)
+
+        self._index: Optional[Dict[str, int]] = None
+        self._undirected: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+
+    @staticmethod
+    def _indptr(keys: np.ndarray, n: int) -> np.ndarray:
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        if len(keys):
+            np.cumsum(np.bincount(keys, minlength=n), out=indptr[1:])
+        return indptr
+
+    #===========================================================
+    # 基本属性
+    #===========================================================
+
+    @property
+    def node_count(self) -> int:
+        return len(self.primary_ids)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.out_indices)
+
+    @property
+    def memory_bytes(self) -> int:
+        """数组占用的字节数（不含 primary_id 字符串）"""
+        arrays = (
+            self.out_indptr, self.out_indices, self.out_types, self.out_weights,
+            self.in_indptr, self.in_indices, self.in_edges, self.node_labels
+        )
+        return int(sum(a.nbytes for a in arrays))
+
+    def index_of(self, primary_id: str) -> Optional[int]:
+        """primary_id → 内部编号"""
+        return self.index.get(primary_id)
+
+    def indices_of(self, primary_ids: Iterable[str]) -> np.ndarray:
+        """批量 primary_id → 内部编号（不存在为 -1）"""
+        index = self.index
+        return np.fromiter((index.get(pid, -1) for pid in primary_ids), dtype=np.int64)
+
+    @property
+    def index(self) -> Dict[str, int]:
+        if self._index is None:
+            self._index = {pid: i for i, pid in enumerate(self.primary_ids)}
+        return self._index
+
+    def node_label(self, node: int) -> Optional[str]:
+        if not self.label_names:
+            return None
+        return self.label_names[self.node_labels[node]]
+
+    #===========================================================
+    # 邻接
+    #===========================================================
+
+    def out_neighbors(self, node: int) -> np.ndarray:
+        return self.out_indices[self.out_indptr[node]:self.out_indptr[node + 1]]
+
+    def in_neighbors(self, node: int) -> np.ndarray:
+        return self.in_indices[self.in_indptr[node]:self.in_indptr[node + 1]]
+
+    def out_degree(self, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """出度（可按边掩码过滤）"""
+        if mask is None:
+            return np.diff(self.out_indptr)
+        return np.bincount(self.edge_sources()[mask], minlength=self.node_count)
+
+    def in_degree(self, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """入度（可按边掩码过滤）"""
+        if mask is None:
+            return np.diff(self.in_indptr)
+        return np.bincount(self.out_indices[mask], minlength=self.node_count)
+
+    def type_mask(self, relationship_types: Optional[Iterable[str]]) -> Optional[np.ndarray]:
+        """
+        CSR 边的类型掩码
+
+        Args:
+            relationship_types: 关系类型（None 表示全部）
+
+        Returns:
+            布尔数组（None 表示不过滤）
+        """
+        if relationship_types is None:
+            return None
+        if isinstance(relationship_types, str):
+            relationship_types = [relationship_types]
+        codes = [self.relationship_types.index(t) for t in relationship_types if t in self.relationship_types]
+        return np.isin(self.out_types, np.asarray(codes, dtype=np.int16))
+
+    def type_weights(self, weights_by_type: Dict[str, float], default: float = 1.0) -> np.ndarray:
+        """
+        按关系类型给 CSR 边赋权（乘以边自身的权重）
+
+        Args:
+            weights_by_type: {关系类型: 权重}
+            default: 未列出的关系类型的权重
+        """
+        table = np.full(max(len(self.relationship_types), 1), default, dtype=np.float32)
+        for name, weight in weights_by_type.items():
+            if name in self.relationship_types:
+                table[self.relationship_types.index(name)] = weight
+        return self.out_weights * table[self.out_types]
+
+    def edge_sources(self) -> np.ndarray:
+        """CSR 各边的源节点编号"""
+        return np.repeat(np.arange(self.node_count, dtype=np.int32), np.diff(self.out_indptr))
+
+    def undirected(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        无向邻接（每条边双向各出现一次）
+
+        Returns:
+            (indptr, indices, edge_ids)，edge_ids 为对应的 CSR 边位置
+        """
+        if self._undirected is None:
+            n = self.node_count
+            sources = self.edge_sources()
+            edge_ids = np.arange(self.edge_count, dtype=np.int64)
+            keys = np.concatenate([sources, self.out_indices])
+            values = np.concatenate([self.out_indices, sources])
+            ids = np.concatenate([edge_ids, edge_ids])
+            order = np.argsort(keys, kind="stable")
+            self._undirected = (self._indptr(keys, n), values[order], ids[order])
+        return self._undirected
+
+    def to_scipy(
+        self,
+        mask: Optional[np.ndarray] = None,
+        weights: Optional[np.ndarray] = None,
+        transpose: bool = False
+    ):
+        """
+        转为 scipy.sparse.csr_matrix（重复边的权重相加）
+
+        Args:
+            mask: CSR 边掩码
+            weights: CSR 边权重（默认 out_weights）
+            transpose: 返回转置（按目标节点为行）
+
+        Returns:
+            n x n 稀疏矩阵
+        """
+        if not SCIPY_AVAILABLE:
+            raise ImportError("scipy is required for sparse matrix operations: pip install scipy")
+
+        n = self.node_count
+        data = self.out_weights if weights is None else weights
+        rows = self.edge_sources()
+        cols = self.out_indices
+        if mask is not None:
+            rows, cols, data = rows[mask], cols[mask], data[mask]
+        if transpose:
+            rows, cols = cols, rows
+        matrix = sp.csr_matrix((data.astype(np.float64), (rows, cols)), shape=(n, n))
+        matrix.sum_duplicates()
+        return matrix
+
+    def describe(self) -> Dict[str, Any]:
+        """投影概要"""
+        return {
+            "node_count": self.node_count,
+            "edge_count": self.edge_count,
+            "relationship_types": {
+                name: int(count)
+                for name, count in zip(
+                    self.relationship_types,
+                    np.bincount(self.out_types, minlength=len(self.relationship_types))
+                )
+            },
+            "labels": {
+                name: int(count)
+                for name, count in zip(
+                    self.label_names,
+                    np.bincount(self.node_labels, minlength=len(self.label_names))
+                )
+            },
+            "memory_bytes": self.memory_bytes,
+            "version": self.version
+        }
+
+
+#===========================================================
+# 从 Neo4j 加载
+#===========================================================
+
+def graph_version(driver) -> str:
+    """
+    图版本标识
+
+    由节点数、关系数以及两者的最大内部 id 组成。只看计数时，删除后再插入
+    同样数量的节点/关系会得到相同版本而沿用过期投影；新建实体会分配更大的
+    内部 id，因此最大 id 可作为变更标记（需要扫描一遍 id，比计数存储慢，
+    但远小于加载投影的开销）。只修改属性的写入不会改变版本，需要时调用
+    ProjectionCache.invalidate()。
+    """
+    with driver.session() as session:
+        node_record = session.run(
+            "MATCH (n) RETURN count(n) AS count, max(id(n)) AS max_id"
+        ).single()
+        rel_record = session.run(
+            "MATCH ()-[r]->() RETURN count(r) AS count, max(id(r)) AS max_id"
+        ).single()
+    return (
+        f"{node_record['count']}:{rel_record['count']}:"
+        f"{node_record['max_id']}:{rel_record['max_id']}"
+    )
+
+
+def load_projection(
+    driver,
+    labels: Optional[Iterable[str]] = None,
+    relationship_types: Optional[Iterable[str]] = None,
+    weight_property: Optional[str] = None,
+    version: Optional[str] = None
+) -> GraphProjection:
+    """
+    从 Neo4j 流式读取子图并构建投影
+
+    节点按 primary_id 去重（没有 primary_id 的节点不参与投影），
+    只保留两端都在投影内的边。
+
+    Args:
+        driver: Neo4j 驱动
+        labels: 节点标签（None 表示全部节点）
+        relationship_types: 关系类型（None 表示全部）
+        weight_property: 作为边权重的关系属性（None 表示全部为 1）
+        version: 图版本（记录在投影上）
+
+    Returns:
+        图投影
+    """
+    labels = _normalize_names(labels)
+    relationship_types = _normalize_names(relationship_types)
+
+    if labels:
+        node_patterns = [f"(n:{_quote_identifier(label)})" for label in labels]
+    else:
+        node_patterns = ["(n)"]
+    rel_pattern = (
+        ":" + "|".join(_quote_identifier(t) for t in relationship_types)
+        if relationship_types else ""
+    )
+
+    index: Dict[str, int] = {}
+    primary_ids: List[str] = []
+    names: List[Optional[str]] = []
+    node_labels = array("h")
+    label_codes: Dict[str, int] = {}
+
+    with driver.session() as session:
+        # 1. 节点
+        for pattern in node_patterns:
+            query = f"""
+            MATCH {pattern}
+            WHERE n.primary_id IS NOT NULL
+            RETURN n.primary_id AS primary_id, n.name AS name, labels(n) AS labels
+            """
+            for record in session.run(query):
+                primary_id = record["primary_id"]
+                if primary_id in index:
+                    continue
+                node_labels_list = record["labels"] or []
+                if labels:
+                    label = next((l for l in node_labels_list if l in labels), labels[0])
+                else:
+                    label = node_labels_list[0] if node_labels_list else ""
+                index[primary_id] = len(primary_ids)
+                primary_ids.append(primary_id)
+                names.append(record["name"])
+                node_labels.append(label_codes.setdefault(label, len(label_codes)))
+
+        # 2. 边（从投影内的源节点出发，目标节点在 Python 中过滤）
+        sources = array("i")
+        targets = array("i")
+        edge_types = array("h")
+        weights = array("f")
+        type_codes: Dict[str, int] = {}
+        weight_expr = "r[$weight_property]" if weight_property else "1.0"
+
+        # 带多个请求标签的源节点只在第一个标签的查询中返回，避免边重复
+        for i, pattern in enumerate(node_patterns):
+            query = f"""
+            MATCH {pattern}-[r{rel_pattern}]->(m)
+            WHERE n.primary_id IS NOT NULL AND m.primary_id IS NOT NULL
+              AND none(l IN labels(n) WHERE l IN $earlier_labels)
+            RETURN n.primary_id AS source, m.primary_id AS target,
+                   type(r) AS type, {weight_expr} AS weight
+            """
+            earlier_labels = list(labels[:i]) if labels else []
+            for record in session.run(query, weight_property=weight_property, earlier_labels=earlier_labels):
+                target = index.get(record["target"])
+                if target is None:
+                    continue
+                sources.append(index[record["source"]])
+                targets.append(target)
+                edge_types.append(type_codes.setdefault(record["type"], len(type_codes)))
+                weight = record["weight"]
+                weights.append(float(weight) if weight is not None else 1.0)
+
+    relationship_names = sorted(type_codes, key=type_codes.get)
+    label_names = sorted(label_codes, key=label_codes.get)
+
+    projection = GraphProjection(
+        primary_ids,
+        np.frombuffer(sources, dtype=np.int32) if sources else np.zeros(0, dtype=np.int32),
+        np.frombuffer(targets, dtype=np.int32) if targets else np.zeros(0, dtype=np.int32),
+        np.frombuffer(edge_types, dtype=np.int16) if edge_types else np.zeros(0, dtype=np.int16),
+        relationship_names,
+        weights=np.frombuffer(weights, dtype=np.float32) if weights else None,
+        node_labels=np.frombuffer(node_labels, dtype=np.int16) if node_labels else None,
+        label_names=label_names,
+        names=names,
+        version=version
+    )
+    projection._index = index
+
+    logger.info(
+        f"Projected graph (labels={labels}, types={relationship_types}): "
+        f"{projection.node_count} nodes, {projection.edge_count} edges, "
+        f"{projection.memory_bytes / 1e6:.1f} MB"
+    )
+    return projection
+
+
+def write_node_property(
+    driver,
+    primary_ids: Sequence[str],
+    values: Sequence[Any],
+    property_name: str,
+    label: Optional[str] = None,
+    batch_size: int = 10000
+) -> int:
+    """
+    按批把算法结果写回节点属性
+
+    每批一条 UNWIND 语句，按 primary_id 匹配节点。
+
+    Args:
+        driver: Neo4j 驱动
+        primary_ids: 节点 primary_id
+        values: 与 primary_ids 对应的属性值
+        property_name: 属性名
+        label: 节点标签（None 表示任意标签）
+        batch_size: 每批节点数
+
+    Returns:
+        写入的节点数
+    """
+    if len(primary_ids) != len(values):
+        raise ValueError("primary_ids and values must have the same length")
+    node_pattern = f"(n:{_quote_identifier(label)} {{primary_id: row.id}})" if label else "(n {primary_id: row.id})"
+    query = f"""
+    UNWIND $rows AS row
+    MATCH {node_pattern}
+    SET n.{_quote_identifier(property_name)} = row.value
+    RETURN count(n) AS written
+    """
+
+    written = 0
+    with driver.session() as session:
+        for start in range(0, len(primary_ids), batch_size):
+            rows = [
+                {"id": primary_id, "value": value.item() if isinstance(value, np.generic) else value}
+                for primary_id, value in zip(
+                    primary_ids[start:start + batch_size], values[start:start + batch_size]
+                )
+            ]
+            record = session.run(query, rows=rows).single()
+            written += record["written"] if record else 0
+
+    logger.info(f"Wrote {property_name} for {written} nodes")
+    return written
+
+
+#===========================================================
+# 缓存
+#===========================================================
+
+class ProjectionCache:
+    """
+    图投影缓存
+
+    以 (标签, 关系类型, 权重属性) 为键保存最近使用的投影；每次取用时比较
+    图版本，版本变化后重新加载。同一驱动的所有算法类共享一个缓存
+    （见 get_projection_cache）。
+    """
+
+    def __init__(self, driver, max_entries: int = 4, check_version: bool = True):
+        """
+        初始化缓存
+
+        Args:
+            driver: Neo4j 驱动
+            max_entries: 最多保留的投影数
+            check_version: 取用时是否检查图版本
+        """
+        self.driver = driver
+        self.max_entries = max(1, max_entries)
+        self.check_version = check_version
+
+        self._entries: "OrderedDict[ProjectionKey, GraphProjection]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.stats = {"hits": 0, "misses": 0, "reloads": 0}
+
+    def get(
+        self,
+        labels: Optional[Iterable[str]] = None,
+        relationship_types: Optional[Iterable[str]] = None,
+        weight_property: Optional[str] = None
+    ) -> GraphProjection:
+        """
+        获取投影（不存在或图版本变化时加载）
+
+        Args:
+            labels: 节点标签（None 表示全部节点）
+            relationship_types: 关系类型（None 表示全部）
+            weight_property: 作为边权重的关系属性
+
+        Returns:
+            图投影
+        """
+        key = (_normalize_names(labels), _normalize_names(relationship_types), weight_property)
+        version = graph_version(self.driver) if self.check_version else None
+
+        with self._lock:
+            projection = self._entries.get(key)
+            if projection is not None and (version is None or projection.version == version):
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return projection
+            if projection is not None:
+                self.stats["reloads"] += 1
+            else:
+                self.stats["misses"] += 1
+
+            projection = load_projection(self.driver, key[0], key[1], weight_property, version)
+            self._entries[key] = projection
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return projection
+
+    def put(
+        self,
+        projection: GraphProjection,
+        labels: Optional[Iterable[str]] = None,
+        relationship_types: Optional[Iterable[str]] = None,
+        weight_property: Optional[str] = None
+    ):
+        """放入外部构建的投影（例如从文件恢复）"""
+        key = (_normalize_names(labels), _normalize_names(relationship_types), weight_property)
+        with self._lock:
+            self._entries[key] = projection
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self):
+        """清空缓存（例如在只改属性的批量写入之后）"""
+        with self._lock:
+            self._entries.clear()
+
+    def describe(self) -> List[Dict[str, Any]]:
+        """缓存中的投影概要"""
+        with self._lock:
+            return [
+                {"labels": key[0], "relationship_types": key[1], "weight_property": key[2], **p.describe()}
+                for key, p in self._entries.items()
+            ]
+
+
+# 按驱动共享的缓存（弱引用驱动，驱动被回收后缓存及其投影随之释放）
+_SHARED_CACHES: "weakref.WeakKeyDictionary[Any, ProjectionCache]" = weakref.WeakKeyDictionary()
+_SHARED_LOCK = threading.Lock()
+
+
+def get_projection_cache(driver) -> ProjectionCache:
+    """
+    获取驱动共享的投影缓存
+
+    缓存内部只持有驱动的弱代理，不会让已关闭的驱动一直存活；
+    不支持弱引用的驱动对象返回独立的缓存。
+
+    Args:
+        driver: Neo4j 驱动
+
+    Returns:
+        该驱动的 ProjectionCache
+    """
+    try:
+        proxy = weakref.proxy(driver)
+    except TypeError:
+        return ProjectionCache(driver)
+
+    with _SHARED_LOCK:
+        cache = _SHARED_CACHES.get(driver)
+        if cache is None:
+            cache = ProjectionCache(proxy)
+            _SHARED_CACHES[driver] = cache
+        return cache
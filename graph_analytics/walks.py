@@ -0,0 +1,475 @@
+#===========================================================
+# PharmaKG - 随机游走语料
+# Pharmaceutical Knowledge Graph - Random Walk Corpus
+#===========================================================
+# 版本: v1.0
+# 描述: 在图投影的 CSR 数组上批量生成均匀 / node2vec (p, q)
+#       随机游走，按分片多进程生成，流式交给 Word2Vec 或写入磁盘
+#===========================================================
+
+import logging
+from collections import deque
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .kernels import _sum_by_pairs
+from .projection import GraphProjection
+
+logger = logging.getLogger(__name__)
+
+
+#===========================================================
+# Alias 表
+#===========================================================
+
+def alias_tables(indptr: np.ndarray, weights: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    为 CSR 的每一行构建 alias 表（所有行一起向量化构建）
+
+    使用前缀和形式的 sweep 构建：每行的权重缩放为均值 1，小项（< 1）依次
+    由大项补足；大项被取到剩余不足 1 时自身成为桶，由下一个大项补足。
+    第 c 个大项在累计缺口首次超过其前 c 个大项的累计盈余时关闭，
+    因此全部配对可以由一次 (行, 前缀和) 排序得到。
+
+    Args:
+        indptr: CSR 行指针
+        weights: 边权重（非负）
+
+    Returns:
+        (prob, alias)：在行内均匀选中边 e 后，以 prob[e] 取 e，否则取 alias[e]
+        （alias 为边的全局下标）
+    """
+    m = len(weights)
+    n = len(indptr) - 1
+    degree = np.diff(indptr)
+    row = np.repeat(np.arange(n, dtype=np.int64), degree)
+    prob = np.ones(m, dtype=np.float64)
+    alias = np.arange(m, dtype=np.int64)
+    if m == 0:
+        return prob, alias
+
+    weights = np.asarray(weights, dtype=np.float64)
+    row_total = np.bincount(row, weights=weights, minlength=n)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scaled = np.where(row_total[row] > 0, weights * degree[row] / row_total[row], 1.0)
+
+    # 舍入误差可能让等权行的所有项都略小于 1，这样的行直接均匀抽样
+    is_small = scaled < 1.0
+    is_small &= np.bincount(row[~is_small], minlength=n)[row] > 0
+    small = np.flatnonzero(is_small)
+    large = np.flatnonzero(~is_small)
+    if not len(small):
+        return prob, alias
+    prob[small] = scaled[small]
+
+    def local_cumsum(values: np.ndarray, rows: np.ndarray, inclusive: bool) -> np.ndarray:
+        # 行内前缀和（values 已按行排序）
+        total = np.cumsum(values)
+        starts = np.flatnonzero(np.r_[True, rows[1:] != rows[:-1]])
+        offsets = np.repeat(total[starts] - values[starts], np.diff(np.r_[starts, len(rows)]))
+        return total - offsets if inclusive else total - offsets - values
+
+    small_row, large_row = row[small], row[large]
+    deficit = 1.0 - scaled[small]
+    deficit_before = local_cumsum(deficit, small_row, inclusive=False)
+    surplus_upto = local_cumsum(scaled[large] - 1.0, large_row, inclusive=True)
+
+    # 合并排序：同一行内按前缀和排序，相等时小项在前
+    keys = np.r_[deficit_before, surplus_upto]
+    rows = np.r_[small_row, large_row]
+    kind = np.r_[np.zeros(len(small), dtype=np.int8), np.ones(len(large), dtype=np.int8)]
+    order = np.lexsort((kind, keys, rows))
+    is_large = kind[order] == 1
+    row_start = np.searchsorted(rows[order], rows[order], side="left")
+    larges_before = np.cumsum(is_large) - is_large
+    smalls_before = np.cumsum(~is_large) - ~is_large
+    larges_before -= larges_before[row_start]
+    smalls_before -= smalls_before[row_start]
+
+    # 每行第一个小项 / 大项在 small / large 数组中的位置
+    small_first = np.searchsorted(small_row, np.arange(n))
+    large_first = np.searchsorted(large_row, np.arange(n))
+    large_count = np.bincount(large_row, minlength=n)
+
+    # 小项 k 的桶由此时尚未关闭的第一个大项补足
+    small_pos = order[~is_large]
+    closed = larges_before[~is_large]
+    r = small_row[small_pos]
+    target = large_first[r] + np.minimum(closed, large_count[r] - 1)
+    alias[small[small_pos]] = large[target]
+
+    # 大项 c 在第一个累计缺口超过其累计盈余的小项处关闭，由下一个大项补足
+    large_pos = order[is_large] - len(small)
+    trigger = smalls_before[is_large] - 1
+    r = large_row[large_pos]
+    next_large = large_pos + 1
+    closes = (trigger >= 0) & (next_large < large_first[r] + large_count[r])
+    large_pos, trigger, r, next_large = large_pos[closes], trigger[closes], r[closes], next_large[closes]
+    k = small_first[r] + trigger
+    deficit_upto = deficit_before[k] + deficit[k]
+    closes = deficit_upto > surplus_upto[large_pos]
+    large_pos, next_large, deficit_upto = large_pos[closes], next_large[closes], deficit_upto[closes]
+    prob[large[large_pos]] = np.clip(1.0 - (deficit_upto - surplus_upto[large_pos]), 0.0, 1.0)
+    alias[large[large_pos]] = large[next_large]
+
+    return prob, alias
+
+
+#===========================================================
+# 游走图
+#===========================================================
+
+class WalkGraph:
+    """
+    随机游走使用的邻接数组
+
+    平行边合并（权重相加），行内邻居按编号排序；默认忽略关系方向。
+    """
+
+    def __init__(
+        self,
+        indptr: np.ndarray,
+        indices: np.ndarray,
+        weights: Optional[np.ndarray] = None,
+        symmetric: bool = False
+    ):
+        """
+        Args:
+            indptr: CSR 行指针
+            indices: 邻居（行内升序）
+            weights: 边权重（None 表示无权图，直接均匀抽样）
+            symmetric: 邻接是否对称（u → v 与 v → u 同时存在且权重相同）
+        """
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.symmetric = symmetric
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.weights = None
+        self.prob = None
+        self.alias = None
+        self._row_weights = None
+        if weights is not None and not np.allclose(weights, weights[0] if len(weights) else 1.0):
+            self.weights = np.asarray(weights, dtype=np.float64)
+            self.prob, self.alias = alias_tables(self.indptr, self.weights)
+
+    @classmethod
+    def from_projection(
+        cls,
+        projection: GraphProjection,
+        directed: bool = False,
+        edge_weights: Optional[np.ndarray] = None
+    ) -> "WalkGraph":
+        """
+        从图投影构建游走图
+
+        Args:
+            projection: 图投影
+            directed: 是否只沿出边游走
+            edge_weights: CSR 边权重（默认 projection.out_weights，0 表示忽略该边）
+        """
+        n = projection.node_count
+        weights = projection.out_weights if edge_weights is None else np.asarray(edge_weights)
+        keep = weights > 0
+        rows = projection.edge_sources()[keep].astype(np.int64)
+        cols = projection.out_indices[keep].astype(np.int64)
+        weights = weights[keep].astype(np.float64)
+        if not directed:
+            rows, cols, weights = np.r_[rows, cols], np.r_[cols, rows], np.r_[weights, weights]
+
+        rows, cols, weights = _sum_by_pairs(rows, cols, weights, n, n)
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+        return cls(indptr, cols, weights, symmetric=not directed)
+
+    @property
+    def node_count(self) -> int:
+        return len(self.indptr) - 1
+
+    def sample_edges(self, nodes: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        """
+        为每个节点按边权重抽取一条出边（没有出边的节点返回 -1）
+
+        无权图在行内均匀抽样；带权图使用 alias 表，每次抽样 O(1)。
+        """
+        start = self.indptr[nodes]
+        degree = self.indptr[nodes + 1] - start
+        result = np.full(len(nodes), -1, dtype=np.int64)
+        has = degree > 0
+        if not has.any():
+            return result
+        edge = start[has] + (rng.random(int(has.sum())) * degree[has]).astype(np.int64)
+        if self.prob is not None:
+            edge = np.where(rng.random(len(edge)) < self.prob[edge], edge, self.alias[edge])
+        result[has] = edge
+        return result
+
+    def sample_neighbors(self, nodes: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        """为每个节点按边权重抽取一个邻居（没有邻居的节点返回 -1）"""
+        edge = self.sample_edges(nodes, rng)
+        return np.where(edge >= 0, self.indices[edge], -1)
+
+    def weight_of(self, edges: np.ndarray) -> np.ndarray:
+        """边下标对应的权重（无权图为 1）"""
+        if self.weights is None:
+            return np.ones(len(edges), dtype=np.float64)
+        return self.weights[edges]
+
+    def edge_positions(self, sources: np.ndarray, targets: np.ndarray) -> np.ndarray:
+        """
+        逐对查找 sources[i] → targets[i] 的边下标（不存在时为 -1）
+
+        所有查询同时在各自的行内二分查找。
+        """
+        end = self.indptr[sources + 1]
+        lo = self.indptr[sources].copy()
+        hi = end.copy()
+        active = np.flatnonzero(lo < hi)
+        while len(active):
+            mid = (lo[active] + hi[active]) // 2
+            less = self.indices[mid] < targets[active]
+            lo[active[less]] = mid[less] + 1
+            hi[active[~less]] = mid[~less]
+            active = active[lo[active] < hi[active]]
+        found = lo < end
+        found[found] = self.indices[lo[found]] == targets[found]
+        return np.where(found, lo, -1)
+
+    def edge_weights(self, sources: np.ndarray, targets: np.ndarray) -> np.ndarray:
+        """逐对返回 sources[i] → targets[i] 的边权重（不存在时为 0）"""
+        position = self.edge_positions(sources, targets)
+        found = position >= 0
+        result = np.zeros(len(position), dtype=np.float64)
+        result[found] = self.weights[position[found]] if self.weights is not None else 1.0
+        return result
+
+    @property
+    def row_weights(self) -> np.ndarray:
+        """每个节点的出边权重之和（无权图为出度）"""
+        if self._row_weights is None:
+            if self.weights is None:
+                self._row_weights = np.diff(self.indptr).astype(np.float64)
+            else:
+                rows = np.repeat(np.arange(self.node_count), np.diff(self.indptr))
+                self._row_weights = np.bincount(rows, weights=self.weights, minlength=self.node_count)
+        return self._row_weights
+
+
+#===========================================================
+# 游走生成
+#===========================================================
+
+def random_walks(
+    graph: WalkGraph,
+    starts: np.ndarray,
+    walk_length: int,
+    rng: np.random.Generator,
+    p: float = 1.0,
+    q: float = 1.0
+) -> np.ndarray:
+    """
+    从一组起点同时生成随机游走
+
+    p = q = 1 时为一阶随机游走。否则为 node2vec 二阶游走：先按一阶分布
+    （alias 表）提议下一节点 x，再以 bias(x) / max_bias 接受，其中
+    x 为上一节点时 bias = 1/p，x 与上一节点相邻时为 1，否则为 1/q；
+    被拒绝的游走者在下一轮重新提议。这样无需为每条边预先构建二阶 alias 表，
+    且只有接受阈值落在 1 与 1/q 之间时才需要查询相邻关系。1/p 大于其余偏置时，
+    返回边多出的偏置折叠为单独的抽样区域，以免整体接受率被 1/p 拉低。
+
+    Args:
+        graph: 游走图
+        starts: 起点
+        walk_length: 游走长度（包含起点）
+        rng: 随机数生成器
+        p: 返回参数
+        q: 进出参数
+
+    Returns:
+        (len(starts), walk_length) 的节点编号矩阵，提前停止（无出边）的位置为 -1
+    """
+    starts = np.asarray(starts, dtype=np.int64)
+    # 按步存储（每步一行），每步读写的是连续内存
+    walks = np.full((max(walk_length, 0), len(starts)), -1, dtype=np.int64)
+    if not len(starts) or walk_length <= 0:
+        return walks.T
+    walks[0] = starts
+
+    second_order = p != 1.0 or q != 1.0
+    # 提议分布的包络：返回边的偏置超过其余边时，多出的部分作为单独区域直接抽取
+    envelope = max(1.0, 1.0 / q)
+    fold = 1.0 / p > envelope
+    if not fold:
+        envelope = max(envelope, 1.0 / p)
+    alive = np.arange(len(starts))
+    # 走到当前节点所经过的边的权重（对称图中等于返回边的权重）
+    arrival = np.zeros(len(starts), dtype=np.float64)
+
+    for step in range(1, walk_length):
+        current = walks[step - 1, alive]
+        if not second_order or step == 1:
+            edge = graph.sample_edges(current, rng)
+            following = np.where(edge >= 0, graph.indices[edge], -1)
+            weight = graph.weight_of(edge)
+        else:
+            previous = walks[step - 2, alive]
+            following = np.full(len(alive), -1, dtype=np.int64)
+            weight = np.zeros(len(alive), dtype=np.float64)
+            if fold:
+                back_weight = arrival if graph.symmetric else graph.edge_weights(current, previous)
+                extra = (1.0 / p - envelope) * back_weight
+                area = envelope * graph.row_weights[current] + extra
+            pending = np.arange(len(alive))
+            while len(pending):
+                if fold:
+                    back = rng.random(len(pending)) * area[pending] < extra[pending]
+                    taken = pending[back]
+                    following[taken] = previous[taken]
+                    weight[taken] = back_weight[taken]
+                    pending = pending[~back]
+                edge = graph.sample_edges(current[pending], rng)
+                dead = edge < 0
+                pending, edge = pending[~dead], edge[~dead]
+                proposal = graph.indices[edge]
+                threshold = rng.random(len(pending)) * envelope
+                back = proposal == previous[pending]
+                accepted = np.where(back, threshold < min(1.0 / p, envelope), threshold < min(1.0, 1.0 / q))
+                # 只有阈值落在 1 与 1/q 之间的提议才需要查询是否与上一节点相邻
+                unsure = ~back & ~accepted & (threshold < max(1.0, 1.0 / q))
+                if unsure.any():
+                    adjacent = graph.edge_positions(previous[pending[unsure]], proposal[unsure]) >= 0
+                    accepted[unsure] = threshold[unsure] < np.where(adjacent, 1.0, 1.0 / q)
+                following[pending[accepted]] = proposal[accepted]
+                weight[pending[accepted]] = graph.weight_of(edge[accepted])
+                pending = pending[~accepted]
+
+        moving = following >= 0
+        alive = alive[moving]
+        walks[step, alive] = following[moving]
+        arrival = weight[moving]
+        if not len(alive):
+            break
+
+    return np.ascontiguousarray(walks.T)
+
+
+# 工作进程内的游走图（由 _init_walk_worker 设置）
+_WALK_GRAPH: Optional[WalkGraph] = None
+
+
+def _init_walk_worker(graph: WalkGraph):
+    global _WALK_GRAPH
+    _WALK_GRAPH = graph
+
+
+def _walk_shard(shard: Tuple[np.ndarray, int, float, float, Tuple[int, ...]]) -> np.ndarray:
+    starts, walk_length, p, q, seed = shard
+    rng = np.random.default_rng(np.random.SeedSequence(seed))
+    return random_walks(_WALK_GRAPH, starts, walk_length, rng, p, q)
+
+
+class WalkCorpus:
+    """
+    随机游走语料
+
+    每轮把全部节点随机打乱后切成分片，每个分片使用由 (seed, 轮次, 分片) 派生的
+    独立随机流，因此结果与进程数无关、可复现。可以反复迭代（Word2Vec 需要多遍
+    读取语料，每次按同样的种子重新生成），也可以用 save() 写成每行一条游走的
+    文本文件供 Word2Vec(corpus_file=...) 使用。
+    """
+
+    def __init__(
+        self,
+        graph: WalkGraph,
+        primary_ids: Sequence[str],
+        num_walks: int = 10,
+        walk_length: int = 80,
+        p: float = 1.0,
+        q: float = 1.0,
+        seed: int = 42,
+        workers: int = 1,
+        shard_size: int = 10000
+    ):
+        """
+        Args:
+            graph: 游走图
+            primary_ids: 节点编号到 primary_id 的映射
+            num_walks: 每个节点的游走次数
+            walk_length: 游走长度
+            p: node2vec 返回参数
+            q: node2vec 进出参数
+            seed: 随机种子
+            workers: 进程数
+            shard_size: 每个分片的起点数
+        """
+        if p <= 0 or q <= 0:
+            raise ValueError("p and q must be positive")
+        self.graph = graph
+        self.primary_ids = primary_ids
+        self.num_walks = num_walks
+        self.walk_length = walk_length
+        self.p = p
+        self.q = q
+        self.seed = seed
+        self.workers = workers
+        self.shard_size = shard_size
+
+    def __len__(self) -> int:
+        return self.num_walks * self.graph.node_count
+
+    def _shards(self) -> Iterator[Tuple[np.ndarray, int, float, float, Tuple[int, ...]]]:
+        n = self.graph.node_count
+        for round_index in range(self.num_walks):
+            order = np.random.default_rng([self.seed, round_index]).permutation(n)
+            for shard_index, start in enumerate(range(0, n, self.shard_size)):
+                yield (
+                    order[start:start + self.shard_size], self.walk_length,
+                    self.p, self.q, (self.seed, round_index, shard_index)
+                )
+
+    def iter_arrays(self) -> Iterator[np.ndarray]:
+        """按分片顺序产出游走矩阵（-1 表示游走提前结束）"""
+        if self.workers and self.workers > 1:
+            from concurrent.futures import ProcessPoolExecutor
+
+            with ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_walk_worker,
+                initargs=(self.graph,)
+            ) as executor:
+                # 有界提交窗口：保持顺序，同时限制在途分片数
+                pending = deque()
+                for shard in self._shards():
+                    pending.append(executor.submit(_walk_shard, shard))
+                    if len(pending) >= self.workers * 2:
+                        yield pending.popleft().result()
+                while pending:
+                    yield pending.popleft().result()
+        else:
+            _init_walk_worker(self.graph)
+            for shard in self._shards():
+                yield _walk_shard(shard)
+
+    def __iter__(self) -> Iterator[List[str]]:
+        ids = self.primary_ids
+        for walks in self.iter_arrays():
+            for walk in walks:
+                yield [ids[node] for node in walk[walk >= 0]]
+
+    def save(self, path: Union[str, Path]) -> int:
+        """
+        写入文本文件（每行一条游走，primary_id 以空格分隔）
+
+        Returns:
+            写入的游走数
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        count = 0
+        with open(path, "w", encoding="utf-8") as f:
+            for walk in self:
+                f.write(" ".join(walk))
+                f.write("\n")
+                count += 1
+        logger.info(f"Wrote {count} walks to {path}")
+        return count
@@ -7,11 +7,16 @@
 #===========================================================
 
 import logging
-from typing import Dict, List, Any, Optional, Tuple
+import os
+from typing import Dict, List, Any, Mapping, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
 import numpy as np
 
+from graph_analytics import kg_embeddings
+from graph_analytics.embedding_store import IdTable
+from graph_analytics.embeddings import EmbeddingType
+
 logger = logging.getLogger(__name__)
 
 
@@ -512,11 +517,13 @@ class NodeClassificationModel:
         return proba_dict
 
 
-class KGEmbeddingModel:
+class KGEmbeddingModel(kg_embeddings.KGEmbeddingModel):
     """
     知识图谱嵌入模型
 
-    使用 TransE、DistMult、CompletEx 等算法学习知识图谱嵌入
+    使用 TransE、DistMult、ComplEx 等算法学习知识图谱嵌入。
+    训练（小批量负采样）、打分和存储由 graph_analytics.kg_embeddings 实现，
+    这里保留按关系类型训练、以 (实体, 分数) 返回预测结果的接口。
     """
 
     def __init__(
@@ -530,21 +537,30 @@ class KGEmbeddingModel:
 
         Args:
             neo4j_driver: Neo4j 数据库驱动
-            embedding_dim: 嵌入维度
+            embedding_dim: 嵌入维度（ComplEx 为实部和虚部之和，须为偶数）
             model_type: 模型类型 (transe, distmult, complex)
         """
-        self.driver = neo4j_driver
-        self.embedding_dim = embedding_dim
-        self.model_type = model_type
-        self.entity_embeddings = {}
-        self.relation_embeddings = {}
+        super().__init__(neo4j_driver, embedding_dim, model_type)
+
+    @property
+    def entity_embeddings(self) -> Mapping[str, np.ndarray]:
+        """实体 ID -> 向量"""
+        return self.embeddings
+
+    @property
+    def relation_embeddings(self) -> Dict[str, np.ndarray]:
+        """关系类型 -> 向量"""
+        if self.relation_matrix is None:
+            return {}
+        return dict(zip(self.relation_names, self.relation_matrix))
 
     def train(
         self,
         relation_types: List[str],
         epochs: int = 100,
         batch_size: int = 256,
-        learning_rate: float = 0.001
+        learning_rate: float = 0.01,
+        **kwargs
     ) -> Dict[str, Any]:
         """
         训练 KG 嵌入模型
@@ -554,79 +570,21 @@ class KGEmbeddingModel:
             epochs: 训练轮数
             batch_size: 批大小
             learning_rate: 学习率
+            **kwargs: 其余训练参数（negatives、loss、optimizer、workers 等）
 
         Returns:
             训练统计
         """
-        import numpy as np
-
-        # 收集三元组
-        triples = []
-        entities = set()
-
-        for rel_type in relation_types:
-            query = f"""
-            MATCH (a)-[r:{rel_type}]->(b)
-            RETURN a.primary_id as head, b.primary_id as tail, '{rel_type}' as relation
-            """
-
-            with self.driver.session() as session:
-                result = session.run(query)
-                for record in result:
-                    triples.append((record["head"], record["relation"], record["tail"]))
-                    entities.add(record["head"])
-                    entities.add(record["tail"])
-
-        # 初始化嵌入
-        for entity in entities:
-            self.entity_embeddings[entity] = np.random.randn(self.embedding_dim)
-
-        for rel_type in relation_types:
-            self.relation_embeddings[rel_type] = np.random.randn(self.embedding_dim)
-
-        # 简化训练：随机梯度下降
-        loss_history = []
-
-        for epoch in range(epochs):
-            batch_triples = triples[:batch_size]
-            loss = self._train_step(batch_triples, learning_rate)
-            loss_history.append(loss)
-
-        return {
-            "success": True,
-            "num_entities": len(entities),
-            "num_relations": len(relation_types),
-            "num_triples": len(triples),
-            "loss_history": loss_history[-10:]  # 最后10个loss
-        }
-
-    def _train_step(
-        self,
-        triples: List[Tuple[str, str, str]],
-        learning_rate: float
-    ) -> float:
-        """执行一步训练"""
-        import numpy as np
-
-        total_loss = 0.0
-
-        for head, relation, tail in triples:
-            head_emb = self.entity_embeddings[head]
-            rel_emb = self.relation_embeddings[relation]
-            tail_emb = self.entity_embeddings[tail]
-
-            # TransE 分数函数
-            score = np.sum(np.abs(head_emb + rel_emb - tail_emb))
-            total_loss += score
-
-            # 梯度更新（简化）
-            grad = np.sign(head_emb + rel_emb - tail_emb)
-
-            self.entity_embeddings[head] -= learning_rate * grad
-            self.relation_embeddings[relation] -= learning_rate * grad
-            self.entity_embeddings[tail] += learning_rate * grad
-
-        return total_loss / len(triples)
+        result = super().train(
+            relationship_types=relation_types,
+            epochs=epochs,
+            batch_size=batch_size,
+            learning_rate=learning_rate,
+            **kwargs
+        )
+        if result["success"]:
+            result["num_triples"] = result["num_train_triples"] + result["num_test_triples"]
+        return result
 
     def score_triple(
         self,
@@ -643,24 +601,18 @@ class KGEmbeddingModel:
             tail: 尾实体
 
         Returns:
-            三元组分数
+            三元组分数（越高越好；实体或关系不存在时为 0.0）
         """
-        head_emb = self.entity_embeddings.get(head)
-        rel_emb = self.relation_embeddings.get(relation)
-        tail_emb = self.entity_embeddings.get(tail)
-
-        if head_emb is None or rel_emb is None or tail_emb is None:
+        if self.entity_matrix is None or relation not in self.relation_names:
+            return 0.0
+        rows = self.entity_ids.rows_of([head, tail])
+        if (rows < 0).any():
             return 0.0
 
-        if self.model_type == "transe":
-            return -np.sum(np.abs(head_emb + rel_emb - tail_emb))  # 越高越好
-        elif self.model_type == "distmult":
-            return np.sum(head_emb * rel_emb * tail_emb)
-        elif self.model_type == "complex":
-            # ComplEx 使用复数嵌入（简化实现）
-            return np.sum(head_emb[:self.embedding_dim//2] * rel_emb[:self.embedding_dim//2] * tail_emb[:self.embedding_dim//2])
-
-        return 0.0
+        rel = self.relation_names.index(relation)
+        return float(kg_embeddings.score_triples(
+            self.model_type, self.entity_matrix[rows[0]], self.relation_matrix[rel], self.entity_matrix[rows[1]]
+        ))
 
     def predict_links(
         self,
@@ -679,43 +631,59 @@ class KGEmbeddingModel:
         Returns:
             (实体, 分数) 列表
         """
-        scores = []
-
-        for entity, emb in self.entity_embeddings.items():
-            if entity == head:
-                continue
-            score = self.score_triple(head, relation, entity)
-            scores.append((entity, score))
-
-        scores.sort(key=lambda x: x[1], reverse=True)
-        return scores[:top_k]
+        if self.entity_matrix is None:
+            return []
+        matches = super().predict_links(head, relation, top_k=top_k, exclude_known=False)
+        return [(match["node_id"], match["score"]) for match in matches]
 
-    def save_embeddings(self, filepath: str):
-        """保存嵌入"""
-        import pickle
+    def save_embeddings(self, filepath: str, dtype: str = "float32"):
+        """
+        保存嵌入为存储目录（实体、relations/ 和三元组，见 save）
 
-        data = {
-            "entity_embeddings": self.entity_embeddings,
-            "relation_embeddings": self.relation_embeddings,
-            "embedding_dim": self.embedding_dim,
-            "model_type": self.model_type
-        }
+        Args:
+            filepath: 存储目录
+            dtype: 实体向量存储精度（float32 或 float16）
+        """
+        self.save(filepath, dtype=dtype)
 
-        with open(filepath, "wb") as f:
-            pickle.dump(data, f)
+    def load_embeddings(self, filepath: str, mmap: bool = True):
+        """
+        加载嵌入
 
-        logger.info(f"Embeddings saved to {filepath}")
+        Args:
+            filepath: 存储目录（旧版 pickle 文件仍可读取）
+            mmap: 是否以内存映射方式打开实体向量
+        """
+        if not os.path.isfile(filepath):
+            self.load(filepath, mmap=mmap)
+            return
 
-    def load_embeddings(self, filepath: str):
-        """加载嵌入"""
         import pickle
 
+        logger.warning(f"Loading legacy pickled embeddings from {filepath}; re-save to convert")
         with open(filepath, "rb") as f:
             data = pickle.load(f)
 
-        self.entity_embeddings = data["entity_embeddings"]
-        self.relation_embeddings = data["relation_embeddings"]
         self.embedding_dim = data["embedding_dim"]
-        self.model_type = data["model_type"]
-
-        logger.info(f"Embeddings loaded from {filepath}")
+        self.model_type = EmbeddingType(data["model_type"])
+        entities = list(data["entity_embeddings"])
+        self.entity_ids = IdTable.build(entities)
+        self.entity_matrix = np.array(
+            [data["entity_embeddings"][e] for e in entities], dtype=np.float32
+        ).reshape(len(entities), self.embedding_dim)
+        self.entity_type_names = [None]
+        self.entity_type_codes = np.zeros(len(entities), dtype=np.int32)
+        self.relation_names = list(data["relation_embeddings"])
+        self.relation_matrix = np.array(
+            [data["relation_embeddings"][r] for r in self.relation_names], dtype=np.float32
+        ).reshape(len(self.relation_names), self.embedding_dim)
+        # 旧格式不含三元组
+        self.triples = np.zeros((0, 3), dtype=np.int64)
+        self.test_triples = np.zeros((0, 3), dtype=np.int64)
+        self._filters = {}
+
+        self.embeddings = dict(zip(entities, self.entity_matrix))
+        self.node_types = {}
+        self.graph_version = None
+        self._index = None
+        self._index_dir = None
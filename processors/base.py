@@ -7,14 +7,18 @@
 #===========================================================
 
 import logging
-import hashlib
 import json
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass, field, fields
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from processors.drug_resolver import DrugNameResolver, get_drug_resolver
+from processors.manifest import ProcessedManifest, file_hash
+from processors.storage import DEFAULT_OUTPUT_FORMAT, RecordWriter, write_records
 
 logger = logging.getLogger(__name__)
 
@@ -43,6 +47,14 @@ class ProcessingMetrics:
     processing_time_seconds: float = 0.0
     memory_used_mb: float = 0.0
 
+    def merge(self, other: "ProcessingMetrics"):
+        """合并另一个指标（计数相加，内存取峰值）"""
+        for f in fields(self):
+            if f.name == "memory_used_mb":
+                self.memory_used_mb = max(self.memory_used_mb, other.memory_used_mb)
+            else:
+                setattr(self, f.name, getattr(self, f.name) + getattr(other, f.name))
+
 
 @dataclass
 class ProcessingResult:
@@ -90,6 +102,113 @@ class ProcessingResult:
             json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
 
 
+class ResultSink:
+    """
+    流式结果输出
+
+    实体和关系在每个文件处理完成后立即写入输出文件（首次写入时创建），
+    close() 时写出处理摘要。
+    """
+
+    def __init__(self, output_dir: Path, processor_name: str, output_format: str = DEFAULT_OUTPUT_FORMAT):
+        """
+        初始化输出
+
+        Args:
+            output_dir: 输出目录
+            processor_name: 处理器名称（写入摘要）
+            output_format: 实体/关系输出格式
+        """
+        self.output_dir = Path(output_dir)
+        self.processor_name = processor_name
+        self.output_format = output_format
+        self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.entities_count = 0
+        self.relationships_count = 0
+
+        self._entities_writer: Optional[RecordWriter] = None
+        self._relationships_writer: Optional[RecordWriter] = None
+
+    def add(self, entities: List[Dict[str, Any]], relationships: List[Dict[str, Any]]):
+        """写入一个文件的实体和关系"""
+        if entities:
+            if self._entities_writer is None:
+                self._entities_writer = self._open_writer("entities")
+            self._entities_writer.write_many(entities)
+            self.entities_count += len(entities)
+
+        if relationships:
+            if self._relationships_writer is None:
+                self._relationships_writer = self._open_writer("relationships")
+            self._relationships_writer.write_many(relationships)
+            self.relationships_count += len(relationships)
+
+    def close(self, processing_time: float = 0.0) -> Optional[Path]:
+        """
+        完成输出
+
+        Args:
+            processing_time: 处理耗时（秒）
+
+        Returns:
+            摘要文件路径（没有任何输出时为 None）
+        """
+        for writer in (self._entities_writer, self._relationships_writer):
+            if writer is not None:
+                writer.close()
+                logger.debug(f"保存 {writer.count} 条记录到: {writer.path}")
+
+        if self._entities_writer is None and self._relationships_writer is None:
+            return None
+
+        summary = {
+            "processor": self.processor_name,
+            "timestamp": self.timestamp,
+            "entities_count": self.entities_count,
+            "relationships_count": self.relationships_count,
+            "processing_time": processing_time,
+        }
+        summary_file = self.output_dir / f"summary_{self.timestamp}.json"
+        with open(summary_file, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+
+        return summary_file
+
+    def _open_writer(self, kind: str) -> RecordWriter:
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        return RecordWriter(self.output_dir / f"{kind}_{self.timestamp}", self.output_format)
+
+
+#===========================================================
+# 多进程文件处理
+#===========================================================
+
+# 工作进程内的处理器实例（由 _init_process_worker 创建）
+_WORKER_PROCESSOR = None
+
+
+def _init_process_worker(processor_cls, config: Dict[str, Any]):
+    """工作进程初始化：按配置重建处理器"""
+    global _WORKER_PROCESSOR
+    _WORKER_PROCESSOR = processor_cls(config)
+
+
+def _process_file_in_worker(file_path: Path):
+    """
+    在工作进程中处理单个文件
+
+    Returns:
+        (处理结果, 本文件的指标, 错误列表, 警告列表)
+    """
+    processor = _WORKER_PROCESSOR
+    processor._metrics = ProcessingMetrics()
+    processor._errors = []
+    processor._warnings = []
+
+    outcome = processor._process_file(file_path)
+    return outcome, processor._metrics, processor._errors, processor._warnings
+
+
 class BaseProcessor(ABC):
     """
     数据处理器基类
@@ -118,6 +237,9 @@ class BaseProcessor(ABC):
         self.data_root = self.project_root / "data"
         self.logger = logging.getLogger(self.__class__.__name__)
 
+        # 实体/关系输出格式（json/jsonl/parquet）
+        self.output_format = self.config.get('output_format', DEFAULT_OUTPUT_FORMAT)
+
         # 目录路径
         self.sources_dir = self.data_root / "sources"
         self.processed_dir = self.data_root / "processed"
@@ -139,6 +261,13 @@ class BaseProcessor(ABC):
         self._errors = []
         self._warnings = []
 
+        # 已处理文件清单（延迟打开）
+        self._manifest: Optional[ProcessedManifest] = None
+
+        # 药物名称 → ChEMBL 解析器（延迟加载）
+        self._drug_resolver: Optional[DrugNameResolver] = None
+        self._drug_resolver_loaded = False
+
     @abstractmethod
     def scan(self, source_path: Union[str, Path]) -> List[Path]:
         """
@@ -195,15 +324,25 @@ class BaseProcessor(ABC):
         self,
         source_path: Union[str, Path],
         output_to: Optional[str] = None,
-        save_intermediate: bool = True
+        save_intermediate: bool = True,
+        workers: Optional[int] = None,
+        keep_results: Optional[bool] = None
     ) -> ProcessingResult:
         """
         处理数据源的主流程
 
+        每个文件处理完成后，实体和关系立即写入输出文件。workers > 1 时
+        文件在进程池中并行处理（各进程按 config 重建处理器），
+        各进程的 ProcessingMetrics 合并到本处理器。
+
         Args:
             source_path: 源数据路径
             output_to: 输出目录（可选）
             save_intermediate: 是否保存中间结果
+            workers: 并行进程数（默认 config['workers']，未配置时为 1）
+            keep_results: 是否在返回结果中保留全部实体和关系
+                （默认 config['keep_results']，未配置时为 True；
+                为 False 时只写入输出文件，不占用内存）
 
         Returns:
             处理结果
@@ -211,6 +350,11 @@ class BaseProcessor(ABC):
         start_time = datetime.now()
         source_path = Path(source_path)
 
+        if workers is None:
+            workers = self.config.get('workers', 1)
+        if keep_results is None:
+            keep_results = self.config.get('keep_results', True)
+
         logger.info(f"[{self.PROCESSOR_NAME}] 开始处理: {source_path}")
 
         # 重置状态
@@ -235,56 +379,47 @@ class BaseProcessor(ABC):
 
             logger.info(f"找到 {len(files)} 个文件待处理")
 
-            # 2. 处理每个文件
+            # 2. 处理每个文件，结果流式写入输出
             all_entities = []
             all_relationships = []
-
-            for file_path in files:
-                try:
-                    # 提取
-                    raw_data = self.extract(file_path)
-                    if not raw_data:
-                        self._metrics.files_skipped += 1
-                        continue
-
-                    # 转换
-                    transformed_data = self.transform(raw_data)
-                    if not transformed_data:
-                        self._metrics.files_skipped += 1
-                        continue
-
-                    # 验证
-                    if not self.validate(transformed_data):
-                        self._warnings.append(f"数据验证失败: {file_path.name}")
-                        self._metrics.files_skipped += 1
-                        continue
-
-                    # 收集实体和关系
-                    entities = transformed_data.get('entities', [])
-                    relationships = transformed_data.get('relationships', [])
-
-                    all_entities.extend(entities)
-                    all_relationships.extend(relationships)
-
+            sink = None
+            if save_intermediate:
+                output_dir = Path(output_to) if output_to else self.documents_output_dir
+                sink = ResultSink(output_dir, self.PROCESSOR_NAME, self.output_format)
+
+            def collect(file_path: Path, outcome):
+                status, entities, relationships, message = outcome
+                if status == 'processed':
                     self._metrics.files_processed += 1
                     self._metrics.entities_extracted += len(entities)
                     self._metrics.relationships_extracted += len(relationships)
-
-                except Exception as e:
-                    logger.error(f"处理文件失败 {file_path}: {e}")
-                    self._errors.append(f"{file_path.name}: {str(e)}")
+                    if sink is not None:
+                        sink.add(entities, relationships)
+                    if keep_results:
+                        all_entities.extend(entities)
+                        all_relationships.extend(relationships)
+                elif status == 'failed':
+                    logger.error(f"处理文件失败 {file_path}: {message}")
+                    self._errors.append(f"{file_path.name}: {message}")
                     self._metrics.files_failed += 1
-
-            # 3. 保存结果
-            output_path = None
-            if save_intermediate and (all_entities or all_relationships):
-                output_path = self._save_results(all_entities, all_relationships, output_to)
-
-            # 4. 计算处理时间
-            processing_time = (datetime.now() - start_time).total_seconds()
-            self._metrics.processing_time_seconds = processing_time
-
-            # 5. 确定最终状态
+                else:
+                    if message:
+                        self._warnings.append(message)
+                    self._metrics.files_skipped += 1
+
+            try:
+                if workers > 1 and len(files) > 1:
+                    self._process_files_parallel(files, workers, collect)
+                else:
+                    for file_path in files:
+                        collect(file_path, self._process_file(file_path))
+            finally:
+                # 3. 计算处理时间并完成输出
+                processing_time = (datetime.now() - start_time).total_seconds()
+                self._metrics.processing_time_seconds = processing_time
+                output_path = sink.close(processing_time) if sink is not None else None
+
+            # 4. 确定最终状态
             if self._metrics.files_failed > 0:
                 status = ProcessingStatus.PARTIAL
             elif self._metrics.files_processed == 0:
@@ -296,8 +431,8 @@ class BaseProcessor(ABC):
                        f"处理={self._metrics.files_processed}, "
                        f"失败={self._metrics.files_failed}, "
                        f"跳过={self._metrics.files_skipped}, "
-                       f"实体={len(all_entities)}, "
-                       f"关系={len(all_relationships)}, "
+                       f"实体={self._metrics.entities_extracted}, "
+                       f"关系={self._metrics.relationships_extracted}, "
                        f"耗时={processing_time:.2f}秒")
 
             return ProcessingResult(
@@ -322,6 +457,93 @@ class BaseProcessor(ABC):
                 errors=[str(e)]
             )
 
+    def _process_file(self, file_path: Path):
+        """
+        对单个文件执行 提取 → 转换 → 验证
+
+        Args:
+            file_path: 文件路径
+
+        Returns:
+            (状态, 实体列表, 关系列表, 消息)，状态为 processed/skipped/failed
+        """
+        try:
+            # 提取
+            raw_data = self.extract(file_path)
+            if not raw_data:
+                return 'skipped', [], [], None
+
+            # 转换
+            transformed_data = self.transform(raw_data)
+            if not transformed_data:
+                return 'skipped', [], [], None
+
+            # 验证
+            if not self.validate(transformed_data):
+                return 'skipped', [], [], f"数据验证失败: {file_path.name}"
+
+            return (
+                'processed',
+                transformed_data.get('entities', []),
+                transformed_data.get('relationships', []),
+                None
+            )
+
+        except Exception as e:
+            return 'failed', [], [], str(e)
+
+    def _process_files_parallel(self, files: List[Path], workers: int, collect):
+        """
+        在进程池中并行处理文件
+
+        同时最多提交 2 * workers 个文件，按完成顺序交给 collect 处理，
+        各进程的指标、错误和警告合并到本处理器。
+
+        Args:
+            files: 文件列表
+            workers: 进程数
+            collect: 结果回调 collect(file_path, outcome)
+        """
+        workers = min(workers, len(files))
+        logger.info(f"使用 {workers} 个进程并行处理")
+
+        pending = {}
+        file_iter = iter(files)
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_process_worker,
+            initargs=(type(self), self.config)
+        ) as executor:
+            def submit_next() -> bool:
+                file_path = next(file_iter, None)
+                if file_path is None:
+                    return False
+                pending[executor.submit(_process_file_in_worker, file_path)] = file_path
+                return True
+
+            for _ in range(workers * 2):
+                if not submit_next():
+                    break
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    file_path = pending.pop(future)
+                    try:
+                        outcome, metrics, errors, warnings = future.result()
+                    except Exception as e:
+                        outcome, metrics, errors, warnings = ('failed', [], [], str(e)), None, [], []
+
+                    # 工作进程中 extract/transform 自行记录的指标
+                    if metrics is not None:
+                        self._metrics.merge(metrics)
+                    self._errors.extend(errors)
+                    self._warnings.extend(warnings)
+
+                    collect(file_path, outcome)
+                    submit_next()
+
     def _save_results(
         self,
         entities: List[Dict[str, Any]],
@@ -339,8 +561,6 @@ class BaseProcessor(ABC):
         Returns:
             输出文件路径
         """
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-
         # 确定输出目录
         if output_to:
             output_dir = Path(output_to)
@@ -349,33 +569,22 @@ class BaseProcessor(ABC):
 
         output_dir.mkdir(parents=True, exist_ok=True)
 
-        # 保存实体
-        if entities:
-            entities_file = output_dir / f"entities_{timestamp}.json"
-            with open(entities_file, 'w', encoding='utf-8') as f:
-                json.dump(entities, f, ensure_ascii=False, indent=2)
-            logger.debug(f"保存实体到: {entities_file}")
+        sink = ResultSink(output_dir, self.PROCESSOR_NAME, self.output_format)
+        sink.add(entities, relationships)
+        return sink.close(self._metrics.processing_time_seconds)
 
-        # 保存关系
-        if relationships:
-            relationships_file = output_dir / f"relationships_{timestamp}.json"
-            with open(relationships_file, 'w', encoding='utf-8') as f:
-                json.dump(relationships, f, ensure_ascii=False, indent=2)
-            logger.debug(f"保存关系到: {relationships_file}")
+    def _write_records(self, path_stem: Path, records: Iterable[Dict[str, Any]]) -> Path:
+        """
+        按处理器配置的输出格式写入记录
 
-        # 保存处理摘要
-        summary = {
-            "processor": self.PROCESSOR_NAME,
-            "timestamp": timestamp,
-            "entities_count": len(entities),
-            "relationships_count": len(relationships),
-            "processing_time": self._metrics.processing_time_seconds,
-        }
-        summary_file = output_dir / f"summary_{timestamp}.json"
-        with open(summary_file, 'w', encoding='utf-8') as f:
-            json.dump(summary, f, ensure_ascii=False, indent=2)
+        Args:
+            path_stem: 不含后缀的输出路径
+            records: 实体或关系记录
 
-        return summary_file
+        Returns:
+            输出文件路径（后缀由格式决定）
+        """
+        return write_records(path_stem, records, self.output_format)
 
     def generate_file_hash(self, file_path: Path) -> str:
         """
@@ -387,30 +596,46 @@ class BaseProcessor(ABC):
         Returns:
             文件的MD5哈希值
         """
-        hash_md5 = hashlib.md5()
-        with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_md5.update(chunk)
-        return hash_md5.hexdigest()
+        return file_hash(file_path)
+
+    @property
+    def manifest(self) -> ProcessedManifest:
+        """
+        已处理文件清单（首次访问时打开）
+
+        清单位于 archive/processed/<OUTPUT_SUBDIR>/manifest.sqlite，
+        同目录下旧版的 {hash}.processed 标记文件会在查询时迁移到清单。
+        """
+        if self._manifest is None:
+            archive_path = self.archive_dir / "processed" / self.OUTPUT_SUBDIR
+            self._manifest = ProcessedManifest(archive_path / "manifest.sqlite", legacy_dir=archive_path)
+        return self._manifest
 
     def is_processed(self, file_path: Path) -> bool:
         """
         检查文件是否已处理
 
+        文件大小、mtime 和 inode 与清单一致时直接返回，不读取文件内容。
+
         Args:
             file_path: 文件路径
 
         Returns:
             是否已处理
         """
-        # 检查归档目录
-        archive_path = self.archive_dir / "processed" / self.OUTPUT_SUBDIR
-        if archive_path.exists():
-            file_hash = self.generate_file_hash(file_path)
-            hash_file = archive_path / f"{file_hash}.processed"
-            return hash_file.exists()
+        return self.manifest.is_processed(file_path)
+
+    def filter_unprocessed(self, files: List[Path]) -> List[Path]:
+        """
+        批量筛选需要处理的文件（未处理或内容已变化）
 
-        return False
+        Args:
+            files: 候选文件列表
+
+        Returns:
+            需要处理的文件列表（保持原顺序）
+        """
+        return self.manifest.dirty(files)
 
     def mark_as_processed(self, file_path: Path):
         """
@@ -419,16 +644,18 @@ class BaseProcessor(ABC):
         Args:
             file_path: 文件路径
         """
-        archive_path = self.archive_dir / "processed" / self.OUTPUT_SUBDIR
-        archive_path.mkdir(parents=True, exist_ok=True)
+        self.manifest.mark_processed(file_path, processor=self.PROCESSOR_NAME)
 
-        file_hash = self.generate_file_hash(file_path)
-        hash_file = archive_path / f"{file_hash}.processed"
+    @property
+    def drug_resolver(self) -> Optional[DrugNameResolver]:
+        """
+        共享的药物名称 → ChEMBL 解析器（首次访问时加载）
 
-        with open(hash_file, 'w') as f:
-            json.dump({
-                "file_path": str(file_path),
-                "file_hash": file_hash,
-                "processed_at": datetime.now().isoformat(),
-                "processor": self.PROCESSOR_NAME
-            }, f, indent=2)
+        索引目录由配置项 drug_resolver_index 指定，默认 processed/drug_resolver；
+        同一进程内的处理器共享同一个内存映射索引。索引不存在时为 None。
+        """
+        if not self._drug_resolver_loaded:
+            index_dir = self.config.get('drug_resolver_index') or self.processed_dir / "drug_resolver"
+            self._drug_resolver = get_drug_resolver(index_dir)
+            self._drug_resolver_loaded = True
+        return self._drug_resolver
@@ -1379,19 +1379,13 @@ class ChEMBLProcessor(BaseProcessor):
                 continue
 
             type_name = entity_type.replace('rd:', '').lower()
-            entities_file = output_dir / f"chembl_{type_name}s_{timestamp}.json"
-
-            with open(entities_file, 'w', encoding='utf-8') as f:
-                json.dump(entities, f, ensure_ascii=False, indent=2)
+            entities_file = self._write_records(output_dir / f"chembl_{type_name}s_{timestamp}", entities)
 
             logger.info(f"保存 {len(entities)} 个 {entity_type} 到: {entities_file}")
 
         # 保存关系
         if all_relationships:
-            relationships_file = output_dir / f"chembl_relationships_{timestamp}.json"
-
-            with open(relationships_file, 'w', encoding='utf-8') as f:
-                json.dump(all_relationships, f, ensure_ascii=False, indent=2)
+            relationships_file = self._write_records(output_dir / f"chembl_relationships_{timestamp}", all_relationships)
 
             logger.info(f"保存 {len(all_relationships)} 个关系到: {relationships_file}")
 
@@ -1502,11 +1502,9 @@ class ClinicalTrialsProcessor(BaseProcessor):
         if intervention_name in self.chembl_cache:
             return self.chembl_cache[intervention_name]
 
-        # 这里应该实现实际的映射逻辑
-        # 例如：通过本地 ChEMBL 数据库查询或 API 调用
-        # 目前返回 None 作为占位符
-
-        chembl_id = None
+        # 通过共享的药物名称索引解析（索引未构建时不映射）
+        resolver = self.drug_resolver
+        chembl_id = resolver.resolve(intervention_name) if resolver else None
 
         # 缓存结果
         self.chembl_cache[intervention_name] = chembl_id
@@ -1734,19 +1732,13 @@ class ClinicalTrialsProcessor(BaseProcessor):
                 continue
 
             type_name = entity_type.replace('clinical:', '').lower()
-            entities_file = output_dir / f"clinicaltrials_{type_name}s_{timestamp}.json"
-
-            with open(entities_file, 'w', encoding='utf-8') as f:
-                json.dump(entity_list, f, ensure_ascii=False, indent=2)
+            entities_file = self._write_records(output_dir / f"clinicaltrials_{type_name}s_{timestamp}", entity_list)
 
             logger.info(f"Saved {len(entity_list)} {entity_type} entities to: {entities_file}")
 
         # 保存关系
         if relationships:
-            relationships_file = output_dir / f"clinicaltrials_relationships_{timestamp}.json"
-
-            with open(relationships_file, 'w', encoding='utf-8') as f:
-                json.dump(relationships, f, ensure_ascii=False, indent=2)
+            relationships_file = self._write_records(output_dir / f"clinicaltrials_relationships_{timestamp}", relationships)
 
             logger.info(f"Saved {len(relationships)} relationships to: {relationships_file}")
 
@@ -63,7 +63,7 @@ class CRLProcessor(BaseProcessor):
             files.extend(source_path.rglob(f"*{ext}"))
 
         # 排除已处理的文件
-        unprocessed_files = [f for f in files if not self.is_processed(f)]
+        unprocessed_files = self.filter_unprocessed(files)
 
         return unprocessed_files
 
@@ -291,6 +291,11 @@ class CRLProcessor(BaseProcessor):
         matches = re.findall(pattern3, text, re.IGNORECASE)
         drug_names.extend(matches)
 
+        # 模式4: 药物名称词典匹配（已构建药物名称索引时）
+        resolver = self.drug_resolver
+        if resolver is not None:
+            drug_names.extend(mention['text'] for mention in resolver.find_mentions(text))
+
         # 去重并返回
         seen = set()
         unique_names = []
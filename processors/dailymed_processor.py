@@ -21,11 +21,54 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 import time
 
 from processors.base import BaseProcessor, ProcessingResult, ProcessingStatus, ProcessingMetrics
+from processors.http_cache import get_http_cache, install_http_cache
+from processors.term_tagger import get_term_tagger
 
 
 logger = logging.getLogger(__name__)
 
 
+# 内置不良事件术语及其常见屈折形式（未配置 MedDRA 时使用，MedDRA 术语优先）
+# 标注按整词匹配，复数/形容词形式需要单独列出，统一归到基本词的标签
+_DEFAULT_ADVERSE_EVENT_VARIANTS = {
+    'nausea': ('nauseated', 'nauseous'),
+    'vomiting': ('vomit', 'vomited'),
+    'diarrhea': ('diarrhoea',),
+    'headache': ('headaches',),
+    'dizziness': ('dizzy',),
+    'rash': ('rashes',),
+    'fever': ('fevers', 'febrile'),
+    'fatigue': ('fatigued',),
+    'pain': ('pains', 'painful'),
+    'infection': ('infections',),
+    'hypersensitivity': ('hypersensitivities',),
+    'anaphylaxis': ('anaphylactic',),
+    'hepatotoxicity': ('hepatotoxicities',),
+    'cardiotoxicity': ('cardiotoxicities',),
+    'nephrotoxicity': ('nephrotoxicities',),
+    'myelosuppression': (),
+}
+
+DEFAULT_ADVERSE_EVENT_TERMS = tuple(
+    (variant, None, term.title())
+    for term, variants in _DEFAULT_ADVERSE_EVENT_VARIANTS.items()
+    for variant in (term,) + variants
+)
+
+# 未配置 MONDO 术语时的疾病名称模式（预编译；逐个扫描，不同模式的匹配可以重叠）
+_DISEASE_FALLBACK_PATTERNS = tuple(
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in (
+        r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\s+(?:disease|disorder|syndrome|condition)\b',
+        r'\b(?:treatment|indicated|used)\s+for\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)',
+        r'\b(?:patients?\s+with)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)'
+    )
+)
+
+# 描述因果关系的句子（"may cause" 等）
+_CAUSAL_SENTENCE_PATTERN = re.compile(r'may cause|can cause|associated with', re.IGNORECASE)
+
+
 class DailyMedExtractionType(str, Enum):
     """DailyMed 提取类型枚举"""
     COMPOUNDS = "compounds"
@@ -57,6 +100,10 @@ class DailyMedExtractionConfig:
     api_base_url: str = "https://dailymed.nlm.nih.gov/dailymed/api/v2"
     download_dir: Optional[str] = None
     use_api: bool = True  # 使用 API 还是本地文件
+    http_cache: bool = True  # 使用共享 HTTP 缓存（条件请求重新验证）
+    meddra_dir: Optional[str] = None  # MedDRA ASCII 目录（默认 sources/meddra）
+    mondo_terms: Optional[str] = None  # MONDO .obo/.json/.tsv（默认 sources/mondo/mondo.obo）
+    term_files: List[str] = field(default_factory=list)  # 额外的不良事件词表
 
 
 @dataclass
@@ -136,6 +183,15 @@ class DailyMedProcessor(BaseProcessor):
             'User-Agent': 'PharmaKG-DailyMedProcessor/1.0'
         })
 
+        # 共享 HTTP 缓存
+        self.http_cache = None
+        if self.extraction_config.http_cache:
+            self.http_cache = get_http_cache(self.data_root / "cache")
+            install_http_cache(self.session, source="dailymed", cache=self.http_cache)
+
+        # 术语标注器（同一进程内按来源共享）
+        self.adverse_event_tagger, self.disease_tagger = self._init_term_taggers()
+
         # 输出文件路径
         self.output_compounds = self.entities_output_dir / "dailymed_compounds.json"
         self.output_conditions = self.entities_output_dir / "dailymed_conditions.json"
@@ -339,6 +395,36 @@ class DailyMedProcessor(BaseProcessor):
 
         return ingredients
 
+    def _init_term_taggers(self):
+        """
+        加载不良事件（MedDRA + 内置术语）和疾病（MONDO）标注器
+
+        Returns:
+            (不良事件标注器, 疾病标注器或 None)
+        """
+        meddra_dir = self.extraction_config.meddra_dir
+        if meddra_dir is None and (self.sources_dir / "meddra").exists():
+            meddra_dir = self.sources_dir / "meddra"
+
+        mondo_path = self.extraction_config.mondo_terms
+        if mondo_path is None and (self.sources_dir / "mondo" / "mondo.obo").exists():
+            mondo_path = self.sources_dir / "mondo" / "mondo.obo"
+
+        adverse_event_tagger = get_term_tagger(
+            "adverse_events",
+            meddra_dir=meddra_dir,
+            term_files=self.extraction_config.term_files,
+            default_terms=DEFAULT_ADVERSE_EVENT_TERMS
+        )
+
+        disease_tagger = None
+        if mondo_path:
+            disease_tagger = get_term_tagger("diseases", mondo_path=mondo_path, min_length=3)
+            if not len(disease_tagger):
+                disease_tagger = None
+
+        return adverse_event_tagger, disease_tagger
+
     def _extract_indications(self, root: ET.Element, namespaces: Dict, compound_data: Dict) -> List[Dict]:
         """提取适应症"""
         indications = []
@@ -357,7 +443,9 @@ class DailyMedProcessor(BaseProcessor):
                     indications.append({
                         'drug_id': compound_data.get('set_id'),
                         'drug_name': compound_data.get('generic_name'),
-                        'disease_name': disease,
+                        'disease_name': disease['name'],
+                        'mondo_id': disease['id'],
+                        'spans': disease['spans'],
                         'indication_type': 'primary',
                         'description': text[:500] if text else ''
                     })
@@ -383,7 +471,9 @@ class DailyMedProcessor(BaseProcessor):
                     contraindications.append({
                         'drug_id': compound_data.get('set_id'),
                         'drug_name': compound_data.get('generic_name'),
-                        'disease_name': disease,
+                        'disease_name': disease['name'],
+                        'mondo_id': disease['id'],
+                        'spans': disease['spans'],
                         'severity': 'severe',
                         'description': text[:500] if text else ''
                     })
@@ -409,7 +499,9 @@ class DailyMedProcessor(BaseProcessor):
                     warnings.append({
                         'drug_id': compound_data.get('set_id'),
                         'drug_name': compound_data.get('generic_name'),
-                        'condition_name': condition,
+                        'condition_name': condition['name'],
+                        'mondo_id': condition['id'],
+                        'spans': condition['spans'],
                         'warning_type': 'precaution',
                         'description': text[:500] if text else ''
                     })
@@ -435,7 +527,9 @@ class DailyMedProcessor(BaseProcessor):
                     boxed_warnings.append({
                         'drug_id': compound_data.get('set_id'),
                         'drug_name': compound_data.get('generic_name'),
-                        'event_name': event,
+                        'event_name': event['name'],
+                        'meddra_pt_code': event['id'],
+                        'spans': event['spans'],
                         'severity': 'severe',
                         'description': text[:500] if text else '',
                         'is_boxed_warning': True
@@ -455,15 +549,18 @@ class DailyMedProcessor(BaseProcessor):
             if title and 'adverse reaction' in title.lower():
                 text = self._find_text(section, './/text', namespaces)
 
-                # 解析不良事件
+                # 解析不良事件（严重程度按章节文本判断，每个章节只计算一次）
                 events = self._parse_adverse_events_from_text(text)
+                severity = self._determine_severity(None, text) if events else None
 
                 for event in events:
                     adverse_events.append({
                         'drug_id': compound_data.get('set_id'),
                         'drug_name': compound_data.get('generic_name'),
-                        'event_name': event,
-                        'severity': self._determine_severity(event, text),
+                        'event_name': event['name'],
+                        'meddra_pt_code': event['id'],
+                        'spans': event['spans'],
+                        'severity': severity,
                         'description': text[:500] if text else ''
                     })
                     self.stats.adverse_events_extracted += 1
@@ -498,59 +595,69 @@ class DailyMedProcessor(BaseProcessor):
 
         return pharmacogenomics
 
-    def _parse_diseases_from_text(self, text: str) -> List[str]:
-        """从文本中解析疾病名称"""
-        if not text:
-            return []
+    def _parse_diseases_from_text(self, text: str) -> List[Dict[str, Any]]:
+        """
+        从文本中解析疾病名称
 
-        diseases = []
+        配置了 MONDO 术语时使用词典标注器（单次扫描），否则退回名称模式匹配。
 
-        # 简单的疾病名称模式匹配
-        # 匹配大写开头的词组
-        patterns = [
-            r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\s+(?:disease|disorder|syndrome|condition)\b',
-            r'\b(?:treatment|indicated|used)\s+for\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)',
-            r'\b(?:patients?\s+with)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)'
-        ]
+        Returns:
+            [{'name', 'id'（MONDO ID 或 None）, 'spans': [(start, end), ...]}]
+        """
+        if not text:
+            return []
 
-        for pattern in patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
-                disease = match.group(1) if match.lastindex else match.group(0)
-                disease = disease.strip()
-                if len(disease) > 2 and disease not in diseases:
-                    diseases.append(disease)
+        if self.disease_tagger is not None:
+            return self.disease_tagger.tag_grouped(text)
+
+        diseases: Dict[str, Dict[str, Any]] = {}
+        for pattern in _DISEASE_FALLBACK_PATTERNS:
+            for match in pattern.finditer(text):
+                group = 1 if match.lastindex else 0
+                disease = match.group(group).strip()
+                if len(disease) <= 2:
+                    continue
+                span = match.span(group)
+                if disease in diseases:
+                    diseases[disease]['spans'].append(span)
+                else:
+                    diseases[disease] = {'name': disease, 'id': None, 'spans': [span]}
+
+        return list(diseases.values())
+
+    def _parse_adverse_events_from_text(self, text: str) -> List[Dict[str, Any]]:
+        """
+        从文本中解析不良事件
 
-        return diseases
+        术语匹配由标注器完成（整段文本一次小写化、一次扫描）；
+        另外保留描述因果关系的短句（"may cause" 等）。
 
-    def _parse_adverse_events_from_text(self, text: str) -> List[str]:
-        """从文本中解析不良事件"""
+        Returns:
+            [{'name', 'id'（MedDRA PT 代码或 None）, 'spans': [(start, end), ...]}]
+        """
         if not text:
             return []
 
-        events = []
-
-        # 常见不良事件关键词
-        adverse_keywords = [
-            'nausea', 'vomiting', 'diarrhea', 'headache', 'dizziness',
-            'rash', 'fever', 'fatigue', 'pain', 'infection',
-            'hypersensitivity', 'anaphylaxis', 'hepatotoxicity',
-            'cardiotoxicity', 'nephrotoxicity', 'myelosuppression'
-        ]
-
-        for keyword in adverse_keywords:
-            if keyword.lower() in text.lower():
-                events.append(keyword.title())
+        events = self.adverse_event_tagger.tag_grouped(text)
+        seen = {event['name'] for event in events}
 
         # 提取以句号分隔的不良事件列表
-        sentences = text.split('.')
-        for sentence in sentences[:20]:  # 限制处理数量
-            sentence = sentence.strip()
-            if len(sentence) > 3 and len(sentence) < 100:
-                if any(adverse in sentence.lower() for adverse in ['may cause', 'can cause', 'associated with']):
-                    events.append(sentence[:50])
-
-        return list(set(events))
+        offset = 0
+        for index, sentence in enumerate(text.split('.')):
+            start = offset
+            offset += len(sentence) + 1
+            if index >= 20:  # 限制处理数量
+                break
+
+            stripped = sentence.strip()
+            if 3 < len(stripped) < 100 and _CAUSAL_SENTENCE_PATTERN.search(stripped):
+                name = stripped[:50]
+                if name not in seen:
+                    seen.add(name)
+                    start += sentence.index(stripped)
+                    events.append({'name': name, 'id': None, 'spans': [(start, start + len(name))]})
+
+        return events
 
     def _parse_biomarkers_from_text(self, text: str) -> List[Dict]:
         """从文本中解析生物标志物"""
@@ -874,9 +981,13 @@ class DailyMedProcessor(BaseProcessor):
                 'version': 'latest'
             }
 
+            identifiers = {'name': condition_name}
+            if condition_data.get('mondo_id'):
+                identifiers['MONDO'] = condition_data['mondo_id']
+
             return {
                 'primary_id': primary_id,
-                'identifiers': {'name': condition_name},
+                'identifiers': identifiers,
                 'properties': properties,
                 'entity_type': 'clinical:Condition'
             }
@@ -939,9 +1050,13 @@ class DailyMedProcessor(BaseProcessor):
                 'version': 'latest'
             }
 
+            identifiers = {'name': event_name}
+            if ae_data.get('meddra_pt_code'):
+                identifiers['MedDRA'] = ae_data['meddra_pt_code']
+
             return {
                 'primary_id': primary_id,
-                'identifiers': {'name': event_name},
+                'identifiers': identifiers,
                 'properties': properties,
                 'entity_type': 'clinical:AdverseEvent'
             }
@@ -1280,7 +1395,8 @@ class DailyMedProcessor(BaseProcessor):
                     'max_files': self.extraction_config.max_files,
                     'query': self.extraction_config.query,
                     'use_api': self.extraction_config.use_api,
-                    'api_calls_made': self.stats.api_calls_made
+                    'api_calls_made': self.stats.api_calls_made,
+                    'http_cache': self.http_cache.get_stats("dailymed") if self.http_cache else None
                 },
                 'stats': {
                     'compounds': len([e for e in all_entities if e.get('entity_type') == 'rd:Compound']),
@@ -1347,19 +1463,13 @@ class DailyMedProcessor(BaseProcessor):
                 continue
 
             type_name = entity_type.replace(':', '_').lower()
-            entities_file = output_dir / f"dailymed_{type_name}s_{timestamp}.json"
-
-            with open(entities_file, 'w', encoding='utf-8') as f:
-                json.dump(entities, f, ensure_ascii=False, indent=2)
+            entities_file = self._write_records(output_dir / f"dailymed_{type_name}s_{timestamp}", entities)
 
             logger.info(f"保存 {len(entities)} 个 {entity_type} 到: {entities_file}")
 
         # 保存关系
         if all_relationships:
-            relationships_file = output_dir / f"dailymed_relationships_{timestamp}.json"
-
-            with open(relationships_file, 'w', encoding='utf-8') as f:
-                json.dump(all_relationships, f, ensure_ascii=False, indent=2)
+            relationships_file = self._write_records(output_dir / f"dailymed_relationships_{timestamp}", all_relationships)
 
             logger.info(f"保存 {len(all_relationships)} 个关系到: {relationships_file}")
 
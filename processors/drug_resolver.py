@@ -0,0 +1,833 @@
+#===========================================================
+# PharmaKG 药物名称解析器
+# Pharmaceutical Knowledge Graph - Drug Name → ChEMBL Resolver
+#===========================================================
+# 版本: v1.0
+# 描述: 由主实体映射表和 ChEMBL/DrugBank 同义词一次性构建的
+#       药物名称索引（规范化名称 → ChEMBL ID），索引以内存映射方式
+#       加载并在进程间共享；自由文本通过词级 Aho-Corasick 自动机匹配
+#===========================================================
+
+import argparse
+import bisect
+import hashlib
+import json
+import logging
+import mmap
+import re
+import sqlite3
+import sys
+import threading
+import unicodedata
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from processors.storage import find_outputs, iter_records
+from processors.term_tagger import TermTagger
+
+logger = logging.getLogger(__name__)
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+PathLike = Union[str, Path]
+
+# 索引格式版本（规范化规则变化时递增，旧索引需要重建）
+INDEX_VERSION = 1
+
+# 名称来源优先级（数值越小越优先，同名冲突时保留优先级高的映射）
+SOURCE_PRIORITY = {
+    "master_entity_map": 0,
+    "chembl": 1,
+    "drugbank": 2,
+}
+
+# 参与自由文本匹配的名称最短长度
+MIN_FREE_TEXT_LENGTH = 4
+
+# 索引目录中的文件
+_KEYS_FILE = "keys.bin"
+_VALUES_FILE = "values.bin"
+_IDS_FILE = "ids.txt"
+_NAMES_FILE = "names.txt"
+_METADATA_FILE = "metadata.json"
+
+
+#===========================================================
+# 名称规范化
+#===========================================================
+
+# 盐型/水合物（仅在去除后仍剩余其他词时去除）
+SALT_TERMS = frozenset({
+    "acetate", "anhydrous", "besylate", "besilate", "bitartrate", "bromide", "calcium",
+    "carbonate", "chloride", "citrate", "dihydrate", "dihydrochloride", "dimesylate",
+    "disodium", "dipotassium", "fumarate", "gluconate", "hcl", "hemihydrate", "hyclate",
+    "hydrobromide", "hydrochloride", "hydrate", "iodide", "lactate", "magnesium", "maleate",
+    "malate", "mesylate", "mesilate", "monohydrate", "monosodium", "nitrate", "oxalate",
+    "phosphate", "potassium", "propionate", "sesquihydrate", "sodium", "stearate",
+    "succinate", "sulfate", "sulphate", "tartrate", "tosylate", "trihydrate", "trometamol",
+    "tromethamine", "valerate",
+})
+
+# 剂型、给药途径和规格描述词
+FORM_TERMS = frozenset({
+    "aerosol", "capsule", "capsules", "cap", "caps", "cream", "delayed", "drops", "er",
+    "extended", "film", "coated", "gel", "granules", "inhalation", "inhaler", "injectable",
+    "injection", "intravenous", "iv", "kit", "lotion", "modified", "ointment", "oral",
+    "patch", "powder", "release", "solution", "sr", "spray", "suppository", "suspension",
+    "syrup", "tab", "tablet", "tablets", "tabs", "topical", "transdermal", "xl", "xr",
+})
+
+# 剂量表达式，例如 "500 mg"、"0.5mg/ml"、"10 %"
+_DOSE_PATTERN = re.compile(
+    r"\d+(?:[.,]\d+)?\s*(?:mg|mcg|µg|ug|g|kg|ml|l|iu|units?|meq|mmol|%)"
+    r"(?:\s*/\s*\d*(?:[.,]\d+)?\s*(?:mg|mcg|g|kg|ml|l|h|hr|hrs|dose|actuation)\b)?",
+    re.IGNORECASE
+)
+
+_PAREN_PATTERN = re.compile(r"[(\[]([^()\[\]]+)[)\]]")
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def normalize_drug_name(name: Optional[str]) -> str:
+    """
+    规范化药物名称
+
+    NFKC + casefold，去除剂量、剂型/给药途径描述词和标点；
+    盐型词（hydrochloride、sodium 等）仅在去除后仍有其他词时去除，
+    因此 "metformin hydrochloride 500 mg tablet" → "metformin"，
+    而 "sodium chloride" 保持不变。
+
+    Args:
+        name: 原始名称
+
+    Returns:
+        规范化名称（无法规范化时为空字符串）
+    """
+    if not name:
+        return ""
+
+    text = unicodedata.normalize("NFKC", str(name)).casefold()
+    text = _DOSE_PATTERN.sub(" ", text)
+    tokens = [t for t in _TOKEN_PATTERN.findall(text) if t not in FORM_TERMS and t != "_"]
+    if not tokens:
+        return ""
+
+    stripped = [t for t in tokens if t not in SALT_TERMS]
+    return " ".join(stripped or tokens)
+
+
+def name_variants(name: Optional[str]) -> List[str]:
+    """
+    生成名称的候选规范化形式（完整名称优先，其次为括号内的名称）
+
+    例如 FAERS 中常见的 "LIPITOR (ATORVASTATIN CALCIUM)" 会生成
+    ["lipitor atorvastatin", "lipitor", "atorvastatin"]。
+    """
+    if not name:
+        return []
+
+    variants = []
+    candidates = [name, _PAREN_PATTERN.sub(" ", name)] + _PAREN_PATTERN.findall(name)
+    for candidate in candidates:
+        normalized = normalize_drug_name(candidate)
+        if normalized and normalized not in variants:
+            variants.append(normalized)
+    return variants
+
+
+def name_key(normalized: str) -> int:
+    """规范化名称的稳定 64 位哈希（跨进程一致，用作索引键）"""
+    return int.from_bytes(hashlib.blake2b(normalized.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+#===========================================================
+# 索引构建
+#===========================================================
+
+class DrugNameIndexBuilder:
+    """
+    药物名称索引构建器
+
+    规范化名称 → ChEMBL ID。同一名称出现多个 ID 时保留来源优先级更高
+    （主实体映射表 > ChEMBL > DrugBank）且先出现的映射，并计入冲突数。
+    品牌名直接映射到其通用名对应的 ChEMBL ID。
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, Tuple[int, str]] = {}
+        self.stats = {
+            "names_added": 0,
+            "conflicts": 0,
+            "sources": {}
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, name: Optional[str], chembl_id: Optional[str], source: str) -> bool:
+        """
+        添加名称映射
+
+        Args:
+            name: 原始名称
+            chembl_id: ChEMBL ID
+            source: 来源（SOURCE_PRIORITY 中的键）
+
+        Returns:
+            是否写入（或覆盖）了映射
+        """
+        if not name or not chembl_id or not str(chembl_id).upper().startswith("CHEMBL"):
+            return False
+
+        normalized = normalize_drug_name(name)
+        if not normalized:
+            return False
+
+        chembl_id = str(chembl_id).upper()
+        priority = SOURCE_PRIORITY.get(source, len(SOURCE_PRIORITY))
+        existing = self._entries.get(normalized)
+
+        if existing is not None:
+            if existing[1] == chembl_id:
+                return False
+            self.stats["conflicts"] += 1
+            if existing[0] <= priority:
+                return False
+
+        self._entries[normalized] = (priority, chembl_id)
+        self.stats["names_added"] += 1
+        self.stats["sources"][source] = self.stats["sources"].get(source, 0) + 1
+        return True
+
+    #===========================================================
+    # 数据源
+    #===========================================================
+
+    def add_master_entity_map(self, db_path: PathLike) -> int:
+        """
+        从主实体映射表（tools/build_master_entity_map.py 生成的 SQLite）添加名称
+
+        Args:
+            db_path: master_entity_map.db 路径
+
+        Returns:
+            写入的名称数
+        """
+        added = 0
+        conn = sqlite3.connect(f"file:{Path(db_path)}?mode=ro", uri=True)
+        try:
+            cursor = conn.execute("""
+                SELECT chembl_id, pref_name, generic_name, brand_name
+                FROM compound_mapping
+                WHERE chembl_id IS NOT NULL
+            """)
+            for chembl_id, pref_name, generic_name, brand_name in cursor:
+                for name in (pref_name, generic_name, *_split_names(brand_name)):
+                    added += self.add(name, chembl_id, "master_entity_map")
+        finally:
+            conn.close()
+
+        logger.info(f"Master entity map: {added} names from {db_path}")
+        return added
+
+    def add_chembl_database(self, db_path: PathLike) -> int:
+        """
+        从 ChEMBL SQLite 数据库添加首选名和同义词（molecule_synonyms）
+
+        盐型分子通过 molecule_hierarchy 映射到母体分子的 ChEMBL ID。
+
+        Args:
+            db_path: ChEMBL SQLite 文件
+
+        Returns:
+            写入的名称数
+        """
+        added = 0
+        conn = sqlite3.connect(f"file:{Path(db_path)}?mode=ro", uri=True)
+        try:
+            parent_id = """
+                COALESCE(
+                    (SELECT p.chembl_id FROM molecule_hierarchy mh
+                     JOIN molecule_dictionary p ON p.molregno = mh.parent_molregno
+                     WHERE mh.molregno = md.molregno),
+                    md.chembl_id
+                )
+            """
+            cursor = conn.execute(f"""
+                SELECT {parent_id}, md.pref_name
+                FROM molecule_dictionary md
+                WHERE md.pref_name IS NOT NULL
+            """)
+            for chembl_id, name in cursor:
+                added += self.add(name, chembl_id, "chembl")
+
+            cursor = conn.execute(f"""
+                SELECT {parent_id}, ms.synonyms
+                FROM molecule_synonyms ms
+                JOIN molecule_dictionary md ON md.molregno = ms.molregno
+                WHERE ms.synonyms IS NOT NULL
+            """)
+            for chembl_id, name in cursor:
+                added += self.add(name, chembl_id, "chembl")
+        except sqlite3.OperationalError as e:
+            logger.warning(f"ChEMBL database {db_path} is missing expected tables: {e}")
+        finally:
+            conn.close()
+
+        logger.info(f"ChEMBL database: {added} names from {db_path}")
+        return added
+
+    def add_chembl_outputs(self, directory: PathLike) -> int:
+        """
+        从 ChEMBL 处理器输出（chembl_compounds_*）添加化合物名称
+
+        Args:
+            directory: ChEMBL 处理器输出目录
+
+        Returns:
+            写入的名称数
+        """
+        compounds = []
+        chembl_by_molregno = {}
+        for path in find_outputs(directory, "chembl_compounds_*"):
+            for entity in iter_records(path):
+                chembl_id = entity.get("primary_id")
+                identifiers = entity.get("identifiers") or {}
+                properties = entity.get("properties") or {}
+                if identifiers.get("molregno"):
+                    chembl_by_molregno.setdefault(str(identifiers["molregno"]), chembl_id)
+                compounds.append((chembl_id, properties.get("name"), properties.get("parent_molregno")))
+
+        added = 0
+        for chembl_id, name, parent_molregno in compounds:
+            parent = chembl_by_molregno.get(str(parent_molregno)) if parent_molregno else None
+            added += self.add(name, parent or chembl_id, "chembl")
+
+        logger.info(f"ChEMBL outputs: {added} names from {directory}")
+        return added
+
+    def add_drugbank_outputs(self, directory: PathLike) -> int:
+        """
+        从 DrugBank 处理器输出（drugbank_compounds_*）添加通用名和品牌名
+
+        Args:
+            directory: DrugBank 处理器输出目录
+
+        Returns:
+            写入的名称数
+        """
+        added = 0
+        for path in find_outputs(directory, "drugbank_compounds_*"):
+            for entity in iter_records(path):
+                chembl_id = (entity.get("identifiers") or {}).get("ChEMBL")
+                if not chembl_id:
+                    continue
+                properties = entity.get("properties") or {}
+                names = [properties.get("name"), properties.get("generic_name")]
+                names.extend(properties.get("brand_names") or [])
+                names.extend(properties.get("synonyms") or [])
+                for name in names:
+                    added += self.add(name, chembl_id, "drugbank")
+
+        logger.info(f"DrugBank outputs: {added} names from {directory}")
+        return added
+
+    #===========================================================
+    # 输出
+    #===========================================================
+
+    def build(self) -> "DrugNameIndex":
+        """构建内存中的索引"""
+        return DrugNameIndex.from_mapping({name: entry[1] for name, entry in self._entries.items()})
+
+    def save(self, index_dir: PathLike) -> Path:
+        """
+        构建并保存索引
+
+        Args:
+            index_dir: 索引目录
+
+        Returns:
+            索引目录
+        """
+        mapping = {name: entry[1] for name, entry in self._entries.items()}
+        return write_index(index_dir, mapping, {"build_stats": self.stats})
+
+
+def _split_names(value: Any) -> List[str]:
+    """拆分以列表、JSON 数组或分隔符存储的多个名称"""
+    if not value:
+        return []
+    if isinstance(value, (list, tuple)):
+        return [str(v) for v in value if v]
+    text = str(value)
+    if text.startswith("["):
+        try:
+            return [str(v) for v in json.loads(text) if v]
+        except ValueError:
+            pass
+    return [part for part in re.split(r"[;|]", text) if part.strip()]
+
+
+def write_index(index_dir: PathLike, mapping: Dict[str, str], metadata: Optional[Dict[str, Any]] = None) -> Path:
+    """
+    将 {规范化名称: ChEMBL ID} 写入索引目录
+
+    键文件为按哈希排序的 uint64 数组，值文件为对应的 uint32 ID 下标，
+    加载时两者均以内存映射方式打开，多个进程共享同一份页缓存。
+
+    Args:
+        index_dir: 索引目录
+        mapping: 规范化名称到 ChEMBL ID 的映射
+        metadata: 额外元数据
+
+    Returns:
+        索引目录
+    """
+    index_dir = Path(index_dir)
+    index_dir.mkdir(parents=True, exist_ok=True)
+
+    ids = sorted(set(mapping.values()))
+    id_index = {chembl_id: i for i, chembl_id in enumerate(ids)}
+
+    entries = sorted((name_key(name), id_index[chembl_id], name) for name, chembl_id in mapping.items())
+
+    # 64 位哈希碰撞极少见，出现时保留第一个
+    deduplicated = []
+    last_key = None
+    for entry in entries:
+        if entry[0] == last_key:
+            logger.warning(f"Hash collision for drug name '{entry[2]}', skipped")
+            continue
+        deduplicated.append(entry)
+        last_key = entry[0]
+
+    keys = memoryview(bytearray(8 * len(deduplicated))).cast("Q")
+    values = memoryview(bytearray(4 * len(deduplicated))).cast("I")
+    for i, (key, value, _) in enumerate(deduplicated):
+        keys[i] = key
+        values[i] = value
+
+    (index_dir / _KEYS_FILE).write_bytes(keys.tobytes())
+    (index_dir / _VALUES_FILE).write_bytes(values.tobytes())
+    (index_dir / _IDS_FILE).write_text("\n".join(ids), encoding="utf-8")
+    (index_dir / _NAMES_FILE).write_text("\n".join(entry[2] for entry in deduplicated), encoding="utf-8")
+
+    with open(index_dir / _METADATA_FILE, "w", encoding="utf-8") as f:
+        json.dump({
+            "version": INDEX_VERSION,
+            "byteorder": sys.byteorder,
+            "names": len(deduplicated),
+            "compounds": len(ids),
+            "built_at": datetime.now().isoformat(),
+            **(metadata or {})
+        }, f, ensure_ascii=False, indent=2)
+
+    logger.info(f"Drug name index: {len(deduplicated)} names → {len(ids)} compounds in {index_dir}")
+    return index_dir
+
+
+#===========================================================
+# 索引
+#===========================================================
+
+class DrugNameIndex:
+    """
+    规范化名称 → ChEMBL ID 的只读索引
+
+    键为排序的 64 位名称哈希，通过二分查找定位；从磁盘加载时键和值均为
+    内存映射，查询不需要把整个索引读入内存。
+    """
+
+    def __init__(self, keys, values, ids: List[str], names_path: Optional[Path] = None,
+                 names: Optional[List[str]] = None, metadata: Optional[Dict[str, Any]] = None):
+        self._keys = keys
+        self._values = values
+        self.ids = ids
+        self.metadata = metadata or {}
+        self._names_path = names_path
+        self._names = names
+        self._mmaps: List[mmap.mmap] = []
+
+        self._np_keys = None
+        self._np_values = None
+
+    @classmethod
+    def from_mapping(cls, mapping: Dict[str, str]) -> "DrugNameIndex":
+        """由内存中的映射构建索引（主要用于测试和小规模数据）"""
+        ids = sorted(set(mapping.values()))
+        id_index = {chembl_id: i for i, chembl_id in enumerate(ids)}
+        entries = sorted((name_key(name), id_index[chembl_id], name) for name, chembl_id in mapping.items())
+        return cls(
+            keys=[entry[0] for entry in entries],
+            values=[entry[1] for entry in entries],
+            ids=ids,
+            names=[entry[2] for entry in entries]
+        )
+
+    @classmethod
+    def load(cls, index_dir: PathLike) -> "DrugNameIndex":
+        """
+        以内存映射方式加载索引
+
+        Args:
+            index_dir: write_index 生成的目录
+
+        Raises:
+            FileNotFoundError: 索引不存在
+            ValueError: 索引版本或字节序不匹配
+        """
+        index_dir = Path(index_dir)
+        with open(index_dir / _METADATA_FILE, "r", encoding="utf-8") as f:
+            metadata = json.load(f)
+
+        if metadata.get("version") != INDEX_VERSION:
+            raise ValueError(f"Drug name index version {metadata.get('version')} != {INDEX_VERSION}, rebuild required")
+        if metadata.get("byteorder") != sys.byteorder:
+            raise ValueError(f"Drug name index was built on a {metadata.get('byteorder')}-endian machine")
+
+        ids = (index_dir / _IDS_FILE).read_text(encoding="utf-8").split("\n")
+        index = cls(keys=[], values=[], ids=ids, names_path=index_dir / _NAMES_FILE, metadata=metadata)
+
+        if metadata.get("names", 0):
+            key_map = _map_file(index_dir / _KEYS_FILE)
+            value_map = _map_file(index_dir / _VALUES_FILE)
+            index._mmaps = [key_map, value_map]
+            index._keys = memoryview(key_map).cast("Q")
+            index._values = memoryview(value_map).cast("I")
+
+        return index
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def lookup(self, normalized: str) -> Optional[str]:
+        """查询规范化名称"""
+        if not normalized:
+            return None
+        key = name_key(normalized)
+        pos = bisect.bisect_left(self._keys, key)
+        if pos < len(self._keys) and self._keys[pos] == key:
+            return self.ids[self._values[pos]]
+        return None
+
+    def lookup_many(self, normalized: Sequence[str]) -> List[Optional[str]]:
+        """
+        批量查询规范化名称（可用 NumPy 时向量化二分查找）
+
+        Args:
+            normalized: 规范化名称列表
+
+        Returns:
+            与输入对齐的 ChEMBL ID 列表
+        """
+        if not NUMPY_AVAILABLE or len(self._keys) == 0:
+            return [self.lookup(name) for name in normalized]
+
+        if self._np_keys is None:
+            self._np_keys = np.asarray(self._keys, dtype=np.uint64)
+            self._np_values = np.asarray(self._values, dtype=np.uint32)
+
+        keys = np.fromiter((name_key(name) if name else 0 for name in normalized),
+                           dtype=np.uint64, count=len(normalized))
+        positions = np.searchsorted(self._np_keys, keys)
+        positions = np.minimum(positions, len(self._np_keys) - 1)
+        found = self._np_keys[positions] == keys
+
+        ids = self.ids
+        values = self._np_values[positions]
+        return [
+            ids[value] if hit and name else None
+            for name, hit, value in zip(normalized, found.tolist(), values.tolist())
+        ]
+
+    def iter_entries(self) -> Iterator[Tuple[str, str]]:
+        """遍历 (规范化名称, ChEMBL ID)，按键顺序"""
+        names = self._names
+        if names is None:
+            with open(self._names_path, "r", encoding="utf-8") as f:
+                names = (line.rstrip("\n") for line in f)
+                for i, name in enumerate(names):
+                    yield name, self.ids[self._values[i]]
+            return
+        for i, name in enumerate(names):
+            yield name, self.ids[self._values[i]]
+
+    def close(self):
+        """释放内存映射"""
+        self._np_keys = None
+        self._np_values = None
+        if self._mmaps:
+            self._keys.release()
+            self._values.release()
+            self._keys, self._values = [], []
+            for mapped in self._mmaps:
+                mapped.close()
+            self._mmaps = []
+
+
+def _map_file(path: Path) -> mmap.mmap:
+    with open(path, "rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+#===========================================================
+# 解析器
+#===========================================================
+
+class DrugNameResolver:
+    """
+    药物名称解析器
+
+    解析顺序：
+    1. 完整名称及括号内名称的规范化形式（哈希查找）
+    2. 自由文本匹配：在名称中查找已知药物名（词级 Aho-Corasick，最左最长），
+       只在所有匹配指向同一化合物时返回，避免复方制剂被误映射
+
+    原始名称的解析结果缓存在进程内，FAERS 等数据源中大量重复的名称
+    只解析一次。
+    """
+
+    def __init__(self, index: DrugNameIndex, free_text: bool = True, cache_size: int = 1_000_000):
+        """
+        初始化解析器
+
+        Args:
+            index: 名称索引
+            free_text: 精确查找失败时是否使用自动机匹配
+            cache_size: 原始名称缓存上限（超出时清空）
+        """
+        self.index = index
+        self.free_text = free_text
+        self.cache_size = cache_size
+
+        self._cache: Dict[str, Optional[str]] = {}
+        self._tagger: Optional[TermTagger] = None
+        self._tagger_lock = threading.Lock()
+
+        self.stats = {
+            "resolved_exact": 0,
+            "resolved_free_text": 0,
+            "unresolved": 0,
+            "cache_hits": 0
+        }
+
+    def resolve(self, name: Optional[str]) -> Optional[str]:
+        """
+        解析单个名称
+
+        Args:
+            name: 原始药物名称
+
+        Returns:
+            ChEMBL ID 或 None
+        """
+        if not name:
+            return None
+
+        cached = self._cache.get(name, _MISSING)
+        if cached is not _MISSING:
+            self.stats["cache_hits"] += 1
+            return cached
+
+        chembl_id = None
+        for variant in name_variants(name):
+            chembl_id = self.index.lookup(variant)
+            if chembl_id:
+                self.stats["resolved_exact"] += 1
+                break
+
+        if chembl_id is None and self.free_text:
+            chembl_id = self._resolve_free_text(name)
+
+        if chembl_id is None:
+            self.stats["unresolved"] += 1
+
+        self._remember(name, chembl_id)
+        return chembl_id
+
+    def resolve_many(self, names: Iterable[Optional[str]]) -> List[Optional[str]]:
+        """
+        批量解析名称
+
+        去重后只规范化一次，精确查找走批量二分查找，未命中的再逐个做自由文本匹配。
+
+        Args:
+            names: 原始名称
+
+        Returns:
+            与输入对齐的 ChEMBL ID 列表
+        """
+        names = list(names)
+        pending = [name for name in dict.fromkeys(names) if name and name not in self._cache]
+
+        if pending:
+            variants = [name_variants(name) for name in pending]
+            depth = max((len(v) for v in variants), default=0)
+            resolved: Dict[str, Optional[str]] = {}
+
+            for level in range(depth):
+                batch = [(name, v[level]) for name, v in zip(pending, variants)
+                         if level < len(v) and name not in resolved]
+                if not batch:
+                    break
+                for (name, _), chembl_id in zip(batch, self.index.lookup_many([b[1] for b in batch])):
+                    if chembl_id:
+                        resolved[name] = chembl_id
+            self.stats["resolved_exact"] += len(resolved)
+
+            for name in pending:
+                chembl_id = resolved.get(name)
+                if chembl_id is None:
+                    chembl_id = self._resolve_free_text(name) if self.free_text else None
+                    if chembl_id is None:
+                        self.stats["unresolved"] += 1
+                self._remember(name, chembl_id)
+
+        return [self._cache.get(name) if name else None for name in names]
+
+    def find_mentions(self, text: str) -> List[Dict[str, Any]]:
+        """
+        在自由文本中查找药物名（最左最长、互不重叠）
+
+        Args:
+            text: 文本
+
+        Returns:
+            [{'text', 'start', 'end', 'chembl_id'}]，偏移为原文字符偏移
+        """
+        return [
+            {"text": match["text"], "start": match["start"], "end": match["end"], "chembl_id": match["id"]}
+            for match in self.tagger.tag(text)
+        ]
+
+    @property
+    def tagger(self) -> TermTagger:
+        """由索引中的全部名称构建的标注器（首次使用时构建）"""
+        if self._tagger is None:
+            with self._tagger_lock:
+                if self._tagger is None:
+                    tagger = TermTagger("drug_names", min_length=MIN_FREE_TEXT_LENGTH)
+                    for name, chembl_id in self.index.iter_entries():
+                        # 纯数字的名称在自由文本中误匹配过多
+                        if not name.replace(" ", "").isdigit():
+                            tagger.add(name, chembl_id)
+                    logger.info(f"Drug name tagger built with {len(tagger)} patterns")
+                    self._tagger = tagger
+        return self._tagger
+
+    def _resolve_free_text(self, name: str) -> Optional[str]:
+        ids = {match["id"] for match in self.tagger.tag(name)}
+        if len(ids) == 1:
+            self.stats["resolved_free_text"] += 1
+            return ids.pop()
+        return None
+
+    def _remember(self, name: str, chembl_id: Optional[str]):
+        if len(self._cache) >= self.cache_size:
+            self._cache.clear()
+        self._cache[name] = chembl_id
+
+
+_MISSING = object()
+
+
+#===========================================================
+# 共享实例
+#===========================================================
+
+_RESOLVERS: Dict[Path, Optional[DrugNameResolver]] = {}
+_RESOLVERS_LOCK = threading.Lock()
+
+
+def get_drug_resolver(index_dir: PathLike, free_text: bool = True) -> Optional[DrugNameResolver]:
+    """
+    获取进程内共享的解析器（每个索引目录只加载一次）
+
+    Args:
+        index_dir: 索引目录
+        free_text: 是否启用自由文本匹配（仅首次加载时生效）
+
+    Returns:
+        解析器；索引不存在或无法加载时返回 None（只记录一次警告）
+    """
+    index_dir = Path(index_dir).resolve()
+    with _RESOLVERS_LOCK:
+        if index_dir not in _RESOLVERS:
+            resolver = None
+            try:
+                resolver = DrugNameResolver(DrugNameIndex.load(index_dir), free_text=free_text)
+                logger.info(f"Loaded drug name index from {index_dir} ({len(resolver.index)} names)")
+            except FileNotFoundError:
+                logger.warning(f"Drug name index not found at {index_dir}; "
+                               f"build it with: python -m processors.drug_resolver build")
+            except ValueError as e:
+                logger.warning(f"Drug name index at {index_dir} unusable: {e}")
+            _RESOLVERS[index_dir] = resolver
+        return _RESOLVERS[index_dir]
+
+
+#===========================================================
+# 命令行
+#===========================================================
+
+def main():
+    """命令行入口：构建索引或解析名称"""
+    project_root = Path(__file__).parent.parent
+    processed_dir = project_root / "data" / "processed"
+
+    parser = argparse.ArgumentParser(description="PharmaKG 药物名称 → ChEMBL 解析索引")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = subparsers.add_parser("build", help="构建索引")
+    build_parser.add_argument("--master-map", type=Path, default=processed_dir / "master_entity_map.db",
+                              help="主实体映射表 SQLite")
+    build_parser.add_argument("--chembl-db", type=Path, help="ChEMBL SQLite 数据库（读取同义词表）")
+    build_parser.add_argument("--chembl-outputs", type=Path, default=processed_dir / "documents" / "chembl",
+                              help="ChEMBL 处理器输出目录")
+    build_parser.add_argument("--drugbank-outputs", type=Path, default=processed_dir / "documents" / "drugbank",
+                              help="DrugBank 处理器输出目录")
+    build_parser.add_argument("--output", type=Path, default=processed_dir / "drug_resolver", help="索引目录")
+
+    resolve_parser = subparsers.add_parser("resolve", help="解析名称")
+    resolve_parser.add_argument("names", nargs="+", help="药物名称")
+    resolve_parser.add_argument("--index", type=Path, default=processed_dir / "drug_resolver", help="索引目录")
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    if args.command == "build":
+        builder = DrugNameIndexBuilder()
+        if args.master_map and args.master_map.exists():
+            builder.add_master_entity_map(args.master_map)
+        if args.chembl_db:
+            builder.add_chembl_database(args.chembl_db)
+        builder.add_chembl_outputs(args.chembl_outputs)
+        builder.add_drugbank_outputs(args.drugbank_outputs)
+
+        if not len(builder):
+            print("未找到任何药物名称，索引未生成")
+            return 1
+
+        builder.save(args.output)
+        print(f"名称数: {len(builder)}")
+        print(f"冲突数: {builder.stats['conflicts']}")
+        print(f"索引目录: {args.output}")
+        return 0
+
+    resolver = get_drug_resolver(args.index)
+    if resolver is None:
+        return 1
+    for name, chembl_id in zip(args.names, resolver.resolve_many(args.names)):
+        print(f"{name}\t{chembl_id or '-'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,19 +9,32 @@
 import logging
 import xml.etree.ElementTree as ET
 import json
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Generator
+from typing import Any, Dict, Iterator, List, Optional, Set, Generator
 from enum import Enum
 import hashlib
 import re
 
 from processors.base import BaseProcessor, ProcessingResult, ProcessingStatus, ProcessingMetrics
+from processors.storage import PartitionedRecordWriter
 
 
 logger = logging.getLogger(__name__)
 
+try:
+    from lxml import etree as LET
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+
+# 顶层 drug 元素的完整标签
+DRUG_TAG = '{http://drugbank.ca}drug'
+
 
 class DrugBankExtractionType(str, Enum):
     """DrugBank 提取类型枚举"""
@@ -47,6 +60,9 @@ class DrugBankExtractionConfig:
     extract_transporters: bool = True
     extract_targets: bool = True
     map_to_chembl: bool = True
+    use_lxml: bool = True  # 已安装 lxml 时使用其 iterparse（按标签过滤）
+    worker_batch_size: int = 64  # 每个提取任务包含的 drug 元素数
+    partition_size: int = 100000  # 每个输出分片文件的记录数
 
 
 @dataclass
@@ -157,6 +173,9 @@ class DrugBankProcessor(BaseProcessor):
         """
         从 DrugBank XML 文件提取数据
 
+        一次性返回全部提取结果；大文件请使用 process()，
+        它以流式方式直接写出分片文件。
+
         Args:
             file_path: XML 文件路径
 
@@ -166,7 +185,6 @@ class DrugBankProcessor(BaseProcessor):
         logger.info(f"Extracting data from {file_path}")
 
         try:
-            # 使用 iterparse 处理大文件
             raw_data = {
                 'compounds': [],
                 'targets': [],
@@ -179,62 +197,13 @@ class DrugBankProcessor(BaseProcessor):
                 'extraction_timestamp': datetime.now().isoformat()
             }
 
-            # 获取文件大小用于进度跟踪
-            file_size = file_path.stat().st_size
-            processed_bytes = 0
-
-            # 使用 iterparse 逐步处理
-            context = ET.iterparse(str(file_path), events=('start', 'end'))
-            context = iter(context)
-
-            # 跳过开始事件
-            event, root = next(context)
-
-            drug_count = 0
-            for event, elem in context:
-                if event == 'end':
-                    # 检查是否为 drug 元素
-                    if elem.tag.endswith('drug'):
-                        try:
-                            drug_data = self._extract_drug_element(elem)
-
-                            if self._should_include_drug(drug_data):
-                                raw_data['compounds'].append(drug_data)
-                                drug_count += 1
-
-                                # 提取相关数据
-                                if self.extraction_config.extract_targets:
-                                    raw_data['targets'].extend(
-                                        self._extract_targets_from_drug(elem, drug_data)
-                                    )
-                                if self.extraction_config.extract_enzymes:
-                                    raw_data['enzymes'].extend(
-                                        self._extract_enzymes_from_drug(elem, drug_data)
-                                    )
-                                if self.extraction_config.extract_transporters:
-                                    raw_data['transporters'].extend(
-                                        self._extract_transporters_from_drug(elem, drug_data)
-                                    )
-                                if self.extraction_config.extract_interactions:
-                                    raw_data['interactions'].extend(
-                                        self._extract_interactions_from_drug(elem, drug_data)
-                                    )
-
-                                # 清理元素以节省内存
-                                elem.clear()
-
-                            # 检查限制
-                            if self.extraction_config.limit_compounds:
-                                if drug_count >= self.extraction_config.limit_compounds:
-                                    break
-
-                        except Exception as e:
-                            logger.warning(f"Error processing drug element: {e}")
-                            self.stats.warnings.append(f"Drug element error: {str(e)}")
-
-                    # 移除已处理的元素
-                    if elem.tag.endswith('drug'):
-                        root.remove(elem)
+            limit = self.extraction_config.limit_compounds
+            for record in self.iter_drug_records(file_path):
+                raw_data['compounds'].append(record['compound'])
+                for key in ('targets', 'enzymes', 'transporters', 'interactions'):
+                    raw_data[key].extend(record[key])
+                if limit and len(raw_data['compounds']) >= limit:
+                    break
 
             logger.info(f"Extracted {len(raw_data['compounds'])} compounds, "
                        f"{len(raw_data['targets'])} targets, "
@@ -247,6 +216,155 @@ class DrugBankProcessor(BaseProcessor):
             self.stats.errors.append(f"Extraction error: {str(e)}")
             return {'error': str(e)}
 
+    #===========================================================
+    # 流式解析
+    #===========================================================
+
+    def iter_drug_elements(self, file_path: Path) -> Iterator[Any]:
+        """
+        逐个产出顶层 <drug> 元素
+
+        只匹配 <drugbank> 根元素的直接子元素，pathways 等处嵌套的
+        <drug> 引用不会被当作药物。元素在调用方处理完（继续迭代）后被清理。
+
+        Args:
+            file_path: XML 文件路径
+
+        Yields:
+            drug 元素（lxml 或 ElementTree）
+        """
+        if LXML_AVAILABLE and self.extraction_config.use_lxml:
+            yield from self._iter_drug_elements_lxml(file_path)
+        else:
+            yield from self._iter_drug_elements_stdlib(file_path)
+
+    def _iter_drug_elements_lxml(self, file_path: Path) -> Iterator[Any]:
+        # tag 过滤由 libxml2 完成，只有 drug 元素回到 Python
+        context = LET.iterparse(str(file_path), events=('end',), tag=DRUG_TAG, huge_tree=True)
+        for _, elem in context:
+            parent = elem.getparent()
+            if parent is None or parent.getparent() is not None:
+                # 嵌套的 drug 引用，随所属的顶层 drug 一起清理
+                continue
+
+            yield elem
+
+            # 清理当前元素及已处理的兄弟节点，保持树的大小恒定
+            elem.clear(keep_tail=True)
+            while elem.getprevious() is not None:
+                del parent[0]
+        del context
+
+    def _iter_drug_elements_stdlib(self, file_path: Path) -> Iterator[Any]:
+        context = ET.iterparse(str(file_path), events=('start', 'end'))
+        root = None
+        depth = 0
+        for event, elem in context:
+            if event == 'start':
+                if root is None:
+                    root = elem
+                depth += 1
+                continue
+
+            depth -= 1
+            if depth == 1 and elem.tag == DRUG_TAG:
+                yield elem
+                root.clear()
+
+    def iter_drug_records(self, file_path: Path, workers: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        逐个产出药物提取结果
+
+        workers > 1 时由主进程解析 XML 并把序列化后的 drug 元素
+        按 worker_batch_size 分批交给进程池提取字段，结果按原文件顺序返回。
+
+        Args:
+            file_path: XML 文件路径
+            workers: 提取进程数（默认 config['workers']，否则为 1）
+
+        Yields:
+            {'compound', 'targets', 'enzymes', 'transporters', 'interactions'}
+            （不满足筛选条件的药物不产出）
+        """
+        if workers is None:
+            workers = self.config.get('workers', 1)
+
+        if not workers or workers <= 1:
+            for elem in self.iter_drug_elements(file_path):
+                try:
+                    record = self._extract_drug_record(elem)
+                except Exception as e:
+                    logger.warning(f"Error processing drug element: {e}")
+                    self.stats.warnings.append(f"Drug element error: {str(e)}")
+                    continue
+                if record:
+                    yield record
+            return
+
+        use_lxml = LXML_AVAILABLE and self.extraction_config.use_lxml
+        to_bytes = LET.tostring if use_lxml else ET.tostring
+        batch_size = max(1, self.extraction_config.worker_batch_size)
+
+        pending = deque()
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_drugbank_worker,
+            initargs=(self.config,)
+        )
+        try:
+            batch = []
+            for elem in self.iter_drug_elements(file_path):
+                # 必须在迭代器清理元素之前序列化
+                batch.append(to_bytes(elem))
+                if len(batch) < batch_size:
+                    continue
+                pending.append(executor.submit(_extract_drugbank_batch, batch))
+                batch = []
+                # 有界窗口：限制已解析但未提取的元素数量
+                if len(pending) >= workers * 2:
+                    yield from self._collect_batch(pending.popleft().result())
+
+            if batch:
+                pending.append(executor.submit(_extract_drugbank_batch, batch))
+            while pending:
+                yield from self._collect_batch(pending.popleft().result())
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=True)
+
+    def _collect_batch(self, outcome) -> List[Dict[str, Any]]:
+        """合并工作进程返回的统计信息"""
+        records, counters, warnings = outcome
+        for name, value in counters.items():
+            setattr(self.stats, name, getattr(self.stats, name) + value)
+        self.stats.warnings.extend(warnings)
+        return records
+
+    def _extract_drug_record(self, elem) -> Optional[Dict[str, Any]]:
+        """
+        提取单个 drug 元素的全部字段
+
+        Returns:
+            提取结果，不满足筛选条件时返回 None
+        """
+        drug_data = self._extract_drug_element(elem)
+        if not self._should_include_drug(drug_data):
+            return None
+
+        config = self.extraction_config
+        return {
+            'compound': drug_data,
+            'targets': self._extract_targets_from_drug(elem, drug_data) if config.extract_targets else [],
+            'enzymes': self._extract_enzymes_from_drug(elem, drug_data) if config.extract_enzymes else [],
+            'transporters': (
+                self._extract_transporters_from_drug(elem, drug_data) if config.extract_transporters else []
+            ),
+            'interactions': (
+                self._extract_interactions_from_drug(elem, drug_data) if config.extract_interactions else []
+            )
+        }
+
     def _should_include_drug(self, drug_data: Dict) -> bool:
         """
         判断是否应该包含该药物
@@ -949,16 +1067,39 @@ class DrugBankProcessor(BaseProcessor):
         self,
         source_path,
         output_to: Optional[str] = None,
-        save_intermediate: bool = True
+        save_intermediate: bool = True,
+        workers: Optional[int] = None,
+        keep_results: Optional[bool] = None
     ) -> ProcessingResult:
-        """处理 DrugBank 数据的主流程"""
+        """
+        处理 DrugBank 数据的主流程
+
+        drug 元素逐个解析（可由进程池并行提取字段），转换后的实体和关系
+        直接写入按 partition_size 切分的输出文件，内存占用与文件大小无关。
+
+        Args:
+            source_path: XML 文件或目录
+            output_to: 自定义输出目录
+            save_intermediate: 是否写出结果文件
+            workers: 提取进程数（默认 config['workers']，否则为 1）
+            keep_results: 是否同时在结果中返回全部实体/关系
+                （默认 config['keep_results']，否则为 False）
+
+        Returns:
+            处理结果
+        """
         start_time = datetime.now()
         source_path = Path(source_path)
 
+        if keep_results is None:
+            keep_results = self.config.get('keep_results', False)
+
         logger.info(f"[{self.PROCESSOR_NAME}] 开始处理: {source_path}")
 
         # 重置状态
         self._metrics = ProcessingMetrics()
+        self._errors = []
+        self._warnings = []
         self.stats = DrugBankStats()
         self.seen_drugbank_ids.clear()
         self.seen_inchikeys.clear()
@@ -979,75 +1120,79 @@ class DrugBankProcessor(BaseProcessor):
                     warnings=self._warnings
                 )
 
-            # 2. 处理每个文件
-            all_entities = []
-            all_relationships = []
-
-            for file_path in files:
-                try:
-                    logger.info(f"Processing {file_path}")
+            output_dir = Path(output_to) if output_to else self.documents_output_dir
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            writers: Dict[str, PartitionedRecordWriter] = {}
+            all_entities: List[Dict] = []
+            all_relationships: List[Dict] = []
+            entity_counts: Dict[str, int] = defaultdict(int)
+            relationship_counts: Dict[str, int] = defaultdict(int)
 
-                    # 提取
-                    raw_data = self.extract(file_path)
-                    if 'error' in raw_data:
-                        self._warnings.append(f"提取失败: {file_path.name} - {raw_data['error']}")
+            def emit_entity(entity: Dict, entity_type: str):
+                if not self._validate_entity(entity):
+                    self.stats.warnings.append(f"Invalid entity in {entity_type}")
+                    return
+                entity = {**entity, 'entity_type': entity_type}
+                entity_counts[entity_type] += 1
+                self._metrics.entities_extracted += 1
+                if save_intermediate:
+                    type_name = entity_type.replace('rd:', '').lower()
+                    self._get_writer(writers, output_dir, f"drugbank_{type_name}s_{timestamp}").write(entity)
+                if keep_results:
+                    all_entities.append(entity)
+
+            def emit_relationship(relationship: Dict):
+                relationship_counts[relationship.get('relationship_type')] += 1
+                self.stats.relationships_created += 1
+                self._metrics.relationships_extracted += 1
+                if save_intermediate:
+                    self._get_writer(writers, output_dir, f"drugbank_relationships_{timestamp}").write(relationship)
+                if keep_results:
+                    all_relationships.append(relationship)
+
+            # 2. 逐个药物提取、转换并写出
+            limit = self.extraction_config.limit_compounds
+            drug_count = 0
+            try:
+                for file_path in files:
+                    if limit and drug_count >= limit:
+                        break
+                    try:
+                        logger.info(f"Processing {file_path}")
+                        for record in self.iter_drug_records(file_path, workers):
+                            self._emit_drug_record(record, emit_entity, emit_relationship)
+                            drug_count += 1
+                            if limit and drug_count >= limit:
+                                break
+                        self._metrics.files_processed += 1
+
+                    except Exception as e:
+                        logger.error(f"处理文件失败 {file_path}: {e}", exc_info=True)
+                        self._errors.append(f"{file_path.name}: {str(e)}")
+                        self.stats.errors.append(f"Extraction error: {str(e)}")
                         self._metrics.files_failed += 1
-                        continue
-
-                    # 转换
-                    transformed_data = self.transform(raw_data)
-                    if not transformed_data:
-                        self._metrics.files_skipped += 1
-                        continue
-
-                    # 验证
-                    if not self.validate(transformed_data):
-                        self._warnings.append(f"数据验证失败: {file_path.name}")
-                        self._metrics.files_skipped += 1
-                        continue
-
-                    # 收集实体和关系
-                    entities_dict = transformed_data.get('entities', {})
-                    relationships = transformed_data.get('relationships', [])
-
-                    # 展平实体字典
-                    for entity_type, entity_list in entities_dict.items():
-                        for entity in entity_list:
-                            all_entities.append({
-                                **entity,
-                                'entity_type': entity_type
-                            })
-
-                    all_relationships.extend(relationships)
-
-                    self._metrics.files_processed += 1
-                    self._metrics.entities_extracted += len(all_entities)
-                    self._metrics.relationships_extracted += len(all_relationships)
+            finally:
+                output_files = {stem: writer.close() for stem, writer in writers.items()}
 
-                except Exception as e:
-                    logger.error(f"处理文件失败 {file_path}: {e}", exc_info=True)
-                    self._errors.append(f"{file_path.name}: {str(e)}")
-                    self._metrics.files_failed += 1
+            if self._metrics.files_processed and not entity_counts:
+                self._warnings.append("No entities extracted")
 
-            # 3. 保存结果
-            output_path = None
-            if save_intermediate and (all_entities or all_relationships):
-                output_path = self._save_drugbank_results(
-                    all_entities,
-                    all_relationships,
-                    transformed_data.get('entities', {}),
-                    output_to
-                )
-
-            # 4. 计算处理时间
+            # 3. 计算处理时间
             processing_time = (datetime.now() - start_time).total_seconds()
             self._metrics.processing_time_seconds = processing_time
             self.stats.processing_time_seconds = processing_time
 
+            # 4. 保存摘要
+            output_path = None
+            if save_intermediate and writers:
+                output_path = self._write_summary(
+                    output_dir, timestamp, dict(entity_counts), self.stats.relationships_created, output_files
+                )
+
             # 5. 确定最终状态
             if self._metrics.files_failed > 0:
                 status = ProcessingStatus.PARTIAL
-            elif self._metrics.files_processed == 0:
+            elif self._metrics.entities_extracted == 0:
                 status = ProcessingStatus.SKIPPED
             else:
                 status = ProcessingStatus.COMPLETED
@@ -1062,19 +1207,20 @@ class DrugBankProcessor(BaseProcessor):
                     'include_experimental': self.extraction_config.include_experimental
                 },
                 'stats': {
-                    'compounds': len([e for e in all_entities if e.get('entity_type') == 'rd:Compound']),
-                    'targets': len([e for e in all_entities if e.get('entity_type') == 'rd:Target']),
-                    'interactions': len([r for r in all_relationships if r.get('relationship_type') == 'INTERACTS_WITH']),
+                    'compounds': entity_counts.get('rd:Compound', 0),
+                    'targets': entity_counts.get('rd:Target', 0),
+                    'interactions': relationship_counts.get('INTERACTS_WITH', 0),
                     'enzymes': self.stats.enzymes_extracted,
                     'transporters': self.stats.transporters_extracted
-                }
+                },
+                'entities_by_type': dict(entity_counts)
             }
 
             logger.info(f"[{self.PROCESSOR_NAME}] 处理完成: "
                        f"处理={self._metrics.files_processed}, "
                        f"失败={self._metrics.files_failed}, "
-                       f"实体={len(all_entities)}, "
-                       f"关系={len(all_relationships)}, "
+                       f"实体={self._metrics.entities_extracted}, "
+                       f"关系={self._metrics.relationships_extracted}, "
                        f"耗时={processing_time:.2f}秒")
 
             return ProcessingResult(
@@ -1097,50 +1243,59 @@ class DrugBankProcessor(BaseProcessor):
                 processor_name=self.PROCESSOR_NAME,
                 source_path=str(source_path),
                 metrics=self._metrics,
-                errors=[str(e)]
+                errors=self._errors + [str(e)]
             )
 
-    def _save_drugbank_results(
-        self,
-        all_entities: List[Dict],
-        all_relationships: List[Dict],
-        entities_by_type: Dict[str, List[Dict]],
-        output_to: Optional[str] = None
-    ) -> Path:
-        """保存 DrugBank 处理结果"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-
-        # 确定输出目录
-        if output_to:
-            output_dir = Path(output_to)
-        else:
-            output_dir = self.documents_output_dir
-
-        output_dir.mkdir(parents=True, exist_ok=True)
+    def _emit_drug_record(self, record: Dict[str, Any], emit_entity, emit_relationship):
+        """转换单个药物的提取结果（与 transform() 的输出一致）"""
+        compound = self._transform_compound(record['compound'])
+        if compound:
+            emit_entity(compound, 'rd:Compound')
+            self.stats.compounds_extracted += 1
 
-        # 按类型保存实体
-        for entity_type, entities in entities_by_type.items():
-            if not entities:
-                continue
-
-            type_name = entity_type.replace('rd:', '').lower()
-            entities_file = output_dir / f"drugbank_{type_name}s_{timestamp}.json"
-
-            with open(entities_file, 'w', encoding='utf-8') as f:
-                json.dump(entities, f, ensure_ascii=False, indent=2)
-
-            logger.info(f"保存 {len(entities)} 个 {entity_type} 到: {entities_file}")
-
-        # 保存关系
-        if all_relationships:
-            relationships_file = output_dir / f"drugbank_relationships_{timestamp}.json"
-
-            with open(relationships_file, 'w', encoding='utf-8') as f:
-                json.dump(all_relationships, f, ensure_ascii=False, indent=2)
-
-            logger.info(f"保存 {len(all_relationships)} 个关系到: {relationships_file}")
+        for target_data in record['targets'] + record['enzymes'] + record['transporters']:
+            entity = self._transform_target(target_data)
+            if entity:
+                emit_entity(entity, 'rd:Target')
+
+        builders = (
+            ('interactions', self._create_interaction_relationship),
+            ('enzymes', self._create_enzyme_relationship),
+            ('transporters', self._create_transporter_relationship),
+            ('targets', self._create_target_relationship)
+        )
+        for key, build in builders:
+            for item in record[key]:
+                relationship = build(item)
+                if relationship:
+                    emit_relationship(relationship)
+
+    def _get_writer(
+        self,
+        writers: Dict[str, PartitionedRecordWriter],
+        output_dir: Path,
+        stem: str
+    ) -> PartitionedRecordWriter:
+        """首次使用时打开分片写入器"""
+        writer = writers.get(stem)
+        if writer is None:
+            writer = PartitionedRecordWriter(
+                output_dir / stem,
+                self.output_format,
+                partition_size=self.extraction_config.partition_size
+            )
+            writers[stem] = writer
+        return writer
 
-        # 保存处理摘要
+    def _write_summary(
+        self,
+        output_dir: Path,
+        timestamp: str,
+        entities_by_type: Dict[str, int],
+        total_relationships: int,
+        output_files: Dict[str, List[Path]]
+    ) -> Path:
+        """保存处理摘要"""
         summary = {
             "processor": self.PROCESSOR_NAME,
             "source": "DrugBank XML Database",
@@ -1160,12 +1315,13 @@ class DrugBankProcessor(BaseProcessor):
                 "relationships_created": self.stats.relationships_created,
                 "processing_time_seconds": self.stats.processing_time_seconds
             },
-            "entities_by_type": {
-                entity_type: len(entities)
-                for entity_type, entities in entities_by_type.items()
+            "entities_by_type": entities_by_type,
+            "total_entities": sum(entities_by_type.values()),
+            "total_relationships": total_relationships,
+            "output_files": {
+                stem: [path.name for path in paths]
+                for stem, paths in output_files.items()
             },
-            "total_entities": len(all_entities),
-            "total_relationships": len(all_relationships),
             "errors": self.stats.errors,
             "warnings": self.stats.warnings
         }
@@ -1179,6 +1335,54 @@ class DrugBankProcessor(BaseProcessor):
         return summary_file
 
 
+#===========================================================
+# 工作进程
+#===========================================================
+
+# 工作进程内的处理器实例（由 _init_drugbank_worker 创建）
+_DRUGBANK_WORKER = None
+
+# 工作进程返回给主进程合并的计数
+_WORKER_COUNTERS = (
+    'targets_extracted',
+    'enzymes_extracted',
+    'transporters_extracted',
+    'interactions_extracted',
+    'pharmacokinetics_extracted'
+)
+
+
+def _init_drugbank_worker(config: Optional[Dict[str, Any]]):
+    """工作进程初始化：按配置重建处理器"""
+    global _DRUGBANK_WORKER
+    _DRUGBANK_WORKER = DrugBankProcessor(config)
+
+
+def _extract_drugbank_batch(payloads: List[bytes]):
+    """
+    在工作进程中提取一批序列化的 drug 元素
+
+    Returns:
+        (提取结果列表, 统计计数, 警告列表)
+    """
+    processor = _DRUGBANK_WORKER
+    processor.stats = DrugBankStats()
+    parse = LET.fromstring if LXML_AVAILABLE and processor.extraction_config.use_lxml else ET.fromstring
+
+    records = []
+    for payload in payloads:
+        try:
+            record = processor._extract_drug_record(parse(payload))
+        except Exception as e:
+            processor.stats.warnings.append(f"Drug element error: {str(e)}")
+            continue
+        if record:
+            records.append(record)
+
+    counters = {name: getattr(processor.stats, name) for name in _WORKER_COUNTERS}
+    return records, counters, processor.stats.warnings
+
+
 #===========================================================
 # 命令行接口
 #===========================================================
@@ -1207,6 +1411,9 @@ def main():
 
   # 只提取已批准药物
   python -m processors.drugbank_processor /path/to/drugbank.xml --min-approval-level approved
+
+  # 使用 8 个进程并行提取
+  python -m processors.drugbank_processor /path/to/drugbank.xml --workers 8
         """
     )
 
@@ -1252,6 +1459,20 @@ def main():
         help='批处理大小（默认: 1000）'
     )
 
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='提取 drug 元素的进程数（默认: 1）'
+    )
+
+    parser.add_argument(
+        '--partition-size',
+        type=int,
+        default=100000,
+        help='每个输出分片文件的记录数（默认: 100000）'
+    )
+
     parser.add_argument(
         '--verbose',
         action='store_true',
@@ -1274,8 +1495,10 @@ def main():
             'limit_compounds': args.limit_compounds,
             'include_withdrawn': args.include_withdrawn,
             'include_experimental': not args.no_experimental,
-            'min_approval_level': args.min_approval_level
-        }
+            'min_approval_level': args.min_approval_level,
+            'partition_size': args.partition_size
+        },
+        'workers': args.workers
     }
 
     # 创建处理器
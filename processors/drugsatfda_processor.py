@@ -1386,19 +1386,13 @@ class DrugsAtFDAProcessor(BaseProcessor):
                 continue
 
             type_name = entity_type.replace(':', '_').lower()
-            entities_file = output_dir / f"drugsatfda_{type_name}s_{timestamp}.json"
-
-            with open(entities_file, 'w', encoding='utf-8') as f:
-                json.dump(entity_list, f, ensure_ascii=False, indent=2)
+            entities_file = self._write_records(output_dir / f"drugsatfda_{type_name}s_{timestamp}", entity_list)
 
             logger.info(f"Saved {len(entity_list)} {entity_type} entities to: {entities_file}")
 
         # 保存关系 / Save relationships
         if relationships:
-            relationships_file = output_dir / f"drugsatfda_relationships_{timestamp}.json"
-
-            with open(relationships_file, 'w', encoding='utf-8') as f:
-                json.dump(relationships, f, ensure_ascii=False, indent=2)
+            relationships_file = self._write_records(output_dir / f"drugsatfda_relationships_{timestamp}", relationships)
 
             logger.info(f"Saved {len(relationships)} relationships to: {relationships_file}")
 
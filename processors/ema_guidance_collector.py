@@ -22,6 +22,8 @@ from urllib.parse import urljoin, urlparse
 import requests
 from bs4 import BeautifulSoup
 
+from processors.http_cache import get_http_cache, install_http_cache
+
 logger = logging.getLogger(__name__)
 
 
@@ -286,9 +288,21 @@ class EMAGuidanceCollector:
         self.session = requests.Session()
         self.session.headers.update(self.HEADERS)
 
+        # Shared HTTP cache: unchanged pages cost only a conditional GET
+        self.http_cache = None
+        if self.config.get("http_cache", True):
+            self.http_cache = get_http_cache(self.config.get("http_cache_dir"))
+            install_http_cache(
+                self.session, source="ema_guidance", cache=self.http_cache, throttle=self._respect_rate_limit
+            )
+
         # Track collected URLs
         self.collected_urls: Set[str] = set()
 
+    def _respect_rate_limit(self):
+        """Pause between requests"""
+        time.sleep(self.REQUEST_DELAY)
+
     def _make_request(self, url: str, params: Optional[Dict] = None) -> Optional[requests.Response]:
         """
         Make HTTP request with rate limiting and error handling
@@ -300,8 +314,11 @@ class EMAGuidanceCollector:
         Returns:
             Response object or None if failed
         """
+        # With the HTTP cache installed, its adapter throttles only real network sends
+        if self.http_cache is None:
+            self._respect_rate_limit()
+
         try:
-            time.sleep(self.REQUEST_DELAY)
             response = self.session.get(url, params=params, timeout=30)
             response.raise_for_status()
             return response
@@ -702,6 +719,7 @@ class EMAGuidanceCollector:
                 "by_category": self.stats["by_category"],
                 "errors_count": len(self.stats["errors"]),
             },
+            "http_cache": self.http_cache.get_stats("ema_guidance") if self.http_cache else None,
         }
 
 
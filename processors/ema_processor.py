@@ -23,6 +23,8 @@ import hashlib
 import requests
 from bs4 import BeautifulSoup
 
+from processors.http_cache import get_http_cache, install_http_cache
+
 logger = logging.getLogger(__name__)
 
 
@@ -251,6 +253,14 @@ class EMAProcessor:
             "Connection": "keep-alive",
         })
 
+        # Shared HTTP cache: unchanged pages cost only a conditional GET
+        self.http_cache = None
+        if self.config.get("http_cache", True):
+            self.http_cache = get_http_cache(self.data_root / "cache")
+            install_http_cache(
+                self.session, source="ema", cache=self.http_cache, throttle=self._respect_rate_limit
+            )
+
         # Rate limiting
         self.request_delay = self.config.get("request_delay", 2)
         self.max_retries = self.config.get("max_retries", 3)
@@ -300,6 +310,13 @@ class EMAProcessor:
         except Exception as e:
             self.logger.warning(f"Failed to save cache: {e}")
 
+    def _respect_rate_limit(self):
+        """Wait until request_delay has passed since the previous request"""
+        elapsed = time.time() - self.last_request_time
+        if elapsed < self.request_delay:
+            time.sleep(self.request_delay - elapsed)
+        self.last_request_time = time.time()
+
     def _make_request(self, url: str, method: str = "GET", **kwargs) -> Optional[requests.Response]:
         """
         Make HTTP request with rate limiting and retry logic
@@ -312,14 +329,12 @@ class EMAProcessor:
         Returns:
             Response object or None if failed
         """
-        # Rate limiting
-        elapsed = time.time() - self.last_request_time
-        if elapsed < self.request_delay:
-            time.sleep(self.request_delay - elapsed)
+        # With the HTTP cache installed, its adapter throttles only real network sends
+        if self.http_cache is None:
+            self._respect_rate_limit()
 
         for attempt in range(self.max_retries):
             try:
-                self.last_request_time = time.time()
                 response = self.session.request(method, url, timeout=30, **kwargs)
                 response.raise_for_status()
                 return response
@@ -949,6 +964,7 @@ class EMAProcessor:
             },
             "error_count": len(self.stats["errors"]),
             "recent_errors": self.stats["errors"][-10:] if self.stats["errors"] else [],
+            "http_cache": self.http_cache.get_stats("ema") if self.http_cache else None,
         }
 
 
@@ -21,6 +21,8 @@ from enum import Enum
 from collections import defaultdict
 
 from processors.base import BaseProcessor, ProcessingResult, ProcessingStatus, ProcessingMetrics
+from processors.faers_stream import PartitionedReportJoin
+from processors.storage import RecordWriter
 
 logger = logging.getLogger(__name__)
 
@@ -76,6 +78,11 @@ class FAERSExtractionConfig:
     max_reports: Optional[int] = None
     skip_existing: bool = True
 
+    # Out-of-core join configuration
+    chunk_size: int = 100000  # Rows per columnar read chunk
+    join_partitions: int = 64  # Hash partitions for the safetyreportid join
+    work_dir: Optional[str] = None  # Spill directory (temporary directory if None)
+
     # Data quality configuration
     require_primary_id: bool = True
     validate_meddra_codes: bool = True
@@ -85,6 +92,12 @@ class FAERSExtractionConfig:
     map_to_chembl: bool = True
     map_to_unii: bool = True
 
+    # Disproportionality signal detection (requires numpy)
+    detect_signals: bool = False
+    signal_stratify_by_quarter: bool = False
+    signal_min_count: int = 3
+    signal_criteria: Tuple[str, ...] = ('prr',)
+
     # Deduplication
     deduplicate_by_safetyreport_id: bool = True
 
@@ -109,6 +122,7 @@ class FAERSStats:
     # Relationship statistics
     relationships_created: int = 0
     cross_domain_relationships: int = 0
+    safety_signals_detected: int = 0
 
     # Data quality statistics
     duplicate_reports_skipped: int = 0
@@ -124,6 +138,7 @@ class FAERSStats:
 
     # Data coverage
     total_reports_in_files: int = 0
+    unique_reports: int = 0
     unique_safetyreport_ids: Set[str] = field(default_factory=set)
 
 
@@ -143,7 +158,7 @@ class FAERSProcessor(BaseProcessor):
     Relationship Types:
     - CAUSED_ADVERSE_EVENT - Compound → AdverseEvent
     - ASSOCIATED_WITH - AdverseEvent → Condition
-    - HAS_SAFETY_SIGNAL - Compound → SafetySignal (derived)
+    - HAS_SAFETY_SIGNAL - Compound → Condition (derived, PRR/ROR/IC disproportionality)
 
     Cross-Domain Relationships:
     - Maps drug names to ChEMBL compounds
@@ -224,21 +239,24 @@ class FAERSProcessor(BaseProcessor):
             return []
 
         # Find all FAERS files
-        faers_files = {}
-        for file_path in source_path.iterdir():
-            if file_path.is_file():
-                match = self.FILE_PATTERN.match(file_path.name)
-                if match:
-                    file_type = match.group(1).upper()
-
-                    # Check if file was already processed
-                    if self.extraction_config.skip_existing and self.is_processed(file_path):
-                        logger.info(f"Skipping already processed file: {file_path.name}")
-                        continue
+        candidates = [
+            file_path for file_path in sorted(source_path.iterdir())
+            if file_path.is_file() and self.FILE_PATTERN.match(file_path.name)
+        ]
+
+        # Skip already processed files (one batched manifest lookup)
+        if self.extraction_config.skip_existing:
+            unprocessed = self.filter_unprocessed(candidates)
+            remaining = set(unprocessed)
+            for file_path in candidates:
+                if file_path not in remaining:
+                    logger.info(f"Skipping already processed file: {file_path.name}")
+            candidates = unprocessed
 
-                    if file_type not in faers_files:
-                        faers_files[file_type] = []
-                    faers_files[file_type].append(file_path)
+        faers_files = {}
+        for file_path in candidates:
+            file_type = self.FILE_PATTERN.match(file_path.name).group(1).upper()
+            faers_files.setdefault(file_type, []).append(file_path)
 
         # Log found files
         for file_type, files in faers_files.items():
@@ -392,6 +410,280 @@ class FAERSProcessor(BaseProcessor):
         logger.info(f"Validation passed: {total_entities} entities, {len(relationships)} relationships")
         return True
 
+    #===========================================================
+    # Streaming Processing
+    #===========================================================
+
+    # FAERS tables joined on safetyreportid
+    JOIN_TABLES = {
+        FAERSDataType.DEMOGRAPHIC: 'DEMO',
+        FAERSDataType.DRUG: 'DRUG',
+        FAERSDataType.REACTION: 'REAC',
+        FAERSDataType.OUTCOME: 'OUTC'
+    }
+
+    def process(
+        self,
+        source_path: Path,
+        output_to: Optional[str] = None,
+        save_intermediate: bool = True,
+        workers: Optional[int] = None,
+        keep_results: Optional[bool] = None
+    ) -> ProcessingResult:
+        """
+        Process FAERS files out of core
+
+        DEMO/DRUG/REAC/OUTC files are read in column chunks and spilled to
+        hash partitions on safetyreportid. Each partition is joined in memory
+        and its entities and relationships are written to the output files as
+        they are produced, so memory stays bounded across multi-year backfills.
+
+        Args:
+            source_path: Directory containing FAERS quarterly files
+            output_to: Custom output directory
+            save_intermediate: Whether to write the output files
+            workers: Unused (the join is single-process)
+            keep_results: Also return all entities/relationships in the result
+                (default config['keep_results'], otherwise False)
+
+        Returns:
+            Processing result
+        """
+        start_time = datetime.now()
+        source_path = Path(source_path)
+
+        if keep_results is None:
+            keep_results = self.config.get('keep_results', False)
+
+        logger.info(f"[{self.PROCESSOR_NAME}] Processing: {source_path}")
+
+        self._metrics = ProcessingMetrics()
+        self._errors = []
+        self._warnings = []
+
+        try:
+            files = self.scan(source_path)
+            self._metrics.files_scanned = len(files)
+
+            if not files:
+                self._warnings.append(f"No FAERS files found: {source_path}")
+                return ProcessingResult(
+                    status=ProcessingStatus.SKIPPED,
+                    processor_name=self.PROCESSOR_NAME,
+                    source_path=str(source_path),
+                    metrics=self._metrics,
+                    warnings=self._warnings
+                )
+
+            output_dir = Path(output_to) if output_to else self.documents_output_dir
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            writers: Dict[str, RecordWriter] = {}
+            all_entities: List[Dict] = []
+            all_relationships: List[Dict] = []
+            entity_counts: Dict[str, int] = defaultdict(int)
+
+            def emit_entity(entity: Dict):
+                entity_counts[entity['entity_type']] += 1
+                self._metrics.entities_extracted += 1
+                if save_intermediate:
+                    type_name = entity['entity_type'].replace(':', '_').lower()
+                    self._get_writer(writers, output_dir, f"faers_{type_name}s_{timestamp}").write(entity)
+                if keep_results:
+                    all_entities.append(entity)
+
+            def emit_relationship(relationship: Dict):
+                self.stats.relationships_created += 1
+                self._metrics.relationships_extracted += 1
+                if save_intermediate:
+                    self._get_writer(writers, output_dir, f"faers_relationships_{timestamp}").write(relationship)
+                if keep_results:
+                    all_relationships.append(relationship)
+
+            join = PartitionedReportJoin(
+                work_dir=self.extraction_config.work_dir,
+                partitions=self.extraction_config.join_partitions
+            )
+            try:
+                # 1. Partition every file by safetyreportid
+                for file_path in files:
+                    table = self.JOIN_TABLES.get(self._determine_file_type(file_path))
+                    if table is None:
+                        logger.info(f"Skipping unsupported FAERS file: {file_path.name}")
+                        self._metrics.files_skipped += 1
+                        continue
+                    try:
+                        rows = join.add_file(table, file_path, self.extraction_config.chunk_size)
+                        logger.info(f"Partitioned {rows} rows from {file_path.name}")
+                        self._metrics.files_processed += 1
+                        self.stats.files_processed += 1
+                        if table == 'DEMO':
+                            self.stats.total_reports_in_files += rows
+                    except Exception as e:
+                        logger.error(f"Failed to read {file_path.name}: {e}")
+                        self._errors.append(f"{file_path.name}: {str(e)}")
+                        self._metrics.files_failed += 1
+                        self.stats.files_failed += 1
+
+                # 2. Join partition by partition and stream out entities
+                analyzer = self._create_signal_analyzer() if self.extraction_config.detect_signals else None
+                self._emit_joined_reports(join, emit_entity, emit_relationship, analyzer)
+
+                # 3. Disproportionality signals over the joined reports
+                if analyzer is not None:
+                    table = analyzer.compute(self.extraction_config.signal_stratify_by_quarter)
+                    for relationship in analyzer.to_relationships(table):
+                        emit_relationship(relationship)
+                        self.stats.safety_signals_detected += 1
+
+                join_stats = join.stats
+                self.stats.duplicate_reports_skipped += join_stats['duplicate_reports']
+                self.stats.invalid_records_skipped += join_stats['rows_missing_key']
+            finally:
+                join.cleanup()
+                for writer in writers.values():
+                    writer.close()
+
+            processing_time = (datetime.now() - start_time).total_seconds()
+            self._metrics.processing_time_seconds = processing_time
+            self.stats.processing_time_seconds = processing_time
+
+            output_path = None
+            if save_intermediate and writers:
+                output_path = self._write_summary(
+                    output_dir, timestamp, dict(entity_counts), self.stats.relationships_created
+                )
+
+            if self._metrics.files_failed > 0:
+                status = ProcessingStatus.PARTIAL
+            elif self._metrics.entities_extracted == 0:
+                status = ProcessingStatus.SKIPPED
+            else:
+                status = ProcessingStatus.COMPLETED
+
+            logger.info(f"[{self.PROCESSOR_NAME}] Completed: "
+                       f"reports={self.stats.adverse_events_extracted}, "
+                       f"entities={self._metrics.entities_extracted}, "
+                       f"relationships={self._metrics.relationships_extracted}, "
+                       f"time={processing_time:.2f}s")
+
+            return ProcessingResult(
+                status=status,
+                processor_name=self.PROCESSOR_NAME,
+                source_path=str(source_path),
+                metrics=self._metrics,
+                entities=all_entities,
+                relationships=all_relationships,
+                errors=self._errors,
+                warnings=self._warnings,
+                metadata={
+                    'entities_by_type': dict(entity_counts),
+                    'duplicate_reports_skipped': self.stats.duplicate_reports_skipped,
+                    'reports_without_demo': join.stats['reports_without_demo']
+                },
+                output_path=str(output_path) if output_path else None
+            )
+
+        except Exception as e:
+            logger.error(f"[{self.PROCESSOR_NAME}] Processing failed: {e}", exc_info=True)
+            return ProcessingResult(
+                status=ProcessingStatus.FAILED,
+                processor_name=self.PROCESSOR_NAME,
+                source_path=str(source_path),
+                metrics=self._metrics,
+                errors=self._errors + [str(e)]
+            )
+
+    def _emit_joined_reports(self, join: PartitionedReportJoin, emit_entity, emit_relationship, analyzer=None):
+        """
+        Convert joined reports into entities and relationships
+
+        Condition and Compound entities are emitted once per primary_id;
+        relationships are emitted per report row as before. When an analyzer
+        is given, each report's suspect drugs and reactions are added to it.
+        """
+        seen_conditions: Set[str] = set()
+        seen_compounds: Set[str] = set()
+        max_reports = self.extraction_config.max_reports
+
+        for report in join.iter_reports(self.extraction_config.deduplicate_by_safetyreport_id):
+            if max_reports and self.stats.adverse_events_extracted >= max_reports:
+                break
+
+            safetyreport_id = report['safetyreportid']
+            try:
+                event_data = self._event_data_from_row(report['demo'], report['quarter'])
+                event_data['outcomes'] = [self._map_outcome_code(code) for code in report['outcomes']]
+
+                # Skip if not serious (if configured)
+                if not self.extraction_config.include_non_serious and not event_data.get('serious'):
+                    continue
+
+                self.stats.unique_reports += 1
+
+                adverse_event_entity = self._create_adverse_event_entity(safetyreport_id, event_data)
+                if adverse_event_entity:
+                    emit_entity(adverse_event_entity)
+                    self.stats.adverse_events_extracted += 1
+
+                signal_report = analyzer.new_report(report['quarter']) if analyzer is not None else None
+
+                for row in report['reactions']:
+                    condition_entity, relationship = self._create_condition_and_relationship(
+                        safetyreport_id, self._reaction_data_from_row(row)
+                    )
+                    if condition_entity and condition_entity['primary_id'] not in seen_conditions:
+                        seen_conditions.add(condition_entity['primary_id'])
+                        emit_entity(condition_entity)
+                        self.stats.conditions_extracted += 1
+                    if relationship:
+                        emit_relationship(relationship)
+                        if signal_report is not None:
+                            analyzer.add_event(signal_report, relationship['target_entity_id'])
+
+                if not report['drugs']:
+                    self.stats.records_with_missing_drugs += 1
+
+                for row in report['drugs']:
+                    drug_data = self._drug_data_from_row(row)
+                    compound_entity, relationship = self._create_compound_and_relationship(
+                        safetyreport_id, drug_data
+                    )
+                    if compound_entity and compound_entity['primary_id'] not in seen_compounds:
+                        seen_compounds.add(compound_entity['primary_id'])
+                        emit_entity(compound_entity)
+                        self.stats.compounds_extracted += 1
+                    if relationship:
+                        emit_relationship(relationship)
+                        if signal_report is not None:
+                            analyzer.add_drug(signal_report, relationship['source_entity_id'])
+
+                    if self.extraction_config.map_to_chembl:
+                        cross_domain = self._create_cross_domain_relationship(safetyreport_id, drug_data)
+                        if cross_domain:
+                            emit_relationship(cross_domain)
+
+            except Exception as e:
+                logger.warning(f"Failed to transform report {safetyreport_id}: {e}")
+                self.stats.warnings.append(f"Transform failed for {safetyreport_id}: {str(e)}")
+
+    def _create_signal_analyzer(self):
+        """Create the disproportionality analyzer from the extraction config"""
+        from processors.faers_signals import DisproportionalityAnalyzer, SignalThresholds
+
+        thresholds = SignalThresholds(
+            min_count=self.extraction_config.signal_min_count,
+            criteria=tuple(self.extraction_config.signal_criteria)
+        )
+        return DisproportionalityAnalyzer(thresholds)
+
+    def _get_writer(self, writers: Dict[str, RecordWriter], output_dir: Path, stem: str) -> RecordWriter:
+        """Open an output writer on first use"""
+        writer = writers.get(stem)
+        if writer is None:
+            writer = RecordWriter(output_dir / stem, self.output_format)
+            writers[stem] = writer
+        return writer
+
     #===========================================================
     # File Type Detection
     #===========================================================
@@ -442,22 +734,10 @@ class FAERSProcessor(BaseProcessor):
                             continue
                         self.seen_safetyreport_ids.add(safetyreport_id)
                         self.stats.unique_safetyreport_ids.add(safetyreport_id)
+                        self.stats.unique_reports += 1
 
                     # Store event data
-                    self.adverse_events_data[safetyreport_id] = {
-                        'safetyreport_id': safetyreport_id,
-                        'case_number': row.get('caseid', '').strip(),
-                        'receive_date': self._parse_fda_date(row.get('receivedate')),
-                        'serious': self._parse_serious(row.get('serious')),
-                        'sex': row.get('patientsex', '').strip(),
-                        'age': self._parse_age(row.get('patientage')),
-                        'age_unit': row.get('patientageunit', '').strip(),
-                        'weight': self._parse_weight(row.get('patientweight')),
-                        'weight_unit': row.get('patientweightunit', '').strip(),
-                        'report_type': row.get('safetyreportversion', '').strip(),
-                        'reporter_type': row.get('reportertype', '').strip(),
-                        'outcomes': []  # Will be populated from OUTC file
-                    }
+                    self.adverse_events_data[safetyreport_id] = self._event_data_from_row(row)
 
                     records.append(row)
                     self.stats.total_reports_in_files += 1
@@ -482,18 +762,7 @@ class FAERSProcessor(BaseProcessor):
                     if not safetyreport_id:
                         continue
 
-                    drug_data = {
-                        'safetyreport_id': safetyreport_id,
-                        'drug_seq': row.get('drugseq', '').strip(),
-                        'drug_characterization': row.get('drugcharacterization', '').strip(),
-                        'drug_name': row.get('drugname', '').strip(),
-                        'medicinal_product': row.get('medicinalproduct', '').strip(),
-                        'dose': row.get('drugdosagetxt', '').strip(),
-                        'frequency': row.get('drugadministration', '').strip(),
-                        'route': row.get('drugroute', '').strip()
-                    }
-
-                    self.drugs_data[safetyreport_id].append(drug_data)
+                    self.drugs_data[safetyreport_id].append(self._drug_data_from_row(row))
                     records.append(row)
 
         except Exception as e:
@@ -516,14 +785,7 @@ class FAERSProcessor(BaseProcessor):
                     if not safetyreport_id:
                         continue
 
-                    reaction_data = {
-                        'safetyreport_id': safetyreport_id,
-                        'drug_seq': row.get('drugcharacterization', '').strip(),
-                        'meddra_code': row.get('reactionmeddrapt', '').strip(),
-                        'meddra_term': row.get('reactionmeddraversionpt', '').strip()
-                    }
-
-                    self.reactions_data[safetyreport_id].append(reaction_data)
+                    self.reactions_data[safetyreport_id].append(self._reaction_data_from_row(row))
                     records.append(row)
 
         except Exception as e:
@@ -560,6 +822,52 @@ class FAERSProcessor(BaseProcessor):
 
         return {'file_type': 'OUTC', 'records': records}
 
+    #===========================================================
+    # Row Conversion Methods
+    #===========================================================
+
+    def _event_data_from_row(self, row: Dict[str, str], quarter: Optional[str] = None) -> Dict[str, Any]:
+        """Convert a DEMO row into adverse event data"""
+        event_data = {
+            'safetyreport_id': row.get('safetyreportid', '').strip(),
+            'case_number': row.get('caseid', '').strip(),
+            'receive_date': self._parse_fda_date(row.get('receivedate')),
+            'serious': self._parse_serious(row.get('serious')),
+            'sex': row.get('patientsex', '').strip(),
+            'age': self._parse_age(row.get('patientage')),
+            'age_unit': row.get('patientageunit', '').strip(),
+            'weight': self._parse_weight(row.get('patientweight')),
+            'weight_unit': row.get('patientweightunit', '').strip(),
+            'report_type': row.get('safetyreportversion', '').strip(),
+            'reporter_type': row.get('reportertype', '').strip(),
+            'outcomes': []  # Will be populated from OUTC file
+        }
+        if quarter:
+            event_data['quarter'] = quarter
+        return event_data
+
+    def _drug_data_from_row(self, row: Dict[str, str]) -> Dict[str, Any]:
+        """Convert a DRUG row into drug data"""
+        return {
+            'safetyreport_id': row.get('safetyreportid', '').strip(),
+            'drug_seq': row.get('drugseq', '').strip(),
+            'drug_characterization': row.get('drugcharacterization', '').strip(),
+            'drug_name': row.get('drugname', '').strip(),
+            'medicinal_product': row.get('medicinalproduct', '').strip(),
+            'dose': row.get('drugdosagetxt', '').strip(),
+            'frequency': row.get('drugadministration', '').strip(),
+            'route': row.get('drugroute', '').strip()
+        }
+
+    def _reaction_data_from_row(self, row: Dict[str, str]) -> Dict[str, Any]:
+        """Convert a REAC row into reaction data"""
+        return {
+            'safetyreport_id': row.get('safetyreportid', '').strip(),
+            'drug_seq': row.get('drugcharacterization', '').strip(),
+            'meddra_code': row.get('reactionmeddrapt', '').strip(),
+            'meddra_term': row.get('reactionmeddraversionpt', '').strip()
+        }
+
     #===========================================================
     # Entity Creation Methods
     #===========================================================
@@ -592,6 +900,7 @@ class FAERSProcessor(BaseProcessor):
                     'report_type': event_data.get('report_type'),
                     'reporter_type': reporter_type_mapped,
                     'outcomes': event_data.get('outcomes', []),
+                    'quarter': event_data.get('quarter'),
                     'data_source': 'FDA FAERS',
                     'extraction_timestamp': datetime.now().isoformat()
                 },
@@ -714,47 +1023,49 @@ class FAERSProcessor(BaseProcessor):
 
         for safetyreport_id, drugs in self.drugs_data.items():
             for drug_data in drugs:
-                drug_name = drug_data.get('drug_name') or drug_data.get('medicinal_product')
-
-                if not drug_name:
-                    continue
-
-                # Map to ChEMBL
-                chembl_id = self._map_drug_to_chembl(drug_name)
-                if chembl_id:
-                    relationship = {
-                        'relationship_type': 'TESTED_IN_CLINICAL_TRIAL',
-                        'source_entity_id': f"Compound-{chembl_id}",
-                        'target_entity_id': f"AdverseEvent-{safetyreport_id}",
-                        'properties': {
-                            'drug_name': drug_name,
-                            'mapping_confidence': 'high',
-                            'data_source': 'FDA FAERS-ChEMBL-Mapping'
-                        },
-                        'source': 'FDA FAERS-ChEMBL-Mapping'
-                    }
+                relationship = self._create_cross_domain_relationship(safetyreport_id, drug_data)
+                if relationship:
                     relationships.append(relationship)
-                    self.stats.cross_domain_relationships += 1
 
         return relationships
 
+    def _create_cross_domain_relationship(self, safetyreport_id: str, drug_data: Dict) -> Optional[Dict]:
+        """Create a ChEMBL cross-domain relationship for one reported drug"""
+        drug_name = drug_data.get('drug_name') or drug_data.get('medicinal_product')
+
+        if not drug_name:
+            return None
+
+        # Map to ChEMBL
+        chembl_id = self._map_drug_to_chembl(drug_name)
+        if not chembl_id:
+            return None
+
+        self.stats.cross_domain_relationships += 1
+        return {
+            'relationship_type': 'TESTED_IN_CLINICAL_TRIAL',
+            'source_entity_id': f"Compound-{chembl_id}",
+            'target_entity_id': f"AdverseEvent-{safetyreport_id}",
+            'properties': {
+                'drug_name': drug_name,
+                'mapping_confidence': 'high',
+                'data_source': 'FDA FAERS-ChEMBL-Mapping'
+            },
+            'source': 'FDA FAERS-ChEMBL-Mapping'
+        }
+
     #===========================================================
     # Cross-Domain Mapping Methods
     #===========================================================
 
     def _map_drug_to_chembl(self, drug_name: str) -> Optional[str]:
-        """Map drug name to ChEMBL compound ID"""
+        """Map drug name to ChEMBL compound ID via the shared drug name index"""
         # Check cache
         if drug_name in self.chembl_cache:
             return self.chembl_cache[drug_name]
 
-        # TODO: Implement actual mapping logic
-        # This could:
-        # 1. Query local ChEMBL database
-        # 2. Call ChEMBL API
-        # 3. Use pre-computed mapping table
-
-        chembl_id = None
+        resolver = self.drug_resolver
+        chembl_id = resolver.resolve(drug_name) if resolver else None
 
         # Cache result
         self.chembl_cache[drug_name] = chembl_id
@@ -905,23 +1216,32 @@ class FAERSProcessor(BaseProcessor):
                 continue
 
             type_name = entity_type.replace(':', '_').lower()
-            entities_file = output_dir / f"faers_{type_name}s_{timestamp}.json"
-
-            with open(entities_file, 'w', encoding='utf-8') as f:
-                json.dump(entity_list, f, ensure_ascii=False, indent=2)
+            entities_file = self._write_records(output_dir / f"faers_{type_name}s_{timestamp}", entity_list)
 
             logger.info(f"Saved {len(entity_list)} {entity_type} entities to: {entities_file}")
 
         # Save relationships
         if relationships:
-            relationships_file = output_dir / f"faers_relationships_{timestamp}.json"
-
-            with open(relationships_file, 'w', encoding='utf-8') as f:
-                json.dump(relationships, f, ensure_ascii=False, indent=2)
+            relationships_file = self._write_records(output_dir / f"faers_relationships_{timestamp}", relationships)
 
             logger.info(f"Saved {len(relationships)} relationships to: {relationships_file}")
 
         # Save processing summary
+        return self._write_summary(
+            output_dir,
+            timestamp,
+            {entity_type: len(entity_list) for entity_type, entity_list in entities.items()},
+            len(relationships)
+        )
+
+    def _write_summary(
+        self,
+        output_dir: Path,
+        timestamp: str,
+        entities_by_type: Dict[str, int],
+        total_relationships: int
+    ) -> Path:
+        """Write the processing summary file"""
         summary = {
             "processor": self.PROCESSOR_NAME,
             "source": "FDA FAERS (FDA Adverse Event Reporting System)",
@@ -938,17 +1258,15 @@ class FAERSProcessor(BaseProcessor):
                 "compounds_extracted": self.stats.compounds_extracted,
                 "relationships_created": self.stats.relationships_created,
                 "cross_domain_relationships": self.stats.cross_domain_relationships,
+                "safety_signals_detected": self.stats.safety_signals_detected,
                 "duplicate_reports_skipped": self.stats.duplicate_reports_skipped,
                 "invalid_records_skipped": self.stats.invalid_records_skipped,
-                "unique_safetyreport_ids": len(self.stats.unique_safetyreport_ids),
+                "unique_safetyreport_ids": self.stats.unique_reports,
                 "processing_time_seconds": self.stats.processing_time_seconds
             },
-            "entities_by_type": {
-                entity_type: len(entity_list)
-                for entity_type, entity_list in entities.items()
-            },
-            "total_entities": sum(len(entity_list) for entity_list in entities.values()),
-            "total_relationships": len(relationships),
+            "entities_by_type": entities_by_type,
+            "total_entities": sum(entities_by_type.values()),
+            "total_relationships": total_relationships,
             "errors": self.stats.errors[:10],  # Limit to first 10
             "warnings": self.stats.warnings[:10]
         }
@@ -985,6 +1303,9 @@ Examples:
   # Include non-serious adverse events
   python -m processors.faers_processor /path/to/faers/data --include-non-serious
 
+  # Detect drug-event safety signals per quarter
+  python -m processors.faers_processor /path/to/faers/data --detect-signals --stratify-by-quarter
+
   # Custom output directory
   python -m processors.faers_processor /path/to/faers/data --output /custom/output/path
         """
@@ -1026,6 +1347,18 @@ Examples:
         help='Disable cross-domain mapping to ChEMBL'
     )
 
+    parser.add_argument(
+        '--detect-signals',
+        action='store_true',
+        help='Emit PRR/ROR/IC disproportionality signals as HAS_SAFETY_SIGNAL relationships'
+    )
+
+    parser.add_argument(
+        '--stratify-by-quarter',
+        action='store_true',
+        help='Compute signals separately for each reporting quarter'
+    )
+
     parser.add_argument(
         '--output',
         help='Output directory (default: data/processed/documents/faers/)'
@@ -1055,7 +1388,9 @@ Examples:
             'max_reports': args.max_reports,
             'include_non_serious': args.include_non_serious,
             'deduplicate_by_safetyreport_id': not args.no_dedup,
-            'map_to_chembl': not args.no_cross_domain
+            'map_to_chembl': not args.no_cross_domain,
+            'detect_signals': args.detect_signals,
+            'signal_stratify_by_quarter': args.stratify_by_quarter
         }
     }
 
@@ -1077,7 +1412,9 @@ Examples:
     print(f"Adverse events extracted: {processor.stats.adverse_events_extracted}")
     print(f"Conditions extracted: {processor.stats.conditions_extracted}")
     print(f"Compounds extracted: {processor.stats.compounds_extracted}")
-    print(f"Relationships created: {len(result.relationships)}")
+    print(f"Relationships created: {processor.stats.relationships_created}")
+    if args.detect_signals:
+        print(f"Safety signals detected: {processor.stats.safety_signals_detected}")
     print(f"Processing time: {elapsed_time:.2f} seconds")
 
     if processor.stats.errors:
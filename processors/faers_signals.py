@@ -0,0 +1,498 @@
+#===========================================================
+# PharmaKG FDA FAERS Signal Detection
+# Pharmaceutical Knowledge Graph - Disproportionality Analysis
+#===========================================================
+# Version: v1.0
+# Description: Vectorised PRR / ROR / chi-square / Bayesian IC over FAERS
+#              drug × reaction contingency tables, optionally stratified
+#              by quarter, emitting HAS_SAFETY_SIGNAL relationships
+#===========================================================
+
+import argparse
+import logging
+from array import array
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from statistics import NormalDist
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from processors.storage import DEFAULT_OUTPUT_FORMAT, find_outputs, iter_records, write_records
+
+logger = logging.getLogger(__name__)
+
+try:
+    import scipy.sparse as sp
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+
+SIGNAL_RELATIONSHIP_TYPE = 'HAS_SAFETY_SIGNAL'
+SIGNAL_SOURCE = 'FDA FAERS-Signal Detection'
+
+# Available signal criteria (all selected criteria must pass)
+SIGNAL_CRITERIA = ('prr', 'ror', 'ic')
+
+
+#===========================================================
+# Configuration and Results
+#===========================================================
+
+@dataclass
+class SignalThresholds:
+    """Signal detection thresholds"""
+    min_count: int = 3  # Minimum reports with both drug and event (cell a)
+    prr: float = 2.0  # Evans criteria: PRR >= 2 and chi-square >= 4
+    chi_square: float = 4.0
+    ror_lower: float = 1.0  # Lower confidence bound of ROR must exceed this
+    ic_lower: float = 0.0  # IC025 must exceed this
+    criteria: Sequence[str] = ('prr',)
+
+
+@dataclass
+class SignalTable:
+    """Disproportionality statistics for every observed drug–event pair (column arrays)"""
+    drugs: List[str]
+    events: List[str]
+    drug_index: np.ndarray
+    event_index: np.ndarray
+    stratum: List[Optional[str]]
+    a: np.ndarray
+    b: np.ndarray
+    c: np.ndarray
+    d: np.ndarray
+    metrics: Dict[str, np.ndarray] = field(default_factory=dict)
+    signal: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.a)
+
+    def iter_rows(self, only_signals: bool = False) -> Iterator[Dict[str, Any]]:
+        """Yield one dict per drug–event(–stratum) pair"""
+        indexes = np.flatnonzero(self.signal) if only_signals and self.signal is not None else range(len(self))
+        for i in indexes:
+            row = {
+                'drug': self.drugs[self.drug_index[i]],
+                'event': self.events[self.event_index[i]],
+                'quarter': self.stratum[i],
+                'a': int(self.a[i]),
+                'b': int(self.b[i]),
+                'c': int(self.c[i]),
+                'd': int(self.d[i]),
+            }
+            for name, values in self.metrics.items():
+                row[name] = round(float(values[i]), 6)
+            if self.signal is not None:
+                row['signal'] = bool(self.signal[i])
+            yield row
+
+
+#===========================================================
+# Contingency Counts
+#===========================================================
+
+class DisproportionalityAnalyzer:
+    """
+    Drug–event disproportionality analysis
+
+    Reports are added incrementally as (suspect drugs, reactions, quarter);
+    only integer indexes are kept, so millions of reports fit in memory.
+    compute() builds sparse report × drug and report × event incidence
+    matrices and derives every 2×2 table from one sparse product:
+
+        a = reports with drug and event      b = drug, not event
+        c = event, not drug                  d = neither
+
+    Only reports with at least one drug and one event are counted.
+    """
+
+    def __init__(self, thresholds: Optional[SignalThresholds] = None, confidence: float = 0.95):
+        """
+        Initialize the analyzer
+
+        Args:
+            thresholds: Signal thresholds
+            confidence: Confidence level for PRR/ROR intervals
+        """
+        self.thresholds = thresholds or SignalThresholds()
+        self.confidence = confidence
+
+        unknown = set(self.thresholds.criteria) - set(SIGNAL_CRITERIA)
+        if unknown:
+            raise ValueError(f"Unknown signal criteria: {sorted(unknown)}. Available: {SIGNAL_CRITERIA}")
+
+        self._drug_ids: Dict[str, int] = {}
+        self._event_ids: Dict[str, int] = {}
+        self._strata_ids: Dict[Optional[str], int] = {}
+
+        self._report_strata = array('i')
+        self._drug_pairs = (array('i'), array('i'))  # (report, drug)
+        self._event_pairs = (array('i'), array('i'))  # (report, event)
+
+    @property
+    def report_count(self) -> int:
+        return len(self._report_strata)
+
+    def add_report(
+        self,
+        drugs: Iterable[str],
+        events: Iterable[str],
+        quarter: Optional[str] = None
+    ) -> int:
+        """
+        Add one report
+
+        Args:
+            drugs: Suspect drug (Compound) ids
+            events: Reaction (Condition) ids
+            quarter: Reporting quarter used for stratification
+
+        Returns:
+            Report index
+        """
+        report = self.new_report(quarter)
+        for drug in drugs:
+            self.add_drug(report, drug)
+        for event in events:
+            self.add_event(report, event)
+        return report
+
+    def new_report(self, quarter: Optional[str] = None) -> int:
+        """Register a report and return its index"""
+        stratum = self._strata_ids.setdefault(quarter, len(self._strata_ids))
+        self._report_strata.append(stratum)
+        return len(self._report_strata) - 1
+
+    def add_drug(self, report: int, drug: str):
+        """Record a suspect drug for a report"""
+        self._drug_pairs[0].append(report)
+        self._drug_pairs[1].append(self._drug_ids.setdefault(drug, len(self._drug_ids)))
+
+    def add_event(self, report: int, event: str):
+        """Record a reaction for a report"""
+        self._event_pairs[0].append(report)
+        self._event_pairs[1].append(self._event_ids.setdefault(event, len(self._event_ids)))
+
+    @classmethod
+    def from_faers_outputs(
+        cls,
+        output_dir: Path,
+        thresholds: Optional[SignalThresholds] = None,
+        confidence: float = 0.95
+    ) -> 'DisproportionalityAnalyzer':
+        """
+        Build an analyzer from FAERSProcessor output files
+
+        Uses faers_clinical_adverseevents_* (report quarter) and
+        faers_relationships_* (CAUSED_ADVERSE_EVENT for suspect drugs,
+        ASSOCIATED_WITH for reactions) in any supported storage format.
+
+        Args:
+            output_dir: FAERSProcessor output directory
+            thresholds: Signal thresholds
+            confidence: Confidence level
+
+        Returns:
+            Analyzer with all reports loaded
+        """
+        analyzer = cls(thresholds, confidence)
+        output_dir = Path(output_dir)
+
+        reports: Dict[str, int] = {}
+        for path in find_outputs(output_dir, 'faers_clinical_adverseevents_*', newest_first=False):
+            for entity in iter_records(path):
+                primary_id = entity.get('primary_id')
+                if primary_id and primary_id not in reports:
+                    reports[primary_id] = analyzer.new_report(entity.get('properties', {}).get('quarter'))
+
+        for path in find_outputs(output_dir, 'faers_relationships_*', newest_first=False):
+            for relationship in iter_records(path):
+                rel_type = relationship.get('relationship_type')
+                if rel_type == 'CAUSED_ADVERSE_EVENT':
+                    report = reports.get(relationship.get('target_entity_id'))
+                    if report is not None:
+                        analyzer.add_drug(report, relationship['source_entity_id'])
+                elif rel_type == 'ASSOCIATED_WITH':
+                    report = reports.get(relationship.get('source_entity_id'))
+                    if report is not None:
+                        analyzer.add_event(report, relationship['target_entity_id'])
+
+        logger.info(f"Loaded {analyzer.report_count} reports, {len(analyzer._drug_ids)} drugs, "
+                    f"{len(analyzer._event_ids)} events from {output_dir}")
+        return analyzer
+
+    #===========================================================
+    # Computation
+    #===========================================================
+
+    def compute(self, stratify_by_quarter: bool = False) -> SignalTable:
+        """
+        Compute disproportionality statistics for all observed pairs
+
+        Args:
+            stratify_by_quarter: Compute a separate 2×2 table per quarter
+
+        Returns:
+            SignalTable with metrics and signal flags
+        """
+        n_reports = self.report_count
+        drug_reports, drug_ids = self._unique_pairs(self._drug_pairs, len(self._drug_ids))
+        event_reports, event_ids = self._unique_pairs(self._event_pairs, len(self._event_ids))
+
+        # Reports contributing to the analysis: at least one drug and one event
+        valid = np.zeros(n_reports, dtype=bool)
+        valid[drug_reports] = True
+        has_event = np.zeros(n_reports, dtype=bool)
+        has_event[event_reports] = True
+        valid &= has_event
+
+        strata = np.frombuffer(self._report_strata, dtype=np.int32) if n_reports else np.zeros(0, dtype=np.int32)
+        labels = {index: label for label, index in self._strata_ids.items()}
+
+        if stratify_by_quarter:
+            groups = [(labels[s], valid & (strata == s)) for s in sorted(labels, key=lambda s: str(labels[s]))]
+        else:
+            groups = [(None, valid)]
+
+        parts = []
+        for label, mask in groups:
+            part = self._contingency(mask, drug_reports, drug_ids, event_reports, event_ids)
+            if part is not None:
+                parts.append((label, part))
+
+        if parts:
+            drug_index = np.concatenate([p[0] for _, p in parts])
+            event_index = np.concatenate([p[1] for _, p in parts])
+            a, b, c, d = (np.concatenate([p[k] for _, p in parts]) for k in range(2, 6))
+            stratum = [label for label, p in parts for _ in range(len(p[2]))]
+        else:
+            drug_index = event_index = np.zeros(0, dtype=np.int64)
+            a = b = c = d = np.zeros(0, dtype=np.float64)
+            stratum = []
+
+        table = SignalTable(
+            drugs=self._names(self._drug_ids),
+            events=self._names(self._event_ids),
+            drug_index=drug_index,
+            event_index=event_index,
+            stratum=stratum,
+            a=a, b=b, c=c, d=d
+        )
+        table.metrics = compute_metrics(a, b, c, d, self.confidence)
+        table.signal = self.detect(table)
+
+        logger.info(f"Computed {len(table)} drug-event pairs, {int(table.signal.sum())} signals")
+        return table
+
+    def detect(self, table: SignalTable) -> np.ndarray:
+        """Apply the configured thresholds; returns a boolean mask over table rows"""
+        t = self.thresholds
+        m = table.metrics
+        signal = table.a >= t.min_count
+        if 'prr' in t.criteria:
+            signal &= (m['prr'] >= t.prr) & (m['chi_square'] >= t.chi_square)
+        if 'ror' in t.criteria:
+            signal &= m['ror_lower'] > t.ror_lower
+        if 'ic' in t.criteria:
+            signal &= m['ic025'] > t.ic_lower
+        return signal
+
+    def _contingency(self, mask, drug_reports, drug_ids, event_reports, event_ids):
+        """Return (drug, event, a, b, c, d) arrays for reports selected by mask"""
+        n_total = int(mask.sum())
+        if n_total == 0:
+            return None
+
+        keep_drug = mask[drug_reports]
+        keep_event = mask[event_reports]
+        dr, dd = drug_reports[keep_drug], drug_ids[keep_drug]
+        er, ee = event_reports[keep_event], event_ids[keep_event]
+
+        n_drugs, n_events = len(self._drug_ids), len(self._event_ids)
+        drug_totals = np.bincount(dd, minlength=n_drugs).astype(np.float64)
+        event_totals = np.bincount(ee, minlength=n_events).astype(np.float64)
+
+        if SCIPY_AVAILABLE:
+            n_reports = len(mask)
+            drug_matrix = sp.csr_matrix(
+                (np.ones(len(dr), dtype=np.float64), (dr, dd)), shape=(n_reports, n_drugs)
+            )
+            event_matrix = sp.csr_matrix(
+                (np.ones(len(er), dtype=np.float64), (er, ee)), shape=(n_reports, n_events)
+            )
+            co = (drug_matrix.T @ event_matrix).tocoo()
+            pair_drug, pair_event, a = co.row.astype(np.int64), co.col.astype(np.int64), co.data
+        else:
+            pair_drug, pair_event, a = _cooccurrence_numpy(dr, dd, er, ee, n_events)
+
+        b = drug_totals[pair_drug] - a
+        c = event_totals[pair_event] - a
+        d = n_total - a - b - c
+        return pair_drug, pair_event, a, b, c, d
+
+    @staticmethod
+    def _unique_pairs(pairs, width: int):
+        reports = np.frombuffer(pairs[0], dtype=np.int32).astype(np.int64)
+        ids = np.frombuffer(pairs[1], dtype=np.int32).astype(np.int64)
+        if len(reports) == 0:
+            return reports, ids
+        keys = np.unique(reports * max(width, 1) + ids)
+        return keys // max(width, 1), keys % max(width, 1)
+
+    @staticmethod
+    def _names(ids: Dict[str, int]) -> List[str]:
+        names = [None] * len(ids)
+        for name, index in ids.items():
+            names[index] = name
+        return names
+
+    #===========================================================
+    # Output
+    #===========================================================
+
+    def to_relationships(self, table: SignalTable) -> Iterator[Dict[str, Any]]:
+        """Yield HAS_SAFETY_SIGNAL relationships (Compound → Condition) for detected signals"""
+        criteria = list(self.thresholds.criteria)
+        detected_at = datetime.now().isoformat()
+        for row in table.iter_rows(only_signals=True):
+            properties = {key: value for key, value in row.items() if key not in ('drug', 'event', 'signal')}
+            properties.update({
+                'criteria': criteria,
+                'detected_at': detected_at,
+                'data_source': SIGNAL_SOURCE
+            })
+            yield {
+                'relationship_type': SIGNAL_RELATIONSHIP_TYPE,
+                'source_entity_id': row['drug'],
+                'target_entity_id': row['event'],
+                'properties': properties,
+                'source': SIGNAL_SOURCE
+            }
+
+    def write_signals(
+        self,
+        table: SignalTable,
+        output_dir: Path,
+        output_format: str = DEFAULT_OUTPUT_FORMAT
+    ) -> Path:
+        """Write signal relationships next to the FAERS outputs"""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        return write_records(
+            Path(output_dir) / f"faers_signal_relationships_{timestamp}",
+            self.to_relationships(table),
+            output_format
+        )
+
+
+#===========================================================
+# Vectorised Statistics
+#===========================================================
+
+def compute_metrics(a, b, c, d, confidence: float = 0.95) -> Dict[str, np.ndarray]:
+    """
+    Compute PRR, ROR, chi-square and IC for arrays of 2×2 tables
+
+    - PRR/ROR use the Haldane–Anscombe correction (+0.5 to every cell)
+      for tables containing a zero cell
+    - chi-square is Yates-corrected, 1 degree of freedom
+    - IC uses the BCPNN shrinkage estimate log2((a + 0.5) / (E + 0.5)) with
+      the closed-form IC025/IC975 approximation of Norén et al. (2013)
+
+    Returns:
+        {metric: array}
+    """
+    a, b, c, d = (np.asarray(x, dtype=np.float64) for x in (a, b, c, d))
+    n = a + b + c + d
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+
+    zero = (a == 0) | (b == 0) | (c == 0) | (d == 0)
+    ca, cb, cc, cd = (np.where(zero, x + 0.5, x) for x in (a, b, c, d))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        prr = (ca / (ca + cb)) / (cc / (cc + cd))
+        prr_se = np.sqrt(1 / ca - 1 / (ca + cb) + 1 / cc - 1 / (cc + cd))
+
+        ror = (ca * cd) / (cb * cc)
+        ror_se = np.sqrt(1 / ca + 1 / cb + 1 / cc + 1 / cd)
+
+        denominator = (a + b) * (c + d) * (a + c) * (b + d)
+        yates = np.maximum(np.abs(a * d - b * c) - n / 2, 0)
+        chi_square = np.where(denominator > 0, n * yates ** 2 / denominator, 0.0)
+
+        expected = (a + b) * (a + c) / n
+        ic = np.log2((a + 0.5) / (expected + 0.5))
+        shrink = a + 0.5
+        ic025 = ic - 3.3 * shrink ** -0.5 - 2 * shrink ** -1.5
+        ic975 = ic + 2.4 * shrink ** -0.5 - 0.5 * shrink ** -1.5
+
+    return {
+        'prr': prr,
+        'prr_lower': np.exp(np.log(prr) - z * prr_se),
+        'prr_upper': np.exp(np.log(prr) + z * prr_se),
+        'ror': ror,
+        'ror_lower': np.exp(np.log(ror) - z * ror_se),
+        'ror_upper': np.exp(np.log(ror) + z * ror_se),
+        'chi_square': chi_square,
+        'expected': expected,
+        'ic': ic,
+        'ic025': ic025,
+        'ic975': ic975,
+    }
+
+
+def _cooccurrence_numpy(dr, dd, er, ee, n_events: int):
+    """Drug × event co-occurrence counts without scipy (join on report id)"""
+    order = np.argsort(er, kind='stable')
+    er, ee = er[order], ee[order]
+
+    starts = np.searchsorted(er, dr, side='left')
+    counts = np.searchsorted(er, dr, side='right') - starts
+    total = int(counts.sum())
+    if total == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, np.zeros(0, dtype=np.float64)
+
+    # Expand each (report, drug) row over the events of the same report
+    offsets = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(total)
+    keys = np.repeat(dd, counts) * n_events + ee[offsets]
+    unique, a = np.unique(keys, return_counts=True)
+    return unique // n_events, unique % n_events, a.astype(np.float64)
+
+
+#===========================================================
+# Command-Line Interface
+#===========================================================
+
+def main():
+    """Command-line main function"""
+    parser = argparse.ArgumentParser(description='FAERS disproportionality signal detection')
+    parser.add_argument('faers_output', help='Directory containing FAERSProcessor output files')
+    parser.add_argument('--output', help='Output directory for signal relationships (default: input directory)')
+    parser.add_argument('--stratify-by-quarter', action='store_true', help='Compute separate tables per quarter')
+    parser.add_argument('--min-count', type=int, default=3, help='Minimum co-reported cases (default: 3)')
+    parser.add_argument('--criteria', nargs='+', choices=SIGNAL_CRITERIA, default=['prr'],
+                        help='Signal criteria that must all pass (default: prr)')
+    parser.add_argument('--format', default=DEFAULT_OUTPUT_FORMAT, help='Output format (json/jsonl/parquet)')
+    parser.add_argument('--verbose', action='store_true', help='Verbose output')
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    thresholds = SignalThresholds(min_count=args.min_count, criteria=tuple(args.criteria))
+    analyzer = DisproportionalityAnalyzer.from_faers_outputs(Path(args.faers_output), thresholds)
+    table = analyzer.compute(stratify_by_quarter=args.stratify_by_quarter)
+    output_path = analyzer.write_signals(table, Path(args.output or args.faers_output), args.format)
+
+    print(f"Drug-event pairs: {len(table)}")
+    print(f"Signals: {int(table.signal.sum())}")
+    print(f"Output: {output_path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,372 @@
+#===========================================================
+# PharmaKG FDA FAERS Streaming Join
+# Pharmaceutical Knowledge Graph - FAERS Out-of-Core Ingestion
+#===========================================================
+# Version: v1.0
+# Description: Chunked columnar reader for FAERS $-delimited files and a
+#              hash-partitioned on-disk join of DEMO/DRUG/REAC/OUTC on
+#              safetyreportid, so reports can be emitted in bounded memory
+#===========================================================
+
+import csv
+import json
+import logging
+import re
+import shutil
+import tempfile
+import zlib
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+try:
+    import pandas as pd
+    PANDAS_AVAILABLE = True
+except ImportError:
+    PANDAS_AVAILABLE = False
+
+
+#===========================================================
+# Table Layout
+#===========================================================
+
+# Columns projected from each FAERS table (everything is read as string)
+TABLE_COLUMNS: Dict[str, Tuple[str, ...]] = {
+    'DEMO': (
+        'safetyreportid', 'caseid', 'receivedate', 'serious', 'patientsex',
+        'patientage', 'patientageunit', 'patientweight', 'patientweightunit',
+        'safetyreportversion', 'reportertype'
+    ),
+    'DRUG': (
+        'safetyreportid', 'drugseq', 'drugcharacterization', 'drugname',
+        'medicinalproduct', 'drugdosagetxt', 'drugadministration', 'drugroute'
+    ),
+    'REAC': (
+        'safetyreportid', 'drugcharacterization', 'reactionmeddrapt', 'reactionmeddraversionpt'
+    ),
+    'OUTC': (
+        'safetyreportid', 'patientoutcome'
+    ),
+}
+
+JOIN_KEY = 'safetyreportid'
+
+QUARTER_PATTERN = re.compile(r"^[A-Z]+(\d{2})Q(\d)", re.IGNORECASE)
+
+
+def quarter_from_filename(file_name: str) -> Optional[str]:
+    """Derive the reporting quarter from a FAERS file name (DEMO24Q1.txt -> 2024Q1)"""
+    match = QUARTER_PATTERN.match(file_name)
+    if not match:
+        return None
+    return f"20{match.group(1)}Q{match.group(2)}"
+
+
+#===========================================================
+# Chunked Columnar Reader
+#===========================================================
+
+def read_header(file_path: Path, delimiter: str = '$') -> List[str]:
+    """Read the header row of a FAERS file"""
+    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+        header = f.readline()
+    return [name.strip() for name in header.rstrip('\r\n').split(delimiter)]
+
+
+def iter_column_chunks(
+    file_path: Path,
+    columns: Sequence[str],
+    chunk_size: int = 100000,
+    delimiter: str = '$'
+) -> Iterator[Dict[str, List[str]]]:
+    """
+    Read a FAERS file in column chunks
+
+    Only the requested columns are materialised, all as stripped strings.
+    Column names are matched case-insensitively; missing columns are filled
+    with empty strings. Uses pyarrow when available, then pandas, then csv.
+
+    Args:
+        file_path: FAERS $-delimited file
+        columns: Columns to project
+        chunk_size: Approximate number of rows per chunk
+        delimiter: Field delimiter
+
+    Yields:
+        {column: [values]} with equal-length lists
+    """
+    header = read_header(file_path, delimiter)
+    by_lower = {name.lower(): name for name in header}
+    present = {column: by_lower[column.lower()] for column in columns if column.lower() in by_lower}
+
+    if not present:
+        logger.warning(f"None of the expected columns found in {file_path.name}")
+        return
+
+    if PYARROW_AVAILABLE:
+        chunks = _iter_chunks_pyarrow(file_path, present, chunk_size, delimiter)
+    elif PANDAS_AVAILABLE:
+        chunks = _iter_chunks_pandas(file_path, present, chunk_size, delimiter)
+    else:
+        chunks = _iter_chunks_csv(file_path, header, present, chunk_size, delimiter)
+
+    for chunk in chunks:
+        length = len(next(iter(chunk.values())))
+        if length == 0:
+            continue
+        for column in columns:
+            if column not in chunk:
+                chunk[column] = [''] * length
+        yield chunk
+
+
+def _iter_chunks_pyarrow(file_path: Path, present: Dict[str, str], chunk_size: int, delimiter: str):
+    # Binary columns so that invalid UTF-8 is dropped (as errors='ignore' did) instead of failing
+    read_options = pa_csv.ReadOptions(block_size=max(1 << 20, chunk_size * 256))
+    parse_options = pa_csv.ParseOptions(
+        delimiter=delimiter,
+        quote_char=False,
+        invalid_row_handler=lambda row: 'skip'
+    )
+    convert_options = pa_csv.ConvertOptions(
+        include_columns=list(present.values()),
+        column_types={source: pa.binary() for source in present.values()},
+        strings_can_be_null=False
+    )
+
+    reader = pa_csv.open_csv(
+        str(file_path),
+        read_options=read_options,
+        parse_options=parse_options,
+        convert_options=convert_options
+    )
+    for batch in reader:
+        chunk = {}
+        for column, source in present.items():
+            values = batch.column(batch.schema.get_field_index(source)).to_pylist()
+            chunk[column] = [
+                value.decode('utf-8', 'ignore').strip() if value is not None else ''
+                for value in values
+            ]
+        yield chunk
+
+
+def _iter_chunks_pandas(file_path: Path, present: Dict[str, str], chunk_size: int, delimiter: str):
+    reader = pd.read_csv(
+        file_path,
+        sep=delimiter,
+        usecols=list(present.values()),
+        dtype=str,
+        keep_default_na=False,
+        quoting=csv.QUOTE_NONE,
+        on_bad_lines='skip',
+        encoding='utf-8',
+        encoding_errors='ignore',
+        chunksize=chunk_size
+    )
+    for frame in reader:
+        yield {
+            column: [value.strip() for value in frame[source].tolist()]
+            for column, source in present.items()
+        }
+
+
+def _iter_chunks_csv(file_path: Path, header: List[str], present: Dict[str, str], chunk_size: int, delimiter: str):
+    indexes = {column: header.index(source) for column, source in present.items()}
+    width = len(header)
+
+    with open(file_path, 'r', encoding='utf-8', errors='ignore', newline='') as f:
+        reader = csv.reader(f, delimiter=delimiter, quoting=csv.QUOTE_NONE)
+        next(reader, None)
+
+        chunk = {column: [] for column in indexes}
+        rows = 0
+        for row in reader:
+            if not row:
+                continue
+            if len(row) < width:
+                row = row + [''] * (width - len(row))
+            for column, index in indexes.items():
+                chunk[column].append(row[index].strip())
+            rows += 1
+            if rows >= chunk_size:
+                yield chunk
+                chunk = {column: [] for column in indexes}
+                rows = 0
+
+        if rows:
+            yield chunk
+
+
+#===========================================================
+# Hash-Partitioned Join
+#===========================================================
+
+class PartitionedReportJoin:
+    """
+    Out-of-core join of FAERS tables on safetyreportid
+
+    Rows are appended to one spill file per (table, partition), where the
+    partition is crc32(safetyreportid) % partitions. Each partition is then
+    joined in memory, so peak memory is roughly total input / partitions.
+
+    DEMO rows are de-duplicated per report (first seen wins, files are added
+    in order); DRUG/REAC/OUTC rows are accumulated across all files.
+    """
+
+    def __init__(self, work_dir: Optional[str] = None, partitions: int = 64):
+        """
+        Initialize the join
+
+        Args:
+            work_dir: Directory for spill files (a temporary directory by default)
+            partitions: Number of hash partitions
+        """
+        self.partitions = max(1, partitions)
+        self._owns_dir = work_dir is None
+        self.work_dir = Path(tempfile.mkdtemp(prefix='faers_join_') if work_dir is None else work_dir)
+        self.work_dir.mkdir(parents=True, exist_ok=True)
+
+        self._handles: Dict[Tuple[str, int], Any] = {}
+
+        self.stats = {
+            'rows_partitioned': defaultdict(int),
+            'rows_missing_key': 0,
+            'duplicate_reports': 0,
+            'reports_without_demo': 0
+        }
+
+    def add_file(self, table: str, file_path: Path, chunk_size: int = 100000) -> int:
+        """
+        Partition a FAERS file by safetyreportid
+
+        Args:
+            table: DEMO, DRUG, REAC or OUTC
+            file_path: Source file
+            chunk_size: Rows per read chunk
+
+        Returns:
+            Number of rows written
+        """
+        columns = TABLE_COLUMNS[table]
+        quarter = quarter_from_filename(file_path.name)
+        written = 0
+
+        for chunk in iter_column_chunks(file_path, columns, chunk_size):
+            keys = chunk[JOIN_KEY]
+            value_columns = [chunk[column] for column in columns[1:]]
+
+            for i, key in enumerate(keys):
+                if not key:
+                    self.stats['rows_missing_key'] += 1
+                    continue
+                row = [key, quarter]
+                row.extend(values[i] for values in value_columns)
+                self._handle(table, self._partition(key)).write(
+                    json.dumps(row, ensure_ascii=False) + '\n'
+                )
+                written += 1
+
+        self.stats['rows_partitioned'][table] += written
+        return written
+
+    def iter_reports(self, deduplicate: bool = True) -> Iterator[Dict[str, Any]]:
+        """
+        Join the partitions and yield one report at a time
+
+        Args:
+            deduplicate: Yield only the first DEMO row per safetyreportid
+
+        Yields:
+            {'safetyreportid', 'quarter', 'demo', 'drugs', 'reactions', 'outcomes'}
+            where demo/drugs/reactions are dicts keyed by FAERS column name
+        """
+        self._close_handles()
+
+        for partition in range(self.partitions):
+            outcomes = self._group(partition, 'OUTC')
+            drugs = self._group(partition, 'DRUG')
+            reactions = self._group(partition, 'REAC')
+
+            seen = set()
+            for key, quarter, demo in self._iter_rows(partition, 'DEMO'):
+                if key in seen:
+                    self.stats['duplicate_reports'] += 1
+                    if deduplicate:
+                        continue
+                seen.add(key)
+
+                yield {
+                    'safetyreportid': key,
+                    'quarter': quarter,
+                    'demo': demo,
+                    'drugs': drugs.get(key, []),
+                    'reactions': reactions.get(key, []),
+                    'outcomes': [row['patientoutcome'] for row in outcomes.get(key, [])]
+                }
+
+            self.stats['reports_without_demo'] += len((set(drugs) | set(reactions)) - seen)
+
+    def cleanup(self):
+        """Close and remove spill files"""
+        self._close_handles()
+        if self._owns_dir:
+            shutil.rmtree(self.work_dir, ignore_errors=True)
+        else:
+            for path in self.work_dir.glob('*.part'):
+                path.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.cleanup()
+
+    #===========================================================
+    # Internal Helpers
+    #===========================================================
+
+    def _partition(self, key: str) -> int:
+        return zlib.crc32(key.encode('utf-8')) % self.partitions
+
+    def _path(self, table: str, partition: int) -> Path:
+        return self.work_dir / f"{table}_{partition:04d}.part"
+
+    def _handle(self, table: str, partition: int):
+        handle = self._handles.get((table, partition))
+        if handle is None:
+            handle = open(self._path(table, partition), 'a', encoding='utf-8')
+            self._handles[(table, partition)] = handle
+        return handle
+
+    def _close_handles(self):
+        for handle in self._handles.values():
+            handle.close()
+        self._handles = {}
+
+    def _iter_rows(self, partition: int, table: str) -> Iterator[Tuple[str, Optional[str], Dict[str, str]]]:
+        path = self._path(table, partition)
+        if not path.exists():
+            return
+        columns = TABLE_COLUMNS[table]
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                key, quarter, *values = json.loads(line)
+                row = dict(zip(columns[1:], values))
+                row[JOIN_KEY] = key
+                yield key, quarter, row
+
+    def _group(self, partition: int, table: str) -> Dict[str, List[Dict[str, str]]]:
+        grouped = defaultdict(list)
+        for key, _, row in self._iter_rows(partition, table):
+            grouped[key].append(row)
+        return grouped
@@ -22,6 +22,8 @@ from urllib.parse import urljoin, urlparse
 import requests
 from bs4 import BeautifulSoup
 
+from processors.http_cache import get_http_cache, install_http_cache
+
 logger = logging.getLogger(__name__)
 
 
@@ -222,9 +224,21 @@ class FDAGuidanceCollector:
         self.session = requests.Session()
         self.session.headers.update(self.HEADERS)
 
+        # Shared HTTP cache: unchanged pages cost only a conditional GET
+        self.http_cache = None
+        if self.config.get("http_cache", True):
+            self.http_cache = get_http_cache(self.config.get("http_cache_dir"))
+            install_http_cache(
+                self.session, source="fda_guidance", cache=self.http_cache, throttle=self._respect_rate_limit
+            )
+
         # Track collected URLs
         self.collected_urls: Set[str] = set()
 
+    def _respect_rate_limit(self):
+        """Pause between requests"""
+        time.sleep(self.REQUEST_DELAY)
+
     def _make_request(self, url: str, params: Optional[Dict] = None) -> Optional[requests.Response]:
         """
         Make HTTP request with rate limiting and error handling
@@ -236,8 +250,11 @@ class FDAGuidanceCollector:
         Returns:
             Response object or None if failed
         """
+        # With the HTTP cache installed, its adapter throttles only real network sends
+        if self.http_cache is None:
+            self._respect_rate_limit()
+
         try:
-            time.sleep(self.REQUEST_DELAY)
             response = self.session.get(url, params=params, timeout=30)
             response.raise_for_status()
             return response
@@ -709,6 +726,7 @@ class FDAGuidanceCollector:
                 "by_product_area": self.stats["by_product"],
                 "errors_count": len(self.stats["errors"]),
             },
+            "http_cache": self.http_cache.get_stats("fda_guidance") if self.http_cache else None,
         }
 
 
@@ -0,0 +1,457 @@
+#===========================================================
+# PharmaKG HTTP 响应缓存
+# Pharmaceutical Knowledge Graph - Shared HTTP Response Cache
+#===========================================================
+# 版本: v1.0
+# 描述: 所有抽取器和处理器共享的磁盘 HTTP 缓存，
+#       支持 ETag/Last-Modified 条件请求、压缩存储和按数据源统计命中率
+#===========================================================
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+logger = logging.getLogger(__name__)
+
+
+# 默认缓存目录（可用环境变量覆盖）
+DEFAULT_CACHE_DIR = os.environ.get("PHARMAKG_HTTP_CACHE_DIR", "data/cache")
+CACHE_FILE_NAME = "http_cache.db"
+
+# 缓存的是解压后的正文，这些头不能原样回放
+_DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection"}
+
+
+@dataclass
+class CacheEntry:
+    """缓存条目"""
+    url: str
+    source: str
+    status_code: int
+    headers: Dict[str, str]
+    body: bytes
+    etag: Optional[str]
+    last_modified: Optional[str]
+    stored_at: float
+
+    def is_fresh(self, max_age: float) -> bool:
+        """在 max_age 秒内可直接使用而无需重新验证"""
+        return max_age > 0 and time.time() - self.stored_at < max_age
+
+
+class HTTPCache:
+    """
+    磁盘 HTTP 响应缓存
+
+    - SQLite 索引 + zlib 压缩正文，单文件存储，线程安全
+    - 记录 ETag / Last-Modified，供条件请求重新验证
+    - 按数据源统计：新鲜命中、304 重新验证命中、未命中、节省的字节数
+    """
+
+    def __init__(self, path: Union[str, Path], compression_level: int = 6):
+        """
+        初始化缓存
+
+        Args:
+            path: 缓存数据库文件路径
+            compression_level: zlib 压缩级别（1-9）
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.compression_level = compression_level
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS http_cache (
+                url TEXT PRIMARY KEY,
+                source TEXT,
+                status_code INTEGER,
+                headers TEXT,
+                body BLOB,
+                etag TEXT,
+                last_modified TEXT,
+                stored_at REAL,
+                body_size INTEGER
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_http_cache_source ON http_cache(source)")
+        self._conn.commit()
+
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    #===========================================================
+    # 读写
+    #===========================================================
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        """
+        读取缓存条目
+
+        Args:
+            url: 完整请求 URL（含查询参数）
+
+        Returns:
+            缓存条目或 None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, source, status_code, headers, body, etag, last_modified, stored_at "
+                "FROM http_cache WHERE url = ?",
+                (url,)
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        try:
+            body = zlib.decompress(row[4])
+        except zlib.error as e:
+            logger.warning(f"Dropping corrupt cache entry for {url}: {e}")
+            self.delete(url)
+            return None
+
+        return CacheEntry(
+            url=row[0],
+            source=row[1],
+            status_code=row[2],
+            headers=json.loads(row[3]),
+            body=body,
+            etag=row[5],
+            last_modified=row[6],
+            stored_at=row[7]
+        )
+
+    def put(
+        self,
+        url: str,
+        source: str,
+        status_code: int,
+        headers: Dict[str, str],
+        body: bytes
+    ):
+        """
+        写入缓存条目
+
+        Args:
+            url: 完整请求 URL
+            source: 数据源名称
+            status_code: 响应状态码
+            headers: 响应头
+            body: 解压后的响应正文
+        """
+        stored_headers = {
+            k: v for k, v in headers.items()
+            if k.lower() not in _DROPPED_HEADERS
+        }
+        lowered = {k.lower(): v for k, v in stored_headers.items()}
+        compressed = zlib.compress(body, self.compression_level)
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO http_cache "
+                "(url, source, status_code, headers, body, etag, last_modified, stored_at, body_size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    url,
+                    source,
+                    status_code,
+                    json.dumps(stored_headers),
+                    compressed,
+                    lowered.get("etag"),
+                    lowered.get("last-modified"),
+                    time.time(),
+                    len(body)
+                )
+            )
+            self._conn.commit()
+
+    def touch(self, url: str, headers: Optional[Dict[str, str]] = None):
+        """304 重新验证后刷新存储时间（以及服务器返回的新验证头）"""
+        lowered = {k.lower(): v for k, v in (headers or {}).items()}
+        with self._lock:
+            self._conn.execute(
+                "UPDATE http_cache SET stored_at = ?, "
+                "etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified) "
+                "WHERE url = ?",
+                (time.time(), lowered.get("etag"), lowered.get("last-modified"), url)
+            )
+            self._conn.commit()
+
+    def delete(self, url: str):
+        """删除缓存条目"""
+        with self._lock:
+            self._conn.execute("DELETE FROM http_cache WHERE url = ?", (url,))
+            self._conn.commit()
+
+    def clear(self, source: Optional[str] = None):
+        """清空缓存（可只清空一个数据源）"""
+        with self._lock:
+            if source:
+                self._conn.execute("DELETE FROM http_cache WHERE source = ?", (source,))
+            else:
+                self._conn.execute("DELETE FROM http_cache")
+            self._conn.commit()
+
+    def close(self):
+        """关闭数据库连接"""
+        with self._lock:
+            self._conn.close()
+
+    #===========================================================
+    # 统计
+    #===========================================================
+
+    def record(self, source: str, event: str, nbytes: int = 0):
+        """
+        记录一次缓存事件
+
+        Args:
+            source: 数据源名称
+            event: fresh_hit / revalidated / miss / stored / bypass
+            nbytes: 因命中而未下载的正文字节数
+        """
+        with self._lock:
+            stats = self._stats.setdefault(source, {
+                "requests": 0,
+                "fresh_hits": 0,
+                "revalidated": 0,
+                "misses": 0,
+                "stored": 0,
+                "bypassed": 0,
+                "bytes_saved": 0
+            })
+            if event == "stored":
+                stats["stored"] += 1
+                return
+            stats["requests"] += 1
+            key = {
+                "fresh_hit": "fresh_hits",
+                "revalidated": "revalidated",
+                "miss": "misses",
+                "bypass": "bypassed"
+            }[event]
+            stats[key] += 1
+            stats["bytes_saved"] += nbytes
+
+    def get_stats(self, source: Optional[str] = None) -> Dict[str, Any]:
+        """
+        获取本进程内的命中统计
+
+        Args:
+            source: 数据源名称（None 表示全部数据源）
+
+        Returns:
+            {数据源: 统计}，或单个数据源的统计
+        """
+        with self._lock:
+            report = {}
+            for name, stats in self._stats.items():
+                entry = dict(stats)
+                cacheable = entry["requests"] - entry["bypassed"]
+                hits = entry["fresh_hits"] + entry["revalidated"]
+                entry["hit_rate"] = round(hits / cacheable, 4) if cacheable else 0.0
+                report[name] = entry
+
+        if source is not None:
+            return report.get(source, {})
+        return report
+
+    def summary(self) -> Dict[str, Dict[str, int]]:
+        """
+        按数据源汇总磁盘上的缓存条目
+
+        Returns:
+            {数据源: {"entries": n, "body_bytes": n, "stored_bytes": n}}
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT source, COUNT(*), SUM(body_size), SUM(LENGTH(body)) "
+                "FROM http_cache GROUP BY source"
+            ).fetchall()
+        return {
+            row[0]: {"entries": row[1], "body_bytes": row[2] or 0, "stored_bytes": row[3] or 0}
+            for row in rows
+        }
+
+
+class CachingHTTPAdapter(HTTPAdapter):
+    """
+    带缓存的 requests 适配器
+
+    挂载到 Session 后，所有 GET 请求（包括各处理器自定义的 _make_request）
+    都经过共享缓存：
+    - 在 max_age 内的条目直接返回
+    - 否则携带 If-None-Match / If-Modified-Since 发起条件请求，304 时返回缓存正文
+    - 带验证头（或设置了 max_age）的 200 响应写入缓存
+    流式请求（stream=True）和非 GET 请求不经过缓存。
+    设置 throttle 时只在真正发出网络请求前调用（缓存直接命中不限速）。
+    """
+
+    def __init__(
+        self,
+        cache: HTTPCache,
+        source: str,
+        max_age: float = 0,
+        throttle: Optional[Callable[[], None]] = None,
+        **kwargs
+    ):
+        """
+        初始化适配器
+
+        Args:
+            cache: 共享缓存
+            source: 数据源名称（用于统计）
+            max_age: 无需重新验证即可使用缓存的秒数（0 表示总是重新验证）
+            throttle: 每次网络请求前调用的限速函数
+            **kwargs: 传给 HTTPAdapter 的参数（max_retries、pool_maxsize 等）
+        """
+        super().__init__(**kwargs)
+        self.cache = cache
+        self.source = source
+        self.max_age = max_age
+        self.throttle = throttle
+
+    def send(self, request, stream=False, **kwargs):
+        if request.method != "GET" or stream or _no_store(request.headers.get("Cache-Control")):
+            if request.method == "GET":
+                self.cache.record(self.source, "bypass")
+            return self._send(request, stream=stream, **kwargs)
+
+        entry = self.cache.get(request.url)
+        if entry is not None and entry.is_fresh(self.max_age):
+            self.cache.record(self.source, "fresh_hit", len(entry.body))
+            return self._build_response(request, entry)
+
+        if entry is not None:
+            if entry.etag:
+                request.headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                request.headers["If-Modified-Since"] = entry.last_modified
+
+        response = self._send(request, stream=stream, **kwargs)
+
+        if response.status_code == 304 and entry is not None:
+            self.cache.touch(request.url, dict(response.headers))
+            self.cache.record(self.source, "revalidated", len(entry.body))
+            response.close()
+            return self._build_response(request, entry)
+
+        self.cache.record(self.source, "miss")
+
+        if response.status_code == 200 and self._storable(response):
+            self.cache.put(
+                request.url,
+                self.source,
+                response.status_code,
+                dict(response.headers),
+                response.content
+            )
+            self.cache.record(self.source, "stored")
+
+        return response
+
+    def _send(self, request, **kwargs):
+        """发出网络请求（先限速）"""
+        if self.throttle is not None:
+            self.throttle()
+        return super().send(request, **kwargs)
+
+    def _storable(self, response: requests.Response) -> bool:
+        if _no_store(response.headers.get("Cache-Control")):
+            return False
+        has_validator = "ETag" in response.headers or "Last-Modified" in response.headers
+        return has_validator or self.max_age > 0
+
+    def _build_response(self, request, entry: CacheEntry) -> requests.Response:
+        """用缓存条目构造响应对象"""
+        response = requests.Response()
+        response.status_code = entry.status_code
+        response.headers = CaseInsensitiveDict(entry.headers)
+        response._content = entry.body
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.reason = "OK"
+        response.connection = self
+        response.from_cache = True
+        return response
+
+
+def _no_store(cache_control: Optional[str]) -> bool:
+    return bool(cache_control) and "no-store" in cache_control.lower()
+
+
+# 进程内按路径共享的缓存实例
+_CACHES: Dict[str, HTTPCache] = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def get_http_cache(cache_dir: Optional[Union[str, Path]] = None) -> HTTPCache:
+    """
+    获取共享缓存实例（同一目录在进程内只打开一次）
+
+    Args:
+        cache_dir: 缓存目录（默认 PHARMAKG_HTTP_CACHE_DIR 或 data/cache）
+
+    Returns:
+        HTTPCache 实例
+    """
+    path = str(Path(cache_dir or DEFAULT_CACHE_DIR).resolve() / CACHE_FILE_NAME)
+    with _CACHES_LOCK:
+        if path not in _CACHES:
+            _CACHES[path] = HTTPCache(path)
+        return _CACHES[path]
+
+
+def install_http_cache(
+    session: requests.Session,
+    source: str,
+    cache: Optional[HTTPCache] = None,
+    max_age: float = 0,
+    throttle: Optional[Callable[[], None]] = None,
+    **adapter_kwargs
+) -> CachingHTTPAdapter:
+    """
+    为 Session 挂载缓存适配器
+
+    未显式指定 max_retries 时沿用 Session 现有适配器的重试策略。
+
+    Args:
+        session: requests 会话
+        source: 数据源名称
+        cache: 缓存实例（默认共享缓存）
+        max_age: 无需重新验证即可使用缓存的秒数
+        throttle: 每次网络请求前调用的限速函数（缓存命中时不调用）
+        **adapter_kwargs: 传给 HTTPAdapter 的参数
+
+    Returns:
+        挂载的适配器
+    """
+    if "max_retries" not in adapter_kwargs:
+        adapter_kwargs["max_retries"] = session.get_adapter("https://").max_retries
+
+    adapter = CachingHTTPAdapter(
+        cache or get_http_cache(),
+        source=source,
+        max_age=max_age,
+        throttle=throttle,
+        **adapter_kwargs
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return adapter
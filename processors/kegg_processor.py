@@ -9,7 +9,6 @@
 import logging
 import json
 import time
-import sqlite3
 import re
 from dataclasses import dataclass, field
 from datetime import datetime
@@ -24,6 +23,7 @@ from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
 from processors.base import BaseProcessor, ProcessingResult, ProcessingStatus, ProcessingMetrics
+from processors.http_cache import get_http_cache, install_http_cache
 
 
 logger = logging.getLogger(__name__)
@@ -76,7 +76,7 @@ class KEGGExtractionConfig:
     retry_backoff: float = 1.0
     timeout: int = 30
     cache_enabled: bool = True
-    cache_file: str = "kegg_cache.db"
+    cache_max_age: int = 7 * 24 * 3600  # KEGG 不返回 ETag/Last-Modified，缓存在此时间内直接使用
     include_genes: bool = True
     include_proteins: bool = True
     include_compounds: bool = True
@@ -188,10 +188,17 @@ class KEGGProcessor(BaseProcessor):
         # 初始化 HTTP 会话
         self.session = self._create_session()
 
-        # 初始化缓存
-        self.cache_conn = None
+        # 共享 HTTP 缓存
+        self.http_cache = None
         if self.extraction_config.cache_enabled:
-            self._init_cache()
+            self.http_cache = get_http_cache(self.data_root / "cache")
+            install_http_cache(
+                self.session,
+                source="kegg",
+                cache=self.http_cache,
+                max_age=self.extraction_config.cache_max_age,
+                throttle=self._respect_rate_limit
+            )
 
         # 速率限制控制
         self.last_request_time = 0
@@ -545,7 +552,8 @@ class KEGGProcessor(BaseProcessor):
                     'relationships_created': self.stats.relationships_created,
                     'api_requests_made': self.stats.api_requests_made,
                     'cache_hits': self.stats.cache_hits
-                }
+                },
+                'http_cache': self.http_cache.get_stats("kegg") if self.http_cache else None
             }
 
             logger.info(f"[{self.PROCESSOR_NAME}] 处理完成: "
@@ -578,11 +586,6 @@ class KEGGProcessor(BaseProcessor):
                 errors=[str(e)]
             )
 
-        finally:
-            # 关闭缓存连接
-            if self.cache_conn:
-                self.cache_conn.close()
-
     #===========================================================
     # HTTP 会话和缓存管理
     #===========================================================
@@ -610,61 +613,6 @@ class KEGGProcessor(BaseProcessor):
 
         return session
 
-    def _init_cache(self):
-        """初始化 SQLite 缓存数据库"""
-        cache_path = self.data_root / "cache" / self.extraction_config.cache_file
-        cache_path.parent.mkdir(parents=True, exist_ok=True)
-
-        self.cache_conn = sqlite3.connect(str(cache_path))
-        self.cache_conn.execute("""
-            CREATE TABLE IF NOT EXISTS kegg_cache (
-                pathway_id TEXT PRIMARY KEY,
-                data TEXT,
-                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-
-    def _get_cached_data(self, pathway_id: str) -> Optional[Dict]:
-        """
-        从缓存获取数据
-
-        Args:
-            pathway_id: KEGG 通路 ID
-
-        Returns:
-            缓存的数据或 None
-        """
-        if not self.cache_conn:
-            return None
-
-        cursor = self.cache_conn.cursor()
-        cursor.execute("SELECT data FROM kegg_cache WHERE pathway_id = ?", (pathway_id,))
-        row = cursor.fetchone()
-
-        if row:
-            self.stats.cache_hits += 1
-            return json.loads(row[0])
-
-        return None
-
-    def _set_cached_data(self, pathway_id: str, data: Dict):
-        """
-        将数据存入缓存
-
-        Args:
-            pathway_id: KEGG 通路 ID
-            data: 要缓存的数据
-        """
-        if not self.cache_conn:
-            return
-
-        cursor = self.cache_conn.cursor()
-        cursor.execute(
-            "INSERT OR REPLACE INTO kegg_cache (pathway_id, data, timestamp) VALUES (?, ?, CURRENT_TIMESTAMP)",
-            (pathway_id, json.dumps(data))
-        )
-        self.cache_conn.commit()
-
     #===========================================================
     # 速率限制和 API 请求
     #===========================================================
@@ -691,17 +639,21 @@ class KEGGProcessor(BaseProcessor):
         Returns:
             响应文本或 None
         """
-        self._respect_rate_limit()
+        # 启用缓存时由缓存适配器在真正发出请求前限速，缓存命中不等待
+        if self.http_cache is None:
+            self._respect_rate_limit()
 
         try:
-            self.stats.api_requests_made += 1
-
             response = self.session.get(
                 url,
                 params=params,
                 timeout=self.extraction_config.timeout
             )
 
+            if getattr(response, "from_cache", False):
+                self.stats.cache_hits += 1
+            else:
+                self.stats.api_requests_made += 1
             response.raise_for_status()
             return response.text
 
@@ -794,18 +746,10 @@ class KEGGProcessor(BaseProcessor):
         results = []
 
         for pathway_id in pathway_ids:
-            # 检查缓存
-            cached_data = self._get_cached_data(pathway_id)
-            if cached_data:
-                results.append(cached_data)
-                continue
-
-            # 从 API 获取
+            # 响应由共享 HTTP 缓存缓存
             pathway_data = self._fetch_single_pathway(pathway_id)
             if pathway_data:
                 results.append(pathway_data)
-                # 缓存数据
-                self._set_cached_data(pathway_id, pathway_data)
 
         return results
 
@@ -1541,28 +1485,20 @@ class KEGGProcessor(BaseProcessor):
         compounds = [e for e in all_entities if e.get('entity_type') == 'rd:Compound']
 
         if pathways:
-            pathways_file = output_dir / f"kegg_pathways_{timestamp}.json"
-            with open(pathways_file, 'w', encoding='utf-8') as f:
-                json.dump(pathways, f, ensure_ascii=False, indent=2)
+            pathways_file = self._write_records(output_dir / f"kegg_pathways_{timestamp}", pathways)
             logger.info(f"保存 {len(pathways)} 个通路到: {pathways_file}")
 
         if targets:
-            targets_file = output_dir / f"kegg_targets_{timestamp}.json"
-            with open(targets_file, 'w', encoding='utf-8') as f:
-                json.dump(targets, f, ensure_ascii=False, indent=2)
+            targets_file = self._write_records(output_dir / f"kegg_targets_{timestamp}", targets)
             logger.info(f"保存 {len(targets)} 个靶点到: {targets_file}")
 
         if compounds:
-            compounds_file = output_dir / f"kegg_compounds_{timestamp}.json"
-            with open(compounds_file, 'w', encoding='utf-8') as f:
-                json.dump(compounds, f, ensure_ascii=False, indent=2)
+            compounds_file = self._write_records(output_dir / f"kegg_compounds_{timestamp}", compounds)
             logger.info(f"保存 {len(compounds)} 个化合物到: {compounds_file}")
 
         # 保存关系
         if all_relationships:
-            relationships_file = output_dir / f"kegg_pathway_relationships_{timestamp}.json"
-            with open(relationships_file, 'w', encoding='utf-8') as f:
-                json.dump(all_relationships, f, ensure_ascii=False, indent=2)
+            relationships_file = self._write_records(output_dir / f"kegg_pathway_relationships_{timestamp}", all_relationships)
             logger.info(f"保存 {len(all_relationships)} 个关系到: {relationships_file}")
 
         # 保存处理摘要
@@ -0,0 +1,337 @@
+#===========================================================
+# PharmaKG 已处理文件清单
+# Pharmaceutical Knowledge Graph - Processed Files Manifest
+#===========================================================
+# 版本: v1.0
+# 描述: 基于 SQLite 的增量处理清单，按 (路径, 大小, mtime, inode)
+#       判断文件是否变化，仅在元数据变化时才计算完整哈希
+#===========================================================
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+
+# 计算文件哈希时每次读取的字节数
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# 批量查询时每条 SQL 的参数上限（低于 SQLite 的默认限制）
+_LOOKUP_BATCH = 500
+
+PathLike = Union[str, Path]
+
+
+def file_hash(file_path: PathLike) -> str:
+    """
+    计算文件的 MD5 哈希值
+
+    Args:
+        file_path: 文件路径
+
+    Returns:
+        十六进制哈希值
+    """
+    hash_md5 = hashlib.md5()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            hash_md5.update(chunk)
+    return hash_md5.hexdigest()
+
+
+def _fingerprint(stat: os.stat_result) -> Tuple[int, int, int]:
+    return stat.st_size, stat.st_mtime_ns, stat.st_ino
+
+
+class ProcessedManifest:
+    """
+    已处理文件清单
+
+    每个文件记录一行 (path, size, mtime_ns, inode, file_hash, processed)：
+    - 元数据完全一致：直接使用记录的状态，不读取文件内容
+    - 元数据变化：计算哈希，内容未变时只刷新元数据（例如 touch）
+    - 无记录或内容已变化：计算哈希，按 file_hash 索引查找内容相同的已处理文件
+      （重命名或复制的文件），或旧版 {hash}.processed 标记文件（迁移到清单）
+
+    计算过哈希但未处理（或内容已变化）的文件以 processed=0 记录，
+    在元数据再次变化前不会重复计算哈希。
+    """
+
+    def __init__(self, db_path: PathLike, legacy_dir: Optional[PathLike] = None):
+        """
+        初始化清单
+
+        Args:
+            db_path: SQLite 文件路径
+            legacy_dir: 旧版 .processed 标记文件目录（可选，用于一次性迁移）
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS processed_files (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                inode INTEGER NOT NULL,
+                file_hash TEXT,
+                processed INTEGER NOT NULL DEFAULT 1,
+                processor TEXT,
+                processed_at TEXT
+            )
+        """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_processed_files_hash ON processed_files (file_hash)"
+        )
+        self._conn.commit()
+
+        self._legacy_hashes = self._load_legacy_hashes(legacy_dir)
+
+        self.stats = {
+            "lookups": 0,
+            "metadata_hits": 0,
+            "hashed": 0,
+            "content_matches": 0,
+            "legacy_migrated": 0
+        }
+
+    #===========================================================
+    # 查询
+    #===========================================================
+
+    def lookup_many(self, paths: Iterable[PathLike]) -> Dict[Path, bool]:
+        """
+        批量检查文件是否已处理
+
+        Args:
+            paths: 文件路径
+
+        Returns:
+            {路径: 是否已处理（且内容未变化）}
+        """
+        paths = [Path(p) for p in paths]
+        rows = self._fetch_rows([self._key(p) for p in paths])
+        # 没有任何可比较的哈希时，新文件无需读取内容
+        can_match = bool(self._legacy_hashes) or self._has_processed_hashes()
+
+        result = {}
+        refreshed = []
+        pending = []
+        for path in paths:
+            self.stats["lookups"] += 1
+            try:
+                stat = path.stat()
+            except OSError:
+                result[path] = False
+                continue
+
+            row = rows.get(self._key(path))
+            fingerprint = _fingerprint(stat)
+
+            if row is not None and tuple(row[:3]) == fingerprint:
+                self.stats["metadata_hits"] += 1
+                result[path] = bool(row[4])
+                continue
+
+            # 元数据变化或无记录：先与本路径记录的哈希比较，
+            # 否则按哈希查找内容相同的已处理文件（重命名或复制）
+            known_hash = row[3] if row is not None and row[4] else None
+            if known_hash is None and not can_match:
+                result[path] = False
+                continue
+
+            digest = file_hash(path)
+            self.stats["hashed"] += 1
+            if digest == known_hash:
+                refreshed.append((path, fingerprint, digest, None))
+                result[path] = True
+            else:
+                pending.append((path, fingerprint, digest, None))
+
+        unprocessed = []
+        if pending:
+            matched = self._processed_hashes([digest for _, _, digest, _ in pending])
+            for entry in pending:
+                path, _, digest, _ = entry
+                if digest in matched:
+                    self.stats["content_matches"] += 1
+                elif digest in self._legacy_hashes:
+                    self.stats["legacy_migrated"] += 1
+                else:
+                    unprocessed.append(entry)
+                    result[path] = False
+                    continue
+                refreshed.append(entry)
+                result[path] = True
+
+        if refreshed:
+            self._refresh(refreshed, processed=True)
+        if unprocessed:
+            self._refresh(unprocessed, processed=False)
+
+        return result
+
+    def is_processed(self, path: PathLike) -> bool:
+        """检查单个文件是否已处理"""
+        return self.lookup_many([path])[Path(path)]
+
+    def dirty(self, paths: Iterable[PathLike]) -> List[Path]:
+        """
+        列出需要处理的文件（未处理或内容已变化），保持输入顺序
+
+        Args:
+            paths: 候选文件
+
+        Returns:
+            需要处理的文件列表
+        """
+        paths = [Path(p) for p in paths]
+        processed = self.lookup_many(paths)
+        return [p for p in paths if not processed[p]]
+
+    #===========================================================
+    # 记录
+    #===========================================================
+
+    def mark_many(self, paths: Iterable[PathLike], processor: Optional[str] = None, compute_hash: bool = True):
+        """
+        批量标记文件为已处理
+
+        Args:
+            paths: 文件路径
+            processor: 处理器名称
+            compute_hash: 是否记录内容哈希（用于元数据变化后的内容比对）
+        """
+        entries = []
+        for path in paths:
+            path = Path(path)
+            try:
+                stat = path.stat()
+            except OSError as e:
+                logger.warning(f"Cannot mark {path} as processed: {e}")
+                continue
+            digest = file_hash(path) if compute_hash else None
+            entries.append((path, _fingerprint(stat), digest, processor))
+
+        if entries:
+            self._upsert(entries)
+
+    def mark_processed(self, path: PathLike, processor: Optional[str] = None, compute_hash: bool = True):
+        """标记单个文件为已处理"""
+        self.mark_many([path], processor, compute_hash)
+
+    def forget(self, paths: Iterable[PathLike]):
+        """从清单中移除文件（下次将重新处理）"""
+        keys = [(self._key(p),) for p in paths]
+        with self._lock:
+            self._conn.executemany("DELETE FROM processed_files WHERE path = ?", keys)
+            self._conn.commit()
+
+    def count(self) -> int:
+        """清单中已处理的文件数"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM processed_files WHERE processed = 1"
+            ).fetchone()[0]
+
+    def close(self):
+        """关闭数据库连接"""
+        with self._lock:
+            self._conn.close()
+
+    #===========================================================
+    # 内部方法
+    #===========================================================
+
+    @staticmethod
+    def _key(path: PathLike) -> str:
+        return str(Path(path).resolve())
+
+    def _fetch_rows(self, keys: List[str]) -> Dict[str, tuple]:
+        rows = {}
+        with self._lock:
+            for i in range(0, len(keys), _LOOKUP_BATCH):
+                batch = keys[i:i + _LOOKUP_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                cursor = self._conn.execute(
+                    f"SELECT path, size, mtime_ns, inode, file_hash, processed "
+                    f"FROM processed_files WHERE path IN ({placeholders})",
+                    batch
+                )
+                for path, *values in cursor:
+                    rows[path] = tuple(values)
+        return rows
+
+    def _has_processed_hashes(self) -> bool:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT 1 FROM processed_files WHERE processed = 1 AND file_hash IS NOT NULL LIMIT 1"
+            ).fetchone() is not None
+
+    def _processed_hashes(self, digests: List[str]) -> set:
+        """给定哈希中已有已处理文件的哈希（走 file_hash 索引）"""
+        digests = list(set(digests))
+        found = set()
+        with self._lock:
+            for i in range(0, len(digests), _LOOKUP_BATCH):
+                batch = digests[i:i + _LOOKUP_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                cursor = self._conn.execute(
+                    f"SELECT DISTINCT file_hash FROM processed_files "
+                    f"WHERE processed = 1 AND file_hash IN ({placeholders})",
+                    batch
+                )
+                found.update(digest for digest, in cursor)
+        return found
+
+    def _upsert(self, entries: List[tuple]):
+        now = datetime.now().isoformat()
+        rows = [
+            (self._key(path), size, mtime_ns, inode, digest, processor, now)
+            for path, (size, mtime_ns, inode), digest, processor in entries
+        ]
+        with self._lock:
+            self._conn.executemany("""
+                INSERT OR REPLACE INTO processed_files
+                    (path, size, mtime_ns, inode, file_hash, processed, processor, processed_at)
+                VALUES (?, ?, ?, ?, ?, 1, ?, ?)
+            """, rows)
+            self._conn.commit()
+
+    def _refresh(self, entries: List[tuple], processed: bool):
+        # 只刷新元数据、哈希和状态，保留原处理器和处理时间
+        now = datetime.now().isoformat()
+        rows = [
+            (self._key(path), size, mtime_ns, inode, digest, int(processed), now if processed else None)
+            for path, (size, mtime_ns, inode), digest, _ in entries
+        ]
+        with self._lock:
+            self._conn.executemany("""
+                INSERT INTO processed_files (path, size, mtime_ns, inode, file_hash, processed, processed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(path) DO UPDATE SET
+                    size = excluded.size,
+                    mtime_ns = excluded.mtime_ns,
+                    inode = excluded.inode,
+                    file_hash = excluded.file_hash,
+                    processed = excluded.processed
+            """, rows)
+            self._conn.commit()
+
+    @staticmethod
+    def _load_legacy_hashes(legacy_dir: Optional[PathLike]) -> set:
+        if legacy_dir is None:
+            return set()
+        legacy_dir = Path(legacy_dir)
+        if not legacy_dir.exists():
+            return set()
+        return {p.stem for p in legacy_dir.glob("*.processed")}
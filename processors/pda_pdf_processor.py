@@ -42,10 +42,57 @@ from processors.base import (
     BaseProcessor, ProcessingResult, ProcessingStatus,
     ProcessingMetrics
 )
+from processors.storage import strip_record_suffix
+from processors.term_tagger import get_term_tagger
 
 logger = logging.getLogger(__name__)
 
 
+#===========================================================
+# 术语表
+#===========================================================
+
+# (术语, ID, 类型标签)；标签为 None 时以原文匹配文本作为类型
+FACILITY_TYPE_TERMS = tuple((term, None, None) for term in (
+    'clean room', 'cleanroom', 'manufacturing area', 'manufacture area', 'production area',
+    'packaging area', 'package area', 'packing area', 'aseptic area', 'aseptic room',
+    'aseptic suite', 'storage area', 'store area', 'warehouse', 'corridor', 'passage', 'hall',
+    'changing room', 'change room', 'gown room',
+))
+
+PROCESS_TYPE_TERMS = tuple((term, None, None) for term in (
+    'moist heat sterilization', 'steam sterilization', 'dry heat sterilization',
+    'gamma irradiation', 'gamma sterilization', 'filtration', 'sterilizing filtration',
+    'sterilize filtration', 'filling', 'aseptic fill', 'lyophilization', 'freeze drying',
+    'inspection', 'visual inspection', 'media fill', 'process simulation', 'cleaning',
+    'sanitization', 'sanitize',
+)) + (
+    ('ethylene oxide sterilization', None, 'ethylene oxide'),
+    ('eto sterilization', None, 'EtO'),
+)
+
+ASSAY_TYPE_TERMS = tuple((term, None, None) for term in (
+    'microbiological test', 'microbiological examination', 'microbiological analysis',
+    'microbiologic test', 'microbiologic examination', 'microbiologic analysis',
+    'particle count', 'particle test', 'particulate', 'bioburden', 'HPLC', 'UPLC', 'LC',
+    'GC', 'gas chromatography', 'osmolality', 'osmolarity',
+)) + (
+    ('endotoxin test', None, 'endotoxin'),
+    ('LAL test', None, 'LAL'),
+    ('sterility test', None, 'sterility'),
+    ('sterile test', None, 'sterile'),
+    ('FTIR', None, 'FTIR'),
+    ('FTIR spectroscopy', None, 'FTIR'),
+    ('IR', None, 'IR'),
+    ('IR spectroscopy', None, 'IR'),
+    ('visibility test', None, 'visibility'),
+    ('clarity test', None, 'clarity'),
+    ('pH', None, 'pH'),
+    ('pH determination', None, 'pH'),
+    ('pH measurement', None, 'pH'),
+)
+
+
 #===========================================================
 # 数据模型
 #===========================================================
@@ -258,45 +305,10 @@ class PDAPDFProcessor(BaseProcessor):
             re.compile(r'\bClass\s*(\d{3,6})\b', re.IGNORECASE),
         ]
 
-        # 设施类型模式
-        self.facility_type_patterns = [
-            re.compile(r'\b(clean\s*room|cleanroom)\b', re.IGNORECASE),
-            re.compile(r'\b(manufactur(?:ing|e)\s*area|production\s*area)\b', re.IGNORECASE),
-            re.compile(r'\b(packag(?:ing|e)\s*area|packing\s*area)\b', re.IGNORECASE),
-            re.compile(r'\b(aseptic\s*(?:area|room|suite))\b', re.IGNORECASE),
-            re.compile(r'\b(stor(?:age|e)\s*area|warehouse)\b', re.IGNORECASE),
-            re.compile(r'\b(corridor|passage|hall)\b', re.IGNORECASE),
-            re.compile(r'\b(chang(?:ing|e)\s*room|gown\s*room)\b', re.IGNORECASE),
-        ]
-
-        # 工艺类型模式
-        self.process_type_patterns = [
-            re.compile(r'\b(moist\s*heat\s*sterilization|steam\s*sterilization)\b', re.IGNORECASE),
-            re.compile(r'\b(dry\s*heat\s*sterilization)\b', re.IGNORECASE),
-            re.compile(r'\b(gamma\s*irradiation|gamma\s*sterilization)\b', re.IGNORECASE),
-            re.compile(r'\b(ethylene\s*oxide|ETO|EtO)\s*sterilization\b', re.IGNORECASE),
-            re.compile(r'\b(filtration|steriliz(?:ing|e)\s*filtration)\b', re.IGNORECASE),
-            re.compile(r'\b(fill(?:ing|e)|aseptic\s*fill)\b', re.IGNORECASE),
-            re.compile(r'\b(lyophilization|freeze\s*drying)\b', re.IGNORECASE),
-            re.compile(r'\b(inspect(?:ion|e)|visual\s*inspect(?:ion|e))\b', re.IGNORECASE),
-            re.compile(r'\b(media\s*fill|process\s*simulation)\b', re.IGNORECASE),
-            re.compile(r'\b(clean(?:ing|e)|sanitiz(?:ation|e))\b', re.IGNORECASE),
-        ]
-
-        # 检测方法模式
-        self.assay_type_patterns = [
-            re.compile(r'\b(microbio(?:logical|logic)\s*(?:test|examination|analysis))\b', re.IGNORECASE),
-            re.compile(r'\b(endotoxin|LAL)\s*test\b', re.IGNORECASE),
-            re.compile(r'\b(sterylity|sterile)\s*test\b', re.IGNORECASE),
-            re.compile(r'\b(particle\s*(?:count|test)|particulate)\b', re.IGNORECASE),
-            re.compile(r'\b(bioburden)\b', re.IGNORECASE),
-            re.compile(r'\b(HPLC|UPLC|LC)\b', re.IGNORECASE),
-            re.compile(r'\b(GC|gas\s*chromatography)\b', re.IGNORECASE),
-            re.compile(r'\b(FTIR|IR)\s*(?:spectroscopy)?\b', re.IGNORECASE),
-            re.compile(r'\b(visibility|clarity)\s*test\b', re.IGNORECASE),
-            re.compile(r'\b(pH)\s*(?:determination|measurement)?\b', re.IGNORECASE),
-            re.compile(r'\b(osmolality|osmolarity)\b', re.IGNORECASE),
-        ]
+        # 设施类型、工艺类型和检测方法术语（词典标注器，每个句子只扫描一次）
+        self.facility_type_tagger = get_term_tagger("pda_facility_types", default_terms=FACILITY_TYPE_TERMS)
+        self.process_type_tagger = get_term_tagger("pda_process_types", default_terms=PROCESS_TYPE_TERMS)
+        self.assay_type_tagger = get_term_tagger("pda_assay_types", default_terms=ASSAY_TYPE_TERMS)
 
         # 环境参数模式 (温度、湿度、压差等)
         self.environmental_param_patterns = [
@@ -370,7 +382,7 @@ class PDAPDFProcessor(BaseProcessor):
             pdf_files.extend(source_path.rglob(f"PDA*{ext}"))
 
         # 过滤已处理的文件
-        unprocessed = [f for f in pdf_files if not self.is_processed(f)]
+        unprocessed = self.filter_unprocessed(pdf_files)
 
         self.logger.info(f"扫描完成: {len(unprocessed)}/{len(pdf_files)} 文件待处理")
         return unprocessed
@@ -744,37 +756,35 @@ class PDAPDFProcessor(BaseProcessor):
                 continue
 
             # 匹配设施类型
-            for pattern in self.facility_type_patterns:
-                matches = pattern.finditer(sentence)
-                for match in matches:
-                    facility_type = match.group(1)
-                    facility_key = f"{facility_type}_{sentence[:50]}"
-
-                    if facility_key in seen:
-                        continue
-
-                    # 提取环境要求
-                    env_reqs = self._extract_environmental_requirements(sentence)
-
-                    # 提取洁净度分级
-                    classification = self._extract_cleanroom_classification(sentence)
-
-                    # 创建实体
-                    facility = {
-                        'entity_type': 'sc:Facility',
-                        'name': f"{facility_type} ({metadata.report_number})",
-                        'facility_type': facility_type,
-                        'classification': classification,
-                        'environmental_requirements': env_reqs,
-                        'design_criteria': {},
-                        'intended_use': self._infer_intended_use(sentence),
-                        'data_source': f'PDA_{metadata.report_number}',
-                        'source_file': metadata.report_number,
-                        'confidence': 0.75
-                    }
-
-                    facilities.append(facility)
-                    seen.add(facility_key)
+            for match in self.facility_type_tagger.tag(sentence):
+                facility_type = match['label']
+                facility_key = f"{facility_type}_{sentence[:50]}"
+
+                if facility_key in seen:
+                    continue
+
+                # 提取环境要求
+                env_reqs = self._extract_environmental_requirements(sentence)
+
+                # 提取洁净度分级
+                classification = self._extract_cleanroom_classification(sentence)
+
+                # 创建实体
+                facility = {
+                    'entity_type': 'sc:Facility',
+                    'name': f"{facility_type} ({metadata.report_number})",
+                    'facility_type': facility_type,
+                    'classification': classification,
+                    'environmental_requirements': env_reqs,
+                    'design_criteria': {},
+                    'intended_use': self._infer_intended_use(sentence),
+                    'data_source': f'PDA_{metadata.report_number}',
+                    'source_file': metadata.report_number,
+                    'confidence': 0.75
+                }
+
+                facilities.append(facility)
+                seen.add(facility_key)
 
         # 从表格提取（表格通常包含详细规格）
         for table in tables:
@@ -931,43 +941,41 @@ class PDAPDFProcessor(BaseProcessor):
                 continue
 
             # 匹配检测类型
-            for pattern in self.assay_type_patterns:
-                matches = pattern.finditer(sentence)
-                for match in matches:
-                    assay_type = match.group(1)
-                    assay_key = f"{assay_type}_{sentence[:50]}"
-
-                    if assay_key in seen:
-                        continue
-
-                    # 提取检测名称
-                    assay_name = self._extract_assay_name(sentence, assay_type)
-
-                    # 提取采样计划
-                    sampling_plan = self._extract_sampling_plan(sentence)
-
-                    # 提取验收标准
-                    acceptance_criteria = self._extract_acceptance_criteria(sentence)
-
-                    # 提取检测频率
-                    frequency = self._extract_frequency(sentence)
-
-                    assay = {
-                        'entity_type': 'rd:Assay',
-                        'assay_name': assay_name,
-                        'assay_type': assay_type,
-                        'test_method': sentence[:100],
-                        'sampling_plan': sampling_plan,
-                        'acceptance_criteria': acceptance_criteria,
-                        'limits': {},
-                        'frequency': frequency,
-                        'data_source': f'PDA_{metadata.report_number}',
-                        'source_file': metadata.report_number,
-                        'confidence': 0.80
-                    }
-
-                    assays.append(assay)
-                    seen.add(assay_key)
+            for match in self.assay_type_tagger.tag(sentence):
+                assay_type = match['label']
+                assay_key = f"{assay_type}_{sentence[:50]}"
+
+                if assay_key in seen:
+                    continue
+
+                # 提取检测名称
+                assay_name = self._extract_assay_name(sentence, assay_type)
+
+                # 提取采样计划
+                sampling_plan = self._extract_sampling_plan(sentence)
+
+                # 提取验收标准
+                acceptance_criteria = self._extract_acceptance_criteria(sentence)
+
+                # 提取检测频率
+                frequency = self._extract_frequency(sentence)
+
+                assay = {
+                    'entity_type': 'rd:Assay',
+                    'assay_name': assay_name,
+                    'assay_type': assay_type,
+                    'test_method': sentence[:100],
+                    'sampling_plan': sampling_plan,
+                    'acceptance_criteria': acceptance_criteria,
+                    'limits': {},
+                    'frequency': frequency,
+                    'data_source': f'PDA_{metadata.report_number}',
+                    'source_file': metadata.report_number,
+                    'confidence': 0.80
+                }
+
+                assays.append(assay)
+                seen.add(assay_key)
 
         return assays
 
@@ -989,38 +997,36 @@ class PDAPDFProcessor(BaseProcessor):
                 continue
 
             # 匹配工艺类型
-            for pattern in self.process_type_patterns:
-                matches = pattern.finditer(sentence)
-                for match in matches:
-                    process_type = match.group(1)
-                    process_key = f"{process_type}_{sentence[:50]}"
-
-                    if process_key in seen:
-                        continue
-
-                    # 提取工艺名称
-                    process_name = self._extract_process_name(sentence, process_type)
-
-                    # 提取关键参数
-                    critical_params = self._extract_critical_parameters(sentence)
-
-                    # 提取验证方法
-                    validation_approach = self._extract_validation_approach(sentence)
-
-                    process = {
-                        'entity_type': 'sc:Process',
-                        'process_name': process_name,
-                        'process_type': process_type,
-                        'critical_parameters': critical_params,
-                        'validation_approach': validation_approach,
-                        'acceptance_criteria': [],
-                        'data_source': f'PDA_{metadata.report_number}',
-                        'source_file': metadata.report_number,
-                        'confidence': 0.75
-                    }
-
-                    processes.append(process)
-                    seen.add(process_key)
+            for match in self.process_type_tagger.tag(sentence):
+                process_type = match['label']
+                process_key = f"{process_type}_{sentence[:50]}"
+
+                if process_key in seen:
+                    continue
+
+                # 提取工艺名称
+                process_name = self._extract_process_name(sentence, process_type)
+
+                # 提取关键参数
+                critical_params = self._extract_critical_parameters(sentence)
+
+                # 提取验证方法
+                validation_approach = self._extract_validation_approach(sentence)
+
+                process = {
+                    'entity_type': 'sc:Process',
+                    'process_name': process_name,
+                    'process_type': process_type,
+                    'critical_parameters': critical_params,
+                    'validation_approach': validation_approach,
+                    'acceptance_criteria': [],
+                    'data_source': f'PDA_{metadata.report_number}',
+                    'source_file': metadata.report_number,
+                    'confidence': 0.75
+                }
+
+                processes.append(process)
+                seen.add(process_key)
 
         return processes
 
@@ -1648,8 +1654,7 @@ class PDAPDFProcessor(BaseProcessor):
 
     def _save_entity_file(self, filepath: Path, entities: List[Dict[str, Any]]):
         """保存实体文件"""
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(entities, f, ensure_ascii=False, indent=2)
+        self._write_records(strip_record_suffix(filepath), entities)
 
 
 #===========================================================
@@ -98,7 +98,7 @@ class PDFCRLProcessor(BaseProcessor):
             files.extend(source_path.rglob(f"*{ext}"))
 
         # 排除已处理的文件
-        unprocessed_files = [f for f in files if not self.is_processed(f)]
+        unprocessed_files = self.filter_unprocessed(files)
 
         return unprocessed_files
 
@@ -523,14 +523,10 @@ class PDFCRLProcessor(BaseProcessor):
                 })
 
         # 保存实体
-        entities_file = output_dir / f'entities_{timestamp}.json'
-        with open(entities_file, 'w', encoding='utf-8') as f:
-            json.dump(mapped_entities, f, ensure_ascii=False, indent=2)
+        entities_file = self._write_records(output_dir / f'entities_{timestamp}', mapped_entities)
 
         # 保存关系
-        relationships_file = output_dir / f'relationships_{timestamp}.json'
-        with open(relationships_file, 'w', encoding='utf-8') as f:
-            json.dump(mapped_relationships, f, ensure_ascii=False, indent=2)
+        relationships_file = self._write_records(output_dir / f'relationships_{timestamp}', mapped_relationships)
 
         # 保存摘要
         summary = {
@@ -36,7 +36,7 @@ class RDDataProcessor(BaseProcessor):
         for ext in self.SUPPORTED_FORMATS:
             files.extend(source_path.rglob(f"*{ext}"))
 
-        return [f for f in files if not self.is_processed(f)]
+        return self.filter_unprocessed(files)
 
     def extract(self, file_path: Path) -> Dict[str, Any]:
         """从文件中提取数据"""
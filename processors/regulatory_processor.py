@@ -59,7 +59,7 @@ class RegulatoryDocumentProcessor(BaseProcessor):
             files.extend(source_path.rglob(f"*{ext}"))
 
         # 排除已处理的文件
-        unprocessed_files = [f for f in files if not self.is_processed(f)]
+        unprocessed_files = self.filter_unprocessed(files)
 
         return unprocessed_files
 
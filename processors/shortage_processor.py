@@ -838,7 +838,7 @@ class ShortageProcessor(BaseProcessor):
                 if not generic_name:
                     continue
 
-                # Map to ChEMBL via UNII
+                # Map to ChEMBL via the shared drug name index
                 chembl_id = self._map_generic_to_chembl(generic_name)
                 if chembl_id:
                     relationship = {
@@ -867,7 +867,7 @@ class ShortageProcessor(BaseProcessor):
 
     def _map_generic_to_chembl(self, generic_name: str) -> Optional[str]:
         """
-        Map generic drug name to ChEMBL compound ID via UNII
+        Map generic drug name to ChEMBL compound ID via the shared drug name index
 
         Args:
             generic_name: Generic drug name
@@ -879,13 +879,8 @@ class ShortageProcessor(BaseProcessor):
         if generic_name in self.chembl_cache:
             return self.chembl_cache[generic_name]
 
-        # TODO: Implement actual mapping
-        # This could:
-        # 1. Lookup UNII from FDA substance registration system
-        # 2. Map UNII to ChEMBL via cross-reference
-        # 3. Use pre-computed mapping table
-
-        chembl_id = None
+        resolver = self.drug_resolver
+        chembl_id = resolver.resolve(generic_name) if resolver else None
 
         # Cache result
         self.chembl_cache[generic_name] = chembl_id
@@ -981,19 +976,13 @@ class ShortageProcessor(BaseProcessor):
                 continue
 
             type_name = entity_type.replace(':', '_').lower()
-            entities_file = output_dir / f"shortages_{type_name}s_{timestamp}.json"
-
-            with open(entities_file, 'w', encoding='utf-8') as f:
-                json.dump(entity_list, f, ensure_ascii=False, indent=2)
+            entities_file = self._write_records(output_dir / f"shortages_{type_name}s_{timestamp}", entity_list)
 
             logger.info(f"Saved {len(entity_list)} {entity_type} entities to: {entities_file}")
 
         # Save relationships
         if relationships:
-            relationships_file = output_dir / f"shortages_relationships_{timestamp}.json"
-
-            with open(relationships_file, 'w', encoding='utf-8') as f:
-                json.dump(relationships, f, ensure_ascii=False, indent=2)
+            relationships_file = self._write_records(output_dir / f"shortages_relationships_{timestamp}", relationships)
 
             logger.info(f"Saved {len(relationships)} relationships to: {relationships_file}")
 
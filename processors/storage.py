@@ -0,0 +1,658 @@
+#===========================================================
+# PharmaKG 中间结果存储
+# Pharmaceutical Knowledge Graph - Intermediate Storage
+#===========================================================
+# 版本: v1.0
+# 描述: 处理器输出（实体/关系列表）的写入和流式读取，
+#       支持 JSON（兼容旧格式）、压缩 JSONL（zstd/gzip）和带类型的 Parquet
+#===========================================================
+
+import argparse
+import gzip
+import io
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+
+# 支持的输出格式
+OUTPUT_FORMATS = ("json", "jsonl", "parquet")
+
+# 默认输出格式（json 与旧版下游工具兼容）
+DEFAULT_OUTPUT_FORMAT = os.environ.get("PHARMAKG_OUTPUT_FORMAT", "json")
+
+# 可识别的文件后缀（按优先级）
+RECORD_SUFFIXES = (".parquet", ".jsonl.zst", ".jsonl.gz", ".jsonl", ".json")
+
+# Parquet 文件中存放 JSON 编码列名和溢出列的元数据键
+_JSON_COLUMNS_KEY = b"pharmakg.json_columns"
+_EXTRA_COLUMN = "_extra"
+
+PathLike = Union[str, Path]
+
+
+def record_suffix(path: PathLike) -> Optional[str]:
+    """返回文件的记录格式后缀（不支持时返回 None）"""
+    name = Path(path).name
+    for suffix in RECORD_SUFFIXES:
+        if name.endswith(suffix):
+            return suffix
+    return None
+
+
+def strip_record_suffix(path: PathLike) -> Path:
+    """去掉记录格式后缀，得到文件主干路径"""
+    path = Path(path)
+    suffix = record_suffix(path)
+    if suffix is None:
+        return path
+    return path.with_name(path.name[:-len(suffix)])
+
+
+def find_outputs(directory: PathLike, pattern: str, newest_first: bool = True) -> List[Path]:
+    """
+    查找任意格式的输出文件
+
+    同一主干存在多种格式时（例如转换后保留了原 JSON），只返回优先级最高的格式。
+
+    Args:
+        directory: 目录
+        pattern: 不含后缀的文件名模式，例如 "entities_*"
+        newest_first: 是否按文件名降序排列（文件名带时间戳）
+
+    Returns:
+        文件路径列表
+    """
+    directory = Path(directory)
+    if not directory.exists():
+        return []
+
+    best: Dict[Path, Path] = {}
+    for suffix in RECORD_SUFFIXES:
+        for path in directory.glob(pattern + suffix):
+            if record_suffix(path) != suffix:
+                continue
+            stem = strip_record_suffix(path)
+            if stem not in best:
+                best[stem] = path
+
+    return sorted(best.values(), key=lambda p: p.name, reverse=newest_first)
+
+
+#===========================================================
+# 写入
+#===========================================================
+
+class RecordWriter:
+    """
+    流式记录写入器
+
+    - json: 逐条写出 JSON 数组元素，不在内存中缓存（输出与 json.dump(indent=2) 一致）
+    - jsonl: 每行一条记录，zstd 压缩（未安装 zstandard 时使用 gzip）
+    - parquet: 按行组写出；首个行组确定列类型，嵌套值以 JSON 字符串列存储，
+      之后出现的新字段或类型不符的值写入 _extra 列，读取时合并还原
+    """
+
+    def __init__(
+        self,
+        path_stem: PathLike,
+        output_format: str = DEFAULT_OUTPUT_FORMAT,
+        row_group_size: int = 50000,
+        compression_level: int = 3
+    ):
+        """
+        初始化写入器
+
+        Args:
+            path_stem: 不含后缀的输出路径
+            output_format: 输出格式（json/jsonl/parquet）
+            row_group_size: Parquet 行组大小
+            compression_level: zstd 压缩级别
+        """
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(
+                f"Unknown output format: {output_format}. Available: {', '.join(OUTPUT_FORMATS)}"
+            )
+        if output_format == "parquet" and not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow is required for parquet output: pip install pyarrow")
+
+        self.output_format = output_format
+        self.row_group_size = row_group_size
+        self.compression_level = compression_level
+        self.count = 0
+
+        stem = Path(path_stem)
+        stem.parent.mkdir(parents=True, exist_ok=True)
+
+        self._buffer: List[Dict[str, Any]] = []
+        self._raw = None
+        self._stream = None
+        self._parquet_writer = None
+        self._schema = None
+        self._json_columns: List[str] = []
+
+        self.path = self.output_path(stem, output_format)
+        if output_format == "jsonl" and ZSTD_AVAILABLE:
+            self._raw = open(self.path, "wb")
+            compressor = zstandard.ZstdCompressor(level=compression_level)
+            self._stream = io.TextIOWrapper(compressor.stream_writer(self._raw), encoding="utf-8")
+        elif output_format == "jsonl":
+            self._stream = gzip.open(self.path, "wt", encoding="utf-8")
+        elif output_format == "json":
+            self._stream = open(self.path, "w", encoding="utf-8")
+            self._stream.write("[")
+
+    @staticmethod
+    def output_path(path_stem: PathLike, output_format: str) -> Path:
+        """给定格式的输出文件路径（jsonl 的后缀取决于是否安装 zstandard）"""
+        stem = Path(path_stem)
+        if output_format == "json":
+            suffix = ".json"
+        elif output_format == "parquet":
+            suffix = ".parquet"
+        else:
+            suffix = ".jsonl.zst" if ZSTD_AVAILABLE else ".jsonl.gz"
+        return stem.with_name(stem.name + suffix)
+
+    def write(self, record: Dict[str, Any]):
+        """写入一条记录"""
+        self.count += 1
+        if self.output_format == "jsonl":
+            self._stream.write(json.dumps(record, ensure_ascii=False, default=str))
+            self._stream.write("\n")
+            return
+        if self.output_format == "json":
+            # 每个元素缩进两格，与 json.dump(records, indent=2) 的输出相同
+            text = json.dumps(record, ensure_ascii=False, indent=2, default=str)
+            self._stream.write("\n  " if self.count == 1 else ",\n  ")
+            self._stream.write(text.replace("\n", "\n  "))
+            return
+
+        self._buffer.append(record)
+        if self.output_format == "parquet" and len(self._buffer) >= self.row_group_size:
+            self._flush_parquet()
+
+    def write_many(self, records: Iterable[Dict[str, Any]]):
+        """写入多条记录"""
+        for record in records:
+            self.write(record)
+
+    def close(self) -> Path:
+        """
+        完成写入
+
+        Returns:
+            输出文件路径
+        """
+        if self.output_format == "json":
+            self._stream.write("\n]" if self.count else "]")
+            self._stream.close()
+        elif self.output_format == "jsonl":
+            self._stream.close()
+            if self._raw is not None and not self._raw.closed:
+                self._raw.close()
+        else:
+            if self._buffer or self._parquet_writer is None:
+                self._flush_parquet()
+            self._parquet_writer.close()
+
+        return self.path
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    #===========================================================
+    # Parquet
+    #===========================================================
+
+    def _flush_parquet(self):
+        if self._schema is None:
+            self._schema, self._json_columns = _infer_schema(self._buffer)
+            self._parquet_writer = pq.ParquetWriter(
+                str(self.path),
+                self._schema,
+                compression="zstd"
+            )
+
+        columns = {name: [] for name in self._schema.names}
+        json_columns = set(self._json_columns)
+        types = {field.name: field.type for field in self._schema}
+
+        for record in self._buffer:
+            extra = {}
+            for name in self._schema.names:
+                if name == _EXTRA_COLUMN:
+                    continue
+                value = record.get(name)
+                if value is None:
+                    columns[name].append(None)
+                elif name in json_columns:
+                    columns[name].append(json.dumps(value, ensure_ascii=False, default=str))
+                elif _fits(value, types[name]):
+                    columns[name].append(float(value) if pa.types.is_floating(types[name]) else value)
+                else:
+                    columns[name].append(None)
+                    extra[name] = value
+            for key, value in record.items():
+                if key not in types:
+                    extra[key] = value
+            columns[_EXTRA_COLUMN].append(
+                json.dumps(extra, ensure_ascii=False, default=str) if extra else None
+            )
+
+        table = pa.Table.from_pydict(columns, schema=self._schema)
+        self._parquet_writer.write_table(table)
+        self._buffer = []
+
+
+def _fits(value: Any, arrow_type) -> bool:
+    """值是否可以无损写入该类型的列"""
+    if pa.types.is_boolean(arrow_type):
+        return isinstance(value, bool)
+    if pa.types.is_integer(arrow_type):
+        return isinstance(value, int) and not isinstance(value, bool) and -2**63 <= value < 2**63
+    if pa.types.is_floating(arrow_type):
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
+    return isinstance(value, str)
+
+
+def _infer_schema(records: List[Dict[str, Any]]):
+    """
+    由首个行组推断列类型
+
+    Returns:
+        (schema, JSON 编码的列名列表)
+    """
+    kinds: Dict[str, set] = {}
+    for record in records:
+        for key, value in record.items():
+            if key == _EXTRA_COLUMN:
+                continue
+            seen = kinds.setdefault(key, set())
+            if value is None:
+                continue
+            if isinstance(value, bool):
+                seen.add("bool")
+            elif isinstance(value, int):
+                seen.add("int" if -2**63 <= value < 2**63 else "json")
+            elif isinstance(value, float):
+                seen.add("float")
+            elif isinstance(value, str):
+                seen.add("str")
+            else:
+                seen.add("json")
+
+    fields = []
+    json_columns = []
+    for key, seen in kinds.items():
+        if seen == {"bool"}:
+            arrow_type = pa.bool_()
+        elif seen == {"int"}:
+            arrow_type = pa.int64()
+        elif seen and seen <= {"int", "float"}:
+            arrow_type = pa.float64()
+        elif seen <= {"str"}:
+            arrow_type = pa.string()
+        else:
+            arrow_type = pa.string()
+            json_columns.append(key)
+        fields.append(pa.field(key, arrow_type))
+
+    fields.append(pa.field(_EXTRA_COLUMN, pa.string()))
+    metadata = {_JSON_COLUMNS_KEY: json.dumps(json_columns).encode("utf-8")}
+    return pa.schema(fields, metadata=metadata), json_columns
+
+
+def write_records(
+    path_stem: PathLike,
+    records: Iterable[Dict[str, Any]],
+    output_format: str = DEFAULT_OUTPUT_FORMAT,
+    **kwargs
+) -> Path:
+    """
+    写入记录列表
+
+    Args:
+        path_stem: 不含后缀的输出路径
+        records: 记录
+        output_format: 输出格式（json/jsonl/parquet）
+        **kwargs: 传给 RecordWriter 的参数
+
+    Returns:
+        输出文件路径
+    """
+    with RecordWriter(path_stem, output_format, **kwargs) as writer:
+        writer.write_many(records)
+    return writer.path
+
+
+class PartitionedRecordWriter:
+    """
+    按记录数分片的写入器
+
+    每写满 partition_size 条记录切换到下一个文件 {主干}_part0000、{主干}_part0001 ...
+    """
+
+    def __init__(
+        self,
+        path_stem: PathLike,
+        output_format: str = DEFAULT_OUTPUT_FORMAT,
+        partition_size: int = 100000,
+        **kwargs
+    ):
+        """
+        初始化写入器
+
+        Args:
+            path_stem: 不含后缀和分片编号的输出路径
+            output_format: 输出格式（json/jsonl/parquet）
+            partition_size: 每个分片的记录数
+            **kwargs: 传给 RecordWriter 的参数
+        """
+        self.path_stem = Path(path_stem)
+        self.output_format = output_format
+        self.partition_size = max(1, partition_size)
+        self.count = 0
+        self.paths: List[Path] = []
+
+        self._kwargs = kwargs
+        self._writer: Optional[RecordWriter] = None
+
+    def write(self, record: Dict[str, Any]):
+        """写入一条记录"""
+        if self._writer is None:
+            stem = self.path_stem.with_name(f"{self.path_stem.name}_part{len(self.paths):04d}")
+            self._writer = RecordWriter(stem, self.output_format, **self._kwargs)
+        self._writer.write(record)
+        self.count += 1
+
+        if self._writer.count >= self.partition_size:
+            self.paths.append(self._writer.close())
+            self._writer = None
+
+    def write_many(self, records: Iterable[Dict[str, Any]]):
+        """写入多条记录"""
+        for record in records:
+            self.write(record)
+
+    def close(self) -> List[Path]:
+        """
+        完成写入
+
+        Returns:
+            全部分片文件路径
+        """
+        if self._writer is not None:
+            self.paths.append(self._writer.close())
+            self._writer = None
+        return self.paths
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+#===========================================================
+# 读取
+#===========================================================
+
+def iter_records(
+    path: PathLike,
+    container_keys: Iterable[str] = ("data", "results"),
+    batch_size: int = 10000
+) -> Iterator[Dict[str, Any]]:
+    """
+    流式读取记录（任意支持的格式）
+
+    JSON 文件：顶层为数组时逐项产出（安装 ijson 时不整体载入内存）；
+    顶层为对象时，若包含 container_keys 中的键则产出其中的列表，否则产出对象本身。
+    Parquet 文件中的空值字段不会出现在记录中。
+
+    Args:
+        path: 文件路径
+        container_keys: JSON 对象中存放记录列表的键
+        batch_size: Parquet 每次读取的行数
+
+    Yields:
+        记录
+    """
+    path = Path(path)
+    suffix = record_suffix(path)
+
+    if suffix == ".parquet":
+        yield from _iter_parquet(path, batch_size)
+    elif suffix in (".jsonl", ".jsonl.gz", ".jsonl.zst"):
+        with _open_text(path, suffix) as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+    elif suffix == ".json":
+        yield from _iter_json(path, tuple(container_keys))
+    else:
+        raise ValueError(f"Unsupported record file: {path}")
+
+
+def read_records(path: PathLike, **kwargs) -> List[Dict[str, Any]]:
+    """读取全部记录为列表"""
+    return list(iter_records(path, **kwargs))
+
+
+def iter_batches(
+    path: PathLike,
+    batch_size: int = 1000,
+    **kwargs
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    按批次流式读取记录
+
+    Args:
+        path: 文件路径
+        batch_size: 每批记录数
+
+    Yields:
+        记录批次
+    """
+    batch = []
+    for record in iter_records(path, **kwargs):
+        batch.append(record)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _open_text(path: Path, suffix: str):
+    if suffix == ".jsonl.zst":
+        if not ZSTD_AVAILABLE:
+            raise ImportError(f"zstandard is required to read {path}: pip install zstandard")
+        raw = open(path, "rb")
+        reader = zstandard.ZstdDecompressor().stream_reader(raw, closefd=True)
+        return io.TextIOWrapper(reader, encoding="utf-8")
+    if suffix == ".jsonl.gz":
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, "r", encoding="utf-8")
+
+
+def _iter_json(path: Path, container_keys: tuple) -> Iterator[Dict[str, Any]]:
+    with open(path, "rb") as f:
+        first = f.read(1)
+        while first and first.isspace():
+            first = f.read(1)
+        f.seek(0)
+
+        if first == b"[" and IJSON_AVAILABLE:
+            yield from ijson.items(f, "item", use_float=True)
+            return
+
+        data = json.load(f)
+
+    if isinstance(data, list):
+        yield from data
+    elif isinstance(data, dict):
+        for key in container_keys:
+            if key in data and isinstance(data[key], list):
+                yield from data[key]
+                return
+        yield data
+    else:
+        logger.warning(f"Unexpected data structure in {path}")
+
+
+def _iter_parquet(path: Path, batch_size: int) -> Iterator[Dict[str, Any]]:
+    if not PYARROW_AVAILABLE:
+        raise ImportError(f"pyarrow is required to read {path}: pip install pyarrow")
+
+    parquet_file = pq.ParquetFile(str(path))
+    metadata = parquet_file.schema_arrow.metadata or {}
+    json_columns = set(json.loads(metadata.get(_JSON_COLUMNS_KEY, b"[]")))
+
+    for batch in parquet_file.iter_batches(batch_size=batch_size):
+        for row in batch.to_pylist():
+            extra = row.pop(_EXTRA_COLUMN, None)
+            record = {}
+            for key, value in row.items():
+                if value is None:
+                    continue
+                record[key] = json.loads(value) if key in json_columns else value
+            if extra:
+                record.update(json.loads(extra))
+            yield record
+
+
+#===========================================================
+# 转换
+#===========================================================
+
+def convert_file(
+    path: PathLike,
+    output_format: str = "jsonl",
+    remove_source: bool = False
+) -> Path:
+    """
+    将已有输出文件转换为另一种格式
+
+    Args:
+        path: 源文件（通常为旧的 JSON 输出）
+        output_format: 目标格式
+        remove_source: 转换成功后删除源文件
+
+    Returns:
+        新文件路径
+    """
+    path = Path(path)
+    stem = strip_record_suffix(path)
+    target = RecordWriter.output_path(stem, output_format)
+    # 先检查再打开写入器，避免同格式转换截断源文件
+    if os.path.realpath(target) == os.path.realpath(path):
+        raise ValueError(f"{path} is already in {output_format} format")
+
+    # 写入同目录下的临时文件，完成后原子替换到目标路径
+    writer = RecordWriter(stem.with_name(f".{stem.name}.converting-{os.getpid()}"), output_format)
+    try:
+        with writer:
+            writer.write_many(iter_records(path))
+        os.replace(writer.path, target)
+    except BaseException:
+        if writer.path.exists():
+            writer.path.unlink()
+        raise
+
+    source_size = path.stat().st_size
+    target_size = target.stat().st_size
+    logger.info(
+        f"Converted {path.name} -> {target.name}: {writer.count} records, "
+        f"{source_size / 1e6:.1f} MB -> {target_size / 1e6:.1f} MB"
+    )
+
+    if remove_source:
+        path.unlink()
+    return target
+
+
+def convert_outputs(
+    paths: Iterable[PathLike],
+    output_format: str = "jsonl",
+    remove_source: bool = False,
+    pattern: str = "*.json"
+) -> List[Path]:
+    """
+    批量转换输出文件（目录按 pattern 递归查找）
+
+    摘要文件（*summary*）和非列表结构的 JSON 保持不变。
+
+    Returns:
+        新文件路径列表
+    """
+    converted = []
+    for path in paths:
+        path = Path(path)
+        files = sorted(path.rglob(pattern)) if path.is_dir() else [path]
+        for file_path in files:
+            if "summary" in file_path.name or not _is_record_list(file_path):
+                logger.debug(f"Skipping {file_path}")
+                continue
+            try:
+                converted.append(convert_file(file_path, output_format, remove_source))
+            except Exception as e:
+                logger.error(f"Failed to convert {file_path}: {e}")
+    return converted
+
+
+def _is_record_list(path: Path) -> bool:
+    """只转换顶层为数组的 JSON 文件"""
+    if record_suffix(path) != ".json":
+        return True
+    with open(path, "rb") as f:
+        first = f.read(1)
+        while first and first.isspace():
+            first = f.read(1)
+    return first == b"["
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Convert processor JSON outputs to a streaming intermediate format"
+    )
+    parser.add_argument("paths", nargs="+", help="Files or directories to convert")
+    parser.add_argument("--format", choices=[f for f in OUTPUT_FORMATS if f != "json"], default="jsonl")
+    parser.add_argument("--pattern", default="*.json", help="Glob pattern when a directory is given")
+    parser.add_argument("--remove-source", action="store_true", help="Delete source files after conversion")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    converted = convert_outputs(args.paths, args.format, args.remove_source, args.pattern)
+    logger.info(f"Converted {len(converted)} files")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,566 @@
+#===========================================================
+# PharmaKG 词典实体标注器
+# Pharmaceutical Knowledge Graph - Dictionary Term Tagger
+#===========================================================
+# 版本: v1.0
+# 描述: 基于词级 Aho-Corasick 自动机的多模式匹配，术语表可由
+#       MedDRA / MONDO / 自定义词表加载；每段文本只做一次小写化
+#       和一次扫描，返回带原文字符偏移的匹配
+#===========================================================
+
+import csv
+import json
+import logging
+import re
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+
+PathLike = Union[str, Path]
+
+# 术语 → (ID, 标签) 的输入格式
+TermEntry = Tuple[str, Optional[str], Optional[str]]
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize_with_spans(text: str) -> List[Tuple[str, int, int]]:
+    """
+    将文本切分为小写词及其在原文中的字符偏移
+
+    整段文本只小写化一次；极少数字符小写后长度会变化（例如 'İ'），
+    此时退回逐词小写以保证偏移对应原文。
+
+    Returns:
+        [(词, 起始偏移, 结束偏移)]
+    """
+    if not text:
+        return []
+
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return [(m.group(), m.start(), m.end()) for m in _TOKEN_PATTERN.finditer(lowered)]
+    return [(m.group().lower(), m.start(), m.end()) for m in _TOKEN_PATTERN.finditer(text)]
+
+
+def term_tokens(term: str) -> List[str]:
+    """术语的词序列（与 tokenize_with_spans 的规则一致）"""
+    return [token for token, _, _ in tokenize_with_spans(term)]
+
+
+#===========================================================
+# 词级 Aho-Corasick 自动机
+#===========================================================
+
+class TokenAutomaton:
+    """
+    以词为字母表的 Aho-Corasick 自动机
+
+    转移表保存为 {(状态, 词 ID): 状态} 的单个字典，避免每个节点一个字典；
+    以词为单位匹配天然满足词边界，扫描文本一遍即可找出全部模式。
+    """
+
+    def __init__(self):
+        self._vocab: Dict[str, int] = {}
+        self._goto: Dict[Tuple[int, int], int] = {}
+        self._parent: List[int] = [0]
+        self._token: List[int] = [-1]
+        self._depth: List[int] = [0]
+        self._fail: List[int] = [0]
+        self._output_link: List[int] = [0]
+        self._outputs: Dict[int, Any] = {}
+        self._finalized = False
+
+    def __len__(self) -> int:
+        return len(self._outputs)
+
+    def add(self, tokens: Sequence[str], value: Any) -> bool:
+        """
+        添加模式
+
+        Args:
+            tokens: 模式的词序列（应与 tokenize_with_spans 的输出一致，即已小写）
+            value: 匹配时返回的值（同一模式重复添加时保留第一个）
+
+        Returns:
+            是否为新模式
+        """
+        if not tokens:
+            return False
+
+        state = 0
+        for token in tokens:
+            token_id = self._vocab.setdefault(token, len(self._vocab))
+            next_state = self._goto.get((state, token_id))
+            if next_state is None:
+                next_state = len(self._parent)
+                self._goto[(state, token_id)] = next_state
+                self._parent.append(state)
+                self._token.append(token_id)
+                self._depth.append(self._depth[state] + 1)
+            state = next_state
+
+        if state in self._outputs:
+            return False
+        self._outputs[state] = value
+        self._finalized = False
+        return True
+
+    def finalize(self):
+        """计算失败链接和输出链接（按深度的广度优先顺序）"""
+        count = len(self._parent)
+        self._fail = [0] * count
+        self._output_link = [0] * count
+
+        for state in sorted(range(1, count), key=self._depth.__getitem__):
+            parent = self._parent[state]
+            if parent == 0:
+                continue
+
+            token_id = self._token[state]
+            fallback = self._fail[parent]
+            while fallback and (fallback, token_id) not in self._goto:
+                fallback = self._fail[fallback]
+            target = self._goto.get((fallback, token_id), 0)
+            self._fail[state] = target if target != state else 0
+
+            fail = self._fail[state]
+            self._output_link[state] = fail if fail in self._outputs else self._output_link[fail]
+
+        self._finalized = True
+
+    def iter_matches(self, tokens: Sequence[str]) -> Iterator[Tuple[int, int, Any]]:
+        """
+        扫描词序列
+
+        Args:
+            tokens: 小写词序列
+
+        Yields:
+            (起始词下标, 结束词下标（不含）, 值)，可能重叠
+        """
+        if not self._finalized:
+            self.finalize()
+
+        goto = self._goto
+        fail = self._fail
+        depth = self._depth
+        outputs = self._outputs
+        output_link = self._output_link
+        vocab = self._vocab
+
+        state = 0
+        for i, token in enumerate(tokens):
+            token_id = vocab.get(token)
+            if token_id is None:
+                state = 0
+                continue
+
+            while state and (state, token_id) not in goto:
+                state = fail[state]
+            state = goto.get((state, token_id), 0)
+
+            match = state if state in outputs else output_link[state]
+            while match:
+                yield i + 1 - depth[match], i + 1, outputs[match]
+                match = output_link[match]
+
+    def find_longest(self, tokens: Sequence[str]) -> List[Tuple[int, int, Any]]:
+        """
+        最左最长、互不重叠的匹配
+
+        Returns:
+            按位置排序的 [(起始词下标, 结束词下标, 值)]
+        """
+        matches = sorted(self.iter_matches(tokens), key=lambda m: (m[0], m[0] - m[1]))
+        selected = []
+        end = 0
+        for match in matches:
+            if match[0] >= end:
+                selected.append(match)
+                end = match[1]
+        return selected
+
+
+#===========================================================
+# 标注器
+#===========================================================
+
+class TermTagger:
+    """
+    词典实体标注器
+
+    每个术语可带标识符（MedDRA PT 代码、MONDO ID 等）和规范标签
+    （同义词/低位语指向的首选名）；未给出标签时以原文匹配文本为名称。
+    """
+
+    def __init__(self, name: str = "terms", min_length: int = 2):
+        """
+        初始化标注器
+
+        Args:
+            name: 标注器名称（用于日志）
+            min_length: 术语最短字符数，更短的术语被忽略
+        """
+        self.name = name
+        self.min_length = min_length
+        self._automaton = TokenAutomaton()
+
+    def __len__(self) -> int:
+        return len(self._automaton)
+
+    def add(self, term: Optional[str], term_id: Optional[str] = None, label: Optional[str] = None) -> bool:
+        """
+        添加术语
+
+        Args:
+            term: 术语文本
+            term_id: 标识符
+            label: 规范标签
+
+        Returns:
+            是否为新术语
+        """
+        if not term or len(term.strip()) < self.min_length:
+            return False
+        return self._automaton.add(term_tokens(term), (term_id, label))
+
+    def add_many(self, entries: Iterable[Union[str, TermEntry]]) -> int:
+        """
+        批量添加术语
+
+        Args:
+            entries: 术语字符串或 (术语, ID, 标签) 元组
+
+        Returns:
+            新增术语数
+        """
+        added = 0
+        for entry in entries:
+            if isinstance(entry, str):
+                added += self.add(entry)
+            else:
+                added += self.add(*entry)
+        return added
+
+    def tag(self, text: Optional[str]) -> List[Dict[str, Any]]:
+        """
+        标注文本（最左最长、互不重叠）
+
+        Args:
+            text: 文本
+
+        Returns:
+            [{'text', 'start', 'end', 'id', 'label'}]，偏移为原文字符偏移
+        """
+        if not text or not len(self._automaton):
+            return []
+
+        spans = tokenize_with_spans(text)
+        matches = []
+        for start, end, (term_id, label) in self._automaton.find_longest([span[0] for span in spans]):
+            char_start, char_end = spans[start][1], spans[end - 1][2]
+            matched = text[char_start:char_end]
+            matches.append({
+                "text": matched,
+                "start": char_start,
+                "end": char_end,
+                "id": term_id,
+                "label": label or matched
+            })
+        return matches
+
+    def tag_grouped(self, text: Optional[str]) -> List[Dict[str, Any]]:
+        """
+        标注文本并按术语合并（按首次出现顺序）
+
+        同一标识符（无标识符时为小写标签）的多次出现合并为一条，
+        保留全部偏移。
+
+        Returns:
+            [{'name', 'id', 'spans': [(start, end), ...]}]
+        """
+        grouped: Dict[str, Dict[str, Any]] = {}
+        for match in self.tag(text):
+            key = match["id"] or match["label"].lower()
+            entry = grouped.get(key)
+            if entry is None:
+                grouped[key] = {"name": match["label"], "id": match["id"], "spans": [(match["start"], match["end"])]}
+            else:
+                entry["spans"].append((match["start"], match["end"]))
+        return list(grouped.values())
+
+    def tag_sections(self, sections: Dict[str, str]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        逐段标注（偏移相对于各段文本）
+
+        Args:
+            sections: {段名: 文本}
+
+        Returns:
+            {段名: 匹配列表}
+        """
+        return {key: self.tag(text) for key, text in sections.items()}
+
+    @classmethod
+    def from_sources(
+        cls,
+        name: str = "terms",
+        meddra_dir: Optional[PathLike] = None,
+        mondo_path: Optional[PathLike] = None,
+        term_files: Sequence[PathLike] = (),
+        default_terms: Iterable[Union[str, TermEntry]] = (),
+        min_length: int = 2
+    ) -> "TermTagger":
+        """
+        从术语来源构建标注器
+
+        先加入的术语优先（重复术语保留第一个映射），顺序为
+        MedDRA → MONDO → 自定义词表 → 内置默认术语。
+
+        Args:
+            name: 标注器名称
+            meddra_dir: MedDRA ASCII 发布目录（含 llt.asc / pt.asc）
+            mondo_path: MONDO 文件（.obo / .json / .tsv / .csv）
+            term_files: 自定义词表（每行 "术语[\\tID[\\t标签]]"）
+            default_terms: 内置默认术语
+            min_length: 术语最短字符数
+        """
+        tagger = cls(name, min_length=min_length)
+        if meddra_dir:
+            tagger.add_many(iter_meddra_terms(meddra_dir))
+        if mondo_path:
+            tagger.add_many(iter_mondo_terms(mondo_path))
+        for path in term_files:
+            tagger.add_many(iter_term_file(path))
+        tagger.add_many(default_terms)
+
+        tagger._automaton.finalize()
+        logger.info(f"Term tagger '{name}' built with {len(tagger)} terms")
+        return tagger
+
+
+#===========================================================
+# 术语来源
+#===========================================================
+
+def iter_meddra_terms(meddra_dir: PathLike, include_llt: bool = True) -> Iterator[TermEntry]:
+    """
+    读取 MedDRA ASCII 发布文件
+
+    PT 以自身为标签；LLT（仅当前有效的）映射到所属 PT 的代码和名称。
+
+    Args:
+        meddra_dir: 包含 pt.asc / llt.asc 的目录（可为 MedAscii 子目录的上级）
+        include_llt: 是否包含低位语
+
+    Yields:
+        (术语, PT 代码, PT 名称)
+    """
+    meddra_dir = Path(meddra_dir)
+    pt_file = _find_file(meddra_dir, "pt.asc")
+    if pt_file is None:
+        logger.warning(f"MedDRA pt.asc not found under {meddra_dir}")
+        return
+
+    pt_names = {}
+    for fields in _iter_asc(pt_file):
+        if len(fields) >= 2 and fields[0]:
+            pt_names[fields[0]] = fields[1]
+            yield fields[1], fields[0], fields[1]
+
+    llt_file = _find_file(meddra_dir, "llt.asc") if include_llt else None
+    if llt_file is None:
+        return
+
+    for fields in _iter_asc(llt_file):
+        if len(fields) < 3 or fields[2] not in pt_names:
+            continue
+        # 第 10 列为 llt_currency，N 表示已不再使用
+        if len(fields) > 9 and fields[9] == "N":
+            continue
+        yield fields[1], fields[2], pt_names[fields[2]]
+
+
+def iter_mondo_terms(path: PathLike, synonym_scopes: Sequence[str] = ("EXACT",)) -> Iterator[TermEntry]:
+    """
+    读取 MONDO 术语（名称和指定范围的同义词，跳过已废弃术语）
+
+    支持 .obo、OBO Graphs .json 以及带 id/label(/synonyms) 列的 .tsv/.csv。
+
+    Args:
+        path: MONDO 文件
+        synonym_scopes: 纳入的同义词范围
+
+    Yields:
+        (术语, MONDO ID, 首选名)
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix == ".obo":
+        yield from _iter_mondo_obo(path, synonym_scopes)
+    elif suffix == ".json":
+        yield from _iter_mondo_json(path, synonym_scopes)
+    elif suffix in (".tsv", ".csv"):
+        yield from _iter_mondo_table(path, "\t" if suffix == ".tsv" else ",")
+    else:
+        logger.warning(f"Unsupported MONDO term file: {path}")
+
+
+def iter_term_file(path: PathLike) -> Iterator[TermEntry]:
+    """
+    读取自定义词表
+
+    每行 "术语[\\tID[\\t标签]]"，# 开头的行为注释。
+
+    Yields:
+        (术语, ID, 标签)
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.rstrip("\r\n")
+            if not line or line.startswith("#"):
+                continue
+            fields = line.split("\t")
+            term = fields[0].strip()
+            term_id = fields[1].strip() if len(fields) > 1 and fields[1].strip() else None
+            label = fields[2].strip() if len(fields) > 2 and fields[2].strip() else None
+            yield term, term_id, label
+
+
+def _find_file(directory: Path, file_name: str) -> Optional[Path]:
+    if (directory / file_name).exists():
+        return directory / file_name
+    return next(iter(sorted(directory.rglob(file_name))), None)
+
+
+def _iter_asc(path: Path) -> Iterator[List[str]]:
+    with open(path, "r", encoding="latin-1") as f:
+        for line in f:
+            yield line.rstrip("\r\n").split("$")
+
+
+_OBO_SYNONYM = re.compile(r'^synonym:\s*"((?:[^"\\]|\\.)*)"\s+(\w+)')
+
+
+def _iter_mondo_obo(path: Path, synonym_scopes: Sequence[str]) -> Iterator[TermEntry]:
+    def flush(stanza):
+        if stanza.get("id", "").startswith("MONDO:") and stanza.get("name") and not stanza.get("obsolete"):
+            yield stanza["name"], stanza["id"], stanza["name"]
+            for synonym in stanza.get("synonyms", []):
+                yield synonym, stanza["id"], stanza["name"]
+
+    stanza: Dict[str, Any] = {}
+    in_term = False
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line.startswith("["):
+                if in_term:
+                    yield from flush(stanza)
+                stanza = {}
+                in_term = line == "[Term]"
+                continue
+            if not in_term or not line:
+                continue
+
+            if line.startswith("id:"):
+                stanza["id"] = line[3:].strip()
+            elif line.startswith("name:"):
+                stanza["name"] = line[5:].strip()
+            elif line.startswith("is_obsolete:"):
+                stanza["obsolete"] = line.endswith("true")
+            elif line.startswith("synonym:"):
+                match = _OBO_SYNONYM.match(line)
+                if match and match.group(2) in synonym_scopes:
+                    stanza.setdefault("synonyms", []).append(match.group(1).replace('\\"', '"'))
+
+    if in_term:
+        yield from flush(stanza)
+
+
+def _iter_mondo_json(path: Path, synonym_scopes: Sequence[str]) -> Iterator[TermEntry]:
+    # OBO Graphs JSON 需要整体加载；大文件建议预先转换为 .tsv
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    predicates = {f"has{scope.capitalize()}Synonym" for scope in synonym_scopes}
+    for graph in data.get("graphs", []):
+        for node in graph.get("nodes", []):
+            node_id = node.get("id", "").rsplit("/", 1)[-1].replace("_", ":")
+            label = node.get("lbl")
+            meta = node.get("meta") or {}
+            if not node_id.startswith("MONDO:") or not label or meta.get("deprecated"):
+                continue
+            yield label, node_id, label
+            for synonym in meta.get("synonyms", []):
+                if synonym.get("pred") in predicates and synonym.get("val"):
+                    yield synonym["val"], node_id, label
+
+
+def _iter_mondo_table(path: Path, delimiter: str) -> Iterator[TermEntry]:
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f, delimiter=delimiter):
+            term_id = (row.get("id") or row.get("mondo_id") or "").strip()
+            label = (row.get("label") or row.get("name") or "").strip()
+            if not term_id or not label:
+                continue
+            yield label, term_id, label
+            for synonym in (row.get("synonyms") or "").split("|"):
+                if synonym.strip():
+                    yield synonym.strip(), term_id, label
+
+
+#===========================================================
+# 共享实例
+#===========================================================
+
+_TAGGERS: Dict[tuple, TermTagger] = {}
+_TAGGERS_LOCK = threading.Lock()
+
+
+def get_term_tagger(
+    name: str,
+    meddra_dir: Optional[PathLike] = None,
+    mondo_path: Optional[PathLike] = None,
+    term_files: Sequence[PathLike] = (),
+    default_terms: Sequence[Union[str, TermEntry]] = (),
+    min_length: int = 2
+) -> TermTagger:
+    """
+    获取进程内共享的标注器（相同来源只构建一次）
+
+    参数含义同 TermTagger.from_sources；不存在的来源路径会被忽略并记录警告。
+    """
+    meddra_dir = _existing(meddra_dir)
+    mondo_path = _existing(mondo_path)
+    term_files = tuple(p for p in (_existing(p) for p in term_files) if p)
+    default_terms = tuple(default_terms)
+
+    key = (name, meddra_dir, mondo_path, term_files, default_terms, min_length)
+    with _TAGGERS_LOCK:
+        tagger = _TAGGERS.get(key)
+        if tagger is None:
+            tagger = TermTagger.from_sources(
+                name,
+                meddra_dir=meddra_dir,
+                mondo_path=mondo_path,
+                term_files=term_files,
+                default_terms=default_terms,
+                min_length=min_length
+            )
+            _TAGGERS[key] = tagger
+        return tagger
+
+
+def _existing(path: Optional[PathLike]) -> Optional[str]:
+    if not path:
+        return None
+    path = Path(path)
+    if not path.exists():
+        logger.warning(f"Term source not found: {path}")
+        return None
+    return str(path.resolve())
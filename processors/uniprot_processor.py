@@ -9,7 +9,6 @@
 import logging
 import json
 import time
-import sqlite3
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
@@ -22,6 +21,7 @@ from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
 from processors.base import BaseProcessor, ProcessingResult, ProcessingStatus, ProcessingMetrics
+from processors.http_cache import get_http_cache, install_http_cache
 
 
 logger = logging.getLogger(__name__)
@@ -55,7 +55,7 @@ class UniProtExtractionConfig:
     retry_backoff: float = 1.0
     timeout: int = 30
     cache_enabled: bool = True
-    cache_file: str = "uniprot_cache.db"
+    cache_max_age: int = 7 * 24 * 3600  # 缓存在此时间内直接使用，超时后条件请求重新验证
     include_go_annotations: bool = True
     include_diseases: bool = True
     include_subcellular_location: bool = True
@@ -137,10 +137,17 @@ class UniProtProcessor(BaseProcessor):
         # 初始化 HTTP 会话
         self.session = self._create_session()
 
-        # 初始化缓存
-        self.cache_conn = None
+        # 共享 HTTP 缓存
+        self.http_cache = None
         if self.extraction_config.cache_enabled:
-            self._init_cache()
+            self.http_cache = get_http_cache(self.data_root / "cache")
+            install_http_cache(
+                self.session,
+                source="uniprot",
+                cache=self.http_cache,
+                max_age=self.extraction_config.cache_max_age,
+                throttle=self._respect_rate_limit
+            )
 
         # 速率限制控制
         self.last_request_time = 0
@@ -450,7 +457,8 @@ class UniProtProcessor(BaseProcessor):
                     'relationships_created': self.stats.relationships_created,
                     'api_requests_made': self.stats.api_requests_made,
                     'cache_hits': self.stats.cache_hits
-                }
+                },
+                'http_cache': self.http_cache.get_stats("uniprot") if self.http_cache else None
             }
 
             logger.info(f"[{self.PROCESSOR_NAME}] 处理完成: "
@@ -483,11 +491,6 @@ class UniProtProcessor(BaseProcessor):
                 errors=[str(e)]
             )
 
-        finally:
-            # 关闭缓存连接
-            if self.cache_conn:
-                self.cache_conn.close()
-
     #===========================================================
     # HTTP 会话和缓存管理
     #===========================================================
@@ -515,61 +518,6 @@ class UniProtProcessor(BaseProcessor):
 
         return session
 
-    def _init_cache(self):
-        """初始化 SQLite 缓存数据库"""
-        cache_path = self.data_root / "cache" / self.extraction_config.cache_file
-        cache_path.parent.mkdir(parents=True, exist_ok=True)
-
-        self.cache_conn = sqlite3.connect(str(cache_path))
-        self.cache_conn.execute("""
-            CREATE TABLE IF NOT EXISTS uniprot_cache (
-                accession TEXT PRIMARY KEY,
-                data TEXT,
-                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-
-    def _get_cached_data(self, accession: str) -> Optional[Dict]:
-        """
-        从缓存获取数据
-
-        Args:
-            accession: UniProt 登录号
-
-        Returns:
-            缓存的数据或 None
-        """
-        if not self.cache_conn:
-            return None
-
-        cursor = self.cache_conn.cursor()
-        cursor.execute("SELECT data FROM uniprot_cache WHERE accession = ?", (accession,))
-        row = cursor.fetchone()
-
-        if row:
-            self.stats.cache_hits += 1
-            return json.loads(row[0])
-
-        return None
-
-    def _set_cached_data(self, accession: str, data: Dict):
-        """
-        将数据存入缓存
-
-        Args:
-            accession: UniProt 登录号
-            data: 要缓存的数据
-        """
-        if not self.cache_conn:
-            return
-
-        cursor = self.cache_conn.cursor()
-        cursor.execute(
-            "INSERT OR REPLACE INTO uniprot_cache (accession, data, timestamp) VALUES (?, ?, CURRENT_TIMESTAMP)",
-            (accession, json.dumps(data))
-        )
-        self.cache_conn.commit()
-
     #===========================================================
     # 速率限制和 API 请求
     #===========================================================
@@ -596,11 +544,11 @@ class UniProtProcessor(BaseProcessor):
         Returns:
             响应数据或 None
         """
-        self._respect_rate_limit()
+        # 启用缓存时由缓存适配器在真正发出请求前限速，缓存命中不等待
+        if self.http_cache is None:
+            self._respect_rate_limit()
 
         try:
-            self.stats.api_requests_made += 1
-
             response = self.session.get(
                 url,
                 params=params,
@@ -608,6 +556,10 @@ class UniProtProcessor(BaseProcessor):
                 headers={"Accept": "application/json"}
             )
 
+            if getattr(response, "from_cache", False):
+                self.stats.cache_hits += 1
+            else:
+                self.stats.api_requests_made += 1
             response.raise_for_status()
             return response.json()
 
@@ -669,18 +621,10 @@ class UniProtProcessor(BaseProcessor):
         else:
             # 对于小批量，使用单独的请求
             for accession in accession_list:
-                # 检查缓存
-                cached_data = self._get_cached_data(accession)
-                if cached_data:
-                    results.append(cached_data)
-                    continue
-
-                # 从 API 获取
+                # 响应由共享 HTTP 缓存缓存
                 entry_data = self._fetch_single_entry(accession)
                 if entry_data:
                     results.append(entry_data)
-                    # 缓存数据
-                    self._set_cached_data(accession, entry_data)
 
         return results
 
@@ -724,12 +668,6 @@ class UniProtProcessor(BaseProcessor):
             if data and "results" in data:
                 results = data["results"]
 
-                # 缓存所有结果
-                for entry in results:
-                    accession = entry.get("primaryAccession")
-                    if accession:
-                        self._set_cached_data(accession, entry)
-
         except Exception as e:
             logger.error(f"Stream fetch failed: {e}")
             # 回退到单独请求
@@ -1150,22 +1088,16 @@ class UniProtProcessor(BaseProcessor):
         diseases = [e for e in all_entities if e.get("entity_type") == "rd:Disease"]
 
         if targets:
-            targets_file = output_dir / f"uniprot_targets_{timestamp}.json"
-            with open(targets_file, "w", encoding="utf-8") as f:
-                json.dump(targets, f, ensure_ascii=False, indent=2)
+            targets_file = self._write_records(output_dir / f"uniprot_targets_{timestamp}", targets)
             logger.info(f"保存 {len(targets)} 个靶点到: {targets_file}")
 
         if diseases:
-            diseases_file = output_dir / f"uniprot_diseases_{timestamp}.json"
-            with open(diseases_file, "w", encoding="utf-8") as f:
-                json.dump(diseases, f, ensure_ascii=False, indent=2)
+            diseases_file = self._write_records(output_dir / f"uniprot_diseases_{timestamp}", diseases)
             logger.info(f"保存 {len(diseases)} 个疾病到: {diseases_file}")
 
         # 保存关系
         if all_relationships:
-            relationships_file = output_dir / f"uniprot_disease_associations_{timestamp}.json"
-            with open(relationships_file, "w", encoding="utf-8") as f:
-                json.dump(all_relationships, f, ensure_ascii=False, indent=2)
+            relationships_file = self._write_records(output_dir / f"uniprot_disease_associations_{timestamp}", all_relationships)
             logger.info(f"保存 {len(all_relationships)} 个关系到: {relationships_file}")
 
         # 保存处理摘要
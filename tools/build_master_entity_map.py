@@ -31,6 +31,7 @@ import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from api.database import Neo4jConnection
+from processors.storage import find_outputs, iter_records
 
 # Configure logging
 logging.basicConfig(
@@ -284,35 +285,18 @@ class MasterEntityMapper:
             entity_type = entity_type_dir.name
             logger.info(f"Processing entity type: {entity_type}")
 
-            # Process JSON files
-            for json_file in entity_type_dir.glob("*.json"):
+            # Process entity files (JSON, JSONL or Parquet), streaming records
+            for record_file in find_outputs(entity_type_dir, "*", newest_first=False):
                 try:
-                    with open(json_file, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-
-                    # Handle different file structures
-                    if isinstance(data, list):
-                        entities = data
-                    elif isinstance(data, dict):
-                        if "data" in data:
-                            entities = data["data"]
-                        elif "results" in data:
-                            entities = data["results"]
-                        else:
-                            entities = [data]
-                    else:
-                        logger.warning(f"Unexpected data structure in {json_file}")
-                        continue
-
                     # Categorize entities
-                    for entity in entities:
+                    for entity in iter_records(record_file):
                         categorized = self._categorize_entity(entity, entity_type)
                         if categorized:
                             entity_type_name, entity_data = categorized
                             extracted_data[entity_type_name].append(entity_data)
 
                 except Exception as e:
-                    logger.error(f"Error processing {json_file}: {str(e)}")
+                    logger.error(f"Error processing {record_file}: {str(e)}")
 
         # Log statistics
         for entity_type, entities in extracted_data.items():
@@ -10,11 +10,16 @@
 import json
 import logging
 import hashlib
+import sys
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 from collections import defaultdict
 from datetime import datetime
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from processors.storage import find_outputs, iter_records
+
 # 配置日志
 def setup_logging(log_dir: Path) -> logging.Logger:
     """配置日志系统"""
@@ -153,8 +158,8 @@ class ComprehensiveDataImporter:
         reg_dir = self.processed_dir / 'documents' / 'regulatory'
 
         # 查找fixed文件
-        entity_files = sorted(reg_dir.glob('entities_fixed_*.json'), reverse=True)
-        rel_files = sorted(reg_dir.glob('relationships_fixed_*.json'), reverse=True)
+        entity_files = find_outputs(reg_dir, 'entities_fixed_*')
+        rel_files = find_outputs(reg_dir, 'relationships_fixed_*')
 
         if not entity_files or not rel_files:
             self.logger.warning("未找到修复后的监管数据文件")
@@ -181,12 +186,12 @@ class ComprehensiveDataImporter:
             return {'status': 'skipped', 'entities': 0, 'relationships': 0}
 
         # 优先查找修复后的关系文件
-        entities_files = sorted(crl_dir.glob('entities_*.json'), reverse=True)
-        relationships_files = sorted(crl_dir.glob('relationships_fixed_*.json'), reverse=True)
+        entities_files = find_outputs(crl_dir, 'entities_*')
+        relationships_files = find_outputs(crl_dir, 'relationships_fixed_*')
 
         # 如果没有修复后的文件，使用原始文件
         if not relationships_files:
-            relationships_files = sorted(crl_dir.glob('relationships_*.json'), reverse=True)
+            relationships_files = find_outputs(crl_dir, 'relationships_*')
             # 过滤掉fixed文件避免重复
             relationships_files = [f for f in relationships_files if 'fixed' not in f.name]
 
@@ -207,11 +212,11 @@ class ComprehensiveDataImporter:
         crl_pdf_dir = self.processed_dir / 'documents' / 'clinical_crl_pdf'
 
         if crl_pdf_dir.exists():
-            entities_files = sorted(crl_pdf_dir.glob('entities_*.json'), reverse=True)
+            entities_files = find_outputs(crl_pdf_dir, 'entities_*')
             # 优先使用修复后的关系文件
-            relationships_files = sorted(crl_pdf_dir.glob('relationships_fixed_*.json'), reverse=True)
+            relationships_files = find_outputs(crl_pdf_dir, 'relationships_fixed_*')
             if not relationships_files:
-                relationships_files = sorted(crl_pdf_dir.glob('relationships_*.json'), reverse=True)
+                relationships_files = find_outputs(crl_pdf_dir, 'relationships_*')
 
             if entities_files and relationships_files:
                 entities_file = entities_files[0]
@@ -247,14 +252,48 @@ class ComprehensiveDataImporter:
 
         self.logger.info(f"导入 {source_name} 数据:")
 
-        # 加载数据
-        with open(entities_file, 'r', encoding='utf-8') as f:
-            entities = json.load(f)
+        # 流式加载数据（支持 JSON/JSONL/Parquet），只保留扁平化后的记录
+        entities_by_label = defaultdict(list)
+        entity_ids = set()
+        total_entities = 0
+
+        for entity in iter_records(entities_file):
+            total_entities += 1
+            label = entity.get('label', 'Unknown').replace(':', '_')
+            props = entity.get('properties', {})
+            primary_id = props.get('primary_id', '')
+
+            if not primary_id:
+                continue
+
+            entity_ids.add(primary_id)
+
+            # 扁平化
+            record = {'primary_id': primary_id}
+            for k, v in props.items():
+                if k != 'primary_id' and v is not None:
+                    if isinstance(v, str):
+                        v = v.replace('\n', ' ').replace('\r', '')
+                    record[k] = v
+
+            entities_by_label[label].append(record)
+
+        # 只保留两端实体都存在的关系
+        relationships_by_type = defaultdict(list)
+        total_relationships = 0
+        valid_relationships = 0
+
+        for rel in iter_records(relationships_file):
+            total_relationships += 1
+            from_id = rel.get('from', '')
+            to_id = rel.get('to', '')
 
-        with open(relationships_file, 'r', encoding='utf-8') as f:
-            relationships = json.load(f)
+            if from_id in entity_ids and to_id in entity_ids:
+                rel_type = rel.get('relationship_type', 'RELATED_TO').replace(':', '_')
+                relationships_by_type[rel_type].append(rel)
+                valid_relationships += 1
 
-        self.logger.info(f"  加载 {len(entities)} 个实体, {len(relationships)} 个关系")
+        self.logger.info(f"  加载 {total_entities} 个实体, {total_relationships} 个关系")
 
         driver = GraphDatabase.driver(
             self.neo4j_uri,
@@ -264,29 +303,6 @@ class ComprehensiveDataImporter:
         try:
             with driver.session(database=self.neo4j_database) as session:
                 # 导入实体
-                entities_by_label = defaultdict(list)
-                entity_ids = set()
-
-                for entity in entities:
-                    label = entity.get('label', 'Unknown').replace(':', '_')
-                    props = entity.get('properties', {})
-                    primary_id = props.get('primary_id', '')
-
-                    if not primary_id:
-                        continue
-
-                    entity_ids.add(primary_id)
-
-                    # 扁平化
-                    record = {'primary_id': primary_id}
-                    for k, v in props.items():
-                        if k != 'primary_id' and v is not None:
-                            if isinstance(v, str):
-                                v = v.replace('\n', ' ').replace('\r', '')
-                            record[k] = v
-
-                    entities_by_label[label].append(record)
-
                 self.logger.info(f"  导入实体 ({len(entities_by_label)} 个标签):")
                 for label, records in sorted(entities_by_label.items()):
                     batch_size = 500
@@ -305,18 +321,6 @@ class ComprehensiveDataImporter:
                     self.import_stats['entities_imported'] += imported
 
                 # 导入关系
-                relationships_by_type = defaultdict(list)
-                valid_relationships = 0
-
-                for rel in relationships:
-                    from_id = rel.get('from', '')
-                    to_id = rel.get('to', '')
-
-                    if from_id in entity_ids and to_id in entity_ids:
-                        rel_type = rel.get('relationship_type', 'RELATED_TO').replace(':', '_')
-                        relationships_by_type[rel_type].append(rel)
-                        valid_relationships += 1
-
                 self.logger.info(f"  导入关系 ({len(relationships_by_type)} 个类型):")
                 for rel_type, rels in sorted(relationships_by_type.items()):
                     batch_size = 500
@@ -336,7 +340,7 @@ class ComprehensiveDataImporter:
                     self.logger.info(f"    {rel_type}: {imported} 个")
                     self.import_stats['relationships_imported'] += imported
 
-                self.logger.info(f"  有效关系: {valid_relationships}/{len(relationships)}")
+                self.logger.info(f"  有效关系: {valid_relationships}/{total_relationships}")
 
                 return {
                     'status': 'completed',